@@ -0,0 +1,113 @@
+"use client"
+
+import { useEffect, useMemo, useRef, useState } from "react"
+import AccretionDiskVisualization from "@/components/accretion-disk-visualization"
+import { QUALITY_TIERS, type QualityTier } from "@/lib/accretion-disk/quality"
+import type { RenderMode } from "@/lib/accretion-disk/renderer"
+import type { GeodesicMode } from "@/lib/accretion-disk/shaders"
+import type { RendererTelemetryEvent } from "@/lib/accretion-disk/telemetry"
+
+interface BenchmarkSettings {
+  tier: QualityTier
+  geodesicMode: GeodesicMode
+  renderMode: RenderMode
+  temporal: boolean
+  /** Timed frames to collect after the warmup. */
+  frames: number
+  warmup: number
+  /** Value u_time is pinned to, in seconds. */
+  time: number
+}
+
+/** Published on `window.__benchmarkResult` once all frames are in; read by `scripts/benchmark.mjs`. */
+interface BenchmarkResult {
+  tier: QualityTier
+  width: number
+  height: number
+  /** Until the slowest of the tier's programs was linked; they compile concurrently. */
+  compileMs: number
+  firstFullFrameMs: number
+  frameMs: number[]
+}
+
+declare global {
+  interface Window {
+    __benchmarkResult?: BenchmarkResult
+  }
+}
+
+function readSettings(): BenchmarkSettings {
+  const params = new URLSearchParams(window.location.search)
+  const tier = params.get("tier") as QualityTier
+  const number = (name: string, fallback: number) => Number(params.get(name) ?? fallback)
+  return {
+    tier: QUALITY_TIERS.includes(tier) ? tier : "medium",
+    geodesicMode: (params.get("geodesic") as GeodesicMode) ?? "march",
+    renderMode: (params.get("render") as RenderMode) ?? "direct",
+    temporal: params.has("temporal"),
+    frames: number("frames", 20),
+    warmup: number("warmup", 3),
+    time: number("time", 4),
+  }
+}
+
+/**
+ * Renders one quality tier with a pinned u_time at the window size and times
+ * each frame. Meant to be driven by `scripts/benchmark.mjs` in headless Chromium.
+ */
+export default function BenchmarkPage() {
+  const [settings, setSettings] = useState<BenchmarkSettings | null>(null)
+  const compileMs = useRef(0)
+  const firstFullFrameMs = useRef(0)
+  const frames = useRef<number[]>([])
+  const warmupLeft = useRef(0)
+  // A new object every render would recreate the renderer.
+  const benchmark = useMemo(() => ({ time: settings?.time ?? 0 }), [settings])
+
+  useEffect(() => {
+    const next = readSettings()
+    warmupLeft.current = next.warmup
+    setSettings(next)
+  }, [])
+
+  function handleTelemetry(event: RendererTelemetryEvent) {
+    if (!settings || window.__benchmarkResult) return
+    if (event.type === "shader-compile") {
+      compileMs.current = Math.max(compileMs.current, event.compileMs)
+    } else if (event.type === "startup") {
+      firstFullFrameMs.current = event.firstFullFrameMs
+    } else if (event.type === "frame") {
+      if (warmupLeft.current > 0) {
+        warmupLeft.current--
+        return
+      }
+      frames.current.push(event.frameMs)
+      if (frames.current.length < settings.frames) return
+      window.__benchmarkResult = {
+        tier: settings.tier,
+        width: window.innerWidth,
+        height: window.innerHeight,
+        compileMs: compileMs.current,
+        firstFullFrameMs: firstFullFrameMs.current,
+        frameMs: frames.current,
+      }
+    }
+  }
+
+  return (
+    <main className="w-full h-screen overflow-hidden bg-black">
+      {settings && (
+        <AccretionDiskVisualization
+          onTelemetry={handleTelemetry}
+          qualityTier={settings.tier}
+          geodesicMode={settings.geodesicMode}
+          renderMode={settings.renderMode}
+          temporal={settings.temporal}
+          adaptiveQuality={false}
+          benchmark={benchmark}
+          poster={false}
+        />
+      )}
+    </main>
+  )
+}
@@ -1,4 +1,4 @@
-import AccretionDiskVisualization from "@/components/accretion-disk-visualization"
+import LazyAccretionDiskVisualization from "@/components/lazy-accretion-disk-visualization"
 import Link from "next/link"
 
 export default function Home() {
@@ -6,7 +6,7 @@ export default function Home() {
     <main className="relative w-full h-screen overflow-hidden bg-black">
       {/* Visualization Background */}
       <div className="absolute inset-0">
-        <AccretionDiskVisualization />
+        <LazyAccretionDiskVisualization />
       </div>
 
       {/* Subtle vignette overlay */}
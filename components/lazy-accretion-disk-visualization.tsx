@@ -0,0 +1,46 @@
+"use client"
+
+import dynamic from "next/dynamic"
+import { useEffect, useState } from "react"
+
+// Client-only, in its own chunk, so none of the WebGL code runs during hydration.
+const AccretionDiskVisualization = dynamic(() => import("@/components/accretion-disk-visualization"), { ssr: false })
+
+// Longest the visualization waits for the main thread to go idle.
+const IDLE_TIMEOUT_MS = 2000
+// Stand-in for requestIdleCallback where it is missing (Safari).
+const IDLE_FALLBACK_MS = 200
+// Effective connection types too slow to spend on the visualization chunk.
+const SLOW_CONNECTIONS = ["slow-2g", "2g"]
+
+interface NetworkInformation {
+  saveData?: boolean
+  effectiveType?: string
+}
+
+/** Save-Data and very slow connections keep the poster frame instead. */
+function shouldSkipVisualization() {
+  const connection = (navigator as Navigator & { connection?: NetworkInformation }).connection
+  if (!connection) return false
+  return connection.saveData === true || SLOW_CONNECTIONS.includes(connection.effectiveType ?? "")
+}
+
+/**
+ * Server-renders the poster frame and loads the live visualization once the
+ * page is hydrated and idle, so the title and CTA are interactive first.
+ */
+export default function LazyAccretionDiskVisualization() {
+  const [load, setLoad] = useState(false)
+
+  useEffect(() => {
+    if (shouldSkipVisualization()) return
+    if (typeof window.requestIdleCallback === "function") {
+      const handle = window.requestIdleCallback(() => setLoad(true), { timeout: IDLE_TIMEOUT_MS })
+      return () => window.cancelIdleCallback(handle)
+    }
+    const timeout = setTimeout(() => setLoad(true), IDLE_FALLBACK_MS)
+    return () => clearTimeout(timeout)
+  }, [])
+
+  return <div className="w-full h-full accretion-disk-poster">{load && <AccretionDiskVisualization />}</div>
+}
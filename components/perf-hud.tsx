@@ -0,0 +1,274 @@
+"use client"
+
+import { useCallback, useEffect, useRef, useState } from "react"
+import type { QualityTier } from "@/lib/accretion-disk/quality"
+import type { RendererDiagnostics } from "@/lib/accretion-disk/renderer"
+import { DEBUG_TERMINATIONS, type DebugView, type UpscalerMode } from "@/lib/accretion-disk/shaders"
+import type { RendererTelemetryEvent, RendererTelemetryListener } from "@/lib/accretion-disk/telemetry"
+import type { ChromeTrace } from "@/lib/accretion-disk/trace-recorder"
+
+// Frames kept for the histograms.
+const HISTORY_FRAMES = 240
+// Upper bin edges in milliseconds; the last bin collects everything slower.
+const BIN_EDGES = [2, 4, 8, 12, 16.7, 25, 33.3, 50, 100]
+// The HUD re-renders on a timer rather than on every frame it records.
+const REFRESH_MS = 250
+// Length of a trace recording; the ring buffer keeps about this much anyway.
+const TRACE_MS = 30000
+
+const DEBUG_VIEW_LABELS: Record<DebugView, string> = { off: "Scene", steps: "Steps", termination: "Termination" }
+const UPSCALER_LABELS: Record<UpscalerMode, string> = { fsr: "FSR", bilinear: "Bilinear", split: "Split" }
+
+interface PerfHudProps {
+  initialTier: QualityTier
+  /** Registers a telemetry listener and returns a function that removes it. */
+  subscribe(listener: RendererTelemetryListener): () => void
+  onDiagnosticsChange(diagnostics: RendererDiagnostics): void
+  onStartTrace(): void
+  onStopTrace(): Promise<ChromeTrace | null>
+}
+
+/** Ring buffer of recent frame costs in milliseconds. */
+class FrameHistory {
+  private readonly values = new Float32Array(HISTORY_FRAMES)
+  private count = 0
+  private next = 0
+
+  push(value: number) {
+    this.values[this.next] = value
+    this.next = (this.next + 1) % HISTORY_FRAMES
+    this.count = Math.min(this.count + 1, HISTORY_FRAMES)
+  }
+
+  summarize() {
+    const sorted = Array.from(this.values.subarray(0, this.count)).sort((a, b) => a - b)
+    const bins = new Array<number>(BIN_EDGES.length + 1).fill(0)
+    for (const value of sorted) {
+      const bin = BIN_EDGES.findIndex((edge) => value <= edge)
+      bins[bin === -1 ? BIN_EDGES.length : bin]++
+    }
+    const at = (q: number) => (sorted.length > 0 ? sorted[Math.min(sorted.length - 1, Math.floor(q * sorted.length))] : null)
+    return { bins, p50: at(0.5), p95: at(0.95), frames: sorted.length }
+  }
+}
+
+/** Saves a trace as JSON for chrome://tracing or ui.perfetto.dev. */
+function downloadTrace(trace: ChromeTrace) {
+  const url = URL.createObjectURL(new Blob([JSON.stringify(trace)], { type: "application/json" }))
+  const link = document.createElement("a")
+  link.href = url
+  link.download = `accretion-disk-trace-${new Date().toISOString().replace(/[:.]/g, "-")}.json`
+  link.click()
+  URL.revokeObjectURL(url)
+}
+
+function Histogram({ label, history }: { label: string; history: FrameHistory }) {
+  const { bins, p50, p95, frames } = history.summarize()
+  const tallest = Math.max(...bins, 1)
+  return (
+    <div className="mt-2">
+      <div className="flex justify-between">
+        <span className="text-white/70">{label}</span>
+        <span>{frames > 0 ? `p50 ${p50!.toFixed(1)} · p95 ${p95!.toFixed(1)} ms` : "no data"}</span>
+      </div>
+      <div className="flex items-end gap-px h-10 mt-1">
+        {bins.map((count, i) => (
+          <div
+            key={i}
+            className="flex-1 bg-amber-200/70"
+            style={{ height: `${(count / tallest) * 100}%` }}
+            title={`${i === 0 ? 0 : BIN_EDGES[i - 1]}–${BIN_EDGES[i] ?? "∞"} ms: ${count} frames`}
+          />
+        ))}
+      </div>
+      <div className="flex justify-between text-white/40">
+        <span>0</span>
+        <span>{BIN_EDGES[BIN_EDGES.length - 1]}+ ms</span>
+      </div>
+    </div>
+  )
+}
+
+/**
+ * Overlay with CPU and GPU frame-time histograms, the active quality tier,
+ * march and display resolution, post chain cost and tile statistics, plus
+ * the steps and ray termination debug views of the ray-marching pass. While
+ * the march is upscaled it switches between the FSR and bilinear upscalers,
+ * or splits the screen between them, to compare their look and post chain
+ * cost. It can also record a trace of the render loop and download it in the
+ * Chrome trace format.
+ */
+export default function PerfHud({ initialTier, subscribe, onDiagnosticsChange, onStartTrace, onStopTrace }: PerfHudProps) {
+  const [debugView, setDebugView] = useState<DebugView>("off")
+  const [upscaler, setUpscaler] = useState<UpscalerMode>("fsr")
+  const [traceStartedAt, setTraceStartedAt] = useState<number | null>(null)
+  const [, setRefresh] = useState(0)
+  const cpu = useRef(new FrameHistory())
+  const gpu = useRef(new FrameHistory())
+  const postGpu = useRef<number | null>(null)
+  const tier = useRef(initialTier)
+  const resolution = useRef<Extract<RendererTelemetryEvent, { type: "resolution" }> | null>(null)
+  const tiles = useRef<Extract<RendererTelemetryEvent, { type: "tile-stats" }> | null>(null)
+  const onDiagnosticsChangeRef = useRef(onDiagnosticsChange)
+  onDiagnosticsChangeRef.current = onDiagnosticsChange
+
+  useEffect(() => {
+    const unsubscribe = subscribe((event) => {
+      if (event.type === "frame-timing") {
+        cpu.current.push(event.cpuMs)
+        if (event.gpuMs !== null) gpu.current.push(event.gpuMs)
+        postGpu.current = event.postGpuMs
+      } else if (event.type === "resolution") {
+        resolution.current = event
+      } else if (event.type === "tier-change") {
+        tier.current = event.to
+      } else if (event.type === "tile-stats") {
+        tiles.current = event
+      }
+    })
+    const interval = setInterval(() => setRefresh((n) => n + 1), REFRESH_MS)
+    return () => {
+      unsubscribe()
+      clearInterval(interval)
+    }
+  }, [subscribe])
+
+  useEffect(() => {
+    onDiagnosticsChangeRef.current({ frameTimings: true, debugView, upscaler })
+  }, [debugView, upscaler])
+
+  useEffect(() => () => onDiagnosticsChangeRef.current({ frameTimings: false, debugView: "off", upscaler: "fsr" }), [])
+
+  const stopTrace = useCallback(() => {
+    setTraceStartedAt(null)
+    onStopTrace().then((trace) => {
+      if (trace) downloadTrace(trace)
+    })
+  }, [onStopTrace])
+
+  useEffect(() => {
+    if (traceStartedAt === null) return
+    const timeout = setTimeout(stopTrace, TRACE_MS)
+    return () => clearTimeout(timeout)
+  }, [traceStartedAt, stopTrace])
+
+  const toggleTrace = () => {
+    if (traceStartedAt === null) {
+      onStartTrace()
+      setTraceStartedAt(performance.now())
+    } else {
+      stopTrace()
+    }
+  }
+
+  return (
+    <div className="fixed top-2 left-2 z-50 w-64 p-3 rounded bg-black/75 font-mono text-[10px] leading-tight text-white/90">
+      <div className="flex justify-between">
+        <span className="text-white/70">tier</span>
+        <span>{tier.current}</span>
+      </div>
+      <div className="flex justify-between">
+        <span className="text-white/70">march</span>
+        <span>
+          {resolution.current
+            ? `${resolution.current.width}×${resolution.current.height} @ ${resolution.current.scale.toFixed(2)}`
+            : "—"}
+        </span>
+      </div>
+      {resolution.current &&
+        (resolution.current.displayWidth !== resolution.current.width ||
+          resolution.current.displayHeight !== resolution.current.height) && (
+          <div className="flex justify-between">
+            <span className="text-white/70">display</span>
+            <span>
+              {resolution.current.displayWidth}×{resolution.current.displayHeight}
+            </span>
+          </div>
+        )}
+      {postGpu.current !== null && (
+        <div className="flex justify-between">
+          <span className="text-white/70">post chain</span>
+          <span>{postGpu.current.toFixed(2)} ms GPU</span>
+        </div>
+      )}
+      {tiles.current && (
+        <div className="flex justify-between">
+          <span className="text-white/70">marched tiles</span>
+          <span>
+            {(tiles.current.marchedFraction * 100).toFixed(0)}% · {tiles.current.meanSteps.toFixed(0)} steps
+          </span>
+        </div>
+      )}
+
+      <Histogram label="CPU" history={cpu.current} />
+      <Histogram label="GPU" history={gpu.current} />
+
+      <div className="flex gap-1 mt-3">
+        {(Object.keys(DEBUG_VIEW_LABELS) as DebugView[]).map((view) => (
+          <button
+            key={view}
+            type="button"
+            onClick={() => setDebugView(view)}
+            className={`flex-1 py-0.5 rounded border ${view === debugView ? "border-amber-200 text-amber-200" : "border-white/20 text-white/60"}`}
+          >
+            {DEBUG_VIEW_LABELS[view]}
+          </button>
+        ))}
+      </div>
+      {debugView === "steps" && (
+        <div className="mt-2">
+          <div className="h-2 rounded bg-[linear-gradient(to_right,#000080,#0080ff,#80ff80,#ff8000,#800000)]" />
+          <div className="flex justify-between text-white/40">
+            <span>0</span>
+            <span>MAX_STEPS</span>
+          </div>
+        </div>
+      )}
+      {debugView === "termination" && (
+        <div className="mt-2">
+          {DEBUG_TERMINATIONS.map(({ label, color }) => (
+            <div key={label} className="flex items-center gap-2">
+              <span
+                className="inline-block w-2 h-2 rounded-sm"
+                style={{ background: `rgb(${color.map((c) => Math.round(c * 255)).join(",")})` }}
+              />
+              <span>{label}</span>
+            </div>
+          ))}
+          <div className="mt-1 text-white/40">Brighter means more steps.</div>
+        </div>
+      )}
+      {debugView !== "off" && <div className="mt-1 text-white/40">Ray-marching mode only.</div>}
+
+      {resolution.current &&
+        (resolution.current.displayWidth > resolution.current.width ||
+          resolution.current.displayHeight > resolution.current.height) && (
+          <>
+            <div className="flex gap-1 mt-3">
+              {(Object.keys(UPSCALER_LABELS) as UpscalerMode[]).map((mode) => (
+                <button
+                  key={mode}
+                  type="button"
+                  onClick={() => setUpscaler(mode)}
+                  className={`flex-1 py-0.5 rounded border ${mode === upscaler ? "border-amber-200 text-amber-200" : "border-white/20 text-white/60"}`}
+                >
+                  {UPSCALER_LABELS[mode]}
+                </button>
+              ))}
+            </div>
+            {upscaler === "split" && <div className="mt-1 text-white/40">Bilinear left, FSR right.</div>}
+          </>
+        )}
+
+      <button
+        type="button"
+        onClick={toggleTrace}
+        className={`w-full mt-3 py-0.5 rounded border ${traceStartedAt !== null ? "border-red-400 text-red-400" : "border-white/20 text-white/60"}`}
+      >
+        {traceStartedAt !== null
+          ? `Recording… ${Math.max(0, Math.ceil((TRACE_MS - (performance.now() - traceStartedAt)) / 1000))} s (stop)`
+          : "Record 30 s trace"}
+      </button>
+    </div>
+  )
+}
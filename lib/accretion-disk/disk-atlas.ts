@@ -0,0 +1,63 @@
+type GL = WebGL2RenderingContext | WebGLRenderingContext
+
+// Texels around the disk and across its radii. The disk is a wide, thin
+// annulus, so the angle gets most of them.
+export const DISK_ATLAS_ANGLES = 512
+export const DISK_ATLAS_RADII = 128
+
+/**
+ * Polar texture of the disk's intrinsic emission, written once per frame by
+ * the disk-atlas pass and sampled by every pass that shades the disk, so the
+ * procedural flow and turbulence are evaluated once per texel instead of at
+ * every ray step. Texels are RGBM encoded in RGBA8, which every device can
+ * render to and filter.
+ */
+export class DiskAtlas {
+  readonly texture: WebGLTexture
+  private framebuffer: WebGLFramebuffer | null
+
+  /** Creates the atlas bound to its own texture unit, where it stays. */
+  constructor(
+    private readonly gl: GL,
+    readonly unit: number,
+  ) {
+    const texture = gl.createTexture()
+    if (!texture) throw new Error("Failed to create disk atlas texture")
+    this.texture = texture
+    this.framebuffer = gl.createFramebuffer()
+
+    gl.activeTexture(gl.TEXTURE0 + unit)
+    gl.bindTexture(gl.TEXTURE_2D, texture)
+    gl.texImage2D(
+      gl.TEXTURE_2D,
+      0,
+      gl.RGBA,
+      DISK_ATLAS_ANGLES,
+      DISK_ATLAS_RADII,
+      0,
+      gl.RGBA,
+      gl.UNSIGNED_BYTE,
+      null,
+    )
+    // Sampled inside the march loop, where screen-space derivatives are undefined, so no mipmaps.
+    gl.texParameteri(gl.TEXTURE_2D, gl.TEXTURE_MIN_FILTER, gl.LINEAR)
+    gl.texParameteri(gl.TEXTURE_2D, gl.TEXTURE_MAG_FILTER, gl.LINEAR)
+    // The angle wraps around; the radii end where the disk's density does.
+    gl.texParameteri(gl.TEXTURE_2D, gl.TEXTURE_WRAP_S, gl.REPEAT)
+    gl.texParameteri(gl.TEXTURE_2D, gl.TEXTURE_WRAP_T, gl.CLAMP_TO_EDGE)
+    gl.bindFramebuffer(gl.FRAMEBUFFER, this.framebuffer)
+    gl.framebufferTexture2D(gl.FRAMEBUFFER, gl.COLOR_ATTACHMENT0, gl.TEXTURE_2D, texture, 0)
+    gl.bindFramebuffer(gl.FRAMEBUFFER, null)
+  }
+
+  bindForWriting() {
+    this.gl.bindFramebuffer(this.gl.FRAMEBUFFER, this.framebuffer)
+    this.gl.viewport(0, 0, DISK_ATLAS_ANGLES, DISK_ATLAS_RADII)
+  }
+
+  dispose() {
+    this.gl.deleteTexture(this.texture)
+    this.gl.deleteFramebuffer(this.framebuffer)
+    this.framebuffer = null
+  }
+}
@@ -0,0 +1,60 @@
+// The disk's turbulence (smoothTurb in the GLSL) is a sum of sine waves whose
+// spatial frequencies are all multiples of 0.1, so at any instant it repeats
+// every 20π along both axes. One period of it is baked into a tileable
+// texture that the shader samples with hardware filtering; time moves the
+// pattern by scrolling the texture coordinates instead of shifting the phase
+// of every wave.
+
+export const DISK_NOISE_SIZE = 512
+export const DISK_NOISE_PERIOD = 20 * Math.PI
+// Sum of the wave amplitudes: texels store the turbulence remapped from
+// [-range, range] around 0.5 to [0, 1].
+export const DISK_NOISE_RANGE = 1.4
+
+/** sin and cos of frequency * x at the texel centers of one period. */
+function waveTable(frequency: number, size: number) {
+  const sin = new Float32Array(size)
+  const cos = new Float32Array(size)
+  for (let i = 0; i < size; i++) {
+    const angle = (frequency * (i + 0.5) * DISK_NOISE_PERIOD) / size
+    sin[i] = Math.sin(angle)
+    cos[i] = Math.cos(angle)
+  }
+  return { sin, cos }
+}
+
+/**
+ * Builds the size x size single-channel turbulence texture, rows along z.
+ * Waves along the two axes are tabulated once and combined with the angle
+ * sum identities, so the build is a few multiplies per texel.
+ */
+export function buildDiskNoise(size = DISK_NOISE_SIZE): Uint8Array {
+  const x12 = waveTable(1.2, size)
+  const x23 = waveTable(2.3, size)
+  const x06 = waveTable(0.6, size)
+  const x41 = waveTable(4.1, size)
+  const x35 = waveTable(3.5, size)
+  const x60 = waveTable(6.0, size)
+  const y09 = waveTable(0.9, size)
+  const y18 = waveTable(1.8, size)
+  const y27 = waveTable(2.7, size)
+  const y32 = waveTable(3.2, size)
+  const y40 = waveTable(4.0, size)
+  const y55 = waveTable(5.5, size)
+
+  const data = new Uint8Array(size * size)
+  for (let j = 0; j < size; j++) {
+    for (let i = 0; i < size; i++) {
+      // smoothTurb at t = 0, one term per line
+      const value =
+        x12.sin[i] * y09.cos[j] * 0.5 +
+        (x23.sin[i] * y18.cos[j] + x23.cos[i] * y18.sin[j]) * 0.3 +
+        (y27.cos[j] * x06.cos[i] + y27.sin[j] * x06.sin[i]) * 0.25 +
+        (x41.sin[i] * y32.cos[j] + x41.cos[i] * y32.sin[j]) * 0.15 +
+        (x35.cos[i] * y40.cos[j] + x35.sin[i] * y40.sin[j]) * 0.12 +
+        x60.sin[i] * y55.cos[j] * 0.08
+      data[j * size + i] = Math.round((value / DISK_NOISE_RANGE) * 127.5 + 127.5)
+    }
+  }
+  return data
+}
@@ -0,0 +1,77 @@
+// Everything diskEmission does to the atlas color after the fetch (relativistic
+// beaming, the blue/red color shift and the gravitational redshift) depends
+// only on the radius and on how the photon's direction lines up with the
+// orbital motion. Per channel it is a scale, plus a constant added to blue
+// on the approaching side, so one RGBA texel holds all of it:
+//   emission = atlas * lut.rgb + vec3(0, 0, lut.a)
+// The table is sampled with hardware filtering instead of running the
+// branches at every disk sample. It needs WebGL2 for filterable half floats;
+// WebGL1 variants keep the analytic code.
+
+// Mirror RS and the disk atlas radii in glsl/scene.glsl.
+const RS = 0.6
+export const DISK_SHIFT_LUT_INNER = 1.2 * 0.9
+export const DISK_SHIFT_LUT_OUTER = 6.0 * 1.1
+
+// Columns span dopplerDot in [-1, 1] with texel centers on both ends; the
+// count is odd so that one sits on dopplerDot = 0, where the color shift
+// switches from red to blue. Rows span the atlas radii the same way.
+export const DISK_SHIFT_LUT_DOTS = 129
+export const DISK_SHIFT_LUT_RADII = 64
+
+export interface DiskShiftLut {
+  /** RGBA rows of DISK_SHIFT_LUT_DOTS texels, one row per radius. */
+  data: Float32Array
+  width: number
+  height: number
+}
+
+const clamp = (x: number, lo: number, hi: number) => Math.min(Math.max(x, lo), hi)
+
+/** Texel (dopplerDot column, radius row) of the table; a port of the tail of diskEmission. */
+function diskShift(r: number, dopplerDot: number, out: Float32Array, offset: number) {
+  const vOrb = 0.5 / Math.sqrt(Math.max(r, 0.1))
+  const dopplerFactor = dopplerDot * vOrb * 2.5
+  let dopplerBright = clamp(1.0 + dopplerFactor, 0.25, 3.0)
+  dopplerBright *= dopplerBright
+
+  let red = dopplerBright
+  let green = dopplerBright
+  let blue = dopplerBright
+  let addedBlue = 0
+  const colorShift = clamp(dopplerFactor * 2.0, -1.0, 1.0)
+  if (colorShift > 0.0) {
+    const boost = 1.0 + colorShift * 0.5
+    red *= (1.0 - colorShift * 0.15) * boost
+    green *= (1.0 + colorShift * 1.2) * boost
+    blue *= (1.0 + colorShift * colorShift * 2.0) * boost
+    addedBlue = colorShift * 0.4 * boost
+  } else {
+    const redShift = -colorShift
+    red *= 1.0 + redShift * 0.6
+    green *= 1.0 - redShift * 0.35
+    blue *= 1.0 - redShift * 0.7
+  }
+
+  const gravRedshift = Math.sqrt(1.0 - RS / Math.max(r, RS * 1.01))
+  const gravColorShift = (1.0 - gravRedshift) * 2.0
+  const blueGrav = gravRedshift * (1.0 - gravColorShift * 0.4)
+  out[offset] = red * gravRedshift
+  out[offset + 1] = green * gravRedshift * (1.0 - gravColorShift * 0.15)
+  out[offset + 2] = blue * blueGrav
+  out[offset + 3] = addedBlue * blueGrav
+}
+
+/** Builds the table; a few thousand texels, so it is cheap enough to run at startup. */
+export function buildDiskShiftLut(): DiskShiftLut {
+  const width = DISK_SHIFT_LUT_DOTS
+  const height = DISK_SHIFT_LUT_RADII
+  const data = new Float32Array(width * height * 4)
+  for (let row = 0; row < height; row++) {
+    const r = DISK_SHIFT_LUT_INNER + ((DISK_SHIFT_LUT_OUTER - DISK_SHIFT_LUT_INNER) * row) / (height - 1)
+    for (let column = 0; column < width; column++) {
+      diskShift(r, (2 * column) / (width - 1) - 1, data, (row * width + column) * 4)
+    }
+  }
+  return { data, width, height }
+}
@@ -0,0 +1,78 @@
+import { SCRATCH_TEXTURE_UNIT } from "./shaders"
+
+export const GBUFFER_TARGET_COUNT = 4
+
+/**
+ * True when half-float color attachments can be rendered to, which the
+ * G-buffer needs. WebGL1 is not supported (no multiple render targets in core).
+ */
+export function supportsFloatRenderTargets(gl: WebGL2RenderingContext | WebGLRenderingContext, isWebGL2: boolean) {
+  if (!isWebGL2) return false
+  return Boolean(gl.getExtension("EXT_color_buffer_float") || gl.getExtension("EXT_color_buffer_half_float"))
+}
+
+/**
+ * Set of RGBA16F render targets written by the G-buffer trace pass with
+ * multiple render targets and read back by the shading pass with texelFetch.
+ */
+export class GBuffer {
+  readonly textures: WebGLTexture[] = []
+  private framebuffer: WebGLFramebuffer | null
+  width = 0
+  height = 0
+
+  constructor(private readonly gl: WebGL2RenderingContext) {
+    this.framebuffer = gl.createFramebuffer()
+    for (let i = 0; i < GBUFFER_TARGET_COUNT; i++) {
+      const texture = gl.createTexture()
+      if (!texture) throw new Error("Failed to create G-buffer texture")
+      this.textures.push(texture)
+    }
+  }
+
+  /** Reallocates the targets. Returns false if the framebuffer is incomplete on this device. */
+  resize(width: number, height: number): boolean {
+    const gl = this.gl
+    this.width = width
+    this.height = height
+
+    gl.activeTexture(gl.TEXTURE0 + SCRATCH_TEXTURE_UNIT)
+    gl.bindFramebuffer(gl.FRAMEBUFFER, this.framebuffer)
+    const attachments: number[] = []
+    this.textures.forEach((texture, i) => {
+      gl.bindTexture(gl.TEXTURE_2D, texture)
+      gl.texImage2D(gl.TEXTURE_2D, 0, gl.RGBA16F, width, height, 0, gl.RGBA, gl.HALF_FLOAT, null)
+      gl.texParameteri(gl.TEXTURE_2D, gl.TEXTURE_MIN_FILTER, gl.NEAREST)
+      gl.texParameteri(gl.TEXTURE_2D, gl.TEXTURE_MAG_FILTER, gl.NEAREST)
+      gl.texParameteri(gl.TEXTURE_2D, gl.TEXTURE_WRAP_S, gl.CLAMP_TO_EDGE)
+      gl.texParameteri(gl.TEXTURE_2D, gl.TEXTURE_WRAP_T, gl.CLAMP_TO_EDGE)
+      gl.framebufferTexture2D(gl.FRAMEBUFFER, gl.COLOR_ATTACHMENT0 + i, gl.TEXTURE_2D, texture, 0)
+      attachments.push(gl.COLOR_ATTACHMENT0 + i)
+    })
+    gl.drawBuffers(attachments)
+    const complete = gl.checkFramebufferStatus(gl.FRAMEBUFFER) === gl.FRAMEBUFFER_COMPLETE
+    gl.bindFramebuffer(gl.FRAMEBUFFER, null)
+    return complete
+  }
+
+  bindForWriting() {
+    this.gl.bindFramebuffer(this.gl.FRAMEBUFFER, this.framebuffer)
+    this.gl.viewport(0, 0, this.width, this.height)
+  }
+
+  bindTextures(units: number[]) {
+    const gl = this.gl
+    this.textures.forEach((texture, i) => {
+      gl.activeTexture(gl.TEXTURE0 + units[i])
+      gl.bindTexture(gl.TEXTURE_2D, texture)
+    })
+  }
+
+  dispose() {
+    const gl = this.gl
+    for (const texture of this.textures) gl.deleteTexture(texture)
+    gl.deleteFramebuffer(this.framebuffer)
+    this.textures.length = 0
+    this.framebuffer = null
+  }
+}
@@ -0,0 +1,28 @@
+// Generated by scripts/build-shaders.mjs from lib/accretion-disk/glsl; do not edit.
+import type { QualityTier } from "../quality"
+import type { ShaderVariant } from "../shaders"
+
+// Tier-independent, so they are bundled with the renderer.
+export const FULLSCREEN_QUAD_SHADERS = {
+  webgl1: "attribute vec2 a_position;varying vec2 v_uv;void main(){v_uv=a_position*.5+.5;gl_Position=vec4(a_position,0.,1.);}",
+  webgl2: "#version 300 es\nin vec2 a_position;out vec2 v_uv;void main(){v_uv=a_position*.5+.5;gl_Position=vec4(a_position,0.,1.);}",
+}
+
+export const PLACEHOLDER_SHADERS = {
+  webgl1: "precision highp float;precision highp int;varying vec2 v_uv;uniform float u_time;uniform vec2 u_resolution;void main(){vec2 uv=(gl_FragCoord.xy-.5*u_resolution)/min(u_resolution.x,u_resolution.y);float ringDist=length(vec2(uv.x,uv.y*5.))-.35;float ring=exp(-ringDist*ringDist*30.);float shadow=smoothstep(.07,.11,length(uv));float pulse=.85+.15*sin(u_time*2.);vec3 color=vec3(1.,.55,.2)*ring*.5*shadow*pulse;gl_FragColor=vec4(pow(color,vec3(.4545)),1.);}",
+  webgl2: "#version 300 es\nprecision highp float;precision highp int;in vec2 v_uv;out vec4 fragColor;uniform float u_time;uniform vec2 u_resolution;void main(){vec2 uv=(gl_FragCoord.xy-.5*u_resolution)/min(u_resolution.x,u_resolution.y);float ringDist=length(vec2(uv.x,uv.y*5.))-.35;float ring=exp(-ringDist*ringDist*30.);float shadow=smoothstep(.07,.11,length(uv));float pulse=.85+.15*sin(u_time*2.);vec3 color=vec3(1.,.55,.2)*ring*.5*shadow*pulse;fragColor=vec4(pow(color,vec3(.4545)),1.);}",
+}
+
+// One chunk per tier and WebGL version, loaded on demand.
+export const SHADER_VARIANT_LOADERS: Record<`${QualityTier}/webgl${1 | 2}`, () => Promise<{ default: ShaderVariant }>> = {
+  "ultra-low/webgl1": () => import("./ultra-low-webgl1"),
+  "ultra-low/webgl2": () => import("./ultra-low-webgl2"),
+  "low/webgl1": () => import("./low-webgl1"),
+  "low/webgl2": () => import("./low-webgl2"),
+  "medium/webgl1": () => import("./medium-webgl1"),
+  "medium/webgl2": () => import("./medium-webgl2"),
+  "high/webgl1": () => import("./high-webgl1"),
+  "high/webgl2": () => import("./high-webgl2"),
+  "ultra/webgl1": () => import("./ultra-webgl1"),
+  "ultra/webgl2": () => import("./ultra-webgl2"),
+}
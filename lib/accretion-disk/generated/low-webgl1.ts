@@ -0,0 +1,11 @@
+// Generated by scripts/build-shaders.mjs from lib/accretion-disk/glsl; do not edit.
+import type { ShaderVariant } from "../shaders"
+
+const variant: ShaderVariant = {
+  "disk-atlas": "precision highp float;precision highp int;varying vec2 v_uv;uniform float u_time;uniform vec2 u_resolution;uniform sampler2D u_diskAtlas;const float PI=3.14159265359;const float RS=.6;const float DISK_INNER=1.2;const float DISK_OUTER=6.;const float INCLINATION=.1045;const float DISK_ATLAS_INNER=DISK_INNER*.9;const float DISK_ATLAS_OUTER=DISK_OUTER*1.1;const float DISK_ATLAS_RANGE=12.;float hash(vec2 p){vec3 p3=fract(vec3(p.xyx)*.1031);p3=p3+dot(p3,p3.yzx+33.33);return fract((p3.x+p3.y)*p3.z);}float diskDopplerDot(vec3 pos,float r,vec3 vel){float orbitDirX=-pos.z/max(r,.001);float orbitDirZ=pos.x/max(r,.001);float velLen=sqrt(vel.x*vel.x+vel.y*vel.y+vel.z*vel.z);float dopplerDot=(orbitDirX*vel.x+orbitDirZ*vel.z)/max(velLen,.001);return dopplerDot;}vec3 diskAtlasEmission(vec3 pos,float r){vec2 uv=vec2(atan(pos.z,pos.x)/(2.*PI)+.5,(r-DISK_ATLAS_INNER)/(DISK_ATLAS_OUTER-DISK_ATLAS_INNER));vec4 texel=texture2D(u_diskAtlas,uv);return texel.rgb*texel.a*DISK_ATLAS_RANGE;}vec3 diskEmission(vec3 pos,float r,float dopplerDot){vec3 col=diskAtlasEmission(pos,r);float vOrb=.5/sqrt(max(r,.1));float dopplerFactor=dopplerDot*vOrb*2.5;float dopplerBright=clamp(1.+dopplerFactor,.25,3.);col=col*dopplerBright*dopplerBright;float colorShift=clamp(dopplerFactor*2.,-1.,1.);if(colorShift>0.){float blueBoost=colorShift*colorShift;col.b=col.b+col.b*blueBoost*2.+colorShift*.4;col.g=col.g+col.g*colorShift*1.2;col.r=col.r*(1.-colorShift*.15);col=col*(1.+colorShift*.5);}else{float redShift=-colorShift;col.r=col.r+col.r*redShift*.6;col.g=col.g*(1.-redShift*.35);col.b=col.b*(1.-redShift*.7);}float gravRedshift=sqrt(1.-RS/max(r,RS*1.01));col=col*gravRedshift;float gravColorShift=(1.-gravRedshift)*2.;col.b=col.b*(1.-gravColorShift*.4);col.g=col.g*(1.-gravColorShift*.15);return col;}float diskDensity(vec3 pos){float r=sqrt(pos.x*pos.x+pos.z*pos.z);float absY=abs(pos.y);float diskThickness=.08+.12*smoothstep(DISK_INNER,DISK_OUTER,r);float verticalDensity=exp(-absY*absY/(diskThickness*diskThickness*2.));if(r<DISK_INNER*.9||r>DISK_OUTER*1.1||verticalDensity<.01){return 0.;}float radialDensity=smoothstep(DISK_INNER*.9,DISK_INNER*1.3,r)*smoothstep(DISK_OUTER*1.1,DISK_OUTER*.6,r);return verticalDensity*radialDensity;}vec4 sampleDiskVolume(vec3 pos,vec3 vel){float density=diskDensity(pos);if(density<=0.)return vec4(0.);float r=sqrt(pos.x*pos.x+pos.z*pos.z);return vec4(diskEmission(pos,r,diskDopplerDot(pos,r,vel)),density);}vec2 jetProfile(vec3 pos){float absY=abs(pos.y);if(absY<.6||absY>12.)return vec2(0.);float r=sqrt(pos.x*pos.x+pos.z*pos.z);float jetRadius=.15+.08*sqrt(absY);float radialFall=exp(-r*r/(jetRadius*jetRadius*3.));if(radialFall<.02)return vec2(0.);float core=exp(-r*r/(jetRadius*jetRadius*.3));float baseFade=smoothstep(.6,2.5,absY);float tipFade=smoothstep(12.,6.,absY);return vec2(radialFall*baseFade*tipFade,core);}vec4 jetEmission(vec2 profile,float absY){float wave1=sin(absY*.8-u_time*4.)*.5+.5;float wave2=sin(absY*.4-u_time*2.8)*.5+.5;float smoothWave=wave1*.7+wave2*.3;float density=profile.x*(.5+.4*smoothWave);vec3 baseColor=vec3(.35,.25,.6);vec3 coreColor=vec3(.7,.85,1.);vec3 color=mix(baseColor,coreColor,profile.y*profile.y+smoothWave*.2);return vec4(color,density*.6);}vec4 sampleJet(vec3 pos){vec2 profile=jetProfile(pos);if(profile.x<=0.)return vec4(0.);return jetEmission(profile,abs(pos.y));}uniform sampler2D u_diskNoise;const float DISK_NOISE_PERIOD=62.831853;const float DISK_NOISE_RANGE=1.4;const vec2 DISK_NOISE_DRIFT=vec2(.583333,-.555556);float smoothTurb(vec2 p,float t){vec2 uv=p/DISK_NOISE_PERIOD+fract(DISK_NOISE_DRIFT*t/DISK_NOISE_PERIOD);return texture2D(u_diskNoise,uv).r*DISK_NOISE_RANGE-(DISK_NOISE_RANGE-1.)*.5;}vec3 diskColor(float r,float temp){float t=clamp((r-DISK_INNER)/(DISK_OUTER-DISK_INNER),0.,1.);vec3 hot=vec3(1.4,1.4,1.3);vec3 warm=vec3(1.3,1.,.5);vec3 mid=vec3(1.2,.65,.2);vec3 cool=vec3(.9,.3,.1);vec3 c;if(t<.33){c=mix(hot,warm,t*3.);}else if(t<.66){c=mix(warm,mid,(t-.33)*3.);}else{c=mix(mid,cool,(t-.66)*3.);}return c+vec3(.3,.2,.1)*temp;}vec3 diskIntrinsicEmission(vec3 pos,float r){float t=u_time;float orbitalSpeed=15./(r*sqrt(r));float orbitalPhase=t*orbitalSpeed;float flowX=pos.x*cos(orbitalPhase)-pos.z*sin(orbitalPhase);float flowZ=pos.x*sin(orbitalPhase)+pos.z*cos(orbitalPhase);float angle=atan(pos.z,pos.x);float streakPhase=angle*6.-t*orbitalSpeed*.5;float motionStreak=sin(streakPhase)*.5+.5;motionStreak=pow(motionStreak,.7)*.3;float turb1=smoothTurb(vec2(flowX*.8,flowZ*.8),t*2.5);float turb2=smoothTurb(vec2(flowX*1.5+5.,flowZ*1.2+3.),t*3.5);float turb3=smoothTurb(vec2(flowX*.4,flowZ*.5),t*1.5);float turbulence=turb1*.5+turb2*.3+turb3*.2;float flow1=sin(flowX*2.+flowZ*1.2+t*4.)*.5+.5;float flow2=cos(flowX*1.3-flowZ*1.8-t*3.)*.5+.5;float flow3=sin(angle*3.-t*orbitalSpeed*.3)*.5+.5;float flowBright=flow1*.3+flow2*.25+flow3*.2+motionStreak+.25;float radialBright=pow(DISK_INNER/max(r,DISK_INNER),1.5);float brightness=radialBright*(.4+turbulence*.4+flowBright*.5);float tempVar=turbulence*.5;return diskColor(r,tempVar)*brightness*4.;}void main(){float angle=(v_uv.x-.5)*2.*PI;float r=mix(DISK_ATLAS_INNER,DISK_ATLAS_OUTER,v_uv.y);vec3 emission=diskIntrinsicEmission(vec3(r*cos(angle),0.,r*sin(angle)),r)/DISK_ATLAS_RANGE;float m=clamp(max(max(emission.r,emission.g),max(emission.b,.000001)),0.,1.);m=ceil(m*255.)/255.;gl_FragColor=vec4(emission/m,m);}",
+  "tile-stats": "precision highp float;precision highp int;varying vec2 v_uv;uniform float u_time;uniform vec2 u_resolution;uniform sampler2D u_diskAtlas;const float PI=3.14159265359;const float RS=.6;const float DISK_INNER=1.2;const float DISK_OUTER=6.;const float INCLINATION=.1045;const float DISK_ATLAS_INNER=DISK_INNER*.9;const float DISK_ATLAS_OUTER=DISK_OUTER*1.1;const float DISK_ATLAS_RANGE=12.;float hash(vec2 p){vec3 p3=fract(vec3(p.xyx)*.1031);p3=p3+dot(p3,p3.yzx+33.33);return fract((p3.x+p3.y)*p3.z);}float diskDopplerDot(vec3 pos,float r,vec3 vel){float orbitDirX=-pos.z/max(r,.001);float orbitDirZ=pos.x/max(r,.001);float velLen=sqrt(vel.x*vel.x+vel.y*vel.y+vel.z*vel.z);float dopplerDot=(orbitDirX*vel.x+orbitDirZ*vel.z)/max(velLen,.001);return dopplerDot;}vec3 diskAtlasEmission(vec3 pos,float r){vec2 uv=vec2(atan(pos.z,pos.x)/(2.*PI)+.5,(r-DISK_ATLAS_INNER)/(DISK_ATLAS_OUTER-DISK_ATLAS_INNER));vec4 texel=texture2D(u_diskAtlas,uv);return texel.rgb*texel.a*DISK_ATLAS_RANGE;}vec3 diskEmission(vec3 pos,float r,float dopplerDot){vec3 col=diskAtlasEmission(pos,r);float vOrb=.5/sqrt(max(r,.1));float dopplerFactor=dopplerDot*vOrb*2.5;float dopplerBright=clamp(1.+dopplerFactor,.25,3.);col=col*dopplerBright*dopplerBright;float colorShift=clamp(dopplerFactor*2.,-1.,1.);if(colorShift>0.){float blueBoost=colorShift*colorShift;col.b=col.b+col.b*blueBoost*2.+colorShift*.4;col.g=col.g+col.g*colorShift*1.2;col.r=col.r*(1.-colorShift*.15);col=col*(1.+colorShift*.5);}else{float redShift=-colorShift;col.r=col.r+col.r*redShift*.6;col.g=col.g*(1.-redShift*.35);col.b=col.b*(1.-redShift*.7);}float gravRedshift=sqrt(1.-RS/max(r,RS*1.01));col=col*gravRedshift;float gravColorShift=(1.-gravRedshift)*2.;col.b=col.b*(1.-gravColorShift*.4);col.g=col.g*(1.-gravColorShift*.15);return col;}float diskDensity(vec3 pos){float r=sqrt(pos.x*pos.x+pos.z*pos.z);float absY=abs(pos.y);float diskThickness=.08+.12*smoothstep(DISK_INNER,DISK_OUTER,r);float verticalDensity=exp(-absY*absY/(diskThickness*diskThickness*2.));if(r<DISK_INNER*.9||r>DISK_OUTER*1.1||verticalDensity<.01){return 0.;}float radialDensity=smoothstep(DISK_INNER*.9,DISK_INNER*1.3,r)*smoothstep(DISK_OUTER*1.1,DISK_OUTER*.6,r);return verticalDensity*radialDensity;}vec4 sampleDiskVolume(vec3 pos,vec3 vel){float density=diskDensity(pos);if(density<=0.)return vec4(0.);float r=sqrt(pos.x*pos.x+pos.z*pos.z);return vec4(diskEmission(pos,r,diskDopplerDot(pos,r,vel)),density);}vec2 jetProfile(vec3 pos){float absY=abs(pos.y);if(absY<.6||absY>12.)return vec2(0.);float r=sqrt(pos.x*pos.x+pos.z*pos.z);float jetRadius=.15+.08*sqrt(absY);float radialFall=exp(-r*r/(jetRadius*jetRadius*3.));if(radialFall<.02)return vec2(0.);float core=exp(-r*r/(jetRadius*jetRadius*.3));float baseFade=smoothstep(.6,2.5,absY);float tipFade=smoothstep(12.,6.,absY);return vec2(radialFall*baseFade*tipFade,core);}vec4 jetEmission(vec2 profile,float absY){float wave1=sin(absY*.8-u_time*4.)*.5+.5;float wave2=sin(absY*.4-u_time*2.8)*.5+.5;float smoothWave=wave1*.7+wave2*.3;float density=profile.x*(.5+.4*smoothWave);vec3 baseColor=vec3(.35,.25,.6);vec3 coreColor=vec3(.7,.85,1.);vec3 color=mix(baseColor,coreColor,profile.y*profile.y+smoothWave*.2);return vec4(color,density*.6);}vec4 sampleJet(vec3 pos){vec2 profile=jetProfile(pos);if(profile.x<=0.)return vec4(0.);return jetEmission(profile,abs(pos.y));}vec3 cameraPosition(float orbitAngle){float camDist=11.;float cI=cos(INCLINATION);float sI=sin(INCLINATION);return vec3(sin(orbitAngle)*cI*camDist,sI*camDist,cos(orbitAngle)*cI*camDist);}vec3 cameraRay(vec2 uv,float orbitAngle){vec3 cam=cameraPosition(orbitAngle);vec3 fwd=-cam/length(cam);vec3 right=vec3(cos(orbitAngle),0.,-sin(orbitAngle));vec3 up=cross(right,fwd);up=up/max(length(up),.001);return normalize(fwd+uv.x*right+uv.y*up);}vec2 screenUv(){vec2 pixel=gl_FragCoord.xy;return(pixel-.5*u_resolution)/min(u_resolution.x,u_resolution.y);}const float CORE_BOUND=RS*6.;const float DISK_BOUND=DISK_OUTER*1.1+.1;const float DISK_HALF_THICKNESS=.61;const float JET_BOUND=1.5;const float JET_TOP=12.;const float BEND_SLACK=.25;const float ESCAPE_RADIUS=30.;const int DISK_CHORD_SAMPLES=6;float deflectionIntegral(float s,float b){float q=b*b+s*s;return s*(2.*s*s+3.*b*b)/(3.*b*q*sqrt(q));}float displacementIntegral(float s,float b){float q=sqrt(b*b+s*s);return(2.*q-b*b/q)/(3.*b);}vec2 rayBending(float s0,float s,float b){float f0=deflectionIntegral(s0,b);float angle=1.5*RS*(deflectionIntegral(s,b)-f0);float drop=1.5*RS*(displacementIntegral(s,b)-displacementIntegral(s0,b)-f0*(s-s0));return vec2(angle,drop);}bool rayMissesScene(vec3 cam,vec3 rd){float tClosest=-dot(cam,rd);if(tClosest<0.)return true;vec3 closest=cam+rd*tClosest;float b=length(closest);if(b<CORE_BOUND)return false;vec3 towardHole=-closest/b;float s0=-tClosest;if(b<DISK_BOUND){float halfChord=sqrt(DISK_BOUND*DISK_BOUND-b*b);float prevY=0.;for(int i=0;i<DISK_CHORD_SAMPLES;i++){float s=halfChord*(2.*float(i)/float(DISK_CHORD_SAMPLES-1)-1.);float y=cam.y+rd.y*(s-s0)+towardHole.y*rayBending(s0,s,b).y;if(abs(y)<DISK_HALF_THICKNESS+BEND_SLACK||(i>0&&y*prevY<0.))return false;prevY=y;}}float lenXZ=dot(rd.xz,rd.xz);if(lenXZ>.000001){float tAxis=max(-dot(cam.xz,rd.xz)/lenXZ,0.);vec3 nearAxis=cam+rd*tAxis+towardHole*rayBending(s0,tAxis+s0,b).y;if(abs(nearAxis.y)<JET_TOP+BEND_SLACK&&length(nearAxis.xz)<JET_BOUND+BEND_SLACK)return false;}return true;}vec3 lensedStarfield(vec3 cam,vec3 rd){float tClosest=-dot(cam,rd);vec3 closest=cam+rd*tClosest;float b=max(length(closest),.001);float sEscape=sqrt(max(ESCAPE_RADIUS*ESCAPE_RADIUS-b*b,0.));float angle=rayBending(-tClosest,sEscape,b).x;vec3 dir=rd*cos(angle)-closest/b*sin(angle);float starVal=hash(vec2(dir.x*400.+dir.y*200.,dir.z*300.));return vec3(pow(starVal,35.)*.3);}const float MAX_GEODESIC_STEP=2.;const float PHOTON_RING_REACH=.45;float emitterDistance(vec3 pos,float r){float cylR=length(pos.xz);float absY=abs(pos.y);float d=min(r-RS*1.5-PHOTON_RING_REACH,length(max(vec2(cylR-DISK_BOUND,absY-DISK_HALF_THICKNESS),0.)));d=min(d,length(max(vec2(cylR-JET_BOUND,absY-JET_TOP),0.)));return max(d,0.);}float marchSampleOffset(){float noise=fract(52.9829189*fract(dot(gl_FragCoord.xy,vec2(.06711056,.00583715))));return noise;}vec4 traceGeodesicMarch(vec3 cam,vec3 rd,int budget,float stepScale,out vec2 stats){stats=vec2(0.,1000.);stepScale=stepScale*1.5;float sampleOffset=marchSampleOffset();if(rayMissesScene(cam,rd)){return vec4(lensedStarfield(cam,rd),0.);}vec3 pos=cam;vec3 vel=rd;vec3 color=vec3(0.);float alpha=0.;float stepSize=.045*stepScale;vec3 h=cross(cam,rd);float pull=1.5*RS*dot(h,h);float camR=length(cam);vec3 acc=-pull/(camR*camR*camR*camR*camR)*cam;float geodesicStep=MAX_GEODESIC_STEP;for(int i=0;i<160;i++){if(i>=budget)break;float r=length(pos);stats=vec2(float(i+1),min(stats.y,r));if(r<RS){color=mix(color,vec3(0.),1.-alpha);alpha=1.;break;}bool leaving=r>DISK_BOUND&&dot(pos,vel)>0.;leaving=leaving&&((abs(pos.y)>JET_TOP+BEND_SLACK&&pos.y*vel.y>0.)||(length(pos.xz)>JET_BOUND+BEND_SLACK&&dot(pos.xz,vel.xz)>0.));if(r>ESCAPE_RADIUS||leaving){float starVal=hash(vec2(rd.x*400.+rd.y*200.,rd.z*300.));starVal=pow(starVal,35.)*.3;color=color+vec3(starVal)*(1.-alpha);break;}float profileStep=.045+.06*smoothstep(RS*2.,RS*8.,r);stepSize=min(max(profileStep*stepScale,emitterDistance(pos,r)),geodesicStep);float dl=stepSize/length(vel);vec3 newPos=pos+(vel+.5*acc*dl)*dl;float newR=length(newPos);vec3 newAcc=-pull/(newR*newR*newR*newR*newR)*newPos;vel=vel+.5*(acc+newAcc)*dl;float error=length(newAcc-acc)*dl*dl/6.;geodesicStep=stepSize*clamp(pow(.001/max(error,1e-12),1./3.),.5,2.);acc=newAcc;float weight=stepSize/profileStep;if(pos.y*newPos.y<=0.||min(abs(pos.y),abs(newPos.y))<DISK_HALF_THICKNESS){for(int s=0;s<2;s++){vec3 diskPos=mix(pos,newPos,(float(s)+sampleOffset)/float(2));vec4 diskSample=sampleDiskVolume(diskPos,vel);if(diskSample.a>.01){float contribution=diskSample.a*stepSize/float(2)*8.*(1.-alpha);color=color+diskSample.rgb*contribution;alpha=alpha+contribution*.5;}}}vec3 samplePos=mix(pos,newPos,sampleOffset);float sampleR=length(samplePos);vec4 jetSample=sampleJet(samplePos);if(jetSample.a>.01){float a=jetSample.a*.008*weight*(1.-alpha);color=color+jetSample.rgb*a;alpha=alpha+a*.2;}float prDist=abs(sampleR-RS*1.5);float prPulse=.7+.3*sin(u_time*4.+atan(samplePos.z,samplePos.x)*4.);float prGlow=exp(-prDist*prDist*100.)*.25*prPulse*weight*(1.-alpha);color=color+vec3(1.,.9,.7)*prGlow;pos=newPos;if(alpha>.95)break;}return vec4(color,alpha);}void main(){vec2 tileOrigin=floor(gl_FragCoord.xy)*16.;vec3 cam=cameraPosition(0.);float steps=0.;float alpha=0.;float closest=16.;float marched=0.;for(int y=0;y<3;y++){for(int x=0;x<3;x++){vec2 pixel=tileOrigin+vec2(float(x),float(y))*(16.*.5);vec2 uv=(pixel-.5*u_resolution)/min(u_resolution.x,u_resolution.y);vec2 stats;vec4 traced=traceGeodesicMarch(cam,cameraRay(uv,0.),160,1.,stats);steps=max(steps,stats.x);alpha=max(alpha,traced.a);closest=min(closest,stats.y/RS);marched=marched+(stats.x>0.?1.:0.);}}gl_FragColor=vec4(steps/float(160),clamp(alpha,0.,1.),clamp(closest/16.,0.,1.),marched/9.);}",
+  "direct-march": "precision highp float;precision highp int;varying vec2 v_uv;uniform float u_time;uniform vec2 u_resolution;uniform sampler2D u_diskAtlas;const float PI=3.14159265359;const float RS=.6;const float DISK_INNER=1.2;const float DISK_OUTER=6.;const float INCLINATION=.1045;const float DISK_ATLAS_INNER=DISK_INNER*.9;const float DISK_ATLAS_OUTER=DISK_OUTER*1.1;const float DISK_ATLAS_RANGE=12.;float hash(vec2 p){vec3 p3=fract(vec3(p.xyx)*.1031);p3=p3+dot(p3,p3.yzx+33.33);return fract((p3.x+p3.y)*p3.z);}float diskDopplerDot(vec3 pos,float r,vec3 vel){float orbitDirX=-pos.z/max(r,.001);float orbitDirZ=pos.x/max(r,.001);float velLen=sqrt(vel.x*vel.x+vel.y*vel.y+vel.z*vel.z);float dopplerDot=(orbitDirX*vel.x+orbitDirZ*vel.z)/max(velLen,.001);return dopplerDot;}vec3 diskAtlasEmission(vec3 pos,float r){vec2 uv=vec2(atan(pos.z,pos.x)/(2.*PI)+.5,(r-DISK_ATLAS_INNER)/(DISK_ATLAS_OUTER-DISK_ATLAS_INNER));vec4 texel=texture2D(u_diskAtlas,uv);return texel.rgb*texel.a*DISK_ATLAS_RANGE;}vec3 diskEmission(vec3 pos,float r,float dopplerDot){vec3 col=diskAtlasEmission(pos,r);float vOrb=.5/sqrt(max(r,.1));float dopplerFactor=dopplerDot*vOrb*2.5;float dopplerBright=clamp(1.+dopplerFactor,.25,3.);col=col*dopplerBright*dopplerBright;float colorShift=clamp(dopplerFactor*2.,-1.,1.);if(colorShift>0.){float blueBoost=colorShift*colorShift;col.b=col.b+col.b*blueBoost*2.+colorShift*.4;col.g=col.g+col.g*colorShift*1.2;col.r=col.r*(1.-colorShift*.15);col=col*(1.+colorShift*.5);}else{float redShift=-colorShift;col.r=col.r+col.r*redShift*.6;col.g=col.g*(1.-redShift*.35);col.b=col.b*(1.-redShift*.7);}float gravRedshift=sqrt(1.-RS/max(r,RS*1.01));col=col*gravRedshift;float gravColorShift=(1.-gravRedshift)*2.;col.b=col.b*(1.-gravColorShift*.4);col.g=col.g*(1.-gravColorShift*.15);return col;}float diskDensity(vec3 pos){float r=sqrt(pos.x*pos.x+pos.z*pos.z);float absY=abs(pos.y);float diskThickness=.08+.12*smoothstep(DISK_INNER,DISK_OUTER,r);float verticalDensity=exp(-absY*absY/(diskThickness*diskThickness*2.));if(r<DISK_INNER*.9||r>DISK_OUTER*1.1||verticalDensity<.01){return 0.;}float radialDensity=smoothstep(DISK_INNER*.9,DISK_INNER*1.3,r)*smoothstep(DISK_OUTER*1.1,DISK_OUTER*.6,r);return verticalDensity*radialDensity;}vec4 sampleDiskVolume(vec3 pos,vec3 vel){float density=diskDensity(pos);if(density<=0.)return vec4(0.);float r=sqrt(pos.x*pos.x+pos.z*pos.z);return vec4(diskEmission(pos,r,diskDopplerDot(pos,r,vel)),density);}vec2 jetProfile(vec3 pos){float absY=abs(pos.y);if(absY<.6||absY>12.)return vec2(0.);float r=sqrt(pos.x*pos.x+pos.z*pos.z);float jetRadius=.15+.08*sqrt(absY);float radialFall=exp(-r*r/(jetRadius*jetRadius*3.));if(radialFall<.02)return vec2(0.);float core=exp(-r*r/(jetRadius*jetRadius*.3));float baseFade=smoothstep(.6,2.5,absY);float tipFade=smoothstep(12.,6.,absY);return vec2(radialFall*baseFade*tipFade,core);}vec4 jetEmission(vec2 profile,float absY){float wave1=sin(absY*.8-u_time*4.)*.5+.5;float wave2=sin(absY*.4-u_time*2.8)*.5+.5;float smoothWave=wave1*.7+wave2*.3;float density=profile.x*(.5+.4*smoothWave);vec3 baseColor=vec3(.35,.25,.6);vec3 coreColor=vec3(.7,.85,1.);vec3 color=mix(baseColor,coreColor,profile.y*profile.y+smoothWave*.2);return vec4(color,density*.6);}vec4 sampleJet(vec3 pos){vec2 profile=jetProfile(pos);if(profile.x<=0.)return vec4(0.);return jetEmission(profile,abs(pos.y));}vec3 cameraPosition(float orbitAngle){float camDist=11.;float cI=cos(INCLINATION);float sI=sin(INCLINATION);return vec3(sin(orbitAngle)*cI*camDist,sI*camDist,cos(orbitAngle)*cI*camDist);}vec3 cameraRay(vec2 uv,float orbitAngle){vec3 cam=cameraPosition(orbitAngle);vec3 fwd=-cam/length(cam);vec3 right=vec3(cos(orbitAngle),0.,-sin(orbitAngle));vec3 up=cross(right,fwd);up=up/max(length(up),.001);return normalize(fwd+uv.x*right+uv.y*up);}vec2 screenUv(){vec2 pixel=gl_FragCoord.xy;return(pixel-.5*u_resolution)/min(u_resolution.x,u_resolution.y);}const float CORE_BOUND=RS*6.;const float DISK_BOUND=DISK_OUTER*1.1+.1;const float DISK_HALF_THICKNESS=.61;const float JET_BOUND=1.5;const float JET_TOP=12.;const float BEND_SLACK=.25;const float ESCAPE_RADIUS=30.;const int DISK_CHORD_SAMPLES=6;float deflectionIntegral(float s,float b){float q=b*b+s*s;return s*(2.*s*s+3.*b*b)/(3.*b*q*sqrt(q));}float displacementIntegral(float s,float b){float q=sqrt(b*b+s*s);return(2.*q-b*b/q)/(3.*b);}vec2 rayBending(float s0,float s,float b){float f0=deflectionIntegral(s0,b);float angle=1.5*RS*(deflectionIntegral(s,b)-f0);float drop=1.5*RS*(displacementIntegral(s,b)-displacementIntegral(s0,b)-f0*(s-s0));return vec2(angle,drop);}bool rayMissesScene(vec3 cam,vec3 rd){float tClosest=-dot(cam,rd);if(tClosest<0.)return true;vec3 closest=cam+rd*tClosest;float b=length(closest);if(b<CORE_BOUND)return false;vec3 towardHole=-closest/b;float s0=-tClosest;if(b<DISK_BOUND){float halfChord=sqrt(DISK_BOUND*DISK_BOUND-b*b);float prevY=0.;for(int i=0;i<DISK_CHORD_SAMPLES;i++){float s=halfChord*(2.*float(i)/float(DISK_CHORD_SAMPLES-1)-1.);float y=cam.y+rd.y*(s-s0)+towardHole.y*rayBending(s0,s,b).y;if(abs(y)<DISK_HALF_THICKNESS+BEND_SLACK||(i>0&&y*prevY<0.))return false;prevY=y;}}float lenXZ=dot(rd.xz,rd.xz);if(lenXZ>.000001){float tAxis=max(-dot(cam.xz,rd.xz)/lenXZ,0.);vec3 nearAxis=cam+rd*tAxis+towardHole*rayBending(s0,tAxis+s0,b).y;if(abs(nearAxis.y)<JET_TOP+BEND_SLACK&&length(nearAxis.xz)<JET_BOUND+BEND_SLACK)return false;}return true;}vec3 lensedStarfield(vec3 cam,vec3 rd){float tClosest=-dot(cam,rd);vec3 closest=cam+rd*tClosest;float b=max(length(closest),.001);float sEscape=sqrt(max(ESCAPE_RADIUS*ESCAPE_RADIUS-b*b,0.));float angle=rayBending(-tClosest,sEscape,b).x;vec3 dir=rd*cos(angle)-closest/b*sin(angle);float starVal=hash(vec2(dir.x*400.+dir.y*200.,dir.z*300.));return vec3(pow(starVal,35.)*.3);}const float MAX_GEODESIC_STEP=2.;const float PHOTON_RING_REACH=.45;float emitterDistance(vec3 pos,float r){float cylR=length(pos.xz);float absY=abs(pos.y);float d=min(r-RS*1.5-PHOTON_RING_REACH,length(max(vec2(cylR-DISK_BOUND,absY-DISK_HALF_THICKNESS),0.)));d=min(d,length(max(vec2(cylR-JET_BOUND,absY-JET_TOP),0.)));return max(d,0.);}float marchSampleOffset(){float noise=fract(52.9829189*fract(dot(gl_FragCoord.xy,vec2(.06711056,.00583715))));return noise;}vec4 traceGeodesicMarch(vec3 cam,vec3 rd,int budget,float stepScale,out vec2 stats){stats=vec2(0.,1000.);stepScale=stepScale*1.5;float sampleOffset=marchSampleOffset();if(rayMissesScene(cam,rd)){return vec4(lensedStarfield(cam,rd),0.);}vec3 pos=cam;vec3 vel=rd;vec3 color=vec3(0.);float alpha=0.;float stepSize=.045*stepScale;vec3 h=cross(cam,rd);float pull=1.5*RS*dot(h,h);float camR=length(cam);vec3 acc=-pull/(camR*camR*camR*camR*camR)*cam;float geodesicStep=MAX_GEODESIC_STEP;for(int i=0;i<160;i++){if(i>=budget)break;float r=length(pos);stats=vec2(float(i+1),min(stats.y,r));if(r<RS){color=mix(color,vec3(0.),1.-alpha);alpha=1.;break;}bool leaving=r>DISK_BOUND&&dot(pos,vel)>0.;leaving=leaving&&((abs(pos.y)>JET_TOP+BEND_SLACK&&pos.y*vel.y>0.)||(length(pos.xz)>JET_BOUND+BEND_SLACK&&dot(pos.xz,vel.xz)>0.));if(r>ESCAPE_RADIUS||leaving){float starVal=hash(vec2(rd.x*400.+rd.y*200.,rd.z*300.));starVal=pow(starVal,35.)*.3;color=color+vec3(starVal)*(1.-alpha);break;}float profileStep=.045+.06*smoothstep(RS*2.,RS*8.,r);stepSize=min(max(profileStep*stepScale,emitterDistance(pos,r)),geodesicStep);float dl=stepSize/length(vel);vec3 newPos=pos+(vel+.5*acc*dl)*dl;float newR=length(newPos);vec3 newAcc=-pull/(newR*newR*newR*newR*newR)*newPos;vel=vel+.5*(acc+newAcc)*dl;float error=length(newAcc-acc)*dl*dl/6.;geodesicStep=stepSize*clamp(pow(.001/max(error,1e-12),1./3.),.5,2.);acc=newAcc;float weight=stepSize/profileStep;if(pos.y*newPos.y<=0.||min(abs(pos.y),abs(newPos.y))<DISK_HALF_THICKNESS){for(int s=0;s<2;s++){vec3 diskPos=mix(pos,newPos,(float(s)+sampleOffset)/float(2));vec4 diskSample=sampleDiskVolume(diskPos,vel);if(diskSample.a>.01){float contribution=diskSample.a*stepSize/float(2)*8.*(1.-alpha);color=color+diskSample.rgb*contribution;alpha=alpha+contribution*.5;}}}vec3 samplePos=mix(pos,newPos,sampleOffset);float sampleR=length(samplePos);vec4 jetSample=sampleJet(samplePos);if(jetSample.a>.01){float a=jetSample.a*.008*weight*(1.-alpha);color=color+jetSample.rgb*a;alpha=alpha+a*.2;}float prDist=abs(sampleR-RS*1.5);float prPulse=.7+.3*sin(u_time*4.+atan(samplePos.z,samplePos.x)*4.);float prGlow=exp(-prDist*prDist*100.)*.25*prPulse*weight*(1.-alpha);color=color+vec3(1.,.9,.7)*prGlow;pos=newPos;if(alpha>.95)break;}return vec4(color,alpha);}uniform sampler2D u_tileStats;uniform vec2 u_tileCount;vec2 tileBudget(){vec2 tile=floor(gl_FragCoord.xy/16.);float steps=0.;float closest=1.;for(int y=-1;y<=1;y++){for(int x=-1;x<=1;x++){vec2 neighbor=clamp(tile+vec2(float(x),float(y)),vec2(0.),u_tileCount-1.);vec4 stats=texture2D(u_tileStats,(neighbor+.5)/u_tileCount);steps=max(steps,stats.r);closest=min(closest,stats.b);}}float budget=min(float(160),steps*float(160)*1.25+24.);float stepScale=1.+.25*smoothstep(3.,8.,closest*16.);return vec2(budget,stepScale);}vec3 displayTransform(vec3 color,vec2 uv){color.x=(color.x*(2.51*color.x+.03))/(color.x*(2.43*color.x+.59)+.14);color.y=(color.y*(2.51*color.y+.03))/(color.y*(2.43*color.y+.59)+.14);color.z=(color.z*(2.51*color.z+.03))/(color.z*(2.43*color.z+.59)+.14);color=pow(clamp(color,0.,1.),vec3(.4545));float vigDist=length(uv);return color*(.92+.08*(1.-smoothstep(.5,1.4,vigDist)));}uniform bool u_hdrOutput;vec3 postProcess(vec3 color,vec2 uv){return displayTransform(color,uv);}vec3 finishColor(vec3 color,float alpha,vec3 cam,vec3 rd,vec2 uv){float rayClosest=-dot(cam,rd);if(rayClosest>0.){float closestR=length(cam+rd*rayClosest);float erDist=closestR-RS*2.6;float einsteinRing=exp(-erDist*erDist*70.);color=color+vec3(1.,.8,.5)*einsteinRing*.4*(1.-alpha*.7);}if(u_hdrOutput)return color;return postProcess(color,uv);}void main(){vec2 uv=screenUv();float orbitAngle=u_time*.25;vec3 cam=cameraPosition(orbitAngle);vec3 rd=cameraRay(uv,orbitAngle);vec2 budget=tileBudget();vec2 stats;vec4 traced=traceGeodesicMarch(cam,rd,int(budget.x),budget.y,stats);gl_FragColor=vec4(finishColor(traced.rgb,traced.a,cam,rd,uv),1.);}",
+  "debug": "precision highp float;precision highp int;varying vec2 v_uv;uniform float u_time;uniform vec2 u_resolution;uniform sampler2D u_diskAtlas;const float PI=3.14159265359;const float RS=.6;const float DISK_INNER=1.2;const float DISK_OUTER=6.;const float INCLINATION=.1045;const float DISK_ATLAS_INNER=DISK_INNER*.9;const float DISK_ATLAS_OUTER=DISK_OUTER*1.1;const float DISK_ATLAS_RANGE=12.;float hash(vec2 p){vec3 p3=fract(vec3(p.xyx)*.1031);p3=p3+dot(p3,p3.yzx+33.33);return fract((p3.x+p3.y)*p3.z);}float diskDopplerDot(vec3 pos,float r,vec3 vel){float orbitDirX=-pos.z/max(r,.001);float orbitDirZ=pos.x/max(r,.001);float velLen=sqrt(vel.x*vel.x+vel.y*vel.y+vel.z*vel.z);float dopplerDot=(orbitDirX*vel.x+orbitDirZ*vel.z)/max(velLen,.001);return dopplerDot;}vec3 diskAtlasEmission(vec3 pos,float r){vec2 uv=vec2(atan(pos.z,pos.x)/(2.*PI)+.5,(r-DISK_ATLAS_INNER)/(DISK_ATLAS_OUTER-DISK_ATLAS_INNER));vec4 texel=texture2D(u_diskAtlas,uv);return texel.rgb*texel.a*DISK_ATLAS_RANGE;}vec3 diskEmission(vec3 pos,float r,float dopplerDot){vec3 col=diskAtlasEmission(pos,r);float vOrb=.5/sqrt(max(r,.1));float dopplerFactor=dopplerDot*vOrb*2.5;float dopplerBright=clamp(1.+dopplerFactor,.25,3.);col=col*dopplerBright*dopplerBright;float colorShift=clamp(dopplerFactor*2.,-1.,1.);if(colorShift>0.){float blueBoost=colorShift*colorShift;col.b=col.b+col.b*blueBoost*2.+colorShift*.4;col.g=col.g+col.g*colorShift*1.2;col.r=col.r*(1.-colorShift*.15);col=col*(1.+colorShift*.5);}else{float redShift=-colorShift;col.r=col.r+col.r*redShift*.6;col.g=col.g*(1.-redShift*.35);col.b=col.b*(1.-redShift*.7);}float gravRedshift=sqrt(1.-RS/max(r,RS*1.01));col=col*gravRedshift;float gravColorShift=(1.-gravRedshift)*2.;col.b=col.b*(1.-gravColorShift*.4);col.g=col.g*(1.-gravColorShift*.15);return col;}float diskDensity(vec3 pos){float r=sqrt(pos.x*pos.x+pos.z*pos.z);float absY=abs(pos.y);float diskThickness=.08+.12*smoothstep(DISK_INNER,DISK_OUTER,r);float verticalDensity=exp(-absY*absY/(diskThickness*diskThickness*2.));if(r<DISK_INNER*.9||r>DISK_OUTER*1.1||verticalDensity<.01){return 0.;}float radialDensity=smoothstep(DISK_INNER*.9,DISK_INNER*1.3,r)*smoothstep(DISK_OUTER*1.1,DISK_OUTER*.6,r);return verticalDensity*radialDensity;}vec4 sampleDiskVolume(vec3 pos,vec3 vel){float density=diskDensity(pos);if(density<=0.)return vec4(0.);float r=sqrt(pos.x*pos.x+pos.z*pos.z);return vec4(diskEmission(pos,r,diskDopplerDot(pos,r,vel)),density);}vec2 jetProfile(vec3 pos){float absY=abs(pos.y);if(absY<.6||absY>12.)return vec2(0.);float r=sqrt(pos.x*pos.x+pos.z*pos.z);float jetRadius=.15+.08*sqrt(absY);float radialFall=exp(-r*r/(jetRadius*jetRadius*3.));if(radialFall<.02)return vec2(0.);float core=exp(-r*r/(jetRadius*jetRadius*.3));float baseFade=smoothstep(.6,2.5,absY);float tipFade=smoothstep(12.,6.,absY);return vec2(radialFall*baseFade*tipFade,core);}vec4 jetEmission(vec2 profile,float absY){float wave1=sin(absY*.8-u_time*4.)*.5+.5;float wave2=sin(absY*.4-u_time*2.8)*.5+.5;float smoothWave=wave1*.7+wave2*.3;float density=profile.x*(.5+.4*smoothWave);vec3 baseColor=vec3(.35,.25,.6);vec3 coreColor=vec3(.7,.85,1.);vec3 color=mix(baseColor,coreColor,profile.y*profile.y+smoothWave*.2);return vec4(color,density*.6);}vec4 sampleJet(vec3 pos){vec2 profile=jetProfile(pos);if(profile.x<=0.)return vec4(0.);return jetEmission(profile,abs(pos.y));}vec3 cameraPosition(float orbitAngle){float camDist=11.;float cI=cos(INCLINATION);float sI=sin(INCLINATION);return vec3(sin(orbitAngle)*cI*camDist,sI*camDist,cos(orbitAngle)*cI*camDist);}vec3 cameraRay(vec2 uv,float orbitAngle){vec3 cam=cameraPosition(orbitAngle);vec3 fwd=-cam/length(cam);vec3 right=vec3(cos(orbitAngle),0.,-sin(orbitAngle));vec3 up=cross(right,fwd);up=up/max(length(up),.001);return normalize(fwd+uv.x*right+uv.y*up);}vec2 screenUv(){vec2 pixel=gl_FragCoord.xy;return(pixel-.5*u_resolution)/min(u_resolution.x,u_resolution.y);}const float CORE_BOUND=RS*6.;const float DISK_BOUND=DISK_OUTER*1.1+.1;const float DISK_HALF_THICKNESS=.61;const float JET_BOUND=1.5;const float JET_TOP=12.;const float BEND_SLACK=.25;const float ESCAPE_RADIUS=30.;const int DISK_CHORD_SAMPLES=6;float deflectionIntegral(float s,float b){float q=b*b+s*s;return s*(2.*s*s+3.*b*b)/(3.*b*q*sqrt(q));}float displacementIntegral(float s,float b){float q=sqrt(b*b+s*s);return(2.*q-b*b/q)/(3.*b);}vec2 rayBending(float s0,float s,float b){float f0=deflectionIntegral(s0,b);float angle=1.5*RS*(deflectionIntegral(s,b)-f0);float drop=1.5*RS*(displacementIntegral(s,b)-displacementIntegral(s0,b)-f0*(s-s0));return vec2(angle,drop);}bool rayMissesScene(vec3 cam,vec3 rd){float tClosest=-dot(cam,rd);if(tClosest<0.)return true;vec3 closest=cam+rd*tClosest;float b=length(closest);if(b<CORE_BOUND)return false;vec3 towardHole=-closest/b;float s0=-tClosest;if(b<DISK_BOUND){float halfChord=sqrt(DISK_BOUND*DISK_BOUND-b*b);float prevY=0.;for(int i=0;i<DISK_CHORD_SAMPLES;i++){float s=halfChord*(2.*float(i)/float(DISK_CHORD_SAMPLES-1)-1.);float y=cam.y+rd.y*(s-s0)+towardHole.y*rayBending(s0,s,b).y;if(abs(y)<DISK_HALF_THICKNESS+BEND_SLACK||(i>0&&y*prevY<0.))return false;prevY=y;}}float lenXZ=dot(rd.xz,rd.xz);if(lenXZ>.000001){float tAxis=max(-dot(cam.xz,rd.xz)/lenXZ,0.);vec3 nearAxis=cam+rd*tAxis+towardHole*rayBending(s0,tAxis+s0,b).y;if(abs(nearAxis.y)<JET_TOP+BEND_SLACK&&length(nearAxis.xz)<JET_BOUND+BEND_SLACK)return false;}return true;}vec3 lensedStarfield(vec3 cam,vec3 rd){float tClosest=-dot(cam,rd);vec3 closest=cam+rd*tClosest;float b=max(length(closest),.001);float sEscape=sqrt(max(ESCAPE_RADIUS*ESCAPE_RADIUS-b*b,0.));float angle=rayBending(-tClosest,sEscape,b).x;vec3 dir=rd*cos(angle)-closest/b*sin(angle);float starVal=hash(vec2(dir.x*400.+dir.y*200.,dir.z*300.));return vec3(pow(starVal,35.)*.3);}const float MAX_GEODESIC_STEP=2.;const float PHOTON_RING_REACH=.45;float emitterDistance(vec3 pos,float r){float cylR=length(pos.xz);float absY=abs(pos.y);float d=min(r-RS*1.5-PHOTON_RING_REACH,length(max(vec2(cylR-DISK_BOUND,absY-DISK_HALF_THICKNESS),0.)));d=min(d,length(max(vec2(cylR-JET_BOUND,absY-JET_TOP),0.)));return max(d,0.);}float marchSampleOffset(){float noise=fract(52.9829189*fract(dot(gl_FragCoord.xy,vec2(.06711056,.00583715))));return noise;}vec4 traceGeodesicMarch(vec3 cam,vec3 rd,int budget,float stepScale,out vec2 stats){stats=vec2(0.,1000.);stepScale=stepScale*1.5;float sampleOffset=marchSampleOffset();if(rayMissesScene(cam,rd)){return vec4(lensedStarfield(cam,rd),0.);}vec3 pos=cam;vec3 vel=rd;vec3 color=vec3(0.);float alpha=0.;float stepSize=.045*stepScale;vec3 h=cross(cam,rd);float pull=1.5*RS*dot(h,h);float camR=length(cam);vec3 acc=-pull/(camR*camR*camR*camR*camR)*cam;float geodesicStep=MAX_GEODESIC_STEP;for(int i=0;i<160;i++){if(i>=budget)break;float r=length(pos);stats=vec2(float(i+1),min(stats.y,r));if(r<RS){color=mix(color,vec3(0.),1.-alpha);alpha=1.;break;}bool leaving=r>DISK_BOUND&&dot(pos,vel)>0.;leaving=leaving&&((abs(pos.y)>JET_TOP+BEND_SLACK&&pos.y*vel.y>0.)||(length(pos.xz)>JET_BOUND+BEND_SLACK&&dot(pos.xz,vel.xz)>0.));if(r>ESCAPE_RADIUS||leaving){float starVal=hash(vec2(rd.x*400.+rd.y*200.,rd.z*300.));starVal=pow(starVal,35.)*.3;color=color+vec3(starVal)*(1.-alpha);break;}float profileStep=.045+.06*smoothstep(RS*2.,RS*8.,r);stepSize=min(max(profileStep*stepScale,emitterDistance(pos,r)),geodesicStep);float dl=stepSize/length(vel);vec3 newPos=pos+(vel+.5*acc*dl)*dl;float newR=length(newPos);vec3 newAcc=-pull/(newR*newR*newR*newR*newR)*newPos;vel=vel+.5*(acc+newAcc)*dl;float error=length(newAcc-acc)*dl*dl/6.;geodesicStep=stepSize*clamp(pow(.001/max(error,1e-12),1./3.),.5,2.);acc=newAcc;float weight=stepSize/profileStep;if(pos.y*newPos.y<=0.||min(abs(pos.y),abs(newPos.y))<DISK_HALF_THICKNESS){for(int s=0;s<2;s++){vec3 diskPos=mix(pos,newPos,(float(s)+sampleOffset)/float(2));vec4 diskSample=sampleDiskVolume(diskPos,vel);if(diskSample.a>.01){float contribution=diskSample.a*stepSize/float(2)*8.*(1.-alpha);color=color+diskSample.rgb*contribution;alpha=alpha+contribution*.5;}}}vec3 samplePos=mix(pos,newPos,sampleOffset);float sampleR=length(samplePos);vec4 jetSample=sampleJet(samplePos);if(jetSample.a>.01){float a=jetSample.a*.008*weight*(1.-alpha);color=color+jetSample.rgb*a;alpha=alpha+a*.2;}float prDist=abs(sampleR-RS*1.5);float prPulse=.7+.3*sin(u_time*4.+atan(samplePos.z,samplePos.x)*4.);float prGlow=exp(-prDist*prDist*100.)*.25*prPulse*weight*(1.-alpha);color=color+vec3(1.,.9,.7)*prGlow;pos=newPos;if(alpha>.95)break;}return vec4(color,alpha);}uniform sampler2D u_tileStats;uniform vec2 u_tileCount;vec2 tileBudget(){vec2 tile=floor(gl_FragCoord.xy/16.);float steps=0.;float closest=1.;for(int y=-1;y<=1;y++){for(int x=-1;x<=1;x++){vec2 neighbor=clamp(tile+vec2(float(x),float(y)),vec2(0.),u_tileCount-1.);vec4 stats=texture2D(u_tileStats,(neighbor+.5)/u_tileCount);steps=max(steps,stats.r);closest=min(closest,stats.b);}}float budget=min(float(160),steps*float(160)*1.25+24.);float stepScale=1.+.25*smoothstep(3.,8.,closest*16.);return vec2(budget,stepScale);}uniform int u_debugView;vec3 heatmap(float t){return clamp(vec3(1.5-abs(4.*t-3.),1.5-abs(4.*t-2.),1.5-abs(4.*t-1.)),0.,1.);}void main(){vec2 uv=screenUv();float orbitAngle=u_time*.25;vec3 cam=cameraPosition(orbitAngle);vec3 rd=cameraRay(uv,orbitAngle);vec2 budget=tileBudget();vec2 stats;vec4 traced=traceGeodesicMarch(cam,rd,int(budget.x),budget.y,stats);float used=stats.x/float(160);vec3 color;if(u_debugView==1){color=stats.x>0.?heatmap(used):vec3(0.);}else{if(stats.x==0.){color=vec3(.15,.2,.4);}else if(stats.y<RS){color=vec3(.75,.2,.8);}else if(traced.a>.95){color=vec3(1.,.75,.15);}else if(stats.x>=budget.x){color=vec3(1.,.1,.1);}else{color=vec3(.2,.75,.3);}color=color*(.35+.65*used);}gl_FragColor=vec4(color,1.);}",
+}
+
+export default variant
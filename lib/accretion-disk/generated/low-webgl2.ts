@@ -0,0 +1,21 @@
+// Generated by scripts/build-shaders.mjs from lib/accretion-disk/glsl; do not edit.
+import type { ShaderVariant } from "../shaders"
+
+const variant: ShaderVariant = {
+  "disk-atlas": "#version 300 es\nprecision highp float;precision highp int;in vec2 v_uv;out vec4 fragColor;uniform float u_time;uniform vec2 u_resolution;uniform sampler2D u_diskAtlas;const float PI=3.14159265359;const float RS=.6;const float DISK_INNER=1.2;const float DISK_OUTER=6.;const float INCLINATION=.1045;const float DISK_ATLAS_INNER=DISK_INNER*.9;const float DISK_ATLAS_OUTER=DISK_OUTER*1.1;const float DISK_ATLAS_RANGE=12.;uniform sampler2D u_diskShift;const vec2 DISK_SHIFT_LUT_SIZE=vec2(129.,64.);float hash(vec2 p){vec3 p3=fract(vec3(p.xyx)*.1031);p3=p3+dot(p3,p3.yzx+33.33);return fract((p3.x+p3.y)*p3.z);}float diskDopplerDot(vec3 pos,float r,vec3 vel){float orbitDirX=-pos.z/max(r,.001);float orbitDirZ=pos.x/max(r,.001);float velLen=sqrt(vel.x*vel.x+vel.y*vel.y+vel.z*vel.z);float dopplerDot=(orbitDirX*vel.x+orbitDirZ*vel.z)/max(velLen,.001);return dopplerDot;}vec3 diskAtlasEmission(vec3 pos,float r){vec2 uv=vec2(atan(pos.z,pos.x)/(2.*PI)+.5,(r-DISK_ATLAS_INNER)/(DISK_ATLAS_OUTER-DISK_ATLAS_INNER));vec4 texel=texture(u_diskAtlas,uv);return texel.rgb*texel.a*DISK_ATLAS_RANGE;}vec3 diskEmission(vec3 pos,float r,float dopplerDot){vec3 col=diskAtlasEmission(pos,r);vec2 lutCoord=vec2(dopplerDot*.5+.5,(r-DISK_ATLAS_INNER)/(DISK_ATLAS_OUTER-DISK_ATLAS_INNER));vec4 shift=texture(u_diskShift,(lutCoord*(DISK_SHIFT_LUT_SIZE-1.)+.5)/DISK_SHIFT_LUT_SIZE);return col*shift.rgb+vec3(0.,0.,shift.a);}float diskDensity(vec3 pos){float r=sqrt(pos.x*pos.x+pos.z*pos.z);float absY=abs(pos.y);float diskThickness=.08+.12*smoothstep(DISK_INNER,DISK_OUTER,r);float verticalDensity=exp(-absY*absY/(diskThickness*diskThickness*2.));if(r<DISK_INNER*.9||r>DISK_OUTER*1.1||verticalDensity<.01){return 0.;}float radialDensity=smoothstep(DISK_INNER*.9,DISK_INNER*1.3,r)*smoothstep(DISK_OUTER*1.1,DISK_OUTER*.6,r);return verticalDensity*radialDensity;}vec4 sampleDiskVolume(vec3 pos,vec3 vel){float density=diskDensity(pos);if(density<=0.)return vec4(0.);float r=sqrt(pos.x*pos.x+pos.z*pos.z);return vec4(diskEmission(pos,r,diskDopplerDot(pos,r,vel)),density);}vec2 jetProfile(vec3 pos){float absY=abs(pos.y);if(absY<.6||absY>12.)return vec2(0.);float r=sqrt(pos.x*pos.x+pos.z*pos.z);float jetRadius=.15+.08*sqrt(absY);float radialFall=exp(-r*r/(jetRadius*jetRadius*3.));if(radialFall<.02)return vec2(0.);float core=exp(-r*r/(jetRadius*jetRadius*.3));float baseFade=smoothstep(.6,2.5,absY);float tipFade=smoothstep(12.,6.,absY);return vec2(radialFall*baseFade*tipFade,core);}vec4 jetEmission(vec2 profile,float absY){float wave1=sin(absY*.8-u_time*4.)*.5+.5;float wave2=sin(absY*.4-u_time*2.8)*.5+.5;float smoothWave=wave1*.7+wave2*.3;float density=profile.x*(.5+.4*smoothWave);vec3 baseColor=vec3(.35,.25,.6);vec3 coreColor=vec3(.7,.85,1.);vec3 color=mix(baseColor,coreColor,profile.y*profile.y+smoothWave*.2);return vec4(color,density*.6);}vec4 sampleJet(vec3 pos){vec2 profile=jetProfile(pos);if(profile.x<=0.)return vec4(0.);return jetEmission(profile,abs(pos.y));}uniform sampler2D u_diskNoise;const float DISK_NOISE_PERIOD=62.831853;const float DISK_NOISE_RANGE=1.4;const vec2 DISK_NOISE_DRIFT=vec2(.583333,-.555556);float smoothTurb(vec2 p,float t){vec2 uv=p/DISK_NOISE_PERIOD+fract(DISK_NOISE_DRIFT*t/DISK_NOISE_PERIOD);return texture(u_diskNoise,uv).r*DISK_NOISE_RANGE-(DISK_NOISE_RANGE-1.)*.5;}vec3 diskColor(float r,float temp){float t=clamp((r-DISK_INNER)/(DISK_OUTER-DISK_INNER),0.,1.);vec3 hot=vec3(1.4,1.4,1.3);vec3 warm=vec3(1.3,1.,.5);vec3 mid=vec3(1.2,.65,.2);vec3 cool=vec3(.9,.3,.1);vec3 c;if(t<.33){c=mix(hot,warm,t*3.);}else if(t<.66){c=mix(warm,mid,(t-.33)*3.);}else{c=mix(mid,cool,(t-.66)*3.);}return c+vec3(.3,.2,.1)*temp;}vec3 diskIntrinsicEmission(vec3 pos,float r){float t=u_time;float orbitalSpeed=15./(r*sqrt(r));float orbitalPhase=t*orbitalSpeed;float flowX=pos.x*cos(orbitalPhase)-pos.z*sin(orbitalPhase);float flowZ=pos.x*sin(orbitalPhase)+pos.z*cos(orbitalPhase);float angle=atan(pos.z,pos.x);float streakPhase=angle*6.-t*orbitalSpeed*.5;float motionStreak=sin(streakPhase)*.5+.5;motionStreak=pow(motionStreak,.7)*.3;float turb1=smoothTurb(vec2(flowX*.8,flowZ*.8),t*2.5);float turb2=smoothTurb(vec2(flowX*1.5+5.,flowZ*1.2+3.),t*3.5);float turb3=smoothTurb(vec2(flowX*.4,flowZ*.5),t*1.5);float turbulence=turb1*.5+turb2*.3+turb3*.2;float flow1=sin(flowX*2.+flowZ*1.2+t*4.)*.5+.5;float flow2=cos(flowX*1.3-flowZ*1.8-t*3.)*.5+.5;float flow3=sin(angle*3.-t*orbitalSpeed*.3)*.5+.5;float flowBright=flow1*.3+flow2*.25+flow3*.2+motionStreak+.25;float radialBright=pow(DISK_INNER/max(r,DISK_INNER),1.5);float brightness=radialBright*(.4+turbulence*.4+flowBright*.5);float tempVar=turbulence*.5;return diskColor(r,tempVar)*brightness*4.;}void main(){float angle=(v_uv.x-.5)*2.*PI;float r=mix(DISK_ATLAS_INNER,DISK_ATLAS_OUTER,v_uv.y);vec3 emission=diskIntrinsicEmission(vec3(r*cos(angle),0.,r*sin(angle)),r)/DISK_ATLAS_RANGE;float m=clamp(max(max(emission.r,emission.g),max(emission.b,.000001)),0.,1.);m=ceil(m*255.)/255.;fragColor=vec4(emission/m,m);}",
+  "tile-stats": "#version 300 es\nprecision highp float;precision highp int;in vec2 v_uv;out vec4 fragColor;uniform float u_time;uniform vec2 u_resolution;uniform sampler2D u_diskAtlas;const float PI=3.14159265359;const float RS=.6;const float DISK_INNER=1.2;const float DISK_OUTER=6.;const float INCLINATION=.1045;const float DISK_ATLAS_INNER=DISK_INNER*.9;const float DISK_ATLAS_OUTER=DISK_OUTER*1.1;const float DISK_ATLAS_RANGE=12.;uniform sampler2D u_diskShift;const vec2 DISK_SHIFT_LUT_SIZE=vec2(129.,64.);float hash(vec2 p){vec3 p3=fract(vec3(p.xyx)*.1031);p3=p3+dot(p3,p3.yzx+33.33);return fract((p3.x+p3.y)*p3.z);}float diskDopplerDot(vec3 pos,float r,vec3 vel){float orbitDirX=-pos.z/max(r,.001);float orbitDirZ=pos.x/max(r,.001);float velLen=sqrt(vel.x*vel.x+vel.y*vel.y+vel.z*vel.z);float dopplerDot=(orbitDirX*vel.x+orbitDirZ*vel.z)/max(velLen,.001);return dopplerDot;}vec3 diskAtlasEmission(vec3 pos,float r){vec2 uv=vec2(atan(pos.z,pos.x)/(2.*PI)+.5,(r-DISK_ATLAS_INNER)/(DISK_ATLAS_OUTER-DISK_ATLAS_INNER));vec4 texel=texture(u_diskAtlas,uv);return texel.rgb*texel.a*DISK_ATLAS_RANGE;}vec3 diskEmission(vec3 pos,float r,float dopplerDot){vec3 col=diskAtlasEmission(pos,r);vec2 lutCoord=vec2(dopplerDot*.5+.5,(r-DISK_ATLAS_INNER)/(DISK_ATLAS_OUTER-DISK_ATLAS_INNER));vec4 shift=texture(u_diskShift,(lutCoord*(DISK_SHIFT_LUT_SIZE-1.)+.5)/DISK_SHIFT_LUT_SIZE);return col*shift.rgb+vec3(0.,0.,shift.a);}float diskDensity(vec3 pos){float r=sqrt(pos.x*pos.x+pos.z*pos.z);float absY=abs(pos.y);float diskThickness=.08+.12*smoothstep(DISK_INNER,DISK_OUTER,r);float verticalDensity=exp(-absY*absY/(diskThickness*diskThickness*2.));if(r<DISK_INNER*.9||r>DISK_OUTER*1.1||verticalDensity<.01){return 0.;}float radialDensity=smoothstep(DISK_INNER*.9,DISK_INNER*1.3,r)*smoothstep(DISK_OUTER*1.1,DISK_OUTER*.6,r);return verticalDensity*radialDensity;}vec4 sampleDiskVolume(vec3 pos,vec3 vel){float density=diskDensity(pos);if(density<=0.)return vec4(0.);float r=sqrt(pos.x*pos.x+pos.z*pos.z);return vec4(diskEmission(pos,r,diskDopplerDot(pos,r,vel)),density);}vec2 jetProfile(vec3 pos){float absY=abs(pos.y);if(absY<.6||absY>12.)return vec2(0.);float r=sqrt(pos.x*pos.x+pos.z*pos.z);float jetRadius=.15+.08*sqrt(absY);float radialFall=exp(-r*r/(jetRadius*jetRadius*3.));if(radialFall<.02)return vec2(0.);float core=exp(-r*r/(jetRadius*jetRadius*.3));float baseFade=smoothstep(.6,2.5,absY);float tipFade=smoothstep(12.,6.,absY);return vec2(radialFall*baseFade*tipFade,core);}vec4 jetEmission(vec2 profile,float absY){float wave1=sin(absY*.8-u_time*4.)*.5+.5;float wave2=sin(absY*.4-u_time*2.8)*.5+.5;float smoothWave=wave1*.7+wave2*.3;float density=profile.x*(.5+.4*smoothWave);vec3 baseColor=vec3(.35,.25,.6);vec3 coreColor=vec3(.7,.85,1.);vec3 color=mix(baseColor,coreColor,profile.y*profile.y+smoothWave*.2);return vec4(color,density*.6);}vec4 sampleJet(vec3 pos){vec2 profile=jetProfile(pos);if(profile.x<=0.)return vec4(0.);return jetEmission(profile,abs(pos.y));}vec3 cameraPosition(float orbitAngle){float camDist=11.;float cI=cos(INCLINATION);float sI=sin(INCLINATION);return vec3(sin(orbitAngle)*cI*camDist,sI*camDist,cos(orbitAngle)*cI*camDist);}vec3 cameraRay(vec2 uv,float orbitAngle){vec3 cam=cameraPosition(orbitAngle);vec3 fwd=-cam/length(cam);vec3 right=vec3(cos(orbitAngle),0.,-sin(orbitAngle));vec3 up=cross(right,fwd);up=up/max(length(up),.001);return normalize(fwd+uv.x*right+uv.y*up);}vec2 screenUv(){vec2 pixel=gl_FragCoord.xy;return(pixel-.5*u_resolution)/min(u_resolution.x,u_resolution.y);}const float CORE_BOUND=RS*6.;const float DISK_BOUND=DISK_OUTER*1.1+.1;const float DISK_HALF_THICKNESS=.61;const float JET_BOUND=1.5;const float JET_TOP=12.;const float BEND_SLACK=.25;const float ESCAPE_RADIUS=30.;const int DISK_CHORD_SAMPLES=6;float deflectionIntegral(float s,float b){float q=b*b+s*s;return s*(2.*s*s+3.*b*b)/(3.*b*q*sqrt(q));}float displacementIntegral(float s,float b){float q=sqrt(b*b+s*s);return(2.*q-b*b/q)/(3.*b);}vec2 rayBending(float s0,float s,float b){float f0=deflectionIntegral(s0,b);float angle=1.5*RS*(deflectionIntegral(s,b)-f0);float drop=1.5*RS*(displacementIntegral(s,b)-displacementIntegral(s0,b)-f0*(s-s0));return vec2(angle,drop);}bool rayMissesScene(vec3 cam,vec3 rd){float tClosest=-dot(cam,rd);if(tClosest<0.)return true;vec3 closest=cam+rd*tClosest;float b=length(closest);if(b<CORE_BOUND)return false;vec3 towardHole=-closest/b;float s0=-tClosest;if(b<DISK_BOUND){float halfChord=sqrt(DISK_BOUND*DISK_BOUND-b*b);float prevY=0.;for(int i=0;i<DISK_CHORD_SAMPLES;i++){float s=halfChord*(2.*float(i)/float(DISK_CHORD_SAMPLES-1)-1.);float y=cam.y+rd.y*(s-s0)+towardHole.y*rayBending(s0,s,b).y;if(abs(y)<DISK_HALF_THICKNESS+BEND_SLACK||(i>0&&y*prevY<0.))return false;prevY=y;}}float lenXZ=dot(rd.xz,rd.xz);if(lenXZ>.000001){float tAxis=max(-dot(cam.xz,rd.xz)/lenXZ,0.);vec3 nearAxis=cam+rd*tAxis+towardHole*rayBending(s0,tAxis+s0,b).y;if(abs(nearAxis.y)<JET_TOP+BEND_SLACK&&length(nearAxis.xz)<JET_BOUND+BEND_SLACK)return false;}return true;}vec3 lensedStarfield(vec3 cam,vec3 rd){float tClosest=-dot(cam,rd);vec3 closest=cam+rd*tClosest;float b=max(length(closest),.001);float sEscape=sqrt(max(ESCAPE_RADIUS*ESCAPE_RADIUS-b*b,0.));float angle=rayBending(-tClosest,sEscape,b).x;vec3 dir=rd*cos(angle)-closest/b*sin(angle);float starVal=hash(vec2(dir.x*400.+dir.y*200.,dir.z*300.));return vec3(pow(starVal,35.)*.3);}const float MAX_GEODESIC_STEP=2.;const float PHOTON_RING_REACH=.45;float emitterDistance(vec3 pos,float r){float cylR=length(pos.xz);float absY=abs(pos.y);float d=min(r-RS*1.5-PHOTON_RING_REACH,length(max(vec2(cylR-DISK_BOUND,absY-DISK_HALF_THICKNESS),0.)));d=min(d,length(max(vec2(cylR-JET_BOUND,absY-JET_TOP),0.)));return max(d,0.);}float marchSampleOffset(){float noise=fract(52.9829189*fract(dot(gl_FragCoord.xy,vec2(.06711056,.00583715))));return noise;}vec4 traceGeodesicMarch(vec3 cam,vec3 rd,int budget,float stepScale,out vec2 stats){stats=vec2(0.,1000.);stepScale=stepScale*1.5;float sampleOffset=marchSampleOffset();if(rayMissesScene(cam,rd)){return vec4(lensedStarfield(cam,rd),0.);}vec3 pos=cam;vec3 vel=rd;vec3 color=vec3(0.);float alpha=0.;float stepSize=.045*stepScale;vec3 h=cross(cam,rd);float pull=1.5*RS*dot(h,h);float camR=length(cam);vec3 acc=-pull/(camR*camR*camR*camR*camR)*cam;float geodesicStep=MAX_GEODESIC_STEP;for(int i=0;i<160;i++){if(i>=budget)break;float r=length(pos);stats=vec2(float(i+1),min(stats.y,r));if(r<RS){color=mix(color,vec3(0.),1.-alpha);alpha=1.;break;}bool leaving=r>DISK_BOUND&&dot(pos,vel)>0.;leaving=leaving&&((abs(pos.y)>JET_TOP+BEND_SLACK&&pos.y*vel.y>0.)||(length(pos.xz)>JET_BOUND+BEND_SLACK&&dot(pos.xz,vel.xz)>0.));if(r>ESCAPE_RADIUS||leaving){float starVal=hash(vec2(rd.x*400.+rd.y*200.,rd.z*300.));starVal=pow(starVal,35.)*.3;color=color+vec3(starVal)*(1.-alpha);break;}float profileStep=.045+.06*smoothstep(RS*2.,RS*8.,r);stepSize=min(max(profileStep*stepScale,emitterDistance(pos,r)),geodesicStep);float dl=stepSize/length(vel);vec3 newPos=pos+(vel+.5*acc*dl)*dl;float newR=length(newPos);vec3 newAcc=-pull/(newR*newR*newR*newR*newR)*newPos;vel=vel+.5*(acc+newAcc)*dl;float error=length(newAcc-acc)*dl*dl/6.;geodesicStep=stepSize*clamp(pow(.001/max(error,1e-12),1./3.),.5,2.);acc=newAcc;float weight=stepSize/profileStep;if(pos.y*newPos.y<=0.||min(abs(pos.y),abs(newPos.y))<DISK_HALF_THICKNESS){for(int s=0;s<2;s++){vec3 diskPos=mix(pos,newPos,(float(s)+sampleOffset)/float(2));vec4 diskSample=sampleDiskVolume(diskPos,vel);if(diskSample.a>.01){float contribution=diskSample.a*stepSize/float(2)*8.*(1.-alpha);color=color+diskSample.rgb*contribution;alpha=alpha+contribution*.5;}}}vec3 samplePos=mix(pos,newPos,sampleOffset);float sampleR=length(samplePos);vec4 jetSample=sampleJet(samplePos);if(jetSample.a>.01){float a=jetSample.a*.008*weight*(1.-alpha);color=color+jetSample.rgb*a;alpha=alpha+a*.2;}float prDist=abs(sampleR-RS*1.5);float prPulse=.7+.3*sin(u_time*4.+atan(samplePos.z,samplePos.x)*4.);float prGlow=exp(-prDist*prDist*100.)*.25*prPulse*weight*(1.-alpha);color=color+vec3(1.,.9,.7)*prGlow;pos=newPos;if(alpha>.95)break;}return vec4(color,alpha);}void main(){vec2 tileOrigin=floor(gl_FragCoord.xy)*16.;vec3 cam=cameraPosition(0.);float steps=0.;float alpha=0.;float closest=16.;float marched=0.;for(int y=0;y<3;y++){for(int x=0;x<3;x++){vec2 pixel=tileOrigin+vec2(float(x),float(y))*(16.*.5);vec2 uv=(pixel-.5*u_resolution)/min(u_resolution.x,u_resolution.y);vec2 stats;vec4 traced=traceGeodesicMarch(cam,cameraRay(uv,0.),160,1.,stats);steps=max(steps,stats.x);alpha=max(alpha,traced.a);closest=min(closest,stats.y/RS);marched=marched+(stats.x>0.?1.:0.);}}fragColor=vec4(steps/float(160),clamp(alpha,0.,1.),clamp(closest/16.,0.,1.),marched/9.);}",
+  "direct-march": "#version 300 es\nprecision highp float;precision highp int;in vec2 v_uv;out vec4 fragColor;uniform float u_time;uniform vec2 u_resolution;uniform sampler2D u_diskAtlas;const float PI=3.14159265359;const float RS=.6;const float DISK_INNER=1.2;const float DISK_OUTER=6.;const float INCLINATION=.1045;const float DISK_ATLAS_INNER=DISK_INNER*.9;const float DISK_ATLAS_OUTER=DISK_OUTER*1.1;const float DISK_ATLAS_RANGE=12.;uniform sampler2D u_diskShift;const vec2 DISK_SHIFT_LUT_SIZE=vec2(129.,64.);float hash(vec2 p){vec3 p3=fract(vec3(p.xyx)*.1031);p3=p3+dot(p3,p3.yzx+33.33);return fract((p3.x+p3.y)*p3.z);}float diskDopplerDot(vec3 pos,float r,vec3 vel){float orbitDirX=-pos.z/max(r,.001);float orbitDirZ=pos.x/max(r,.001);float velLen=sqrt(vel.x*vel.x+vel.y*vel.y+vel.z*vel.z);float dopplerDot=(orbitDirX*vel.x+orbitDirZ*vel.z)/max(velLen,.001);return dopplerDot;}vec3 diskAtlasEmission(vec3 pos,float r){vec2 uv=vec2(atan(pos.z,pos.x)/(2.*PI)+.5,(r-DISK_ATLAS_INNER)/(DISK_ATLAS_OUTER-DISK_ATLAS_INNER));vec4 texel=texture(u_diskAtlas,uv);return texel.rgb*texel.a*DISK_ATLAS_RANGE;}vec3 diskEmission(vec3 pos,float r,float dopplerDot){vec3 col=diskAtlasEmission(pos,r);vec2 lutCoord=vec2(dopplerDot*.5+.5,(r-DISK_ATLAS_INNER)/(DISK_ATLAS_OUTER-DISK_ATLAS_INNER));vec4 shift=texture(u_diskShift,(lutCoord*(DISK_SHIFT_LUT_SIZE-1.)+.5)/DISK_SHIFT_LUT_SIZE);return col*shift.rgb+vec3(0.,0.,shift.a);}float diskDensity(vec3 pos){float r=sqrt(pos.x*pos.x+pos.z*pos.z);float absY=abs(pos.y);float diskThickness=.08+.12*smoothstep(DISK_INNER,DISK_OUTER,r);float verticalDensity=exp(-absY*absY/(diskThickness*diskThickness*2.));if(r<DISK_INNER*.9||r>DISK_OUTER*1.1||verticalDensity<.01){return 0.;}float radialDensity=smoothstep(DISK_INNER*.9,DISK_INNER*1.3,r)*smoothstep(DISK_OUTER*1.1,DISK_OUTER*.6,r);return verticalDensity*radialDensity;}vec4 sampleDiskVolume(vec3 pos,vec3 vel){float density=diskDensity(pos);if(density<=0.)return vec4(0.);float r=sqrt(pos.x*pos.x+pos.z*pos.z);return vec4(diskEmission(pos,r,diskDopplerDot(pos,r,vel)),density);}vec2 jetProfile(vec3 pos){float absY=abs(pos.y);if(absY<.6||absY>12.)return vec2(0.);float r=sqrt(pos.x*pos.x+pos.z*pos.z);float jetRadius=.15+.08*sqrt(absY);float radialFall=exp(-r*r/(jetRadius*jetRadius*3.));if(radialFall<.02)return vec2(0.);float core=exp(-r*r/(jetRadius*jetRadius*.3));float baseFade=smoothstep(.6,2.5,absY);float tipFade=smoothstep(12.,6.,absY);return vec2(radialFall*baseFade*tipFade,core);}vec4 jetEmission(vec2 profile,float absY){float wave1=sin(absY*.8-u_time*4.)*.5+.5;float wave2=sin(absY*.4-u_time*2.8)*.5+.5;float smoothWave=wave1*.7+wave2*.3;float density=profile.x*(.5+.4*smoothWave);vec3 baseColor=vec3(.35,.25,.6);vec3 coreColor=vec3(.7,.85,1.);vec3 color=mix(baseColor,coreColor,profile.y*profile.y+smoothWave*.2);return vec4(color,density*.6);}vec4 sampleJet(vec3 pos){vec2 profile=jetProfile(pos);if(profile.x<=0.)return vec4(0.);return jetEmission(profile,abs(pos.y));}vec3 cameraPosition(float orbitAngle){float camDist=11.;float cI=cos(INCLINATION);float sI=sin(INCLINATION);return vec3(sin(orbitAngle)*cI*camDist,sI*camDist,cos(orbitAngle)*cI*camDist);}vec3 cameraRay(vec2 uv,float orbitAngle){vec3 cam=cameraPosition(orbitAngle);vec3 fwd=-cam/length(cam);vec3 right=vec3(cos(orbitAngle),0.,-sin(orbitAngle));vec3 up=cross(right,fwd);up=up/max(length(up),.001);return normalize(fwd+uv.x*right+uv.y*up);}vec2 screenUv(){vec2 pixel=gl_FragCoord.xy;return(pixel-.5*u_resolution)/min(u_resolution.x,u_resolution.y);}const float CORE_BOUND=RS*6.;const float DISK_BOUND=DISK_OUTER*1.1+.1;const float DISK_HALF_THICKNESS=.61;const float JET_BOUND=1.5;const float JET_TOP=12.;const float BEND_SLACK=.25;const float ESCAPE_RADIUS=30.;const int DISK_CHORD_SAMPLES=6;float deflectionIntegral(float s,float b){float q=b*b+s*s;return s*(2.*s*s+3.*b*b)/(3.*b*q*sqrt(q));}float displacementIntegral(float s,float b){float q=sqrt(b*b+s*s);return(2.*q-b*b/q)/(3.*b);}vec2 rayBending(float s0,float s,float b){float f0=deflectionIntegral(s0,b);float angle=1.5*RS*(deflectionIntegral(s,b)-f0);float drop=1.5*RS*(displacementIntegral(s,b)-displacementIntegral(s0,b)-f0*(s-s0));return vec2(angle,drop);}bool rayMissesScene(vec3 cam,vec3 rd){float tClosest=-dot(cam,rd);if(tClosest<0.)return true;vec3 closest=cam+rd*tClosest;float b=length(closest);if(b<CORE_BOUND)return false;vec3 towardHole=-closest/b;float s0=-tClosest;if(b<DISK_BOUND){float halfChord=sqrt(DISK_BOUND*DISK_BOUND-b*b);float prevY=0.;for(int i=0;i<DISK_CHORD_SAMPLES;i++){float s=halfChord*(2.*float(i)/float(DISK_CHORD_SAMPLES-1)-1.);float y=cam.y+rd.y*(s-s0)+towardHole.y*rayBending(s0,s,b).y;if(abs(y)<DISK_HALF_THICKNESS+BEND_SLACK||(i>0&&y*prevY<0.))return false;prevY=y;}}float lenXZ=dot(rd.xz,rd.xz);if(lenXZ>.000001){float tAxis=max(-dot(cam.xz,rd.xz)/lenXZ,0.);vec3 nearAxis=cam+rd*tAxis+towardHole*rayBending(s0,tAxis+s0,b).y;if(abs(nearAxis.y)<JET_TOP+BEND_SLACK&&length(nearAxis.xz)<JET_BOUND+BEND_SLACK)return false;}return true;}vec3 lensedStarfield(vec3 cam,vec3 rd){float tClosest=-dot(cam,rd);vec3 closest=cam+rd*tClosest;float b=max(length(closest),.001);float sEscape=sqrt(max(ESCAPE_RADIUS*ESCAPE_RADIUS-b*b,0.));float angle=rayBending(-tClosest,sEscape,b).x;vec3 dir=rd*cos(angle)-closest/b*sin(angle);float starVal=hash(vec2(dir.x*400.+dir.y*200.,dir.z*300.));return vec3(pow(starVal,35.)*.3);}const float MAX_GEODESIC_STEP=2.;const float PHOTON_RING_REACH=.45;float emitterDistance(vec3 pos,float r){float cylR=length(pos.xz);float absY=abs(pos.y);float d=min(r-RS*1.5-PHOTON_RING_REACH,length(max(vec2(cylR-DISK_BOUND,absY-DISK_HALF_THICKNESS),0.)));d=min(d,length(max(vec2(cylR-JET_BOUND,absY-JET_TOP),0.)));return max(d,0.);}float marchSampleOffset(){float noise=fract(52.9829189*fract(dot(gl_FragCoord.xy,vec2(.06711056,.00583715))));return noise;}vec4 traceGeodesicMarch(vec3 cam,vec3 rd,int budget,float stepScale,out vec2 stats){stats=vec2(0.,1000.);stepScale=stepScale*1.5;float sampleOffset=marchSampleOffset();if(rayMissesScene(cam,rd)){return vec4(lensedStarfield(cam,rd),0.);}vec3 pos=cam;vec3 vel=rd;vec3 color=vec3(0.);float alpha=0.;float stepSize=.045*stepScale;vec3 h=cross(cam,rd);float pull=1.5*RS*dot(h,h);float camR=length(cam);vec3 acc=-pull/(camR*camR*camR*camR*camR)*cam;float geodesicStep=MAX_GEODESIC_STEP;for(int i=0;i<160;i++){if(i>=budget)break;float r=length(pos);stats=vec2(float(i+1),min(stats.y,r));if(r<RS){color=mix(color,vec3(0.),1.-alpha);alpha=1.;break;}bool leaving=r>DISK_BOUND&&dot(pos,vel)>0.;leaving=leaving&&((abs(pos.y)>JET_TOP+BEND_SLACK&&pos.y*vel.y>0.)||(length(pos.xz)>JET_BOUND+BEND_SLACK&&dot(pos.xz,vel.xz)>0.));if(r>ESCAPE_RADIUS||leaving){float starVal=hash(vec2(rd.x*400.+rd.y*200.,rd.z*300.));starVal=pow(starVal,35.)*.3;color=color+vec3(starVal)*(1.-alpha);break;}float profileStep=.045+.06*smoothstep(RS*2.,RS*8.,r);stepSize=min(max(profileStep*stepScale,emitterDistance(pos,r)),geodesicStep);float dl=stepSize/length(vel);vec3 newPos=pos+(vel+.5*acc*dl)*dl;float newR=length(newPos);vec3 newAcc=-pull/(newR*newR*newR*newR*newR)*newPos;vel=vel+.5*(acc+newAcc)*dl;float error=length(newAcc-acc)*dl*dl/6.;geodesicStep=stepSize*clamp(pow(.001/max(error,1e-12),1./3.),.5,2.);acc=newAcc;float weight=stepSize/profileStep;if(pos.y*newPos.y<=0.||min(abs(pos.y),abs(newPos.y))<DISK_HALF_THICKNESS){for(int s=0;s<2;s++){vec3 diskPos=mix(pos,newPos,(float(s)+sampleOffset)/float(2));vec4 diskSample=sampleDiskVolume(diskPos,vel);if(diskSample.a>.01){float contribution=diskSample.a*stepSize/float(2)*8.*(1.-alpha);color=color+diskSample.rgb*contribution;alpha=alpha+contribution*.5;}}}vec3 samplePos=mix(pos,newPos,sampleOffset);float sampleR=length(samplePos);vec4 jetSample=sampleJet(samplePos);if(jetSample.a>.01){float a=jetSample.a*.008*weight*(1.-alpha);color=color+jetSample.rgb*a;alpha=alpha+a*.2;}float prDist=abs(sampleR-RS*1.5);float prPulse=.7+.3*sin(u_time*4.+atan(samplePos.z,samplePos.x)*4.);float prGlow=exp(-prDist*prDist*100.)*.25*prPulse*weight*(1.-alpha);color=color+vec3(1.,.9,.7)*prGlow;pos=newPos;if(alpha>.95)break;}return vec4(color,alpha);}uniform sampler2D u_tileStats;uniform vec2 u_tileCount;vec2 tileBudget(){vec2 tile=floor(gl_FragCoord.xy/16.);float steps=0.;float closest=1.;for(int y=-1;y<=1;y++){for(int x=-1;x<=1;x++){vec2 neighbor=clamp(tile+vec2(float(x),float(y)),vec2(0.),u_tileCount-1.);vec4 stats=texture(u_tileStats,(neighbor+.5)/u_tileCount);steps=max(steps,stats.r);closest=min(closest,stats.b);}}float budget=min(float(160),steps*float(160)*1.25+24.);float stepScale=1.+.25*smoothstep(3.,8.,closest*16.);return vec2(budget,stepScale);}vec3 displayTransform(vec3 color,vec2 uv){color.x=(color.x*(2.51*color.x+.03))/(color.x*(2.43*color.x+.59)+.14);color.y=(color.y*(2.51*color.y+.03))/(color.y*(2.43*color.y+.59)+.14);color.z=(color.z*(2.51*color.z+.03))/(color.z*(2.43*color.z+.59)+.14);color=pow(clamp(color,0.,1.),vec3(.4545));float vigDist=length(uv);return color*(.92+.08*(1.-smoothstep(.5,1.4,vigDist)));}uniform bool u_hdrOutput;vec3 postProcess(vec3 color,vec2 uv){return displayTransform(color,uv);}vec3 finishColor(vec3 color,float alpha,vec3 cam,vec3 rd,vec2 uv){float rayClosest=-dot(cam,rd);if(rayClosest>0.){float closestR=length(cam+rd*rayClosest);float erDist=closestR-RS*2.6;float einsteinRing=exp(-erDist*erDist*70.);color=color+vec3(1.,.8,.5)*einsteinRing*.4*(1.-alpha*.7);}if(u_hdrOutput)return color;return postProcess(color,uv);}void main(){vec2 uv=screenUv();float orbitAngle=u_time*.25;vec3 cam=cameraPosition(orbitAngle);vec3 rd=cameraRay(uv,orbitAngle);vec2 budget=tileBudget();vec2 stats;vec4 traced=traceGeodesicMarch(cam,rd,int(budget.x),budget.y,stats);fragColor=vec4(finishColor(traced.rgb,traced.a,cam,rd,uv),1.);}",
+  "debug": "#version 300 es\nprecision highp float;precision highp int;in vec2 v_uv;out vec4 fragColor;uniform float u_time;uniform vec2 u_resolution;uniform sampler2D u_diskAtlas;const float PI=3.14159265359;const float RS=.6;const float DISK_INNER=1.2;const float DISK_OUTER=6.;const float INCLINATION=.1045;const float DISK_ATLAS_INNER=DISK_INNER*.9;const float DISK_ATLAS_OUTER=DISK_OUTER*1.1;const float DISK_ATLAS_RANGE=12.;uniform sampler2D u_diskShift;const vec2 DISK_SHIFT_LUT_SIZE=vec2(129.,64.);float hash(vec2 p){vec3 p3=fract(vec3(p.xyx)*.1031);p3=p3+dot(p3,p3.yzx+33.33);return fract((p3.x+p3.y)*p3.z);}float diskDopplerDot(vec3 pos,float r,vec3 vel){float orbitDirX=-pos.z/max(r,.001);float orbitDirZ=pos.x/max(r,.001);float velLen=sqrt(vel.x*vel.x+vel.y*vel.y+vel.z*vel.z);float dopplerDot=(orbitDirX*vel.x+orbitDirZ*vel.z)/max(velLen,.001);return dopplerDot;}vec3 diskAtlasEmission(vec3 pos,float r){vec2 uv=vec2(atan(pos.z,pos.x)/(2.*PI)+.5,(r-DISK_ATLAS_INNER)/(DISK_ATLAS_OUTER-DISK_ATLAS_INNER));vec4 texel=texture(u_diskAtlas,uv);return texel.rgb*texel.a*DISK_ATLAS_RANGE;}vec3 diskEmission(vec3 pos,float r,float dopplerDot){vec3 col=diskAtlasEmission(pos,r);vec2 lutCoord=vec2(dopplerDot*.5+.5,(r-DISK_ATLAS_INNER)/(DISK_ATLAS_OUTER-DISK_ATLAS_INNER));vec4 shift=texture(u_diskShift,(lutCoord*(DISK_SHIFT_LUT_SIZE-1.)+.5)/DISK_SHIFT_LUT_SIZE);return col*shift.rgb+vec3(0.,0.,shift.a);}float diskDensity(vec3 pos){float r=sqrt(pos.x*pos.x+pos.z*pos.z);float absY=abs(pos.y);float diskThickness=.08+.12*smoothstep(DISK_INNER,DISK_OUTER,r);float verticalDensity=exp(-absY*absY/(diskThickness*diskThickness*2.));if(r<DISK_INNER*.9||r>DISK_OUTER*1.1||verticalDensity<.01){return 0.;}float radialDensity=smoothstep(DISK_INNER*.9,DISK_INNER*1.3,r)*smoothstep(DISK_OUTER*1.1,DISK_OUTER*.6,r);return verticalDensity*radialDensity;}vec4 sampleDiskVolume(vec3 pos,vec3 vel){float density=diskDensity(pos);if(density<=0.)return vec4(0.);float r=sqrt(pos.x*pos.x+pos.z*pos.z);return vec4(diskEmission(pos,r,diskDopplerDot(pos,r,vel)),density);}vec2 jetProfile(vec3 pos){float absY=abs(pos.y);if(absY<.6||absY>12.)return vec2(0.);float r=sqrt(pos.x*pos.x+pos.z*pos.z);float jetRadius=.15+.08*sqrt(absY);float radialFall=exp(-r*r/(jetRadius*jetRadius*3.));if(radialFall<.02)return vec2(0.);float core=exp(-r*r/(jetRadius*jetRadius*.3));float baseFade=smoothstep(.6,2.5,absY);float tipFade=smoothstep(12.,6.,absY);return vec2(radialFall*baseFade*tipFade,core);}vec4 jetEmission(vec2 profile,float absY){float wave1=sin(absY*.8-u_time*4.)*.5+.5;float wave2=sin(absY*.4-u_time*2.8)*.5+.5;float smoothWave=wave1*.7+wave2*.3;float density=profile.x*(.5+.4*smoothWave);vec3 baseColor=vec3(.35,.25,.6);vec3 coreColor=vec3(.7,.85,1.);vec3 color=mix(baseColor,coreColor,profile.y*profile.y+smoothWave*.2);return vec4(color,density*.6);}vec4 sampleJet(vec3 pos){vec2 profile=jetProfile(pos);if(profile.x<=0.)return vec4(0.);return jetEmission(profile,abs(pos.y));}vec3 cameraPosition(float orbitAngle){float camDist=11.;float cI=cos(INCLINATION);float sI=sin(INCLINATION);return vec3(sin(orbitAngle)*cI*camDist,sI*camDist,cos(orbitAngle)*cI*camDist);}vec3 cameraRay(vec2 uv,float orbitAngle){vec3 cam=cameraPosition(orbitAngle);vec3 fwd=-cam/length(cam);vec3 right=vec3(cos(orbitAngle),0.,-sin(orbitAngle));vec3 up=cross(right,fwd);up=up/max(length(up),.001);return normalize(fwd+uv.x*right+uv.y*up);}vec2 screenUv(){vec2 pixel=gl_FragCoord.xy;return(pixel-.5*u_resolution)/min(u_resolution.x,u_resolution.y);}const float CORE_BOUND=RS*6.;const float DISK_BOUND=DISK_OUTER*1.1+.1;const float DISK_HALF_THICKNESS=.61;const float JET_BOUND=1.5;const float JET_TOP=12.;const float BEND_SLACK=.25;const float ESCAPE_RADIUS=30.;const int DISK_CHORD_SAMPLES=6;float deflectionIntegral(float s,float b){float q=b*b+s*s;return s*(2.*s*s+3.*b*b)/(3.*b*q*sqrt(q));}float displacementIntegral(float s,float b){float q=sqrt(b*b+s*s);return(2.*q-b*b/q)/(3.*b);}vec2 rayBending(float s0,float s,float b){float f0=deflectionIntegral(s0,b);float angle=1.5*RS*(deflectionIntegral(s,b)-f0);float drop=1.5*RS*(displacementIntegral(s,b)-displacementIntegral(s0,b)-f0*(s-s0));return vec2(angle,drop);}bool rayMissesScene(vec3 cam,vec3 rd){float tClosest=-dot(cam,rd);if(tClosest<0.)return true;vec3 closest=cam+rd*tClosest;float b=length(closest);if(b<CORE_BOUND)return false;vec3 towardHole=-closest/b;float s0=-tClosest;if(b<DISK_BOUND){float halfChord=sqrt(DISK_BOUND*DISK_BOUND-b*b);float prevY=0.;for(int i=0;i<DISK_CHORD_SAMPLES;i++){float s=halfChord*(2.*float(i)/float(DISK_CHORD_SAMPLES-1)-1.);float y=cam.y+rd.y*(s-s0)+towardHole.y*rayBending(s0,s,b).y;if(abs(y)<DISK_HALF_THICKNESS+BEND_SLACK||(i>0&&y*prevY<0.))return false;prevY=y;}}float lenXZ=dot(rd.xz,rd.xz);if(lenXZ>.000001){float tAxis=max(-dot(cam.xz,rd.xz)/lenXZ,0.);vec3 nearAxis=cam+rd*tAxis+towardHole*rayBending(s0,tAxis+s0,b).y;if(abs(nearAxis.y)<JET_TOP+BEND_SLACK&&length(nearAxis.xz)<JET_BOUND+BEND_SLACK)return false;}return true;}vec3 lensedStarfield(vec3 cam,vec3 rd){float tClosest=-dot(cam,rd);vec3 closest=cam+rd*tClosest;float b=max(length(closest),.001);float sEscape=sqrt(max(ESCAPE_RADIUS*ESCAPE_RADIUS-b*b,0.));float angle=rayBending(-tClosest,sEscape,b).x;vec3 dir=rd*cos(angle)-closest/b*sin(angle);float starVal=hash(vec2(dir.x*400.+dir.y*200.,dir.z*300.));return vec3(pow(starVal,35.)*.3);}const float MAX_GEODESIC_STEP=2.;const float PHOTON_RING_REACH=.45;float emitterDistance(vec3 pos,float r){float cylR=length(pos.xz);float absY=abs(pos.y);float d=min(r-RS*1.5-PHOTON_RING_REACH,length(max(vec2(cylR-DISK_BOUND,absY-DISK_HALF_THICKNESS),0.)));d=min(d,length(max(vec2(cylR-JET_BOUND,absY-JET_TOP),0.)));return max(d,0.);}float marchSampleOffset(){float noise=fract(52.9829189*fract(dot(gl_FragCoord.xy,vec2(.06711056,.00583715))));return noise;}vec4 traceGeodesicMarch(vec3 cam,vec3 rd,int budget,float stepScale,out vec2 stats){stats=vec2(0.,1000.);stepScale=stepScale*1.5;float sampleOffset=marchSampleOffset();if(rayMissesScene(cam,rd)){return vec4(lensedStarfield(cam,rd),0.);}vec3 pos=cam;vec3 vel=rd;vec3 color=vec3(0.);float alpha=0.;float stepSize=.045*stepScale;vec3 h=cross(cam,rd);float pull=1.5*RS*dot(h,h);float camR=length(cam);vec3 acc=-pull/(camR*camR*camR*camR*camR)*cam;float geodesicStep=MAX_GEODESIC_STEP;for(int i=0;i<160;i++){if(i>=budget)break;float r=length(pos);stats=vec2(float(i+1),min(stats.y,r));if(r<RS){color=mix(color,vec3(0.),1.-alpha);alpha=1.;break;}bool leaving=r>DISK_BOUND&&dot(pos,vel)>0.;leaving=leaving&&((abs(pos.y)>JET_TOP+BEND_SLACK&&pos.y*vel.y>0.)||(length(pos.xz)>JET_BOUND+BEND_SLACK&&dot(pos.xz,vel.xz)>0.));if(r>ESCAPE_RADIUS||leaving){float starVal=hash(vec2(rd.x*400.+rd.y*200.,rd.z*300.));starVal=pow(starVal,35.)*.3;color=color+vec3(starVal)*(1.-alpha);break;}float profileStep=.045+.06*smoothstep(RS*2.,RS*8.,r);stepSize=min(max(profileStep*stepScale,emitterDistance(pos,r)),geodesicStep);float dl=stepSize/length(vel);vec3 newPos=pos+(vel+.5*acc*dl)*dl;float newR=length(newPos);vec3 newAcc=-pull/(newR*newR*newR*newR*newR)*newPos;vel=vel+.5*(acc+newAcc)*dl;float error=length(newAcc-acc)*dl*dl/6.;geodesicStep=stepSize*clamp(pow(.001/max(error,1e-12),1./3.),.5,2.);acc=newAcc;float weight=stepSize/profileStep;if(pos.y*newPos.y<=0.||min(abs(pos.y),abs(newPos.y))<DISK_HALF_THICKNESS){for(int s=0;s<2;s++){vec3 diskPos=mix(pos,newPos,(float(s)+sampleOffset)/float(2));vec4 diskSample=sampleDiskVolume(diskPos,vel);if(diskSample.a>.01){float contribution=diskSample.a*stepSize/float(2)*8.*(1.-alpha);color=color+diskSample.rgb*contribution;alpha=alpha+contribution*.5;}}}vec3 samplePos=mix(pos,newPos,sampleOffset);float sampleR=length(samplePos);vec4 jetSample=sampleJet(samplePos);if(jetSample.a>.01){float a=jetSample.a*.008*weight*(1.-alpha);color=color+jetSample.rgb*a;alpha=alpha+a*.2;}float prDist=abs(sampleR-RS*1.5);float prPulse=.7+.3*sin(u_time*4.+atan(samplePos.z,samplePos.x)*4.);float prGlow=exp(-prDist*prDist*100.)*.25*prPulse*weight*(1.-alpha);color=color+vec3(1.,.9,.7)*prGlow;pos=newPos;if(alpha>.95)break;}return vec4(color,alpha);}uniform sampler2D u_tileStats;uniform vec2 u_tileCount;vec2 tileBudget(){vec2 tile=floor(gl_FragCoord.xy/16.);float steps=0.;float closest=1.;for(int y=-1;y<=1;y++){for(int x=-1;x<=1;x++){vec2 neighbor=clamp(tile+vec2(float(x),float(y)),vec2(0.),u_tileCount-1.);vec4 stats=texture(u_tileStats,(neighbor+.5)/u_tileCount);steps=max(steps,stats.r);closest=min(closest,stats.b);}}float budget=min(float(160),steps*float(160)*1.25+24.);float stepScale=1.+.25*smoothstep(3.,8.,closest*16.);return vec2(budget,stepScale);}uniform int u_debugView;vec3 heatmap(float t){return clamp(vec3(1.5-abs(4.*t-3.),1.5-abs(4.*t-2.),1.5-abs(4.*t-1.)),0.,1.);}void main(){vec2 uv=screenUv();float orbitAngle=u_time*.25;vec3 cam=cameraPosition(orbitAngle);vec3 rd=cameraRay(uv,orbitAngle);vec2 budget=tileBudget();vec2 stats;vec4 traced=traceGeodesicMarch(cam,rd,int(budget.x),budget.y,stats);float used=stats.x/float(160);vec3 color;if(u_debugView==1){color=stats.x>0.?heatmap(used):vec3(0.);}else{if(stats.x==0.){color=vec3(.15,.2,.4);}else if(stats.y<RS){color=vec3(.75,.2,.8);}else if(traced.a>.95){color=vec3(1.,.75,.15);}else if(stats.x>=budget.x){color=vec3(1.,.1,.1);}else{color=vec3(.2,.75,.3);}color=color*(.35+.65*used);}fragColor=vec4(color,1.);}",
+  "direct-lut": "#version 300 es\nprecision highp float;precision highp int;in vec2 v_uv;out vec4 fragColor;uniform float u_time;uniform vec2 u_resolution;uniform sampler2D u_diskAtlas;const float PI=3.14159265359;const float RS=.6;const float DISK_INNER=1.2;const float DISK_OUTER=6.;const float INCLINATION=.1045;const float DISK_ATLAS_INNER=DISK_INNER*.9;const float DISK_ATLAS_OUTER=DISK_OUTER*1.1;const float DISK_ATLAS_RANGE=12.;uniform sampler2D u_diskShift;const vec2 DISK_SHIFT_LUT_SIZE=vec2(129.,64.);float hash(vec2 p){vec3 p3=fract(vec3(p.xyx)*.1031);p3=p3+dot(p3,p3.yzx+33.33);return fract((p3.x+p3.y)*p3.z);}float diskDopplerDot(vec3 pos,float r,vec3 vel){float orbitDirX=-pos.z/max(r,.001);float orbitDirZ=pos.x/max(r,.001);float velLen=sqrt(vel.x*vel.x+vel.y*vel.y+vel.z*vel.z);float dopplerDot=(orbitDirX*vel.x+orbitDirZ*vel.z)/max(velLen,.001);return dopplerDot;}vec3 diskAtlasEmission(vec3 pos,float r){vec2 uv=vec2(atan(pos.z,pos.x)/(2.*PI)+.5,(r-DISK_ATLAS_INNER)/(DISK_ATLAS_OUTER-DISK_ATLAS_INNER));vec4 texel=texture(u_diskAtlas,uv);return texel.rgb*texel.a*DISK_ATLAS_RANGE;}vec3 diskEmission(vec3 pos,float r,float dopplerDot){vec3 col=diskAtlasEmission(pos,r);vec2 lutCoord=vec2(dopplerDot*.5+.5,(r-DISK_ATLAS_INNER)/(DISK_ATLAS_OUTER-DISK_ATLAS_INNER));vec4 shift=texture(u_diskShift,(lutCoord*(DISK_SHIFT_LUT_SIZE-1.)+.5)/DISK_SHIFT_LUT_SIZE);return col*shift.rgb+vec3(0.,0.,shift.a);}float diskDensity(vec3 pos){float r=sqrt(pos.x*pos.x+pos.z*pos.z);float absY=abs(pos.y);float diskThickness=.08+.12*smoothstep(DISK_INNER,DISK_OUTER,r);float verticalDensity=exp(-absY*absY/(diskThickness*diskThickness*2.));if(r<DISK_INNER*.9||r>DISK_OUTER*1.1||verticalDensity<.01){return 0.;}float radialDensity=smoothstep(DISK_INNER*.9,DISK_INNER*1.3,r)*smoothstep(DISK_OUTER*1.1,DISK_OUTER*.6,r);return verticalDensity*radialDensity;}vec4 sampleDiskVolume(vec3 pos,vec3 vel){float density=diskDensity(pos);if(density<=0.)return vec4(0.);float r=sqrt(pos.x*pos.x+pos.z*pos.z);return vec4(diskEmission(pos,r,diskDopplerDot(pos,r,vel)),density);}vec2 jetProfile(vec3 pos){float absY=abs(pos.y);if(absY<.6||absY>12.)return vec2(0.);float r=sqrt(pos.x*pos.x+pos.z*pos.z);float jetRadius=.15+.08*sqrt(absY);float radialFall=exp(-r*r/(jetRadius*jetRadius*3.));if(radialFall<.02)return vec2(0.);float core=exp(-r*r/(jetRadius*jetRadius*.3));float baseFade=smoothstep(.6,2.5,absY);float tipFade=smoothstep(12.,6.,absY);return vec2(radialFall*baseFade*tipFade,core);}vec4 jetEmission(vec2 profile,float absY){float wave1=sin(absY*.8-u_time*4.)*.5+.5;float wave2=sin(absY*.4-u_time*2.8)*.5+.5;float smoothWave=wave1*.7+wave2*.3;float density=profile.x*(.5+.4*smoothWave);vec3 baseColor=vec3(.35,.25,.6);vec3 coreColor=vec3(.7,.85,1.);vec3 color=mix(baseColor,coreColor,profile.y*profile.y+smoothWave*.2);return vec4(color,density*.6);}vec4 sampleJet(vec3 pos){vec2 profile=jetProfile(pos);if(profile.x<=0.)return vec4(0.);return jetEmission(profile,abs(pos.y));}vec3 cameraPosition(float orbitAngle){float camDist=11.;float cI=cos(INCLINATION);float sI=sin(INCLINATION);return vec3(sin(orbitAngle)*cI*camDist,sI*camDist,cos(orbitAngle)*cI*camDist);}vec3 cameraRay(vec2 uv,float orbitAngle){vec3 cam=cameraPosition(orbitAngle);vec3 fwd=-cam/length(cam);vec3 right=vec3(cos(orbitAngle),0.,-sin(orbitAngle));vec3 up=cross(right,fwd);up=up/max(length(up),.001);return normalize(fwd+uv.x*right+uv.y*up);}vec2 screenUv(){vec2 pixel=gl_FragCoord.xy;return(pixel-.5*u_resolution)/min(u_resolution.x,u_resolution.y);}uniform sampler2D u_geodesicLut;const float LUT_MAX_IMPACT=11.;const float LUT_PHI_MAX=9.424778;const float LUT_PHI_SAMPLES=256.;const float LUT_WIDTH=257.;const float LUT_HEIGHT=256.;const int LUT_MAX_CROSSINGS=3;const int LUT_JET_SAMPLES=8;vec4 geodesicAt(float row,float phi){float column=.5+clamp(phi/LUT_PHI_MAX,0.,1.)*(LUT_PHI_SAMPLES-1.);return texture(u_geodesicLut,vec2(column/LUT_WIDTH,row));}vec4 traceGeodesicLut(vec3 cam,vec3 rd){float camDist=length(cam);vec3 e1=cam/camDist;vec3 normal=cross(e1,rd);float sinPsi=length(normal);vec3 e2=sinPsi>1e-5?cross(normal/sinPsi,e1):normalize(cross(e1,vec3(1.,0.,0.)));float impact=camDist*sinPsi;float row=(.5+clamp(impact/LUT_MAX_IMPACT,0.,1.)*(LUT_HEIGHT-1.))/LUT_HEIGHT;vec4 summary=texture(u_geodesicLut,vec2((LUT_WIDTH-.5)/LUT_WIDTH,row));float phiEnd=summary.x;float captured=clamp(summary.y,0.,1.);vec3 color=vec3(0.);float alpha=0.;float axialLen2=max(rd.x*rd.x+rd.z*rd.z,1e-4);float tAxis=-(cam.x*rd.x+cam.z*rd.z)/axialLen2;float tLimit=captured>.5?dot(-cam,rd):1e4;for(int j=0;j<LUT_JET_SAMPLES;j++){float t=tAxis+(float(j)/float(LUT_JET_SAMPLES-1)-.5)*2.4;if(t<0.||t>tLimit)continue;vec3 p=cam+rd*t;vec4 jetSample=sampleJet(p);if(jetSample.a>.01){float localStep=.045+.06*smoothstep(RS*2.,RS*8.,length(p));float a=jetSample.a*.008*(2.4/float(LUT_JET_SAMPLES))/localStep*(1.-alpha);color=color+jetSample.rgb*a;alpha=alpha+a*.2;}}float phiNode=mod(atan(-e1.y,e2.y),PI);for(int k=0;k<LUT_MAX_CROSSINGS;k++){float phi=phiNode+float(k)*PI;if(phi>phiEnd)break;vec4 state=geodesicAt(row,phi);float u=max(state.x,1e-4);float r=1./u;vec3 radial=cos(phi)*e1+sin(phi)*e2;vec3 tangent=-sin(phi)*e1+cos(phi)*e2;vec3 pos=radial*r;pos.y=0.;vec3 dir=normalize(tangent-(state.y/u)*radial);vec4 diskSample=sampleDiskVolume(pos,dir);if(diskSample.a>.01){float diskThickness=.08+.12*smoothstep(DISK_INNER,DISK_OUTER,r);float column=diskSample.a*diskThickness*2.5066*8./max(abs(dir.y),.02);float transmittance=exp(-.5*column);color=color+diskSample.rgb*(1.-alpha)*(1.-transmittance)*2.;alpha=1.-(1.-alpha)*transmittance;}}float phiPeriapsis=summary.w;vec3 periapsis=cos(phiPeriapsis)*e1+sin(phiPeriapsis)*e2;float prPulse=.7+.3*sin(u_time*4.+atan(periapsis.z,periapsis.x)*4.);float prGlow=summary.z/.045*.25*prPulse*(1.-alpha);color=color+vec3(1.,.9,.7)*prGlow;float starVal=hash(vec2(rd.x*400.+rd.y*200.,rd.z*300.));starVal=pow(starVal,35.)*.3;color=color+vec3(starVal)*(1.-alpha)*(1.-captured);color=mix(color,color*alpha,captured);alpha=mix(alpha,1.,captured);return vec4(color,alpha);}vec3 displayTransform(vec3 color,vec2 uv){color.x=(color.x*(2.51*color.x+.03))/(color.x*(2.43*color.x+.59)+.14);color.y=(color.y*(2.51*color.y+.03))/(color.y*(2.43*color.y+.59)+.14);color.z=(color.z*(2.51*color.z+.03))/(color.z*(2.43*color.z+.59)+.14);color=pow(clamp(color,0.,1.),vec3(.4545));float vigDist=length(uv);return color*(.92+.08*(1.-smoothstep(.5,1.4,vigDist)));}uniform bool u_hdrOutput;vec3 postProcess(vec3 color,vec2 uv){return displayTransform(color,uv);}vec3 finishColor(vec3 color,float alpha,vec3 cam,vec3 rd,vec2 uv){float rayClosest=-dot(cam,rd);if(rayClosest>0.){float closestR=length(cam+rd*rayClosest);float erDist=closestR-RS*2.6;float einsteinRing=exp(-erDist*erDist*70.);color=color+vec3(1.,.8,.5)*einsteinRing*.4*(1.-alpha*.7);}if(u_hdrOutput)return color;return postProcess(color,uv);}void main(){vec2 uv=screenUv();float orbitAngle=u_time*.25;vec3 cam=cameraPosition(orbitAngle);vec3 rd=cameraRay(uv,orbitAngle);vec4 traced=traceGeodesicLut(cam,rd);fragColor=vec4(finishColor(traced.rgb,traced.a,cam,rd,uv),1.);}",
+  "gbuffer-trace": "#version 300 es\nprecision highp float;precision highp int;in vec2 v_uv;layout(location=0)out vec4 gCrossing0;layout(location=1)out vec4 gCrossing1;layout(location=2)out vec4 gEscape;layout(location=3)out vec4 gGlow;uniform float u_time;uniform vec2 u_resolution;uniform sampler2D u_diskAtlas;const float PI=3.14159265359;const float RS=.6;const float DISK_INNER=1.2;const float DISK_OUTER=6.;const float INCLINATION=.1045;const float DISK_ATLAS_INNER=DISK_INNER*.9;const float DISK_ATLAS_OUTER=DISK_OUTER*1.1;const float DISK_ATLAS_RANGE=12.;uniform sampler2D u_diskShift;const vec2 DISK_SHIFT_LUT_SIZE=vec2(129.,64.);float hash(vec2 p){vec3 p3=fract(vec3(p.xyx)*.1031);p3=p3+dot(p3,p3.yzx+33.33);return fract((p3.x+p3.y)*p3.z);}float diskDopplerDot(vec3 pos,float r,vec3 vel){float orbitDirX=-pos.z/max(r,.001);float orbitDirZ=pos.x/max(r,.001);float velLen=sqrt(vel.x*vel.x+vel.y*vel.y+vel.z*vel.z);float dopplerDot=(orbitDirX*vel.x+orbitDirZ*vel.z)/max(velLen,.001);return dopplerDot;}vec3 diskAtlasEmission(vec3 pos,float r){vec2 uv=vec2(atan(pos.z,pos.x)/(2.*PI)+.5,(r-DISK_ATLAS_INNER)/(DISK_ATLAS_OUTER-DISK_ATLAS_INNER));vec4 texel=texture(u_diskAtlas,uv);return texel.rgb*texel.a*DISK_ATLAS_RANGE;}vec3 diskEmission(vec3 pos,float r,float dopplerDot){vec3 col=diskAtlasEmission(pos,r);vec2 lutCoord=vec2(dopplerDot*.5+.5,(r-DISK_ATLAS_INNER)/(DISK_ATLAS_OUTER-DISK_ATLAS_INNER));vec4 shift=texture(u_diskShift,(lutCoord*(DISK_SHIFT_LUT_SIZE-1.)+.5)/DISK_SHIFT_LUT_SIZE);return col*shift.rgb+vec3(0.,0.,shift.a);}float diskDensity(vec3 pos){float r=sqrt(pos.x*pos.x+pos.z*pos.z);float absY=abs(pos.y);float diskThickness=.08+.12*smoothstep(DISK_INNER,DISK_OUTER,r);float verticalDensity=exp(-absY*absY/(diskThickness*diskThickness*2.));if(r<DISK_INNER*.9||r>DISK_OUTER*1.1||verticalDensity<.01){return 0.;}float radialDensity=smoothstep(DISK_INNER*.9,DISK_INNER*1.3,r)*smoothstep(DISK_OUTER*1.1,DISK_OUTER*.6,r);return verticalDensity*radialDensity;}vec4 sampleDiskVolume(vec3 pos,vec3 vel){float density=diskDensity(pos);if(density<=0.)return vec4(0.);float r=sqrt(pos.x*pos.x+pos.z*pos.z);return vec4(diskEmission(pos,r,diskDopplerDot(pos,r,vel)),density);}vec2 jetProfile(vec3 pos){float absY=abs(pos.y);if(absY<.6||absY>12.)return vec2(0.);float r=sqrt(pos.x*pos.x+pos.z*pos.z);float jetRadius=.15+.08*sqrt(absY);float radialFall=exp(-r*r/(jetRadius*jetRadius*3.));if(radialFall<.02)return vec2(0.);float core=exp(-r*r/(jetRadius*jetRadius*.3));float baseFade=smoothstep(.6,2.5,absY);float tipFade=smoothstep(12.,6.,absY);return vec2(radialFall*baseFade*tipFade,core);}vec4 jetEmission(vec2 profile,float absY){float wave1=sin(absY*.8-u_time*4.)*.5+.5;float wave2=sin(absY*.4-u_time*2.8)*.5+.5;float smoothWave=wave1*.7+wave2*.3;float density=profile.x*(.5+.4*smoothWave);vec3 baseColor=vec3(.35,.25,.6);vec3 coreColor=vec3(.7,.85,1.);vec3 color=mix(baseColor,coreColor,profile.y*profile.y+smoothWave*.2);return vec4(color,density*.6);}vec4 sampleJet(vec3 pos){vec2 profile=jetProfile(pos);if(profile.x<=0.)return vec4(0.);return jetEmission(profile,abs(pos.y));}vec3 cameraPosition(float orbitAngle){float camDist=11.;float cI=cos(INCLINATION);float sI=sin(INCLINATION);return vec3(sin(orbitAngle)*cI*camDist,sI*camDist,cos(orbitAngle)*cI*camDist);}vec3 cameraRay(vec2 uv,float orbitAngle){vec3 cam=cameraPosition(orbitAngle);vec3 fwd=-cam/length(cam);vec3 right=vec3(cos(orbitAngle),0.,-sin(orbitAngle));vec3 up=cross(right,fwd);up=up/max(length(up),.001);return normalize(fwd+uv.x*right+uv.y*up);}vec2 screenUv(){vec2 pixel=gl_FragCoord.xy;return(pixel-.5*u_resolution)/min(u_resolution.x,u_resolution.y);}vec4 packCrossing(vec4 acc,vec2 azimuth,float multiplier){if(acc.x<=0.)return vec4(0.);return vec4(acc.y/acc.x,atan(azimuth.y,azimuth.x),acc.z/acc.x,acc.x*multiplier);}void main(){vec2 uv=screenUv();vec3 cam=cameraPosition(0.);vec3 rd=cameraRay(uv,0.);vec3 pos=cam;vec3 vel=rd;float alpha=0.;float stepSize=.045;float multiplier=1.;float starWeight=0.;vec4 crossing0=vec4(0.);vec4 crossing1=vec4(0.);vec2 azimuth0=vec2(0.);vec2 azimuth1=vec2(0.);int crossing=-1;bool wasInDisk=false;vec3 jet=vec3(0.);vec3 glow=vec3(0.);for(int i=0;i<160;i++){float r=length(pos);if(r<RS){multiplier=alpha;alpha=1.;break;}if(r>30.){starWeight=1.-alpha;break;}vec3 h=cross(pos,vel);float rInv=1./r;float accel=1.5*RS*dot(h,h)*rInv*rInv*rInv*rInv;vel=vel-pos*rInv*accel*stepSize;vel=vel/max(length(vel),.001);stepSize=.045+.06*smoothstep(RS*2.,RS*8.,r);float density=diskDensity(pos);bool inDisk=density>.01;if(inDisk){if(!wasInDisk&&crossing<1)crossing++;float contribution=density*stepSize*8.*(1.-alpha);float rc=sqrt(pos.x*pos.x+pos.z*pos.z);float a=atan(pos.z,pos.x);vec4 acc=contribution*vec4(1.,rc,diskDopplerDot(pos,rc,vel),0.);vec2 dir=contribution*vec2(cos(a),sin(a));if(crossing==0){crossing0+=acc;azimuth0+=dir;}else{crossing1+=acc;azimuth1+=dir;}alpha=alpha+contribution*.5;}wasInDisk=inDisk;vec2 profile=jetProfile(pos);if(profile.x*.42>.01){float w=profile.x*.008*(1.-alpha);jet+=w*vec3(1.,abs(pos.y),profile.y*profile.y);alpha=alpha+w*.42*.2;}float prDist=abs(r-RS*1.5);float g=exp(-prDist*prDist*100.)*.25*(1.-alpha);float pulsePhase=atan(pos.z,pos.x)*4.;glow+=g*vec3(1.,cos(pulsePhase),sin(pulsePhase));pos=pos+vel*stepSize;if(alpha>.95)break;}gCrossing0=packCrossing(crossing0,azimuth0,multiplier);gCrossing1=packCrossing(crossing1,azimuth1,multiplier);gEscape=vec4(starWeight,alpha,jet.x*multiplier,jet.x>0.?jet.y/jet.x:0.);gGlow=vec4(glow*multiplier,jet.x>0.?jet.z/jet.x:0.);}",
+  "gbuffer-shade": "#version 300 es\nprecision highp float;precision highp int;in vec2 v_uv;out vec4 fragColor;uniform sampler2D u_gCrossing0;uniform sampler2D u_gCrossing1;uniform sampler2D u_gEscape;uniform sampler2D u_gGlow;uniform float u_time;uniform vec2 u_resolution;uniform sampler2D u_diskAtlas;const float PI=3.14159265359;const float RS=.6;const float DISK_INNER=1.2;const float DISK_OUTER=6.;const float INCLINATION=.1045;const float DISK_ATLAS_INNER=DISK_INNER*.9;const float DISK_ATLAS_OUTER=DISK_OUTER*1.1;const float DISK_ATLAS_RANGE=12.;uniform sampler2D u_diskShift;const vec2 DISK_SHIFT_LUT_SIZE=vec2(129.,64.);float hash(vec2 p){vec3 p3=fract(vec3(p.xyx)*.1031);p3=p3+dot(p3,p3.yzx+33.33);return fract((p3.x+p3.y)*p3.z);}float diskDopplerDot(vec3 pos,float r,vec3 vel){float orbitDirX=-pos.z/max(r,.001);float orbitDirZ=pos.x/max(r,.001);float velLen=sqrt(vel.x*vel.x+vel.y*vel.y+vel.z*vel.z);float dopplerDot=(orbitDirX*vel.x+orbitDirZ*vel.z)/max(velLen,.001);return dopplerDot;}vec3 diskAtlasEmission(vec3 pos,float r){vec2 uv=vec2(atan(pos.z,pos.x)/(2.*PI)+.5,(r-DISK_ATLAS_INNER)/(DISK_ATLAS_OUTER-DISK_ATLAS_INNER));vec4 texel=texture(u_diskAtlas,uv);return texel.rgb*texel.a*DISK_ATLAS_RANGE;}vec3 diskEmission(vec3 pos,float r,float dopplerDot){vec3 col=diskAtlasEmission(pos,r);vec2 lutCoord=vec2(dopplerDot*.5+.5,(r-DISK_ATLAS_INNER)/(DISK_ATLAS_OUTER-DISK_ATLAS_INNER));vec4 shift=texture(u_diskShift,(lutCoord*(DISK_SHIFT_LUT_SIZE-1.)+.5)/DISK_SHIFT_LUT_SIZE);return col*shift.rgb+vec3(0.,0.,shift.a);}float diskDensity(vec3 pos){float r=sqrt(pos.x*pos.x+pos.z*pos.z);float absY=abs(pos.y);float diskThickness=.08+.12*smoothstep(DISK_INNER,DISK_OUTER,r);float verticalDensity=exp(-absY*absY/(diskThickness*diskThickness*2.));if(r<DISK_INNER*.9||r>DISK_OUTER*1.1||verticalDensity<.01){return 0.;}float radialDensity=smoothstep(DISK_INNER*.9,DISK_INNER*1.3,r)*smoothstep(DISK_OUTER*1.1,DISK_OUTER*.6,r);return verticalDensity*radialDensity;}vec4 sampleDiskVolume(vec3 pos,vec3 vel){float density=diskDensity(pos);if(density<=0.)return vec4(0.);float r=sqrt(pos.x*pos.x+pos.z*pos.z);return vec4(diskEmission(pos,r,diskDopplerDot(pos,r,vel)),density);}vec2 jetProfile(vec3 pos){float absY=abs(pos.y);if(absY<.6||absY>12.)return vec2(0.);float r=sqrt(pos.x*pos.x+pos.z*pos.z);float jetRadius=.15+.08*sqrt(absY);float radialFall=exp(-r*r/(jetRadius*jetRadius*3.));if(radialFall<.02)return vec2(0.);float core=exp(-r*r/(jetRadius*jetRadius*.3));float baseFade=smoothstep(.6,2.5,absY);float tipFade=smoothstep(12.,6.,absY);return vec2(radialFall*baseFade*tipFade,core);}vec4 jetEmission(vec2 profile,float absY){float wave1=sin(absY*.8-u_time*4.)*.5+.5;float wave2=sin(absY*.4-u_time*2.8)*.5+.5;float smoothWave=wave1*.7+wave2*.3;float density=profile.x*(.5+.4*smoothWave);vec3 baseColor=vec3(.35,.25,.6);vec3 coreColor=vec3(.7,.85,1.);vec3 color=mix(baseColor,coreColor,profile.y*profile.y+smoothWave*.2);return vec4(color,density*.6);}vec4 sampleJet(vec3 pos){vec2 profile=jetProfile(pos);if(profile.x<=0.)return vec4(0.);return jetEmission(profile,abs(pos.y));}vec3 cameraPosition(float orbitAngle){float camDist=11.;float cI=cos(INCLINATION);float sI=sin(INCLINATION);return vec3(sin(orbitAngle)*cI*camDist,sI*camDist,cos(orbitAngle)*cI*camDist);}vec3 cameraRay(vec2 uv,float orbitAngle){vec3 cam=cameraPosition(orbitAngle);vec3 fwd=-cam/length(cam);vec3 right=vec3(cos(orbitAngle),0.,-sin(orbitAngle));vec3 up=cross(right,fwd);up=up/max(length(up),.001);return normalize(fwd+uv.x*right+uv.y*up);}vec2 screenUv(){vec2 pixel=gl_FragCoord.xy;return(pixel-.5*u_resolution)/min(u_resolution.x,u_resolution.y);}vec3 displayTransform(vec3 color,vec2 uv){color.x=(color.x*(2.51*color.x+.03))/(color.x*(2.43*color.x+.59)+.14);color.y=(color.y*(2.51*color.y+.03))/(color.y*(2.43*color.y+.59)+.14);color.z=(color.z*(2.51*color.z+.03))/(color.z*(2.43*color.z+.59)+.14);color=pow(clamp(color,0.,1.),vec3(.4545));float vigDist=length(uv);return color*(.92+.08*(1.-smoothstep(.5,1.4,vigDist)));}uniform bool u_hdrOutput;vec3 postProcess(vec3 color,vec2 uv){return displayTransform(color,uv);}vec3 finishColor(vec3 color,float alpha,vec3 cam,vec3 rd,vec2 uv){float rayClosest=-dot(cam,rd);if(rayClosest>0.){float closestR=length(cam+rd*rayClosest);float erDist=closestR-RS*2.6;float einsteinRing=exp(-erDist*erDist*70.);color=color+vec3(1.,.8,.5)*einsteinRing*.4*(1.-alpha*.7);}if(u_hdrOutput)return color;return postProcess(color,uv);}vec3 shadeCrossing(vec4 g,float orbitAngle){if(g.w<=0.)return vec3(0.);float a=g.y-orbitAngle;vec3 pos=vec3(g.x*cos(a),0.,g.x*sin(a));return diskEmission(pos,g.x,g.z)*g.w;}void main(){ivec2 texel=ivec2(gl_FragCoord.xy);vec4 crossing0=texelFetch(u_gCrossing0,texel,0);vec4 crossing1=texelFetch(u_gCrossing1,texel,0);vec4 escape=texelFetch(u_gEscape,texel,0);vec4 glow=texelFetch(u_gGlow,texel,0);vec2 uv=screenUv();float orbitAngle=u_time*.25;vec3 cam=cameraPosition(orbitAngle);vec3 rd=cameraRay(uv,orbitAngle);vec3 color=shadeCrossing(crossing0,orbitAngle)+shadeCrossing(crossing1,orbitAngle);if(escape.z>0.){vec4 jetSample=jetEmission(vec2(1.,sqrt(glow.w)),escape.w);color=color+jetSample.rgb*jetSample.a*escape.z;}float pulsePhase=u_time*4.-orbitAngle*4.;float prGlow=.7*glow.x+.3*(sin(pulsePhase)*glow.y+cos(pulsePhase)*glow.z);color=color+vec3(1.,.9,.7)*prGlow;float starVal=hash(vec2(rd.x*400.+rd.y*200.,rd.z*300.));starVal=pow(starVal,35.)*.3;color=color+vec3(starVal)*escape.x;fragColor=vec4(finishColor(color,escape.y,cam,rd,uv),1.);}",
+  "bloom-down": "#version 300 es\nprecision highp float;precision highp int;in vec2 v_uv;out vec4 fragColor;uniform sampler2D u_source;uniform vec2 u_texelSize;uniform bool u_prefilter;const float BLOOM_CLAMP=2.;vec3 bloomTap(vec2 uv){vec3 color=texture(u_source,uv).rgb;if(!u_prefilter)return color;float lum=dot(color,vec3(.299,.587,.114));return color*smoothstep(.6,2.,lum)*min(1.,BLOOM_CLAMP/max(lum,1e-6));}void main(){vec3 sum=bloomTap(v_uv)*4.;sum=sum+bloomTap(v_uv-u_texelSize);sum=sum+bloomTap(v_uv+u_texelSize);sum=sum+bloomTap(v_uv+vec2(u_texelSize.x,-u_texelSize.y));sum=sum+bloomTap(v_uv-vec2(u_texelSize.x,-u_texelSize.y));fragColor=vec4(sum/8.,1.);}",
+  "bloom-up": "#version 300 es\nprecision highp float;precision highp int;in vec2 v_uv;out vec4 fragColor;uniform sampler2D u_source;uniform vec2 u_texelSize;void main(){vec2 h=u_texelSize;vec3 sum=texture(u_source,v_uv+vec2(-2.*h.x,0.)).rgb;sum=sum+texture(u_source,v_uv+vec2(2.*h.x,0.)).rgb;sum=sum+texture(u_source,v_uv+vec2(0.,-2.*h.y)).rgb;sum=sum+texture(u_source,v_uv+vec2(0.,2.*h.y)).rgb;sum=sum+texture(u_source,v_uv+vec2(-h.x,h.y)).rgb*2.;sum=sum+texture(u_source,v_uv+vec2(h.x,h.y)).rgb*2.;sum=sum+texture(u_source,v_uv+vec2(h.x,-h.y)).rgb*2.;sum=sum+texture(u_source,v_uv+vec2(-h.x,-h.y)).rgb*2.;fragColor=vec4(sum/12.,1.);}",
+  "post-composite": "#version 300 es\nprecision highp float;precision highp int;in vec2 v_uv;out vec4 fragColor;vec3 displayTransform(vec3 color,vec2 uv){color.x=(color.x*(2.51*color.x+.03))/(color.x*(2.43*color.x+.59)+.14);color.y=(color.y*(2.51*color.y+.03))/(color.y*(2.43*color.y+.59)+.14);color.z=(color.z*(2.51*color.z+.03))/(color.z*(2.43*color.z+.59)+.14);color=pow(clamp(color,0.,1.),vec3(.4545));float vigDist=length(uv);return color*(.92+.08*(1.-smoothstep(.5,1.4,vigDist)));}uniform vec2 u_resolution;uniform sampler2D u_scene;uniform sampler2D u_bloom;uniform float u_bloomScale;uniform bool u_rawColor;void main(){vec3 color=texture(u_scene,v_uv).rgb;if(u_rawColor){fragColor=vec4(color,1.);return;}vec2 uv=(gl_FragCoord.xy-.5*u_resolution)/min(u_resolution.x,u_resolution.y);fragColor=vec4(displayTransform(color,uv),1.);}",
+  "upscale-easu": "#version 300 es\nprecision highp float;precision highp int;in vec2 v_uv;out vec4 fragColor;uniform sampler2D u_source;uniform vec2 u_sourceSize;uniform vec2 u_resolution;vec3 easuFetch(ivec2 texel){return texelFetch(u_source,clamp(texel,ivec2(0),ivec2(u_sourceSize)-1),0).rgb;}float easuLuma(vec3 color){return color.b*.5+(color.r*.5+color.g);}void easuSet(inout vec2 dir,inout float len,float w,float la,float lb,float lc,float ld,float le){float dirX=ld-lb;float lenX=max(abs(ld-lc),abs(lc-lb));lenX=clamp(abs(dirX)/max(lenX,1e-5),0.,1.);float dirY=le-la;float lenY=max(abs(le-lc),abs(lc-la));lenY=clamp(abs(dirY)/max(lenY,1e-5),0.,1.);dir=dir+vec2(dirX,dirY)*w;len=len+(lenX*lenX+lenY*lenY)*w;}void easuTap(inout vec3 sum,inout float weightSum,vec2 off,vec2 dir,vec2 len2,float lob,float clp,vec3 color){vec2 v=vec2(off.x*dir.x+off.y*dir.y,off.x*-dir.y+off.y*dir.x)*len2;float d2=min(dot(v,v),clp);float wB=.4*d2-1.;float wA=lob*d2-1.;float w=(1.5625*wB*wB-.5625)*(wA*wA);sum=sum+color*w;weightSum=weightSum+w;}void main(){vec2 pp=gl_FragCoord.xy*u_sourceSize/u_resolution-.5;vec2 fp=floor(pp);pp=pp-fp;ivec2 p=ivec2(fp);vec3 b=easuFetch(p+ivec2(0,-1));vec3 c=easuFetch(p+ivec2(1,-1));vec3 e=easuFetch(p+ivec2(-1,0));vec3 f=easuFetch(p);vec3 g=easuFetch(p+ivec2(1,0));vec3 h=easuFetch(p+ivec2(2,0));vec3 i=easuFetch(p+ivec2(-1,1));vec3 j=easuFetch(p+ivec2(0,1));vec3 k=easuFetch(p+ivec2(1,1));vec3 l=easuFetch(p+ivec2(2,1));vec3 n=easuFetch(p+ivec2(0,2));vec3 o=easuFetch(p+ivec2(1,2));float bL=easuLuma(b);float cL=easuLuma(c);float eL=easuLuma(e);float fL=easuLuma(f);float gL=easuLuma(g);float hL=easuLuma(h);float iL=easuLuma(i);float jL=easuLuma(j);float kL=easuLuma(k);float lL=easuLuma(l);float nL=easuLuma(n);float oL=easuLuma(o);vec2 dir=vec2(0.);float len=0.;easuSet(dir,len,(1.-pp.x)*(1.-pp.y),bL,eL,fL,gL,jL);easuSet(dir,len,pp.x*(1.-pp.y),cL,fL,gL,hL,kL);easuSet(dir,len,(1.-pp.x)*pp.y,fL,iL,jL,kL,nL);easuSet(dir,len,pp.x*pp.y,gL,jL,kL,lL,oL);float dirLength2=dot(dir,dir);dir=dirLength2<1./32768.?vec2(1.,0.):dir*inversesqrt(dirLength2);len=len*.5;len=len*len;float stretch=dot(dir,dir)/max(abs(dir.x),abs(dir.y));vec2 len2=vec2(1.+(stretch-1.)*len,1.-.5*len);float lob=.5+(.21-.5)*len;float clp=1./lob;vec3 sum=vec3(0.);float weightSum=0.;easuTap(sum,weightSum,vec2(0.,-1.)-pp,dir,len2,lob,clp,b);easuTap(sum,weightSum,vec2(1.,-1.)-pp,dir,len2,lob,clp,c);easuTap(sum,weightSum,vec2(-1.,1.)-pp,dir,len2,lob,clp,i);easuTap(sum,weightSum,vec2(0.,1.)-pp,dir,len2,lob,clp,j);easuTap(sum,weightSum,vec2(0.,0.)-pp,dir,len2,lob,clp,f);easuTap(sum,weightSum,vec2(-1.,0.)-pp,dir,len2,lob,clp,e);easuTap(sum,weightSum,vec2(1.,1.)-pp,dir,len2,lob,clp,k);easuTap(sum,weightSum,vec2(2.,1.)-pp,dir,len2,lob,clp,l);easuTap(sum,weightSum,vec2(2.,0.)-pp,dir,len2,lob,clp,h);easuTap(sum,weightSum,vec2(1.,0.)-pp,dir,len2,lob,clp,g);easuTap(sum,weightSum,vec2(1.,2.)-pp,dir,len2,lob,clp,o);easuTap(sum,weightSum,vec2(0.,2.)-pp,dir,len2,lob,clp,n);vec3 lo=min(min(f,g),min(j,k));vec3 hi=max(max(f,g),max(j,k));fragColor=vec4(clamp(sum/weightSum,lo,hi),1.);}",
+  "upscale-rcas": "#version 300 es\nprecision highp float;precision highp int;in vec2 v_uv;out vec4 fragColor;uniform sampler2D u_source;uniform float u_sharpness;const float RCAS_LIMIT=.25-1./16.;void main(){ivec2 p=ivec2(gl_FragCoord.xy);ivec2 last=textureSize(u_source,0)-1;vec3 b=texelFetch(u_source,clamp(p+ivec2(0,-1),ivec2(0),last),0).rgb;vec3 d=texelFetch(u_source,clamp(p+ivec2(-1,0),ivec2(0),last),0).rgb;vec3 e=texelFetch(u_source,p,0).rgb;vec3 f=texelFetch(u_source,clamp(p+ivec2(1,0),ivec2(0),last),0).rgb;vec3 h=texelFetch(u_source,clamp(p+ivec2(0,1),ivec2(0),last),0).rgb;float bL=b.b*.5+(b.r*.5+b.g);float dL=d.b*.5+(d.r*.5+d.g);float eL=e.b*.5+(e.r*.5+e.g);float fL=f.b*.5+(f.r*.5+f.g);float hL=h.b*.5+(h.r*.5+h.g);float noise=.25*(bL+dL+fL+hL)-eL;float range=max(max(max(bL,dL),max(eL,fL)),hL)-min(min(min(bL,dL),min(eL,fL)),hL);noise=1.-.5*clamp(abs(noise)/max(range,1e-5),0.,1.);vec3 mn4=min(min(b,d),min(f,h));vec3 mx4=max(max(b,d),max(f,h));vec3 hitMin=mn4/(4.*max(mx4,vec3(1e-5)));vec3 hitMax=(1.-mx4)/min(4.*mn4-4.,vec3(-1e-5));vec3 lobeRGB=max(-hitMin,hitMax);float lobe=max(-RCAS_LIMIT,min(max(max(lobeRGB.r,lobeRGB.g),lobeRGB.b),0.))*u_sharpness*noise;fragColor=vec4((lobe*(b+d+f+h)+e)/(4.*lobe+1.),1.);}",
+  "temporal-march": "#version 300 es\nprecision highp float;precision highp int;in vec2 v_uv;layout(location=0)out vec4 fragColor;layout(location=1)out vec4 fragMotion;uniform float u_time;uniform vec2 u_resolution;uniform sampler2D u_diskAtlas;const float PI=3.14159265359;const float RS=.6;const float DISK_INNER=1.2;const float DISK_OUTER=6.;const float INCLINATION=.1045;const float DISK_ATLAS_INNER=DISK_INNER*.9;const float DISK_ATLAS_OUTER=DISK_OUTER*1.1;const float DISK_ATLAS_RANGE=12.;uniform sampler2D u_diskShift;const vec2 DISK_SHIFT_LUT_SIZE=vec2(129.,64.);float hash(vec2 p){vec3 p3=fract(vec3(p.xyx)*.1031);p3=p3+dot(p3,p3.yzx+33.33);return fract((p3.x+p3.y)*p3.z);}float diskDopplerDot(vec3 pos,float r,vec3 vel){float orbitDirX=-pos.z/max(r,.001);float orbitDirZ=pos.x/max(r,.001);float velLen=sqrt(vel.x*vel.x+vel.y*vel.y+vel.z*vel.z);float dopplerDot=(orbitDirX*vel.x+orbitDirZ*vel.z)/max(velLen,.001);return dopplerDot;}vec3 diskAtlasEmission(vec3 pos,float r){vec2 uv=vec2(atan(pos.z,pos.x)/(2.*PI)+.5,(r-DISK_ATLAS_INNER)/(DISK_ATLAS_OUTER-DISK_ATLAS_INNER));vec4 texel=texture(u_diskAtlas,uv);return texel.rgb*texel.a*DISK_ATLAS_RANGE;}vec3 diskEmission(vec3 pos,float r,float dopplerDot){vec3 col=diskAtlasEmission(pos,r);vec2 lutCoord=vec2(dopplerDot*.5+.5,(r-DISK_ATLAS_INNER)/(DISK_ATLAS_OUTER-DISK_ATLAS_INNER));vec4 shift=texture(u_diskShift,(lutCoord*(DISK_SHIFT_LUT_SIZE-1.)+.5)/DISK_SHIFT_LUT_SIZE);return col*shift.rgb+vec3(0.,0.,shift.a);}float diskDensity(vec3 pos){float r=sqrt(pos.x*pos.x+pos.z*pos.z);float absY=abs(pos.y);float diskThickness=.08+.12*smoothstep(DISK_INNER,DISK_OUTER,r);float verticalDensity=exp(-absY*absY/(diskThickness*diskThickness*2.));if(r<DISK_INNER*.9||r>DISK_OUTER*1.1||verticalDensity<.01){return 0.;}float radialDensity=smoothstep(DISK_INNER*.9,DISK_INNER*1.3,r)*smoothstep(DISK_OUTER*1.1,DISK_OUTER*.6,r);return verticalDensity*radialDensity;}vec4 sampleDiskVolume(vec3 pos,vec3 vel){float density=diskDensity(pos);if(density<=0.)return vec4(0.);float r=sqrt(pos.x*pos.x+pos.z*pos.z);return vec4(diskEmission(pos,r,diskDopplerDot(pos,r,vel)),density);}vec2 jetProfile(vec3 pos){float absY=abs(pos.y);if(absY<.6||absY>12.)return vec2(0.);float r=sqrt(pos.x*pos.x+pos.z*pos.z);float jetRadius=.15+.08*sqrt(absY);float radialFall=exp(-r*r/(jetRadius*jetRadius*3.));if(radialFall<.02)return vec2(0.);float core=exp(-r*r/(jetRadius*jetRadius*.3));float baseFade=smoothstep(.6,2.5,absY);float tipFade=smoothstep(12.,6.,absY);return vec2(radialFall*baseFade*tipFade,core);}vec4 jetEmission(vec2 profile,float absY){float wave1=sin(absY*.8-u_time*4.)*.5+.5;float wave2=sin(absY*.4-u_time*2.8)*.5+.5;float smoothWave=wave1*.7+wave2*.3;float density=profile.x*(.5+.4*smoothWave);vec3 baseColor=vec3(.35,.25,.6);vec3 coreColor=vec3(.7,.85,1.);vec3 color=mix(baseColor,coreColor,profile.y*profile.y+smoothWave*.2);return vec4(color,density*.6);}vec4 sampleJet(vec3 pos){vec2 profile=jetProfile(pos);if(profile.x<=0.)return vec4(0.);return jetEmission(profile,abs(pos.y));}vec3 cameraPosition(float orbitAngle){float camDist=11.;float cI=cos(INCLINATION);float sI=sin(INCLINATION);return vec3(sin(orbitAngle)*cI*camDist,sI*camDist,cos(orbitAngle)*cI*camDist);}vec3 cameraRay(vec2 uv,float orbitAngle){vec3 cam=cameraPosition(orbitAngle);vec3 fwd=-cam/length(cam);vec3 right=vec3(cos(orbitAngle),0.,-sin(orbitAngle));vec3 up=cross(right,fwd);up=up/max(length(up),.001);return normalize(fwd+uv.x*right+uv.y*up);}uniform vec2 u_jitter;vec2 screenUv(){vec2 pixel=gl_FragCoord.xy+u_jitter;return(pixel-.5*u_resolution)/min(u_resolution.x,u_resolution.y);}const float CORE_BOUND=RS*6.;const float DISK_BOUND=DISK_OUTER*1.1+.1;const float DISK_HALF_THICKNESS=.61;const float JET_BOUND=1.5;const float JET_TOP=12.;const float BEND_SLACK=.25;const float ESCAPE_RADIUS=30.;const int DISK_CHORD_SAMPLES=6;float deflectionIntegral(float s,float b){float q=b*b+s*s;return s*(2.*s*s+3.*b*b)/(3.*b*q*sqrt(q));}float displacementIntegral(float s,float b){float q=sqrt(b*b+s*s);return(2.*q-b*b/q)/(3.*b);}vec2 rayBending(float s0,float s,float b){float f0=deflectionIntegral(s0,b);float angle=1.5*RS*(deflectionIntegral(s,b)-f0);float drop=1.5*RS*(displacementIntegral(s,b)-displacementIntegral(s0,b)-f0*(s-s0));return vec2(angle,drop);}bool rayMissesScene(vec3 cam,vec3 rd){float tClosest=-dot(cam,rd);if(tClosest<0.)return true;vec3 closest=cam+rd*tClosest;float b=length(closest);if(b<CORE_BOUND)return false;vec3 towardHole=-closest/b;float s0=-tClosest;if(b<DISK_BOUND){float halfChord=sqrt(DISK_BOUND*DISK_BOUND-b*b);float prevY=0.;for(int i=0;i<DISK_CHORD_SAMPLES;i++){float s=halfChord*(2.*float(i)/float(DISK_CHORD_SAMPLES-1)-1.);float y=cam.y+rd.y*(s-s0)+towardHole.y*rayBending(s0,s,b).y;if(abs(y)<DISK_HALF_THICKNESS+BEND_SLACK||(i>0&&y*prevY<0.))return false;prevY=y;}}float lenXZ=dot(rd.xz,rd.xz);if(lenXZ>.000001){float tAxis=max(-dot(cam.xz,rd.xz)/lenXZ,0.);vec3 nearAxis=cam+rd*tAxis+towardHole*rayBending(s0,tAxis+s0,b).y;if(abs(nearAxis.y)<JET_TOP+BEND_SLACK&&length(nearAxis.xz)<JET_BOUND+BEND_SLACK)return false;}return true;}vec3 lensedStarfield(vec3 cam,vec3 rd){float tClosest=-dot(cam,rd);vec3 closest=cam+rd*tClosest;float b=max(length(closest),.001);float sEscape=sqrt(max(ESCAPE_RADIUS*ESCAPE_RADIUS-b*b,0.));float angle=rayBending(-tClosest,sEscape,b).x;vec3 dir=rd*cos(angle)-closest/b*sin(angle);float starVal=hash(vec2(dir.x*400.+dir.y*200.,dir.z*300.));return vec3(pow(starVal,35.)*.3);}const float MAX_GEODESIC_STEP=2.;const float PHOTON_RING_REACH=.45;float emitterDistance(vec3 pos,float r){float cylR=length(pos.xz);float absY=abs(pos.y);float d=min(r-RS*1.5-PHOTON_RING_REACH,length(max(vec2(cylR-DISK_BOUND,absY-DISK_HALF_THICKNESS),0.)));d=min(d,length(max(vec2(cylR-JET_BOUND,absY-JET_TOP),0.)));return max(d,0.);}uniform float u_jitterPhase;float marchSampleOffset(){float noise=fract(52.9829189*fract(dot(gl_FragCoord.xy,vec2(.06711056,.00583715))));return fract(noise+u_jitterPhase);}vec4 marchAnchor;float marchAnchorWeight;void addMarchAnchor(vec3 samplePos,float angularSpeed,float weight){float cylR=length(samplePos.xz);marchAnchor=marchAnchor+vec4(samplePos.xz/max(cylR,.001),cylR,angularSpeed)*weight;marchAnchorWeight=marchAnchorWeight+weight;}vec4 traceGeodesicMarch(vec3 cam,vec3 rd,int budget,float stepScale,out vec2 stats){stats=vec2(0.,1000.);marchAnchor=vec4(0.);marchAnchorWeight=0.;stepScale=stepScale*1.5;float sampleOffset=marchSampleOffset();if(rayMissesScene(cam,rd)){return vec4(lensedStarfield(cam,rd),0.);}vec3 pos=cam;vec3 vel=rd;vec3 color=vec3(0.);float alpha=0.;float stepSize=.045*stepScale;vec3 h=cross(cam,rd);float pull=1.5*RS*dot(h,h);float camR=length(cam);vec3 acc=-pull/(camR*camR*camR*camR*camR)*cam;float geodesicStep=MAX_GEODESIC_STEP;for(int i=0;i<160;i++){if(i>=budget)break;float r=length(pos);stats=vec2(float(i+1),min(stats.y,r));if(r<RS){color=mix(color,vec3(0.),1.-alpha);alpha=1.;break;}bool leaving=r>DISK_BOUND&&dot(pos,vel)>0.;leaving=leaving&&((abs(pos.y)>JET_TOP+BEND_SLACK&&pos.y*vel.y>0.)||(length(pos.xz)>JET_BOUND+BEND_SLACK&&dot(pos.xz,vel.xz)>0.));if(r>ESCAPE_RADIUS||leaving){float starVal=hash(vec2(rd.x*400.+rd.y*200.,rd.z*300.));starVal=pow(starVal,35.)*.3;color=color+vec3(starVal)*(1.-alpha);break;}float profileStep=.045+.06*smoothstep(RS*2.,RS*8.,r);stepSize=min(max(profileStep*stepScale,emitterDistance(pos,r)),geodesicStep);float dl=stepSize/length(vel);vec3 newPos=pos+(vel+.5*acc*dl)*dl;float newR=length(newPos);vec3 newAcc=-pull/(newR*newR*newR*newR*newR)*newPos;vel=vel+.5*(acc+newAcc)*dl;float error=length(newAcc-acc)*dl*dl/6.;geodesicStep=stepSize*clamp(pow(.001/max(error,1e-12),1./3.),.5,2.);acc=newAcc;float weight=stepSize/profileStep;if(pos.y*newPos.y<=0.||min(abs(pos.y),abs(newPos.y))<DISK_HALF_THICKNESS){for(int s=0;s<2;s++){vec3 diskPos=mix(pos,newPos,(float(s)+sampleOffset)/float(2));vec4 diskSample=sampleDiskVolume(diskPos,vel);if(diskSample.a>.01){float contribution=diskSample.a*stepSize/float(2)*8.*(1.-alpha);color=color+diskSample.rgb*contribution;alpha=alpha+contribution*.5;float cylR=max(length(diskPos.xz),.1);addMarchAnchor(diskPos,-15./(cylR*sqrt(cylR)),contribution);}}}vec3 samplePos=mix(pos,newPos,sampleOffset);float sampleR=length(samplePos);vec4 jetSample=sampleJet(samplePos);if(jetSample.a>.01){float a=jetSample.a*.008*weight*(1.-alpha);color=color+jetSample.rgb*a;alpha=alpha+a*.2;}float prDist=abs(sampleR-RS*1.5);float prPulse=.7+.3*sin(u_time*4.+atan(samplePos.z,samplePos.x)*4.);float prGlow=exp(-prDist*prDist*100.)*.25*prPulse*weight*(1.-alpha);color=color+vec3(1.,.9,.7)*prGlow;addMarchAnchor(samplePos,-1.,prGlow);pos=newPos;if(alpha>.95)break;}return vec4(color,alpha);}uniform sampler2D u_tileStats;uniform vec2 u_tileCount;vec2 tileBudget(){vec2 tile=floor(gl_FragCoord.xy/16.);float steps=0.;float closest=1.;for(int y=-1;y<=1;y++){for(int x=-1;x<=1;x++){vec2 neighbor=clamp(tile+vec2(float(x),float(y)),vec2(0.),u_tileCount-1.);vec4 stats=texture(u_tileStats,(neighbor+.5)/u_tileCount);steps=max(steps,stats.r);closest=min(closest,stats.b);}}float budget=min(float(160),steps*float(160)*1.25+24.);float stepScale=1.+.25*smoothstep(3.,8.,closest*16.);return vec2(budget,stepScale);}vec3 displayTransform(vec3 color,vec2 uv){color.x=(color.x*(2.51*color.x+.03))/(color.x*(2.43*color.x+.59)+.14);color.y=(color.y*(2.51*color.y+.03))/(color.y*(2.43*color.y+.59)+.14);color.z=(color.z*(2.51*color.z+.03))/(color.z*(2.43*color.z+.59)+.14);color=pow(clamp(color,0.,1.),vec3(.4545));float vigDist=length(uv);return color*(.92+.08*(1.-smoothstep(.5,1.4,vigDist)));}uniform bool u_hdrOutput;vec3 postProcess(vec3 color,vec2 uv){return displayTransform(color,uv);}vec3 finishColor(vec3 color,float alpha,vec3 cam,vec3 rd,vec2 uv){float rayClosest=-dot(cam,rd);if(rayClosest>0.){float closestR=length(cam+rd*rayClosest);float erDist=closestR-RS*2.6;float einsteinRing=exp(-erDist*erDist*70.);color=color+vec3(1.,.8,.5)*einsteinRing*.4*(1.-alpha*.7);}if(u_hdrOutput)return color;return postProcess(color,uv);}const float TEMPORAL_STEP_SCALE=2./1.5;const float ORBIT_SPEED=.25;const float MAX_MOTION=64.;uniform float u_timeStep;float wrapAngle(float angle){return angle-6.2831853*floor(angle/6.2831853+.5);}vec2 reprojectionOffset(float azimuth,float radius,float angularSpeed){mat2 jacobian=mat2(wrapAngle(dFdx(azimuth)),dFdx(radius),wrapAngle(dFdy(azimuth)),dFdy(radius));float det=determinant(jacobian);if(abs(det)<1e-8)return vec2(0.);vec2 offset=inverse(jacobian)*vec2(-(angularSpeed+ORBIT_SPEED)*u_timeStep,0.);return dot(offset,offset)<MAX_MOTION*MAX_MOTION?offset:vec2(0.);}void main(){vec2 uv=screenUv();float orbitAngle=u_time*.25;vec3 cam=cameraPosition(orbitAngle);vec3 rd=cameraRay(uv,orbitAngle);vec2 budget=tileBudget();vec2 stats;vec4 traced=traceGeodesicMarch(cam,rd,int(budget.x),budget.y*TEMPORAL_STEP_SCALE,stats);fragColor=vec4(finishColor(traced.rgb,traced.a,cam,rd,uv),1.);float azimuth=atan(rd.z,rd.x);float radius=rd.y;float angularSpeed=0.;if(marchAnchorWeight>.001){vec4 anchor=marchAnchor/marchAnchorWeight;azimuth=atan(anchor.y,anchor.x);radius=anchor.z;angularSpeed=anchor.w;}fragMotion=vec4(reprojectionOffset(azimuth,radius,angularSpeed),0.,1.);}",
+  "temporal-resolve": "#version 300 es\nprecision highp float;precision highp int;in vec2 v_uv;out vec4 fragColor;uniform sampler2D u_source;uniform sampler2D u_motion;uniform sampler2D u_history;uniform float u_historyWeight;vec3 compress(vec3 c){return c/(1.+max(c.r,max(c.g,c.b)));}vec3 uncompress(vec3 c){return c/max(1.-max(c.r,max(c.g,c.b)),1e-4);}void main(){ivec2 p=ivec2(gl_FragCoord.xy);ivec2 size=textureSize(u_source,0);ivec2 last=size-1;vec3 current=compress(texelFetch(u_source,p,0).rgb);vec3 low=current;vec3 high=current;for(int y=-1;y<=1;y++){for(int x=-1;x<=1;x++){vec3 c=compress(texelFetch(u_source,clamp(p+ivec2(x,y),ivec2(0),last),0).rgb);low=min(low,c);high=max(high,c);}}vec2 previous=gl_FragCoord.xy+texelFetch(u_motion,p,0).xy;float weight=u_historyWeight;if(any(lessThan(previous,vec2(0.)))||any(greaterThan(previous,vec2(size))))weight=0.;vec3 history=clamp(compress(texture(u_history,previous/vec2(size)).rgb),low,high);fragColor=vec4(uncompress(mix(current,history,weight)),1.);}",
+}
+
+export default variant
@@ -0,0 +1,132 @@
+// Schwarzschild photon orbits are planar and, for a camera at a fixed radius,
+// depend only on the impact parameter b. Integrating the Binet equation
+//   u'' + u = 1.5 * RS * u²,   u = 1 / r,
+// over the swept in-plane angle φ once per b gives every pixel's path.
+
+export const LUT_IMPACT_SAMPLES = 256
+export const LUT_PHI_SAMPLES = 256
+// Rays close to the critical impact parameter wind around the hole; beyond
+// 1.5 turns their contribution is negligible and they are treated as captured.
+export const LUT_PHI_MAX = 3 * Math.PI
+// One extra column per row stores that row's summary (see buildGeodesicLut).
+export const LUT_WIDTH = LUT_PHI_SAMPLES + 1
+const SUBSTEPS = 4
+
+export interface GeodesicLutParams {
+  /** Schwarzschild radius, RS in the shader. */
+  rs: number
+  cameraDistance: number
+  /** Radius past which an outgoing ray counts as escaped. */
+  escapeRadius: number
+  /** Radius of the photon-ring glow shell and its gaussian sharpness. */
+  photonRingRadius: number
+  photonRingSharpness: number
+}
+
+export interface GeodesicLut {
+  /** RGBA rows of LUT_WIDTH texels, one row per impact parameter sample. */
+  data: Float32Array
+  width: number
+  height: number
+  /** Impact parameter mapped to the last row; the first row is b = 0. */
+  maxImpact: number
+}
+
+/**
+ * Builds the deflection table sampled by the `lut` geodesic mode.
+ *
+ * Texel (φ column, b row) holds (u, du/dφ, 0, 0). The final column holds the
+ * row summary: (φ at which the ray terminated, 1 if captured else 0, path
+ * integral of the photon-ring glow, φ of periapsis). Columns past termination
+ * repeat the last state so filtering never reads garbage.
+ */
+export function buildGeodesicLut(params: GeodesicLutParams): GeodesicLut {
+  const { rs, cameraDistance, escapeRadius, photonRingRadius, photonRingSharpness } = params
+  const width = LUT_WIDTH
+  const height = LUT_IMPACT_SAMPLES
+  const data = new Float32Array(width * height * 4)
+  // Every on-screen ray points inward from the camera, so b never exceeds the camera radius.
+  const maxImpact = cameraDistance
+  const h = LUT_PHI_MAX / ((LUT_PHI_SAMPLES - 1) * SUBSTEPS)
+  const captureU = 1 / rs
+  const escapeU = 1 / escapeRadius
+
+  for (let row = 0; row < height; row++) {
+    const b = (maxImpact * row) / (height - 1)
+    const rowOffset = row * width * 4
+
+    let u = 1 / cameraDistance
+    let du = 0
+    let phiEnd = 0
+    let captured = 1
+    let glow = 0
+    let phiPeriapsis = -1
+
+    if (b > 1e-4) {
+      const sinPsi = Math.min(b / cameraDistance, 1)
+      du = Math.sqrt(1 - sinPsi * sinPsi) / b
+      phiEnd = LUT_PHI_MAX
+    }
+
+    data[rowOffset] = u
+    data[rowOffset + 1] = du
+    let terminated = phiEnd === 0
+    let phi = 0
+
+    for (let column = 1; column < LUT_PHI_SAMPLES; column++) {
+      for (let substep = 0; substep < SUBSTEPS && !terminated; substep++) {
+        const k1u = du
+        const k1d = u * (1.5 * rs * u - 1)
+        const u2 = u + 0.5 * h * k1u
+        const k2u = du + 0.5 * h * k1d
+        const k2d = u2 * (1.5 * rs * u2 - 1)
+        const u3 = u + 0.5 * h * k2u
+        const k3u = du + 0.5 * h * k2d
+        const k3d = u3 * (1.5 * rs * u3 - 1)
+        const u4 = u + h * k3u
+        const k4u = du + h * k3d
+        const k4d = u4 * (1.5 * rs * u4 - 1)
+        const nextU = u + (h / 6) * (k1u + 2 * k2u + 2 * k3u + k4u)
+        const nextDu = du + (h / 6) * (k1d + 2 * k2d + 2 * k3d + k4d)
+
+        // ds = sqrt(dr² + r² dφ²) with dr/dφ = -u'/u²
+        const r = 1 / u
+        const ringDistance = r - photonRingRadius
+        const ds = r * Math.sqrt(1 + (du * r) * (du * r)) * h
+        glow += Math.exp(-ringDistance * ringDistance * photonRingSharpness) * ds
+
+        if (phiPeriapsis < 0 && du > 0 && nextDu <= 0) phiPeriapsis = phi + h * (du / (du - nextDu))
+        phi += h
+
+        if (nextU >= captureU) {
+          phiEnd = phi
+          captured = 1
+          terminated = true
+          u = captureU
+          du = nextDu
+        } else if (nextDu < 0 && nextU <= escapeU) {
+          phiEnd = phi
+          captured = 0
+          terminated = true
+          u = nextU
+          du = nextDu
+        } else {
+          u = nextU
+          du = nextDu
+        }
+      }
+
+      const offset = rowOffset + column * 4
+      data[offset] = u
+      data[offset + 1] = du
+    }
+
+    const summary = rowOffset + LUT_PHI_SAMPLES * 4
+    data[summary] = phiEnd
+    data[summary + 1] = captured
+    data[summary + 2] = glow
+    data[summary + 3] = phiPeriapsis < 0 ? phiEnd : phiPeriapsis
+  }
+
+  return { data, width, height, maxImpact }
+}
@@ -0,0 +1,45 @@
+type GL = WebGL2RenderingContext | WebGLRenderingContext
+
+export interface GLResourceRecipe {
+  /** Label for debugging; recipes are otherwise anonymous closures. */
+  name: string
+  /** Creates the objects and sets any state they need, storing the new handles wherever the caller keeps them. */
+  create(gl: GL): void
+  /** Deletes the objects; not called after a context loss since they are already gone. */
+  dispose?(gl: GL): void
+}
+
+/**
+ * Records how every GL object the renderer owns is created: programs and their
+ * uniform locations, buffers and attribute bindings, textures, extensions.
+ * After a lost context is restored all of them are rebuilt in registration
+ * order, so later recipes may depend on state left by earlier ones (an
+ * attribute pointer needs its buffer bound), and the page never reloads.
+ */
+export class GLResourceManager {
+  private readonly recipes: GLResourceRecipe[] = []
+
+  constructor(private readonly gl: GL) {}
+
+  /** Runs the recipe now and keeps it for later rebuilds. */
+  add(recipe: GLResourceRecipe) {
+    recipe.create(this.gl)
+    this.recipes.push(recipe)
+  }
+
+  /** Recreates everything on a restored context. Returns how long it took in milliseconds. */
+  rebuild(): number {
+    const startedAt = performance.now()
+    for (const recipe of this.recipes) {
+      recipe.create(this.gl)
+    }
+    return performance.now() - startedAt
+  }
+
+  dispose() {
+    for (let i = this.recipes.length - 1; i >= 0; i--) {
+      this.recipes[i].dispose?.(this.gl)
+    }
+    this.recipes.length = 0
+  }
+}
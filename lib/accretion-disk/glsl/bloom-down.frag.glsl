@@ -0,0 +1,28 @@
+// Bloom downsample (WebGL2 only): halves u_source with the dual filter's
+// five taps. The first level also keeps only the bright part of the scene,
+// weighted like the single-pass bloom in post.glsl, and caps its luminance:
+// the disk core reaches ~100 in linear HDR and would flood the shadow.
+#include "prelude.glsl"
+
+uniform sampler2D u_source;
+// One texel of u_source
+uniform vec2 u_texelSize;
+uniform bool u_prefilter;
+
+const float BLOOM_CLAMP = 2.0;
+
+vec3 bloomTap(vec2 uv) {
+  vec3 color = TEXTURE(u_source, uv).rgb;
+  if (!u_prefilter) return color;
+  float lum = dot(color, vec3(0.299, 0.587, 0.114));
+  return color * smoothstep(0.6, 2.0, lum) * min(1.0, BLOOM_CLAMP / max(lum, 1e-6));
+}
+
+void main() {
+  vec3 sum = bloomTap(v_uv) * 4.0;
+  sum = sum + bloomTap(v_uv - u_texelSize);
+  sum = sum + bloomTap(v_uv + u_texelSize);
+  sum = sum + bloomTap(v_uv + vec2(u_texelSize.x, -u_texelSize.y));
+  sum = sum + bloomTap(v_uv - vec2(u_texelSize.x, -u_texelSize.y));
+  fragColor = vec4(sum / 8.0, 1.0);
+}
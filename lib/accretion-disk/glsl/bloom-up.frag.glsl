@@ -0,0 +1,21 @@
+// Bloom upsample (WebGL2 only): the dual filter's eight-tap tent over the
+// level below, blended additively into the level above, so the top level
+// ends up holding every level's blur.
+#include "prelude.glsl"
+
+uniform sampler2D u_source;
+// Half a texel of u_source
+uniform vec2 u_texelSize;
+
+void main() {
+  vec2 h = u_texelSize;
+  vec3 sum = TEXTURE(u_source, v_uv + vec2(-2.0 * h.x, 0.0)).rgb;
+  sum = sum + TEXTURE(u_source, v_uv + vec2(2.0 * h.x, 0.0)).rgb;
+  sum = sum + TEXTURE(u_source, v_uv + vec2(0.0, -2.0 * h.y)).rgb;
+  sum = sum + TEXTURE(u_source, v_uv + vec2(0.0, 2.0 * h.y)).rgb;
+  sum = sum + TEXTURE(u_source, v_uv + vec2(-h.x, h.y)).rgb * 2.0;
+  sum = sum + TEXTURE(u_source, v_uv + vec2(h.x, h.y)).rgb * 2.0;
+  sum = sum + TEXTURE(u_source, v_uv + vec2(h.x, -h.y)).rgb * 2.0;
+  sum = sum + TEXTURE(u_source, v_uv + vec2(-h.x, -h.y)).rgb * 2.0;
+  fragColor = vec4(sum / 12.0, 1.0);
+}
@@ -0,0 +1,31 @@
+// Orbiting camera: position and primary ray direction for a pixel.
+
+vec3 cameraPosition(float orbitAngle) {
+  float camDist = 11.0;
+  float cI = cos(INCLINATION);
+  float sI = sin(INCLINATION);
+  return vec3(sin(orbitAngle) * cI * camDist, sI * camDist, cos(orbitAngle) * cI * camDist);
+}
+
+vec3 cameraRay(vec2 uv, float orbitAngle) {
+  vec3 cam = cameraPosition(orbitAngle);
+  vec3 fwd = -cam / length(cam);
+  vec3 right = vec3(cos(orbitAngle), 0.0, -sin(orbitAngle));
+  vec3 up = cross(right, fwd);
+  up = up / max(length(up), 0.001);
+  return normalize(fwd + uv.x * right + uv.y * up);
+}
+
+#ifdef TEMPORAL
+// Sub-pixel offset of this frame's rays, in pixels
+uniform vec2 u_jitter;
+#endif
+
+vec2 screenUv() {
+#ifdef TEMPORAL
+  vec2 pixel = gl_FragCoord.xy + u_jitter;
+#else
+  vec2 pixel = gl_FragCoord.xy;
+#endif
+  return (pixel - 0.5 * u_resolution) / min(u_resolution.x, u_resolution.y);
+}
@@ -0,0 +1,55 @@
+// Diagnostic variant of the ray-marching pass. It traces exactly like the
+// real pass, tile budgets included, but paints either the steps each pixel
+// took as a heatmap or how its ray ended, shaded by steps taken.
+#include "prelude.glsl"
+#include "scene.glsl"
+#include "camera.glsl"
+#include "march.glsl"
+#include "tile-budget.glsl"
+
+// Values of u_debugView and the termination colors mirror DEBUG_VIEWS and
+// DEBUG_TERMINATIONS in shaders.ts.
+#define DEBUG_VIEW_STEPS 1
+#define SKY_COLOR vec3(0.15, 0.2, 0.4)
+#define ESCAPED_COLOR vec3(0.2, 0.75, 0.3)
+#define HORIZON_COLOR vec3(0.75, 0.2, 0.8)
+#define SATURATED_COLOR vec3(1.0, 0.75, 0.15)
+#define BUDGET_COLOR vec3(1.0, 0.1, 0.1)
+
+uniform int u_debugView;
+
+// Dark blue through cyan, green and yellow to red
+vec3 heatmap(float t) {
+  return clamp(vec3(1.5 - abs(4.0 * t - 3.0), 1.5 - abs(4.0 * t - 2.0), 1.5 - abs(4.0 * t - 1.0)), 0.0, 1.0);
+}
+
+void main() {
+  vec2 uv = screenUv();
+  float orbitAngle = u_time * 0.25;
+  vec3 cam = cameraPosition(orbitAngle);
+  vec3 rd = cameraRay(uv, orbitAngle);
+
+  vec2 budget = tileBudget();
+  vec2 stats;
+  vec4 traced = traceGeodesicMarch(cam, rd, int(budget.x), budget.y, stats);
+  float used = stats.x / float(MAX_STEPS);
+
+  vec3 color;
+  if (u_debugView == DEBUG_VIEW_STEPS) {
+    color = stats.x > 0.0 ? heatmap(used) : vec3(0.0);
+  } else {
+    if (stats.x == 0.0) {
+      color = SKY_COLOR;
+    } else if (stats.y < RS) {
+      color = HORIZON_COLOR;
+    } else if (traced.a > 0.95) {
+      color = SATURATED_COLOR;
+    } else if (stats.x >= budget.x) {
+      color = BUDGET_COLOR;
+    } else {
+      color = ESCAPED_COLOR;
+    }
+    color = color * (0.35 + 0.65 * used);
+  }
+  fragColor = vec4(color, 1.0);
+}
@@ -0,0 +1,17 @@
+// Deflection-table pass (WebGL2 only): every pixel reads its planar orbit from
+// the geodesic LUT instead of marching it.
+#include "prelude.glsl"
+#include "scene.glsl"
+#include "camera.glsl"
+#include "lut-trace.glsl"
+#include "post.glsl"
+
+void main() {
+  vec2 uv = screenUv();
+  float orbitAngle = u_time * 0.25;
+  vec3 cam = cameraPosition(orbitAngle);
+  vec3 rd = cameraRay(uv, orbitAngle);
+
+  vec4 traced = traceGeodesicLut(cam, rd);
+  fragColor = vec4(finishColor(traced.rgb, traced.a, cam, rd, uv), 1.0);
+}
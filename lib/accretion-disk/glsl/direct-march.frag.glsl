@@ -0,0 +1,20 @@
+// Ray-marching pass: every pixel integrates its geodesic through the scene
+// within the step budget of its screen tile.
+#include "prelude.glsl"
+#include "scene.glsl"
+#include "camera.glsl"
+#include "march.glsl"
+#include "tile-budget.glsl"
+#include "post.glsl"
+
+void main() {
+  vec2 uv = screenUv();
+  float orbitAngle = u_time * 0.25;
+  vec3 cam = cameraPosition(orbitAngle);
+  vec3 rd = cameraRay(uv, orbitAngle);
+
+  vec2 budget = tileBudget();
+  vec2 stats;
+  vec4 traced = traceGeodesicMarch(cam, rd, int(budget.x), budget.y, stats);
+  fragColor = vec4(finishColor(traced.rgb, traced.a, cam, rd, uv), 1.0);
+}
@@ -0,0 +1,17 @@
+// Disk atlas pass: renders the disk's intrinsic emission at u_time into a
+// polar texture, angle across and radius up, so that the passes shading the
+// disk read one texel per sample instead of evaluating the procedural
+// emission. Colors are RGBM encoded to fit HDR values in 8 bits.
+#include "prelude.glsl"
+#include "scene.glsl"
+#include "disk-emission.glsl"
+
+void main() {
+  float angle = (v_uv.x - 0.5) * 2.0 * PI;
+  float r = mix(DISK_ATLAS_INNER, DISK_ATLAS_OUTER, v_uv.y);
+  vec3 emission = diskIntrinsicEmission(vec3(r * cos(angle), 0.0, r * sin(angle)), r) / DISK_ATLAS_RANGE;
+  // The multiplier is rounded up to its 8-bit step so the channels never clip
+  float m = clamp(max(max(emission.r, emission.g), max(emission.b, 0.000001)), 0.0, 1.0);
+  m = ceil(m * 255.0) / 255.0;
+  fragColor = vec4(emission / m, m);
+}
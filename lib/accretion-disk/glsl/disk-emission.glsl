@@ -0,0 +1,81 @@
+// Procedural disk emission in the material's own frame: Keplerian flow,
+// turbulence, streaks and radial color. Only the disk-atlas pass evaluates it;
+// everything else reads the atlas.
+
+uniform sampler2D u_diskNoise;
+
+// Mirror DISK_NOISE_PERIOD and DISK_NOISE_RANGE in disk-noise.ts
+const float DISK_NOISE_PERIOD = 62.831853;
+const float DISK_NOISE_RANGE = 1.4;
+// Velocity of sin(1.2 x + 0.7 t) * cos(0.9 y - 0.5 t), the largest wave pair
+const vec2 DISK_NOISE_DRIFT = vec2(0.583333, -0.555556);
+
+// Smooth turbulence: one period of a sum of sine waves, baked into a tileable
+// texture by disk-noise.ts, scrolled at the speed of its largest swirl
+float smoothTurb(vec2 p, float t) {
+  vec2 uv = p / DISK_NOISE_PERIOD + fract(DISK_NOISE_DRIFT * t / DISK_NOISE_PERIOD);
+  return TEXTURE(u_diskNoise, uv).r * DISK_NOISE_RANGE - (DISK_NOISE_RANGE - 1.0) * 0.5;
+}
+
+vec3 diskColor(float r, float temp) {
+  float t = clamp((r - DISK_INNER) / (DISK_OUTER - DISK_INNER), 0.0, 1.0);
+
+  vec3 hot = vec3(1.4, 1.4, 1.3);
+  vec3 warm = vec3(1.3, 1.0, 0.5);
+  vec3 mid = vec3(1.2, 0.65, 0.2);
+  vec3 cool = vec3(0.9, 0.3, 0.1);
+
+  vec3 c;
+  if (t < 0.33) {
+    c = mix(hot, warm, t * 3.0);
+  } else if (t < 0.66) {
+    c = mix(warm, mid, (t - 0.33) * 3.0);
+  } else {
+    c = mix(mid, cool, (t - 0.66) * 3.0);
+  }
+
+  return c + vec3(0.3, 0.2, 0.1) * temp;
+}
+
+// Emission of disk material at pos (r = cylindrical radius) in its own frame,
+// before the Doppler and gravitational shifts
+vec3 diskIntrinsicEmission(vec3 pos, float r) {
+  // Time-based animation - everything flows
+  float t = u_time;
+
+  // Orbital motion - inner regions move MUCH faster (Keplerian)
+  // Increased base speed for more visible rotation
+  float orbitalSpeed = 15.0 / (r * sqrt(r));
+  float orbitalPhase = t * orbitalSpeed;
+
+  // Create flowing coordinates that animate smoothly
+  float flowX = pos.x * cos(orbitalPhase) - pos.z * sin(orbitalPhase);
+  float flowZ = pos.x * sin(orbitalPhase) + pos.z * cos(orbitalPhase);
+
+  // Motion streaks - elongated in direction of rotation
+  float angle = atan(pos.z, pos.x);
+  float streakPhase = angle * 6.0 - t * orbitalSpeed * 0.5;
+  float motionStreak = sin(streakPhase) * 0.5 + 0.5;
+  motionStreak = pow(motionStreak, 0.7) * 0.3;
+
+  // Multiple layers of smooth turbulence at different scales
+  float turb1 = smoothTurb(vec2(flowX * 0.8, flowZ * 0.8), t * 2.5);
+  float turb2 = smoothTurb(vec2(flowX * 1.5 + 5.0, flowZ * 1.2 + 3.0), t * 3.5);
+  float turb3 = smoothTurb(vec2(flowX * 0.4, flowZ * 0.5), t * 1.5);
+  float turbulence = turb1 * 0.5 + turb2 * 0.3 + turb3 * 0.2;
+
+  // Fast flowing brightness variations - more dynamic
+  float flow1 = sin(flowX * 2.0 + flowZ * 1.2 + t * 4.0) * 0.5 + 0.5;
+  float flow2 = cos(flowX * 1.3 - flowZ * 1.8 - t * 3.0) * 0.5 + 0.5;
+  float flow3 = sin(angle * 3.0 - t * orbitalSpeed * 0.3) * 0.5 + 0.5;
+  float flowBright = flow1 * 0.3 + flow2 * 0.25 + flow3 * 0.2 + motionStreak + 0.25;
+
+  // Radial brightness - hotter near center
+  float radialBright = pow(DISK_INNER / max(r, DISK_INNER), 1.5);
+
+  float brightness = radialBright * (0.4 + turbulence * 0.4 + flowBright * 0.5);
+
+  // Color based on radius and turbulence
+  float tempVar = turbulence * 0.5;
+  return diskColor(r, tempVar) * brightness * 4.0;
+}
@@ -0,0 +1,14 @@
+// Display transform shared by the single-pass programs and the post chain's
+// composite: ACES tonemap, gamma and vignette. uv is the centered screen
+// coordinate of screenUv().
+
+vec3 displayTransform(vec3 color, vec2 uv) {
+  color.x = (color.x * (2.51 * color.x + 0.03)) / (color.x * (2.43 * color.x + 0.59) + 0.14);
+  color.y = (color.y * (2.51 * color.y + 0.03)) / (color.y * (2.43 * color.y + 0.59) + 0.14);
+  color.z = (color.z * (2.51 * color.z + 0.03)) / (color.z * (2.43 * color.z + 0.59) + 0.14);
+
+  color = pow(clamp(color, 0.0, 1.0), vec3(0.4545));
+
+  float vigDist = length(uv);
+  return color * (0.92 + 0.08 * (1.0 - smoothstep(0.5, 1.4, vigDist)));
+}
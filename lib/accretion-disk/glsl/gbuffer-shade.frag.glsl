@@ -0,0 +1,53 @@
+// Shade pass of the G-buffer pipeline: re-evaluates the time-dependent
+// emission at the crossings the trace pass recorded for each pixel.
+#include "prelude.glsl"
+
+uniform sampler2D u_gCrossing0;
+uniform sampler2D u_gCrossing1;
+uniform sampler2D u_gEscape;
+uniform sampler2D u_gGlow;
+
+#include "scene.glsl"
+#include "camera.glsl"
+#include "post.glsl"
+
+vec3 shadeCrossing(vec4 g, float orbitAngle) {
+  if (g.w <= 0.0) return vec3(0.0);
+  // World azimuth trails the camera-frame azimuth by the orbit angle
+  float a = g.y - orbitAngle;
+  vec3 pos = vec3(g.x * cos(a), 0.0, g.x * sin(a));
+  return diskEmission(pos, g.x, g.z) * g.w;
+}
+
+void main() {
+  ivec2 texel = ivec2(gl_FragCoord.xy);
+  vec4 crossing0 = texelFetch(u_gCrossing0, texel, 0);
+  vec4 crossing1 = texelFetch(u_gCrossing1, texel, 0);
+  vec4 escape = texelFetch(u_gEscape, texel, 0);
+  vec4 glow = texelFetch(u_gGlow, texel, 0);
+
+  vec2 uv = screenUv();
+  float orbitAngle = u_time * 0.25;
+  vec3 cam = cameraPosition(orbitAngle);
+  vec3 rd = cameraRay(uv, orbitAngle);
+
+  vec3 color = shadeCrossing(crossing0, orbitAngle) + shadeCrossing(crossing1, orbitAngle);
+
+#ifdef JET_ENABLED
+  if (escape.z > 0.0) {
+    vec4 jetSample = jetEmission(vec2(1.0, sqrt(glow.w)), escape.w);
+    color = color + jetSample.rgb * jetSample.a * escape.z;
+  }
+#endif
+
+  // sum(g * pulse) with pulse = 0.7 + 0.3 * sin(4t + 4 * (a - orbitAngle)), expanded around the stored moments
+  float pulsePhase = u_time * 4.0 - orbitAngle * 4.0;
+  float prGlow = 0.7 * glow.x + 0.3 * (sin(pulsePhase) * glow.y + cos(pulsePhase) * glow.z);
+  color = color + vec3(1.0, 0.9, 0.7) * prGlow;
+
+  float starVal = hash(vec2(rd.x * 400.0 + rd.y * 200.0, rd.z * 300.0));
+  starVal = pow(starVal, 35.0) * 0.3;
+  color = color + vec3(starVal) * escape.x;
+
+  fragColor = vec4(finishColor(color, escape.y, cam, rd, uv), 1.0);
+}
@@ -0,0 +1,114 @@
+// Two-pass G-buffer rendering (WebGL2 only). The camera only orbits an
+// axisymmetric scene, so in the camera's rotating frame every pixel's geodesic
+// is fixed: this trace pass marches it once (at orbit angle 0) and records per
+// disk crossing the density-weighted radius, azimuth, Doppler alignment and
+// accumulated weight, plus star, jet and photon-ring terms. The shade pass
+// re-evaluates only the time-dependent emission for the current orbit angle.
+#define MULTIPLE_RENDER_TARGETS
+#include "prelude.glsl"
+
+layout(location = 0) out vec4 gCrossing0;
+layout(location = 1) out vec4 gCrossing1;
+layout(location = 2) out vec4 gEscape;
+layout(location = 3) out vec4 gGlow;
+
+#include "scene.glsl"
+#include "camera.glsl"
+
+vec4 packCrossing(vec4 acc, vec2 azimuth, float multiplier) {
+  if (acc.x <= 0.0) return vec4(0.0);
+  return vec4(acc.y / acc.x, atan(azimuth.y, azimuth.x), acc.z / acc.x, acc.x * multiplier);
+}
+
+void main() {
+  vec2 uv = screenUv();
+  vec3 cam = cameraPosition(0.0);
+  vec3 rd = cameraRay(uv, 0.0);
+  vec3 pos = cam;
+  vec3 vel = rd;
+
+  float alpha = 0.0;
+  float stepSize = ADAPTIVE_STEP;
+  // Capture darkens everything accumulated so far by the alpha at capture time
+  float multiplier = 1.0;
+  float starWeight = 0.0;
+
+  // Crossing accumulators: (weight, weight * r, weight * dopplerDot, unused) and weighted azimuth vector
+  vec4 crossing0 = vec4(0.0);
+  vec4 crossing1 = vec4(0.0);
+  vec2 azimuth0 = vec2(0.0);
+  vec2 azimuth1 = vec2(0.0);
+  int crossing = -1;
+  bool wasInDisk = false;
+
+  // Jet: (weight, weight * |y|, weight * core^2); photon ring: (glow, glow * cos 4a, glow * sin 4a)
+  vec3 jet = vec3(0.0);
+  vec3 glow = vec3(0.0);
+
+  for (int i = 0; i < MAX_STEPS; i++) {
+    float r = length(pos);
+
+    if (r < RS) {
+      multiplier = alpha;
+      alpha = 1.0;
+      break;
+    }
+
+    if (r > 30.0) {
+      starWeight = 1.0 - alpha;
+      break;
+    }
+
+    vec3 h = cross(pos, vel);
+    float rInv = 1.0 / r;
+    float accel = 1.5 * RS * dot(h, h) * rInv * rInv * rInv * rInv;
+    vel = vel - pos * rInv * accel * stepSize;
+    vel = vel / max(length(vel), 0.001);
+
+    stepSize = ADAPTIVE_STEP + 0.06 * smoothstep(RS * 2.0, RS * 8.0, r);
+
+    float density = diskDensity(pos);
+    bool inDisk = density > 0.01;
+    if (inDisk) {
+      if (!wasInDisk && crossing < 1) crossing++;
+      float contribution = density * stepSize * 8.0 * (1.0 - alpha);
+      float rc = sqrt(pos.x * pos.x + pos.z * pos.z);
+      float a = atan(pos.z, pos.x);
+      vec4 acc = contribution * vec4(1.0, rc, diskDopplerDot(pos, rc, vel), 0.0);
+      vec2 dir = contribution * vec2(cos(a), sin(a));
+      if (crossing == 0) {
+        crossing0 += acc;
+        azimuth0 += dir;
+      } else {
+        crossing1 += acc;
+        azimuth1 += dir;
+      }
+      alpha = alpha + contribution * 0.5;
+    }
+    wasInDisk = inDisk;
+
+#ifdef JET_ENABLED
+    vec2 profile = jetProfile(pos);
+    // 0.42 = time-averaged jet density factor (0.5 + 0.4 * 0.5) * 0.6
+    if (profile.x * 0.42 > 0.01) {
+      float w = profile.x * 0.008 * (1.0 - alpha);
+      jet += w * vec3(1.0, abs(pos.y), profile.y * profile.y);
+      alpha = alpha + w * 0.42 * 0.2;
+    }
+#endif
+
+    float prDist = abs(r - RS * 1.5);
+    float g = exp(-prDist * prDist * 100.0) * 0.25 * (1.0 - alpha);
+    float pulsePhase = atan(pos.z, pos.x) * 4.0;
+    glow += g * vec3(1.0, cos(pulsePhase), sin(pulsePhase));
+
+    pos = pos + vel * stepSize;
+
+    if (alpha > 0.95) break;
+  }
+
+  gCrossing0 = packCrossing(crossing0, azimuth0, multiplier);
+  gCrossing1 = packCrossing(crossing1, azimuth1, multiplier);
+  gEscape = vec4(starWeight, alpha, jet.x * multiplier, jet.x > 0.0 ? jet.y / jet.x : 0.0);
+  gGlow = vec4(glow * multiplier, jet.x > 0.0 ? jet.z / jet.x : 0.0);
+}
@@ -0,0 +1,101 @@
+// Resolves the orbit plane of each ray and reads the disk crossings, the fate
+// of the ray and its photon-ring glow from the deflection table instead of
+// stepping through it. The disk is treated as a gaussian slab at each crossing
+// and integrated in closed form; the jet is sampled along the unbent ray.
+
+uniform sampler2D u_geodesicLut;
+
+// Table layout; mirrors GEODESIC_LUT_PARAMS.cameraDistance in shaders.ts and
+// LUT_PHI_MAX, LUT_PHI_SAMPLES, LUT_WIDTH and LUT_IMPACT_SAMPLES in geodesic-lut.ts.
+const float LUT_MAX_IMPACT = 11.0;
+const float LUT_PHI_MAX = 9.424778;
+const float LUT_PHI_SAMPLES = 256.0;
+const float LUT_WIDTH = 257.0;
+const float LUT_HEIGHT = 256.0;
+const int LUT_MAX_CROSSINGS = 3;
+const int LUT_JET_SAMPLES = 8;
+
+vec4 geodesicAt(float row, float phi) {
+  float column = 0.5 + clamp(phi / LUT_PHI_MAX, 0.0, 1.0) * (LUT_PHI_SAMPLES - 1.0);
+  return texture(u_geodesicLut, vec2(column / LUT_WIDTH, row));
+}
+
+vec4 traceGeodesicLut(vec3 cam, vec3 rd) {
+  float camDist = length(cam);
+  vec3 e1 = cam / camDist;
+  vec3 normal = cross(e1, rd);
+  float sinPsi = length(normal);
+  // Tangential direction of travel inside the orbit plane
+  vec3 e2 = sinPsi > 1e-5 ? cross(normal / sinPsi, e1) : normalize(cross(e1, vec3(1.0, 0.0, 0.0)));
+  float impact = camDist * sinPsi;
+  float row = (0.5 + clamp(impact / LUT_MAX_IMPACT, 0.0, 1.0) * (LUT_HEIGHT - 1.0)) / LUT_HEIGHT;
+
+  vec4 summary = texture(u_geodesicLut, vec2((LUT_WIDTH - 0.5) / LUT_WIDTH, row));
+  float phiEnd = summary.x;
+  float captured = clamp(summary.y, 0.0, 1.0);
+
+  vec3 color = vec3(0.0);
+  float alpha = 0.0;
+
+#ifdef JET_ENABLED
+  // Jet: straight-line samples around the ray's closest approach to the spin axis,
+  // weighted by how many march steps would have landed there.
+  float axialLen2 = max(rd.x * rd.x + rd.z * rd.z, 1e-4);
+  float tAxis = -(cam.x * rd.x + cam.z * rd.z) / axialLen2;
+  float tLimit = captured > 0.5 ? dot(-cam, rd) : 1e4;
+  for (int j = 0; j < LUT_JET_SAMPLES; j++) {
+    float t = tAxis + (float(j) / float(LUT_JET_SAMPLES - 1) - 0.5) * 2.4;
+    if (t < 0.0 || t > tLimit) continue;
+    vec3 p = cam + rd * t;
+    vec4 jetSample = sampleJet(p);
+    if (jetSample.a > 0.01) {
+      float localStep = ADAPTIVE_STEP + 0.06 * smoothstep(RS * 2.0, RS * 8.0, length(p));
+      float a = jetSample.a * 0.008 * (2.4 / float(LUT_JET_SAMPLES)) / localStep * (1.0 - alpha);
+      color = color + jetSample.rgb * a;
+      alpha = alpha + a * 0.2;
+    }
+  }
+#endif
+
+  // The orbit crosses the equatorial plane every PI radians from its first node.
+  float phiNode = mod(atan(-e1.y, e2.y), PI);
+  for (int k = 0; k < LUT_MAX_CROSSINGS; k++) {
+    float phi = phiNode + float(k) * PI;
+    if (phi > phiEnd) break;
+
+    vec4 state = geodesicAt(row, phi);
+    float u = max(state.x, 1e-4);
+    float r = 1.0 / u;
+    vec3 radial = cos(phi) * e1 + sin(phi) * e2;
+    vec3 tangent = -sin(phi) * e1 + cos(phi) * e2;
+    vec3 pos = radial * r;
+    pos.y = 0.0;
+    vec3 dir = normalize(tangent - (state.y / u) * radial);
+
+    vec4 diskSample = sampleDiskVolume(pos, dir);
+    if (diskSample.a > 0.01) {
+      // Column density of the gaussian slab along the ray, then the closed form
+      // of the march's (1 - alpha) weighted accumulation over that column.
+      float diskThickness = 0.08 + 0.12 * smoothstep(DISK_INNER, DISK_OUTER, r);
+      float column = diskSample.a * diskThickness * 2.5066 * 8.0 / max(abs(dir.y), 0.02);
+      float transmittance = exp(-0.5 * column);
+      color = color + diskSample.rgb * (1.0 - alpha) * (1.0 - transmittance) * 2.0;
+      alpha = 1.0 - (1.0 - alpha) * transmittance;
+    }
+  }
+
+  float phiPeriapsis = summary.w;
+  vec3 periapsis = cos(phiPeriapsis) * e1 + sin(phiPeriapsis) * e2;
+  float prPulse = 0.7 + 0.3 * sin(u_time * 4.0 + atan(periapsis.z, periapsis.x) * 4.0);
+  float prGlow = summary.z / ADAPTIVE_STEP * 0.25 * prPulse * (1.0 - alpha);
+  color = color + vec3(1.0, 0.9, 0.7) * prGlow;
+
+  float starVal = hash(vec2(rd.x * 400.0 + rd.y * 200.0, rd.z * 300.0));
+  starVal = pow(starVal, 35.0) * 0.3;
+  color = color + vec3(starVal) * (1.0 - alpha) * (1.0 - captured);
+
+  color = mix(color, color * alpha, captured);
+  alpha = mix(alpha, 1.0, captured);
+
+  return vec4(color, alpha);
+}
@@ -0,0 +1,194 @@
+// Ray marching through the curved spacetime. The photon follows
+// x'' = -1.5 RS h^2 x / r^5 with h = |x cross x'|, integrated with one Euler
+// step per iteration or, under INTEGRATOR_VERLET, with velocity Verlet steps
+// sized by a local error estimate. Each step takes DISK_SAMPLES stratified
+// samples of the disk volume and one of the jet and photon ring, all offset
+// within the step per pixel so that coarse steps dither instead of banding.
+#include "sky.glsl"
+
+#ifdef INTEGRATOR_VERLET
+// Longest step through empty space
+const float MAX_GEODESIC_STEP = 2.0;
+// Beyond this distance from the photon sphere its glow is below 1e-8
+const float PHOTON_RING_REACH = 0.45;
+
+// Distance to the nearest region that emits light: the photon ring, the disk
+// slab and the jet cylinder. A step no longer than this cannot cross any of
+// them however much the path bends, since an arc is never shorter than its
+// chord.
+float emitterDistance(vec3 pos, float r) {
+  float cylR = length(pos.xz);
+  float absY = abs(pos.y);
+  float d = min(r - RS * 1.5 - PHOTON_RING_REACH,
+    length(max(vec2(cylR - DISK_BOUND, absY - DISK_HALF_THICKNESS), 0.0)));
+#ifdef JET_ENABLED
+  d = min(d, length(max(vec2(cylR - JET_BOUND, absY - JET_TOP), 0.0)));
+#endif
+  return max(d, 0.0);
+}
+#endif
+
+#ifdef TEMPORAL
+// Shifts this frame's emitter samples within each step; see marchSampleOffset
+uniform float u_jitterPhase;
+#endif
+
+// How far into each step, or into each of its disk strata, the emitters are
+// sampled: interleaved gradient noise over the screen, whose neighbouring
+// pixels sample evenly spread points. The temporal pass moves it on every
+// frame so that each pixel's history covers the whole step.
+float marchSampleOffset() {
+  float noise = fract(52.9829189 * fract(dot(gl_FragCoord.xy, vec2(0.06711056, 0.00583715))));
+#ifdef TEMPORAL
+  return fract(noise + u_jitterPhase);
+#else
+  return noise;
+#endif
+}
+
+#ifdef TEMPORAL
+// What the ray saw, for reprojecting the history: density-weighted sums over
+// the disk and photon ring samples of their azimuth direction (xy) and
+// cylindrical radius (z), and of their angular speed about the spin axis (w),
+// and the sum of the weights. Left for the caller by traceGeodesicMarch.
+vec4 marchAnchor;
+float marchAnchorWeight;
+
+void addMarchAnchor(vec3 samplePos, float angularSpeed, float weight) {
+  float cylR = length(samplePos.xz);
+  marchAnchor = marchAnchor + vec4(samplePos.xz / max(cylR, 0.001), cylR, angularSpeed) * weight;
+  marchAnchorWeight = marchAnchorWeight + weight;
+}
+#endif
+
+// Marches until capture, escape, saturation or the step budget runs out;
+// stats receives the steps taken and the closest approach to the hole. Steps
+// are STEP_SCALE times the tier's profile on top of the given stepScale.
+vec4 traceGeodesicMarch(vec3 cam, vec3 rd, int budget, float stepScale, out vec2 stats) {
+  stats = vec2(0.0, 1000.0);
+#ifdef TEMPORAL
+  marchAnchor = vec4(0.0);
+  marchAnchorWeight = 0.0;
+#endif
+  stepScale = stepScale * STEP_SCALE;
+  float sampleOffset = marchSampleOffset();
+  if (rayMissesScene(cam, rd)) {
+    return vec4(lensedStarfield(cam, rd), 0.0);
+  }
+
+  vec3 pos = cam;
+  vec3 vel = rd;
+  vec3 color = vec3(0.0);
+  float alpha = 0.0;
+  float stepSize = ADAPTIVE_STEP * stepScale;
+
+#ifdef INTEGRATOR_VERLET
+  // h is conserved under a central pull, so its strength is fixed for the ray
+  vec3 h = cross(cam, rd);
+  float pull = 1.5 * RS * dot(h, h);
+  float camR = length(cam);
+  vec3 acc = -pull / (camR * camR * camR * camR * camR) * cam;
+  float geodesicStep = MAX_GEODESIC_STEP;
+#endif
+
+  for (int i = 0; i < MAX_STEPS; i++) {
+    if (i >= budget) break;
+    float r = length(pos);
+    stats = vec2(float(i + 1), min(stats.y, r));
+
+    if (r < RS) {
+      color = mix(color, vec3(0.0), 1.0 - alpha);
+      alpha = 1.0;
+      break;
+    }
+
+    // Once outgoing beyond everything that emits, a ray can only escape;
+    // stopping here keeps step counts down to the steps that matter
+    bool leaving = r > DISK_BOUND && dot(pos, vel) > 0.0;
+#ifdef JET_ENABLED
+    leaving = leaving && ((abs(pos.y) > JET_TOP + BEND_SLACK && pos.y * vel.y > 0.0) ||
+      (length(pos.xz) > JET_BOUND + BEND_SLACK && dot(pos.xz, vel.xz) > 0.0));
+#endif
+
+    if (r > ESCAPE_RADIUS || leaving) {
+      float starVal = hash(vec2(rd.x * 400.0 + rd.y * 200.0, rd.z * 300.0));
+      starVal = pow(starVal, 35.0) * 0.3;
+      color = color + vec3(starVal) * (1.0 - alpha);
+      break;
+    }
+
+    // Sampling step for the emitters, longer away from the hole
+    float profileStep = ADAPTIVE_STEP + 0.06 * smoothstep(RS * 2.0, RS * 8.0, r);
+
+#ifdef INTEGRATOR_VERLET
+    // Empty space is crossed in one step where the error estimate allows
+    stepSize = min(max(profileStep * stepScale, emitterDistance(pos, r)), geodesicStep);
+    float dl = stepSize / length(vel);
+    vec3 newPos = pos + (vel + 0.5 * acc * dl) * dl;
+    float newR = length(newPos);
+    vec3 newAcc = -pull / (newR * newR * newR * newR * newR) * newPos;
+    vel = vel + 0.5 * (acc + newAcc) * dl;
+    // Position error of the step, from the change in pull across it; the
+    // next step is sized to bring it to GEODESIC_TOLERANCE
+    float error = length(newAcc - acc) * dl * dl / 6.0;
+    geodesicStep = stepSize * clamp(pow(GEODESIC_TOLERANCE / max(error, 1e-12), 1.0 / 3.0), 0.5, 2.0);
+    acc = newAcc;
+#else
+    vec3 h = cross(pos, vel);
+    float accel = 1.5 * RS * dot(h, h) / (r * r * r * r);
+    vel = vel - pos / r * accel * stepSize;
+    vel = vel / max(length(vel), 0.001);
+    stepSize = profileStep * stepScale;
+    vec3 newPos = pos + vel * stepSize;
+#endif
+    // Per-step emission counts for its share of the step profile, so the
+    // light gathered does not depend on how finely the ray is sampled
+    float weight = stepSize / profileStep;
+
+    // Volumetric disk sampling, one sample per stratum of the step. Only
+    // steps that reach into the disk's slab can pick up any of it.
+    if (pos.y * newPos.y <= 0.0 || min(abs(pos.y), abs(newPos.y)) < DISK_HALF_THICKNESS) {
+      for (int s = 0; s < DISK_SAMPLES; s++) {
+        vec3 diskPos = mix(pos, newPos, (float(s) + sampleOffset) / float(DISK_SAMPLES));
+        vec4 diskSample = sampleDiskVolume(diskPos, vel);
+        if (diskSample.a > 0.01) {
+          float contribution = diskSample.a * stepSize / float(DISK_SAMPLES) * 8.0 * (1.0 - alpha);
+          color = color + diskSample.rgb * contribution;
+          alpha = alpha + contribution * 0.5;
+#ifdef TEMPORAL
+          // The disk's pattern turns with the Keplerian flow of diskIntrinsicEmission
+          float cylR = max(length(diskPos.xz), 0.1);
+          addMarchAnchor(diskPos, -15.0 / (cylR * sqrt(cylR)), contribution);
+#endif
+        }
+      }
+    }
+
+    vec3 samplePos = mix(pos, newPos, sampleOffset);
+    float sampleR = length(samplePos);
+
+#ifdef JET_ENABLED
+    vec4 jetSample = sampleJet(samplePos);
+    if (jetSample.a > 0.01) {
+      float a = jetSample.a * 0.008 * weight * (1.0 - alpha);
+      color = color + jetSample.rgb * a;
+      alpha = alpha + a * 0.2;
+    }
+#endif
+
+    float prDist = abs(sampleR - RS * 1.5);
+    float prPulse = 0.7 + 0.3 * sin(u_time * 4.0 + atan(samplePos.z, samplePos.x) * 4.0);
+    float prGlow = exp(-prDist * prDist * 100.0) * 0.25 * prPulse * weight * (1.0 - alpha);
+    color = color + vec3(1.0, 0.9, 0.7) * prGlow;
+#ifdef TEMPORAL
+    // Its pulses travel at -1 rad/s
+    addMarchAnchor(samplePos, -1.0, prGlow);
+#endif
+
+    pos = newPos;
+
+    if (alpha > 0.95) break;
+  }
+
+  return vec4(color, alpha);
+}
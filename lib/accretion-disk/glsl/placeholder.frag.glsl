@@ -0,0 +1,16 @@
+// Cheap stand-in drawn while the real programs compile: a dim, flattened ring
+// around a dark core, roughly where the disk and shadow will appear.
+#include "prelude.glsl"
+
+uniform float u_time;
+uniform vec2 u_resolution;
+
+void main() {
+  vec2 uv = (gl_FragCoord.xy - 0.5 * u_resolution) / min(u_resolution.x, u_resolution.y);
+  float ringDist = length(vec2(uv.x, uv.y * 5.0)) - 0.35;
+  float ring = exp(-ringDist * ringDist * 30.0);
+  float shadow = smoothstep(0.07, 0.11, length(uv));
+  float pulse = 0.85 + 0.15 * sin(u_time * 2.0);
+  vec3 color = vec3(1.0, 0.55, 0.2) * ring * 0.5 * shadow * pulse;
+  fragColor = vec4(pow(color, vec3(0.4545)), 1.0);
+}
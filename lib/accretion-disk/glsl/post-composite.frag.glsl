@@ -0,0 +1,25 @@
+// Composite pass of the post chain (WebGL2 only): resamples the scene target
+// to the display, adds the bloom pyramid and applies the display transform.
+#include "prelude.glsl"
+#include "display.glsl"
+
+uniform vec2 u_resolution;
+uniform sampler2D u_scene;
+uniform sampler2D u_bloom;
+// Bloom gain over the number of pyramid levels summed into u_bloom
+uniform float u_bloomScale;
+// Debug views paint final colors, which are shown untouched
+uniform bool u_rawColor;
+
+void main() {
+  vec3 color = TEXTURE(u_scene, v_uv).rgb;
+  if (u_rawColor) {
+    fragColor = vec4(color, 1.0);
+    return;
+  }
+#ifdef BLOOM_ENABLED
+  color = color + TEXTURE(u_bloom, v_uv).rgb * u_bloomScale;
+#endif
+  vec2 uv = (gl_FragCoord.xy - 0.5 * u_resolution) / min(u_resolution.x, u_resolution.y);
+  fragColor = vec4(displayTransform(color, uv), 1.0);
+}
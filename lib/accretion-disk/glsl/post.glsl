@@ -0,0 +1,30 @@
+// Einstein ring, then either linear HDR for the post chain or, when drawing
+// straight to the screen, the per-pixel bloom and the display transform.
+#include "display.glsl"
+
+// Set when the pass renders into the post chain's scene target.
+uniform bool u_hdrOutput;
+
+vec3 postProcess(vec3 color, vec2 uv) {
+#ifdef BLOOM_ENABLED
+  // Single-pass stand-in for the post chain's bloom: brightens what it would spread
+  float lum = dot(color, vec3(0.299, 0.587, 0.114));
+  float bloomMult = smoothstep(0.6, 2.0, lum) * 0.2;
+  color = color + color * bloomMult;
+#endif
+
+  return displayTransform(color, uv);
+}
+
+vec3 finishColor(vec3 color, float alpha, vec3 cam, vec3 rd, vec2 uv) {
+  float rayClosest = -dot(cam, rd);
+  if (rayClosest > 0.0) {
+    float closestR = length(cam + rd * rayClosest);
+    float erDist = closestR - RS * 2.6;
+    float einsteinRing = exp(-erDist * erDist * 70.0);
+    color = color + vec3(1.0, 0.8, 0.5) * einsteinRing * 0.4 * (1.0 - alpha * 0.7);
+  }
+
+  if (u_hdrOutput) return color;
+  return postProcess(color, uv);
+}
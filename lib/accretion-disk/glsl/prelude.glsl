@@ -0,0 +1,16 @@
+// Shared by every fragment shader: precision, the interpolated quad UV and the
+// names that differ between GLSL ES 1.00 and 3.00.
+precision highp float;
+precision highp int;
+
+#ifdef WEBGL2
+in vec2 v_uv;
+#define TEXTURE texture
+#ifndef MULTIPLE_RENDER_TARGETS
+out vec4 fragColor;
+#endif
+#else
+varying vec2 v_uv;
+#define TEXTURE texture2D
+#define fragColor gl_FragColor
+#endif
@@ -0,0 +1,176 @@
+// Uniforms, constants and the emissive scene: disk, jet and helpers. MAX_STEPS
+// and ADAPTIVE_STEP are defined per quality tier by the build, as are the
+// JET_ENABLED and BLOOM_ENABLED feature flags.
+
+uniform float u_time;
+uniform vec2 u_resolution;
+uniform sampler2D u_diskAtlas;
+
+const float PI = 3.14159265359;
+const float RS = 0.6;
+const float DISK_INNER = 1.2;
+const float DISK_OUTER = 6.0;
+const float INCLINATION = 0.1045;
+// Radii the disk atlas spans and the RGBM range it stores; scripts/reference-render.mjs mirrors them
+const float DISK_ATLAS_INNER = DISK_INNER * 0.9;
+const float DISK_ATLAS_OUTER = DISK_OUTER * 1.1;
+const float DISK_ATLAS_RANGE = 12.0;
+#ifdef WEBGL2
+// Doppler and gravitational terms of diskEmission, tabulated over
+// (dopplerDot, r) by disk-shift-lut.ts; mirror its texel counts
+uniform sampler2D u_diskShift;
+const vec2 DISK_SHIFT_LUT_SIZE = vec2(129.0, 64.0);
+#endif
+
+float hash(vec2 p) {
+  vec3 p3 = fract(vec3(p.xyx) * 0.1031);
+  p3 = p3 + dot(p3, p3.yzx + 33.33);
+  return fract((p3.x + p3.y) * p3.z);
+}
+
+// Alignment of a photon's direction with the Keplerian orbital velocity at pos
+float diskDopplerDot(vec3 pos, float r, vec3 vel) {
+  float orbitDirX = -pos.z / max(r, 0.001);
+  float orbitDirZ = pos.x / max(r, 0.001);
+  float velLen = sqrt(vel.x * vel.x + vel.y * vel.y + vel.z * vel.z);
+  float dopplerDot = (orbitDirX * vel.x + orbitDirZ * vel.z) / max(velLen, 0.001);
+  return dopplerDot;
+}
+
+// Intrinsic emission of the disk at pos, from the polar atlas the disk-atlas
+// pass renders every frame
+vec3 diskAtlasEmission(vec3 pos, float r) {
+  vec2 uv = vec2(
+    atan(pos.z, pos.x) / (2.0 * PI) + 0.5,
+    (r - DISK_ATLAS_INNER) / (DISK_ATLAS_OUTER - DISK_ATLAS_INNER)
+  );
+  vec4 texel = TEXTURE(u_diskAtlas, uv);
+  return texel.rgb * texel.a * DISK_ATLAS_RANGE;
+}
+
+// Emissive color of disk material at pos (r = cylindrical radius), seen by a
+// photon whose direction projects onto the orbital motion as dopplerDot
+vec3 diskEmission(vec3 pos, float r, float dopplerDot) {
+  vec3 col = diskAtlasEmission(pos, r);
+
+#ifdef WEBGL2
+  // Per-channel scale in rgb, blue added on the approaching side in a;
+  // texel centers sit on the ends of both ranges
+  vec2 lutCoord = vec2(dopplerDot * 0.5 + 0.5, (r - DISK_ATLAS_INNER) / (DISK_ATLAS_OUTER - DISK_ATLAS_INNER));
+  vec4 shift = TEXTURE(u_diskShift, (lutCoord * (DISK_SHIFT_LUT_SIZE - 1.0) + 0.5) / DISK_SHIFT_LUT_SIZE);
+  return col * shift.rgb + vec3(0.0, 0.0, shift.a);
+#else
+  // Doppler effect for approaching/receding sides
+  float vOrb = 0.5 / sqrt(max(r, 0.1));
+
+  // Doppler factor: positive = approaching (blueshift), negative = receding (redshift)
+  float dopplerFactor = dopplerDot * vOrb * 2.5;
+
+  // Brightness boost for approaching material (relativistic beaming)
+  float dopplerBright = clamp(1.0 + dopplerFactor, 0.25, 3.0);
+  col = col * dopplerBright * dopplerBright;
+
+  // Apply relativistic color shift
+  // Blueshift: approaching material appears hotter (shift toward blue/white)
+  // Redshift: receding material appears cooler (shift toward red/orange)
+  float colorShift = clamp(dopplerFactor * 2.0, -1.0, 1.0);
+
+  // Blueshift - strong shift toward blue/cyan/white for approaching material
+  if (colorShift > 0.0) {
+    float blueBoost = colorShift * colorShift; // Quadratic for stronger effect
+    col.b = col.b + col.b * blueBoost * 2.0 + colorShift * 0.4;
+    col.g = col.g + col.g * colorShift * 1.2;
+    col.r = col.r * (1.0 - colorShift * 0.15); // Slightly reduce red
+    col = col * (1.0 + colorShift * 0.5); // Brighter overall
+  }
+  // Redshift - boost red, reduce blue significantly
+  else {
+    float redShift = -colorShift;
+    col.r = col.r + col.r * redShift * 0.6;
+    col.g = col.g * (1.0 - redShift * 0.35);
+    col.b = col.b * (1.0 - redShift * 0.7);
+  }
+
+  // Gravitational redshift - light loses energy escaping the gravity well
+  // Stronger effect closer to the black hole (Schwarzschild factor)
+  float gravRedshift = sqrt(1.0 - RS / max(r, RS * 1.01));
+  col = col * gravRedshift;
+  // Shift color toward red for inner disk regions
+  float gravColorShift = (1.0 - gravRedshift) * 2.0;
+  col.b = col.b * (1.0 - gravColorShift * 0.4);
+  col.g = col.g * (1.0 - gravColorShift * 0.15);
+
+  return col;
+#endif
+}
+
+// Disk density at any 3D point; zero outside the disk volume
+float diskDensity(vec3 pos) {
+  float r = sqrt(pos.x * pos.x + pos.z * pos.z);
+  float absY = abs(pos.y);
+
+  // Disk thickness varies with radius - thicker at outer edge
+  float diskThickness = 0.08 + 0.12 * smoothstep(DISK_INNER, DISK_OUTER, r);
+
+  // Smooth vertical density falloff (no hard edges)
+  float verticalDensity = exp(-absY * absY / (diskThickness * diskThickness * 2.0));
+
+  if (r < DISK_INNER * 0.9 || r > DISK_OUTER * 1.1 || verticalDensity < 0.01) {
+    return 0.0;
+  }
+
+  // Radial density falloff
+  float radialDensity = smoothstep(DISK_INNER * 0.9, DISK_INNER * 1.3, r) *
+                        smoothstep(DISK_OUTER * 1.1, DISK_OUTER * 0.6, r);
+
+  return verticalDensity * radialDensity;
+}
+
+// Volumetric disk sampling - samples density at any 3D point
+vec4 sampleDiskVolume(vec3 pos, vec3 vel) {
+  float density = diskDensity(pos);
+  if (density <= 0.0) return vec4(0.0);
+  float r = sqrt(pos.x * pos.x + pos.z * pos.z);
+  return vec4(diskEmission(pos, r, diskDopplerDot(pos, r, vel)), density);
+}
+
+#ifdef JET_ENABLED
+// Time-independent jet profile: x = density envelope, y = core brightness
+vec2 jetProfile(vec3 pos) {
+  float absY = abs(pos.y);
+  if (absY < 0.6 || absY > 12.0) return vec2(0.0);
+
+  float r = sqrt(pos.x * pos.x + pos.z * pos.z);
+  float jetRadius = 0.15 + 0.08 * sqrt(absY);
+  float radialFall = exp(-r * r / (jetRadius * jetRadius * 3.0));
+
+  if (radialFall < 0.02) return vec2(0.0);
+
+  float core = exp(-r * r / (jetRadius * jetRadius * 0.3));
+  float baseFade = smoothstep(0.6, 2.5, absY);
+  float tipFade = smoothstep(12.0, 6.0, absY);
+
+  return vec2(radialFall * baseFade * tipFade, core);
+}
+
+// Animated jet color and density for a profile sampled at height absY
+vec4 jetEmission(vec2 profile, float absY) {
+  float wave1 = sin(absY * 0.8 - u_time * 4.0) * 0.5 + 0.5;
+  float wave2 = sin(absY * 0.4 - u_time * 2.8) * 0.5 + 0.5;
+  float smoothWave = wave1 * 0.7 + wave2 * 0.3;
+
+  float density = profile.x * (0.5 + 0.4 * smoothWave);
+
+  vec3 baseColor = vec3(0.35, 0.25, 0.6);
+  vec3 coreColor = vec3(0.7, 0.85, 1.0);
+  vec3 color = mix(baseColor, coreColor, profile.y * profile.y + smoothWave * 0.2);
+
+  return vec4(color, density * 0.6);
+}
+
+vec4 sampleJet(vec3 pos) {
+  vec2 profile = jetProfile(pos);
+  if (profile.x <= 0.0) return vec4(0.0);
+  return jetEmission(profile, abs(pos.y));
+}
+#endif
@@ -0,0 +1,84 @@
+// Analytic sky classification: rays that provably miss every emitter skip the march.
+
+// Inside CORE_BOUND bending is too strong for the weak-field estimate below
+const float CORE_BOUND = RS * 6.0;
+// Disk extent where diskDensity can be non-zero (1.1 * DISK_OUTER, 0.61 thick)
+const float DISK_BOUND = DISK_OUTER * 1.1 + 0.1;
+const float DISK_HALF_THICKNESS = 0.61;
+// Jet envelope radius at its tip, and its height
+const float JET_BOUND = 1.5;
+const float JET_TOP = 12.0;
+// Covers the first-order error of the estimate and curvature between samples
+const float BEND_SLACK = 0.25;
+const float ESCAPE_RADIUS = 30.0;
+const int DISK_CHORD_SAMPLES = 6;
+
+// Integral of the transverse pull b^3 / (b^2 + s^2)^(5/2) along the straight
+// ray, s measured from periapsis
+float deflectionIntegral(float s, float b) {
+  float q = b * b + s * s;
+  return s * (2.0 * s * s + 3.0 * b * b) / (3.0 * b * q * sqrt(q));
+}
+
+// Antiderivative of deflectionIntegral
+float displacementIntegral(float s, float b) {
+  float q = sqrt(b * b + s * s);
+  return (2.0 * q - b * b / q) / (3.0 * b);
+}
+
+// Weak-field bending of a ray leaving the camera at s0: angle turned and
+// distance dropped toward the hole by the time it reaches s
+vec2 rayBending(float s0, float s, float b) {
+  float f0 = deflectionIntegral(s0, b);
+  float angle = 1.5 * RS * (deflectionIntegral(s, b) - f0);
+  float drop = 1.5 * RS * (displacementIntegral(s, b) - displacementIntegral(s0, b) - f0 * (s - s0));
+  return vec2(angle, drop);
+}
+
+bool rayMissesScene(vec3 cam, vec3 rd) {
+  float tClosest = -dot(cam, rd);
+  // The camera sits outside every bound, so rays heading away never come back
+  if (tClosest < 0.0) return true;
+
+  vec3 closest = cam + rd * tClosest;
+  float b = length(closest);
+  if (b < CORE_BOUND) return false;
+  vec3 towardHole = -closest / b;
+  float s0 = -tClosest;
+
+  // Height of the bent ray at a few points across the disk's bounding sphere;
+  // a sign change or a near-zero height means it passes through the disk
+  if (b < DISK_BOUND) {
+    float halfChord = sqrt(DISK_BOUND * DISK_BOUND - b * b);
+    float prevY = 0.0;
+    for (int i = 0; i < DISK_CHORD_SAMPLES; i++) {
+      float s = halfChord * (2.0 * float(i) / float(DISK_CHORD_SAMPLES - 1) - 1.0);
+      float y = cam.y + rd.y * (s - s0) + towardHole.y * rayBending(s0, s, b).y;
+      if (abs(y) < DISK_HALF_THICKNESS + BEND_SLACK || (i > 0 && y * prevY < 0.0)) return false;
+      prevY = y;
+    }
+  }
+#ifdef JET_ENABLED
+  float lenXZ = dot(rd.xz, rd.xz);
+  if (lenXZ > 0.000001) {
+    float tAxis = max(-dot(cam.xz, rd.xz) / lenXZ, 0.0);
+    vec3 nearAxis = cam + rd * tAxis + towardHole * rayBending(s0, tAxis + s0, b).y;
+    if (abs(nearAxis.y) < JET_TOP + BEND_SLACK && length(nearAxis.xz) < JET_BOUND + BEND_SLACK) return false;
+  }
+#endif
+  return true;
+}
+
+// Starfield seen along a ray bent by the deflection accumulated between the
+// camera and the escape radius
+vec3 lensedStarfield(vec3 cam, vec3 rd) {
+  float tClosest = -dot(cam, rd);
+  vec3 closest = cam + rd * tClosest;
+  float b = max(length(closest), 0.001);
+  float sEscape = sqrt(max(ESCAPE_RADIUS * ESCAPE_RADIUS - b * b, 0.0));
+  float angle = rayBending(-tClosest, sEscape, b).x;
+  vec3 dir = rd * cos(angle) - closest / b * sin(angle);
+
+  float starVal = hash(vec2(dir.x * 400.0 + dir.y * 200.0, dir.z * 300.0));
+  return vec3(pow(starVal, 35.0) * 0.3);
+}
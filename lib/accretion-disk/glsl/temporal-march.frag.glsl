@@ -0,0 +1,77 @@
+// Ray-marching pass with temporal accumulation (WebGL2 only): rays are shifted
+// by a sub-pixel jitter and emitters sampled at a jittered point within each
+// step, so that temporal-resolve can average successive frames into a history
+// and each frame can step twice as coarsely as the tier's profile. The second
+// target receives how far each pixel's content moved since the previous frame.
+//
+// The camera only orbits an axisymmetric scene, so in its rotating frame every
+// pixel's geodesic is fixed and content moves only by turning about the spin
+// axis: the disk pattern with its Keplerian flow, the photon ring's pulses and
+// the stars against the camera's own orbit. What a pixel saw is summarized as
+// an azimuth and a radius (the escape direction's azimuth and height for
+// stars); the screen derivatives of the two give the pixel offset at which the
+// azimuth, turned back by one frame, was seen before.
+#define TEMPORAL
+#define MULTIPLE_RENDER_TARGETS
+#include "prelude.glsl"
+
+layout(location = 0) out vec4 fragColor;
+layout(location = 1) out vec4 fragMotion;
+
+#include "scene.glsl"
+#include "camera.glsl"
+#include "march.glsl"
+#include "tile-budget.glsl"
+#include "post.glsl"
+
+// Emission steps relative to the tier's profile, whatever STEP_SCALE the
+// single-frame pass takes
+const float TEMPORAL_STEP_SCALE = 2.0 / STEP_SCALE;
+// Angular speed of the camera's orbit, u_time * 0.25
+const float ORBIT_SPEED = 0.25;
+// Longest motion trusted, in pixels; past it the estimate is an edge artifact
+const float MAX_MOTION = 64.0;
+
+// Scene time since the previous frame
+uniform float u_timeStep;
+
+// Differences across the azimuth's branch cut, brought back into [-pi, pi]
+float wrapAngle(float angle) {
+  return angle - 6.2831853 * floor(angle / 6.2831853 + 0.5);
+}
+
+// Pixel offset to where the current content of this pixel was a frame ago,
+// from its azimuth and radius and the angular speed they turn at in the
+// world. Runs in uniform control flow for the derivatives.
+vec2 reprojectionOffset(float azimuth, float radius, float angularSpeed) {
+  mat2 jacobian = mat2(wrapAngle(dFdx(azimuth)), dFdx(radius), wrapAngle(dFdy(azimuth)), dFdy(radius));
+  float det = determinant(jacobian);
+  if (abs(det) < 1e-8) return vec2(0.0);
+  // In the camera's frame the azimuth turns at the world speed plus the orbit's
+  vec2 offset = inverse(jacobian) * vec2(-(angularSpeed + ORBIT_SPEED) * u_timeStep, 0.0);
+  return dot(offset, offset) < MAX_MOTION * MAX_MOTION ? offset : vec2(0.0);
+}
+
+void main() {
+  vec2 uv = screenUv();
+  float orbitAngle = u_time * 0.25;
+  vec3 cam = cameraPosition(orbitAngle);
+  vec3 rd = cameraRay(uv, orbitAngle);
+
+  vec2 budget = tileBudget();
+  vec2 stats;
+  vec4 traced = traceGeodesicMarch(cam, rd, int(budget.x), budget.y * TEMPORAL_STEP_SCALE, stats);
+  fragColor = vec4(finishColor(traced.rgb, traced.a, cam, rd, uv), 1.0);
+
+  // Stars are hashed on the ray's world direction, so they stay put as the camera orbits
+  float azimuth = atan(rd.z, rd.x);
+  float radius = rd.y;
+  float angularSpeed = 0.0;
+  if (marchAnchorWeight > 0.001) {
+    vec4 anchor = marchAnchor / marchAnchorWeight;
+    azimuth = atan(anchor.y, anchor.x);
+    radius = anchor.z;
+    angularSpeed = anchor.w;
+  }
+  fragMotion = vec4(reprojectionOffset(azimuth, radius, angularSpeed), 0.0, 1.0);
+}
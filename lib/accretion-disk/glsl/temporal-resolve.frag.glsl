@@ -0,0 +1,47 @@
+// Temporal resolve (WebGL2 only): blends the jittered march of this frame into
+// the history of the earlier ones. The history is fetched where the pixel's
+// content was a frame ago, per the motion temporal-march wrote, and clamped to
+// the range of the current frame's 3x3 neighborhood, so that content the
+// reprojection got wrong, or that was just revealed, replaces the history
+// instead of trailing behind as a ghost. Colors are blended compressed by
+// 1 / (1 + max channel), so that a lone bright sample cannot dominate the
+// average. The output is the next frame's history and the post chain's input.
+#include "prelude.glsl"
+
+uniform sampler2D u_source;
+uniform sampler2D u_motion;
+uniform sampler2D u_history;
+// Share of the history kept; 0 drops it, e.g. after a resize
+uniform float u_historyWeight;
+
+vec3 compress(vec3 c) {
+  return c / (1.0 + max(c.r, max(c.g, c.b)));
+}
+
+vec3 uncompress(vec3 c) {
+  return c / max(1.0 - max(c.r, max(c.g, c.b)), 1e-4);
+}
+
+void main() {
+  ivec2 p = ivec2(gl_FragCoord.xy);
+  ivec2 size = textureSize(u_source, 0);
+  ivec2 last = size - 1;
+
+  vec3 current = compress(texelFetch(u_source, p, 0).rgb);
+  vec3 low = current;
+  vec3 high = current;
+  for (int y = -1; y <= 1; y++) {
+    for (int x = -1; x <= 1; x++) {
+      vec3 c = compress(texelFetch(u_source, clamp(p + ivec2(x, y), ivec2(0), last), 0).rgb);
+      low = min(low, c);
+      high = max(high, c);
+    }
+  }
+
+  vec2 previous = gl_FragCoord.xy + texelFetch(u_motion, p, 0).xy;
+  float weight = u_historyWeight;
+  if (any(lessThan(previous, vec2(0.0))) || any(greaterThan(previous, vec2(size)))) weight = 0.0;
+  vec3 history = clamp(compress(TEXTURE(u_history, previous / vec2(size)).rgb), low, high);
+
+  fragColor = vec4(uncompress(mix(current, history, weight)), 1.0);
+}
@@ -0,0 +1,26 @@
+// Per-tile step budget and step scale for the ray-marching pass.
+#include "tiles.glsl"
+
+uniform sampler2D u_tileStats;
+uniform vec2 u_tileCount;
+
+// Budget and step scale from the coarse pre-pass. The worst of the 3x3
+// surrounding tiles is used so a ray is never cut short where the samples
+// of its own tile happened to miss the disk.
+vec2 tileBudget() {
+  vec2 tile = floor(gl_FragCoord.xy / TILE_SIZE);
+  float steps = 0.0;
+  float closest = 1.0;
+  for (int y = -1; y <= 1; y++) {
+    for (int x = -1; x <= 1; x++) {
+      vec2 neighbor = clamp(tile + vec2(float(x), float(y)), vec2(0.0), u_tileCount - 1.0);
+      vec4 stats = TEXTURE(u_tileStats, (neighbor + 0.5) / u_tileCount);
+      steps = max(steps, stats.r);
+      closest = min(closest, stats.b);
+    }
+  }
+  float budget = min(float(MAX_STEPS), steps * float(MAX_STEPS) * 1.25 + 24.0);
+  // Tiles that stay well clear of the photon ring can take longer steps
+  float stepScale = 1.0 + 0.25 * smoothstep(3.0, 8.0, closest * TILE_RADIUS_RANGE);
+  return vec2(budget, stepScale);
+}
@@ -0,0 +1,40 @@
+// Coarse pre-pass for the ray-marching pass: one fragment per TILE_SIZE tile
+// marches a 3x3 grid of rays spanning the tile (edges shared with its
+// neighbours) at full budget and records the most steps used, the highest
+// alpha, the closest approach to the hole and the share of rays that marched.
+// Ray geometry is fixed in the orbiting camera's frame, so it only needs to
+// run when the canvas is resized.
+#include "prelude.glsl"
+#include "scene.glsl"
+#include "camera.glsl"
+#include "march.glsl"
+#include "tiles.glsl"
+
+void main() {
+  vec2 tileOrigin = floor(gl_FragCoord.xy) * TILE_SIZE;
+  vec3 cam = cameraPosition(0.0);
+  float steps = 0.0;
+  float alpha = 0.0;
+  float closest = TILE_RADIUS_RANGE;
+  float marched = 0.0;
+
+  for (int y = 0; y < 3; y++) {
+    for (int x = 0; x < 3; x++) {
+      vec2 pixel = tileOrigin + vec2(float(x), float(y)) * (TILE_SIZE * 0.5);
+      vec2 uv = (pixel - 0.5 * u_resolution) / min(u_resolution.x, u_resolution.y);
+      vec2 stats;
+      vec4 traced = traceGeodesicMarch(cam, cameraRay(uv, 0.0), MAX_STEPS, 1.0, stats);
+      steps = max(steps, stats.x);
+      alpha = max(alpha, traced.a);
+      closest = min(closest, stats.y / RS);
+      marched = marched + (stats.x > 0.0 ? 1.0 : 0.0);
+    }
+  }
+
+  fragColor = vec4(
+    steps / float(MAX_STEPS),
+    clamp(alpha, 0.0, 1.0),
+    clamp(closest / TILE_RADIUS_RANGE, 0.0, 1.0),
+    marched / 9.0
+  );
+}
@@ -0,0 +1,4 @@
+// Screen tile edge in pixels; mirrors TILE_SIZE in shaders.ts.
+#define TILE_SIZE 16.0
+// Closest approach (in units of RS) stored in the tile texture is normalized by this.
+#define TILE_RADIUS_RANGE 16.0
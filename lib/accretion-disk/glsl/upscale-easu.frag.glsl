@@ -0,0 +1,121 @@
+// Edge-adaptive upscale (WebGL2 only), a port of the EASU pass of AMD's
+// FidelityFX Super Resolution 1. Reads the composited, tonemapped image at
+// march resolution and writes it at display resolution: each output pixel
+// fits a direction and a stretch to the luma of the 12 nearest source texels
+// and filters them with a Lanczos-like lobe laid along the edge, then clamps
+// to the four nearest texels so edges do not ring.
+#include "prelude.glsl"
+
+uniform sampler2D u_source;
+// Size of u_source in texels
+uniform vec2 u_sourceSize;
+uniform vec2 u_resolution;
+
+vec3 easuFetch(ivec2 texel) {
+  return texelFetch(u_source, clamp(texel, ivec2(0), ivec2(u_sourceSize) - 1), 0).rgb;
+}
+
+// Cheap luma with the weights FSR uses, in units of green.
+float easuLuma(vec3 color) {
+  return color.b * 0.5 + (color.r * 0.5 + color.g);
+}
+
+// Adds one bilinear quadrant's gradient direction and edge length, weighted by
+// how close the output pixel is to that quadrant's center texel c. a, e lie
+// above and below c, b, d to its left and right.
+void easuSet(inout vec2 dir, inout float len, float w, float la, float lb, float lc, float ld, float le) {
+  float dirX = ld - lb;
+  float lenX = max(abs(ld - lc), abs(lc - lb));
+  lenX = clamp(abs(dirX) / max(lenX, 1e-5), 0.0, 1.0);
+  float dirY = le - la;
+  float lenY = max(abs(le - lc), abs(lc - la));
+  lenY = clamp(abs(dirY) / max(lenY, 1e-5), 0.0, 1.0);
+  dir = dir + vec2(dirX, dirY) * w;
+  len = len + (lenX * lenX + lenY * lenY) * w;
+}
+
+// Accumulates one texel at offset off from the output pixel through the lobe.
+void easuTap(inout vec3 sum, inout float weightSum, vec2 off, vec2 dir, vec2 len2, float lob, float clp, vec3 color) {
+  vec2 v = vec2(off.x * dir.x + off.y * dir.y, off.x * -dir.y + off.y * dir.x) * len2;
+  float d2 = min(dot(v, v), clp);
+  // (25/16 * (2/5 * x^2 - 1)^2 - (25/16 - 1)) * (lob * x^2 - 1)^2
+  float wB = 0.4 * d2 - 1.0;
+  float wA = lob * d2 - 1.0;
+  float w = (1.5625 * wB * wB - 0.5625) * (wA * wA);
+  sum = sum + color * w;
+  weightSum = weightSum + w;
+}
+
+void main() {
+  vec2 pp = gl_FragCoord.xy * u_sourceSize / u_resolution - 0.5;
+  vec2 fp = floor(pp);
+  pp = pp - fp;
+  ivec2 p = ivec2(fp);
+
+  //    b c
+  //  e f g h
+  //  i j k l
+  //    n o
+  vec3 b = easuFetch(p + ivec2(0, -1));
+  vec3 c = easuFetch(p + ivec2(1, -1));
+  vec3 e = easuFetch(p + ivec2(-1, 0));
+  vec3 f = easuFetch(p);
+  vec3 g = easuFetch(p + ivec2(1, 0));
+  vec3 h = easuFetch(p + ivec2(2, 0));
+  vec3 i = easuFetch(p + ivec2(-1, 1));
+  vec3 j = easuFetch(p + ivec2(0, 1));
+  vec3 k = easuFetch(p + ivec2(1, 1));
+  vec3 l = easuFetch(p + ivec2(2, 1));
+  vec3 n = easuFetch(p + ivec2(0, 2));
+  vec3 o = easuFetch(p + ivec2(1, 2));
+  float bL = easuLuma(b);
+  float cL = easuLuma(c);
+  float eL = easuLuma(e);
+  float fL = easuLuma(f);
+  float gL = easuLuma(g);
+  float hL = easuLuma(h);
+  float iL = easuLuma(i);
+  float jL = easuLuma(j);
+  float kL = easuLuma(k);
+  float lL = easuLuma(l);
+  float nL = easuLuma(n);
+  float oL = easuLuma(o);
+
+  vec2 dir = vec2(0.0);
+  float len = 0.0;
+  easuSet(dir, len, (1.0 - pp.x) * (1.0 - pp.y), bL, eL, fL, gL, jL);
+  easuSet(dir, len, pp.x * (1.0 - pp.y), cL, fL, gL, hL, kL);
+  easuSet(dir, len, (1.0 - pp.x) * pp.y, fL, iL, jL, kL, nL);
+  easuSet(dir, len, pp.x * pp.y, gL, jL, kL, lL, oL);
+
+  // Flat neighborhoods have no direction; filter them along x.
+  float dirLength2 = dot(dir, dir);
+  dir = dirLength2 < 1.0 / 32768.0 ? vec2(1.0, 0.0) : dir * inversesqrt(dirLength2);
+  len = len * 0.5;
+  len = len * len;
+  // Diagonal edges are stretched out to the corner of the unit square.
+  float stretch = dot(dir, dir) / max(abs(dir.x), abs(dir.y));
+  vec2 len2 = vec2(1.0 + (stretch - 1.0) * len, 1.0 - 0.5 * len);
+  // Sharper lobe along strong edges, softer in smooth areas.
+  float lob = 0.5 + (0.21 - 0.5) * len;
+  float clp = 1.0 / lob;
+
+  vec3 sum = vec3(0.0);
+  float weightSum = 0.0;
+  easuTap(sum, weightSum, vec2(0.0, -1.0) - pp, dir, len2, lob, clp, b);
+  easuTap(sum, weightSum, vec2(1.0, -1.0) - pp, dir, len2, lob, clp, c);
+  easuTap(sum, weightSum, vec2(-1.0, 1.0) - pp, dir, len2, lob, clp, i);
+  easuTap(sum, weightSum, vec2(0.0, 1.0) - pp, dir, len2, lob, clp, j);
+  easuTap(sum, weightSum, vec2(0.0, 0.0) - pp, dir, len2, lob, clp, f);
+  easuTap(sum, weightSum, vec2(-1.0, 0.0) - pp, dir, len2, lob, clp, e);
+  easuTap(sum, weightSum, vec2(1.0, 1.0) - pp, dir, len2, lob, clp, k);
+  easuTap(sum, weightSum, vec2(2.0, 1.0) - pp, dir, len2, lob, clp, l);
+  easuTap(sum, weightSum, vec2(2.0, 0.0) - pp, dir, len2, lob, clp, h);
+  easuTap(sum, weightSum, vec2(1.0, 0.0) - pp, dir, len2, lob, clp, g);
+  easuTap(sum, weightSum, vec2(1.0, 2.0) - pp, dir, len2, lob, clp, o);
+  easuTap(sum, weightSum, vec2(0.0, 2.0) - pp, dir, len2, lob, clp, n);
+
+  vec3 lo = min(min(f, g), min(j, k));
+  vec3 hi = max(max(f, g), max(j, k));
+  fragColor = vec4(clamp(sum / weightSum, lo, hi), 1.0);
+}
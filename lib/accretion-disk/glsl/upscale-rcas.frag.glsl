@@ -0,0 +1,44 @@
+// Sharpening after the edge-adaptive upscale (WebGL2 only), a port of the RCAS
+// pass of AMD's FidelityFX Super Resolution 1. Each pixel gets the strongest
+// negative lobe over its four neighbors that cannot push any channel outside
+// [0, 1] given their minimum and maximum, scaled down where the neighborhood
+// looks like noise rather than an edge.
+#include "prelude.glsl"
+
+uniform sampler2D u_source;
+// 1 is full strength; FSR's "stops" setting s maps to exp2(-s)
+uniform float u_sharpness;
+
+// Caps the lobe so the kernel stays positive in the center.
+const float RCAS_LIMIT = 0.25 - 1.0 / 16.0;
+
+void main() {
+  ivec2 p = ivec2(gl_FragCoord.xy);
+  ivec2 last = textureSize(u_source, 0) - 1;
+  //    b
+  //  d e f
+  //    h
+  vec3 b = texelFetch(u_source, clamp(p + ivec2(0, -1), ivec2(0), last), 0).rgb;
+  vec3 d = texelFetch(u_source, clamp(p + ivec2(-1, 0), ivec2(0), last), 0).rgb;
+  vec3 e = texelFetch(u_source, p, 0).rgb;
+  vec3 f = texelFetch(u_source, clamp(p + ivec2(1, 0), ivec2(0), last), 0).rgb;
+  vec3 h = texelFetch(u_source, clamp(p + ivec2(0, 1), ivec2(0), last), 0).rgb;
+
+  float bL = b.b * 0.5 + (b.r * 0.5 + b.g);
+  float dL = d.b * 0.5 + (d.r * 0.5 + d.g);
+  float eL = e.b * 0.5 + (e.r * 0.5 + e.g);
+  float fL = f.b * 0.5 + (f.r * 0.5 + f.g);
+  float hL = h.b * 0.5 + (h.r * 0.5 + h.g);
+  float noise = 0.25 * (bL + dL + fL + hL) - eL;
+  float range = max(max(max(bL, dL), max(eL, fL)), hL) - min(min(min(bL, dL), min(eL, fL)), hL);
+  noise = 1.0 - 0.5 * clamp(abs(noise) / max(range, 1e-5), 0.0, 1.0);
+
+  vec3 mn4 = min(min(b, d), min(f, h));
+  vec3 mx4 = max(max(b, d), max(f, h));
+  vec3 hitMin = mn4 / (4.0 * max(mx4, vec3(1e-5)));
+  vec3 hitMax = (1.0 - mx4) / min(4.0 * mn4 - 4.0, vec3(-1e-5));
+  vec3 lobeRGB = max(-hitMin, hitMax);
+  float lobe = max(-RCAS_LIMIT, min(max(max(lobeRGB.r, lobeRGB.g), lobeRGB.b), 0.0)) * u_sharpness * noise;
+
+  fragColor = vec4((lobe * (b + d + f + h) + e) / (4.0 * lobe + 1.0), 1.0);
+}
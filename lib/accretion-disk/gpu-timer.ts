@@ -0,0 +1,127 @@
+type GL = WebGL2RenderingContext | WebGLRenderingContext
+
+interface TimerQueryExtWebGL2 {
+  TIME_ELAPSED_EXT: number
+  GPU_DISJOINT_EXT: number
+}
+
+interface TimerQueryExtWebGL1 {
+  TIME_ELAPSED_EXT: number
+  GPU_DISJOINT_EXT: number
+  QUERY_RESULT_EXT: number
+  QUERY_RESULT_AVAILABLE_EXT: number
+  createQueryEXT(): WebGLQuery | null
+  deleteQueryEXT(query: WebGLQuery | null): void
+  beginQueryEXT(target: number, query: WebGLQuery): void
+  endQueryEXT(target: number): void
+  getQueryObjectEXT(query: WebGLQuery, pname: number): number | boolean
+}
+
+// Queries are resolved a few frames after they are issued, so keep a small pool in flight.
+const MAX_PENDING_QUERIES = 4
+
+/**
+ * Measures GPU time of a frame with EXT_disjoint_timer_query(_webgl2).
+ * Results arrive asynchronously; `poll()` returns the most recent resolved
+ * duration in milliseconds, or null when nothing new is available.
+ */
+export class GpuTimer {
+  private pending: WebGLQuery[] = []
+  private free: WebGLQuery[] = []
+  private active: WebGLQuery | null = null
+
+  private constructor(
+    private readonly gl: GL,
+    private readonly ext: TimerQueryExtWebGL2 | TimerQueryExtWebGL1,
+    private readonly isWebGL2: boolean,
+  ) {}
+
+  static create(gl: GL, isWebGL2: boolean): GpuTimer | null {
+    const ext = isWebGL2
+      ? (gl.getExtension("EXT_disjoint_timer_query_webgl2") as TimerQueryExtWebGL2 | null)
+      : (gl.getExtension("EXT_disjoint_timer_query") as TimerQueryExtWebGL1 | null)
+    if (!ext) return null
+    return new GpuTimer(gl, ext, isWebGL2)
+  }
+
+  /** Starts timing the commands issued until `end()`. Skipped when too many queries are unresolved. */
+  begin() {
+    if (this.active || this.pending.length >= MAX_PENDING_QUERIES) return
+    const query = this.free.pop() ?? this.createQuery()
+    if (!query) return
+    if (this.isWebGL2) {
+      ;(this.gl as WebGL2RenderingContext).beginQuery(this.ext.TIME_ELAPSED_EXT, query)
+    } else {
+      ;(this.ext as TimerQueryExtWebGL1).beginQueryEXT(this.ext.TIME_ELAPSED_EXT, query)
+    }
+    this.active = query
+  }
+
+  end() {
+    if (!this.active) return
+    if (this.isWebGL2) {
+      ;(this.gl as WebGL2RenderingContext).endQuery(this.ext.TIME_ELAPSED_EXT)
+    } else {
+      ;(this.ext as TimerQueryExtWebGL1).endQueryEXT(this.ext.TIME_ELAPSED_EXT)
+    }
+    this.pending.push(this.active)
+    this.active = null
+  }
+
+  poll(): number | null {
+    const disjoint = this.gl.getParameter(this.ext.GPU_DISJOINT_EXT)
+    let latest: number | null = null
+
+    while (this.pending.length > 0) {
+      const query = this.pending[0]
+      if (!this.isResultAvailable(query)) break
+      this.pending.shift()
+      const nanoseconds = this.getResult(query)
+      this.free.push(query)
+      // A disjoint event (clock change, context switch) invalidates every result in flight.
+      if (!disjoint) latest = nanoseconds / 1e6
+    }
+
+    return latest
+  }
+
+  dispose() {
+    for (const query of [...this.pending, ...this.free]) this.deleteQuery(query)
+    if (this.active) this.deleteQuery(this.active)
+    this.pending = []
+    this.free = []
+    this.active = null
+  }
+
+  private createQuery(): WebGLQuery | null {
+    return this.isWebGL2
+      ? (this.gl as WebGL2RenderingContext).createQuery()
+      : (this.ext as TimerQueryExtWebGL1).createQueryEXT()
+  }
+
+  private deleteQuery(query: WebGLQuery) {
+    if (this.isWebGL2) {
+      ;(this.gl as WebGL2RenderingContext).deleteQuery(query)
+    } else {
+      ;(this.ext as TimerQueryExtWebGL1).deleteQueryEXT(query)
+    }
+  }
+
+  private isResultAvailable(query: WebGLQuery): boolean {
+    if (this.isWebGL2) {
+      const gl2 = this.gl as WebGL2RenderingContext
+      return Boolean(gl2.getQueryParameter(query, gl2.QUERY_RESULT_AVAILABLE))
+    }
+    const ext = this.ext as TimerQueryExtWebGL1
+    return Boolean(ext.getQueryObjectEXT(query, ext.QUERY_RESULT_AVAILABLE_EXT))
+  }
+
+  private getResult(query: WebGLQuery): number {
+    if (this.isWebGL2) {
+      const gl2 = this.gl as WebGL2RenderingContext
+      return gl2.getQueryParameter(query, gl2.QUERY_RESULT) as number
+    }
+    const ext = this.ext as TimerQueryExtWebGL1
+    return ext.getQueryObjectEXT(query, ext.QUERY_RESULT_EXT) as number
+  }
+}
@@ -0,0 +1,234 @@
+import { SCRATCH_TEXTURE_UNIT } from "./shaders"
+
+// Bloom levels below the scene target, each half the size of the one above.
+// Levels that would be smaller than MIN_BLOOM_SIZE texels are dropped.
+export const BLOOM_LEVELS = 5
+const MIN_BLOOM_SIZE = 8
+
+interface Target {
+  texture: WebGLTexture
+  framebuffer: WebGLFramebuffer | null
+  width: number
+  height: number
+}
+
+/**
+ * Render targets of the multi-pass pipeline: an RGBA16F scene target the
+ * ray-marching pass writes linear HDR color into at its own resolution, and
+ * the bloom pyramid downsampled from it. The composite pass reads both and
+ * draws the display-resolution image. When the march is smaller than the
+ * display, the edge-adaptive upscaler instead takes the composite at march
+ * size from an RGBA8 target and writes the display-size image into a second
+ * one for sharpening. With temporal accumulation the march also writes each
+ * pixel's motion into a second attachment of the scene target, and the
+ * resolve alternates between two history targets, the latest of which the
+ * post passes read as the scene. Needs WebGL2 with float render targets (see
+ * supportsFloatRenderTargets), as the G-buffer does.
+ */
+export class PostChain {
+  private readonly scene: Target
+  private readonly bloom: Target[] = []
+  private readonly composited: Target
+  private readonly upscaled: Target
+  private readonly motion: Target | null = null
+  private readonly history: Target[] = []
+  // Index of the history target holding the latest resolved frame.
+  private latestHistory = 0
+  width = 0
+  height = 0
+  /** Whether this frame was resolved into the history, which the post passes then read instead of the march. */
+  resolved = false
+
+  constructor(
+    private readonly gl: WebGL2RenderingContext,
+    readonly temporal = false,
+  ) {
+    this.scene = this.createTarget()
+    for (let i = 0; i < BLOOM_LEVELS; i++) this.bloom.push(this.createTarget())
+    this.composited = this.createTarget()
+    this.upscaled = this.createTarget()
+    if (temporal) {
+      this.motion = this.createTarget()
+      this.history.push(this.createTarget(), this.createTarget())
+    }
+  }
+
+  private createTarget(): Target {
+    const texture = this.gl.createTexture()
+    if (!texture) throw new Error("Failed to create post chain texture")
+    return { texture, framebuffer: this.gl.createFramebuffer(), width: 0, height: 0 }
+  }
+
+  /** Bloom levels in use at the current size, at most BLOOM_LEVELS. */
+  get bloomLevels(): number {
+    return this.bloom.filter((level) => level.width > 0).length
+  }
+
+  /**
+   * Reallocates the scene target and bloom pyramid, and the motion and history
+   * targets with temporal accumulation, which starts over. Returns false if a
+   * framebuffer is incomplete on this device.
+   */
+  resize(width: number, height: number): boolean {
+    this.width = width
+    this.height = height
+    let complete = true
+    if (this.motion) {
+      // Resized ahead of the scene target it is attached to, which checks the pair.
+      complete = this.allocate(this.motion, width, height)
+      for (const target of this.history) complete = this.allocate(target, width, height) && complete
+    }
+    complete = this.allocate(this.scene, width, height) && complete
+    if (this.motion) complete = this.attachMotion() && complete
+    this.resolved = false
+    let levelWidth = width
+    let levelHeight = height
+    for (const level of this.bloom) {
+      levelWidth = Math.floor(levelWidth / 2)
+      levelHeight = Math.floor(levelHeight / 2)
+      if (Math.min(levelWidth, levelHeight) < MIN_BLOOM_SIZE) {
+        level.width = level.height = 0
+        continue
+      }
+      complete = this.allocate(level, levelWidth, levelHeight) && complete
+    }
+    return complete
+  }
+
+  /**
+   * Sizes the upscaler's targets for the current march size and a display of
+   * the given size, reallocating only when either changed. Only needed while
+   * the march is smaller than the display. Returns false if a framebuffer is
+   * incomplete on this device.
+   */
+  resizeUpscale(displayWidth: number, displayHeight: number): boolean {
+    const { composited, upscaled } = this
+    if (
+      composited.width === this.width &&
+      composited.height === this.height &&
+      upscaled.width === displayWidth &&
+      upscaled.height === displayHeight
+    ) {
+      return true
+    }
+    // Both hold tonemapped colors, which 8 bits per channel cover.
+    const composited = this.allocate(this.composited, this.width, this.height, false)
+    return this.allocate(this.upscaled, displayWidth, displayHeight, false) && composited
+  }
+
+  private allocate(target: Target, width: number, height: number, hdr = true): boolean {
+    const gl = this.gl
+    target.width = width
+    target.height = height
+    // Never on the active unit: resizes come after the tables were bound to theirs.
+    gl.activeTexture(gl.TEXTURE0 + SCRATCH_TEXTURE_UNIT)
+    gl.bindTexture(gl.TEXTURE_2D, target.texture)
+    if (hdr) {
+      gl.texImage2D(gl.TEXTURE_2D, 0, gl.RGBA16F, width, height, 0, gl.RGBA, gl.HALF_FLOAT, null)
+    } else {
+      gl.texImage2D(gl.TEXTURE_2D, 0, gl.RGBA8, width, height, 0, gl.RGBA, gl.UNSIGNED_BYTE, null)
+    }
+    // Every pass after the march resamples its input, so all targets filter.
+    gl.texParameteri(gl.TEXTURE_2D, gl.TEXTURE_MIN_FILTER, gl.LINEAR)
+    gl.texParameteri(gl.TEXTURE_2D, gl.TEXTURE_MAG_FILTER, gl.LINEAR)
+    gl.texParameteri(gl.TEXTURE_2D, gl.TEXTURE_WRAP_S, gl.CLAMP_TO_EDGE)
+    gl.texParameteri(gl.TEXTURE_2D, gl.TEXTURE_WRAP_T, gl.CLAMP_TO_EDGE)
+    gl.bindFramebuffer(gl.FRAMEBUFFER, target.framebuffer)
+    gl.framebufferTexture2D(gl.FRAMEBUFFER, gl.COLOR_ATTACHMENT0, gl.TEXTURE_2D, target.texture, 0)
+    const complete = gl.checkFramebufferStatus(gl.FRAMEBUFFER) === gl.FRAMEBUFFER_COMPLETE
+    gl.bindFramebuffer(gl.FRAMEBUFFER, null)
+    return complete
+  }
+
+  /** Makes the motion target the scene framebuffer's second draw buffer. */
+  private attachMotion(): boolean {
+    const gl = this.gl
+    gl.bindFramebuffer(gl.FRAMEBUFFER, this.scene.framebuffer)
+    gl.framebufferTexture2D(gl.FRAMEBUFFER, gl.COLOR_ATTACHMENT1, gl.TEXTURE_2D, this.motion!.texture, 0)
+    gl.drawBuffers([gl.COLOR_ATTACHMENT0, gl.COLOR_ATTACHMENT1])
+    const complete = gl.checkFramebufferStatus(gl.FRAMEBUFFER) === gl.FRAMEBUFFER_COMPLETE
+    gl.bindFramebuffer(gl.FRAMEBUFFER, null)
+    return complete
+  }
+
+  private bindForWriting(target: Target) {
+    this.gl.bindFramebuffer(this.gl.FRAMEBUFFER, target.framebuffer)
+    this.gl.viewport(0, 0, target.width, target.height)
+  }
+
+  private bindTexture(target: Target, unit: number) {
+    this.gl.activeTexture(this.gl.TEXTURE0 + unit)
+    this.gl.bindTexture(this.gl.TEXTURE_2D, target.texture)
+  }
+
+  bindSceneForWriting() {
+    this.bindForWriting(this.scene)
+  }
+
+  /** Binds the scene as the post passes see it: the resolved history if this frame has one, else the march. */
+  bindScene(unit: number) {
+    this.bindTexture(this.resolved ? this.history[this.latestHistory] : this.scene, unit)
+  }
+
+  bindMarch(unit: number) {
+    this.bindTexture(this.scene, unit)
+  }
+
+  bindMotion(unit: number) {
+    this.bindTexture(this.motion!, unit)
+  }
+
+  /** Binds the latest resolved frame for reading and the other history target for the resolve to write. */
+  bindHistoryForResolve(unit: number) {
+    this.bindTexture(this.history[this.latestHistory], unit)
+    this.bindForWriting(this.history[1 - this.latestHistory])
+  }
+
+  /** Makes the target the resolve just wrote the latest history. */
+  commitResolve() {
+    this.latestHistory = 1 - this.latestHistory
+    this.resolved = true
+  }
+
+  bindBloomForWriting(level: number) {
+    this.bindForWriting(this.bloom[level])
+  }
+
+  bindBloom(level: number, unit: number) {
+    this.bindTexture(this.bloom[level], unit)
+  }
+
+  bindCompositedForWriting() {
+    this.bindForWriting(this.composited)
+  }
+
+  bindComposited(unit: number) {
+    this.bindTexture(this.composited, unit)
+  }
+
+  bindUpscaledForWriting() {
+    this.bindForWriting(this.upscaled)
+  }
+
+  bindUpscaled(unit: number) {
+    this.bindTexture(this.upscaled, unit)
+  }
+
+  /** Texel size of a bloom level, or of the scene target for level -1. */
+  texelSize(level: number): [number, number] {
+    const target = level < 0 ? this.scene : this.bloom[level]
+    return [1 / target.width, 1 / target.height]
+  }
+
+  dispose() {
+    const targets = [this.scene, ...this.bloom, this.composited, this.upscaled, ...this.history]
+    if (this.motion) targets.push(this.motion)
+    for (const target of targets) {
+      this.gl.deleteTexture(target.texture)
+      this.gl.deleteFramebuffer(target.framebuffer)
+      target.framebuffer = null
+    }
+    this.bloom.length = 0
+    this.history.length = 0
+  }
+}
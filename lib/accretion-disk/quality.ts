@@ -0,0 +1,137 @@
+export type QualityTier = "ultra-low" | "low" | "medium" | "high" | "ultra"
+
+/** Tiers from cheapest to most expensive. */
+export const QUALITY_TIERS: QualityTier[] = ["ultra-low", "low", "medium", "high", "ultra"]
+
+export function detectQualityTier(): QualityTier {
+  if (typeof window === "undefined") return "medium"
+
+  const isMobile = /Android|webOS|iPhone|iPad|iPod|BlackBerry|IEMobile|Opera Mini/i.test(navigator.userAgent)
+  const isTablet = /iPad|Android(?!.*Mobile)/i.test(navigator.userAgent)
+  const isIOS = /iPhone|iPad|iPod/i.test(navigator.userAgent)
+  const isOlderAndroid = /Android [1-7]\./i.test(navigator.userAgent)
+
+  const cores = navigator.hardwareConcurrency || 4
+  const memory = (navigator as Navigator & { deviceMemory?: number }).deviceMemory || 4
+  const screenArea = window.screen.width * window.screen.height
+
+  if (isMobile && !isTablet) {
+    if (isOlderAndroid || cores <= 2 || memory <= 1) return "ultra-low"
+    if (cores <= 4 || memory <= 2) return "low"
+    if (isIOS) return "medium"
+    return "medium"
+  }
+
+  if (isTablet) {
+    if (cores <= 2 || memory <= 2) return "low"
+    if (cores <= 4 || memory <= 3) return "medium"
+    return "high"
+  }
+
+  if (cores >= 8 && memory >= 8 && screenArea >= 2073600) return "ultra"
+  if (cores >= 4 && memory >= 4) return "high"
+  if (cores <= 2) return "low"
+  return "medium"
+}
+
+/**
+ * How the ray-marching pass integrates a photon's path: "euler" takes one step
+ * of the sampling profile per iteration, "verlet" takes velocity Verlet steps
+ * sized to keep each one's position error near geodesicTolerance, crossing
+ * empty space in a few long steps.
+ */
+export type GeodesicIntegrator = "euler" | "verlet"
+
+// The same on every tier, which differ only in geodesicTolerance. Mirrored in
+// scripts/reference-render.mjs, which scripts/build-shaders.mjs builds with.
+export const GEODESIC_INTEGRATOR: GeodesicIntegrator = "verlet"
+
+// Length of the emission steps relative to each tier's adaptiveStep profile.
+// The disk samples dither the longer steps on every tier alike, so it is not a
+// tier setting; mirrored in scripts/reference-render.mjs the same way.
+export const STEP_SCALE = 1.5
+
+export interface QualitySettings {
+  maxSteps: number
+  pixelRatio: number
+  upscaledPixelRatio: number
+  minPixelRatio: number
+  maxPixelRatio: number
+  diskSamples: number
+  jetEnabled: boolean
+  bloomEnabled: boolean
+  targetFPS: number
+  adaptiveStep: number
+  geodesicTolerance: number
+}
+
+export function getQualitySettings(tier: QualityTier): QualitySettings {
+  const settings: Record<QualityTier, QualitySettings> = {
+    "ultra-low": {
+      maxSteps: 128,
+      pixelRatio: 0.75,
+      upscaledPixelRatio: 0.5,
+      minPixelRatio: 0.4,
+      maxPixelRatio: 0.9,
+      diskSamples: 2,
+      jetEnabled: true,
+      bloomEnabled: false,
+      targetFPS: 30,
+      adaptiveStep: 0.05,
+      geodesicTolerance: 1e-3,
+    },
+    low: {
+      maxSteps: 160,
+      pixelRatio: 0.85,
+      upscaledPixelRatio: 0.5,
+      minPixelRatio: 0.5,
+      maxPixelRatio: 1.0,
+      diskSamples: 2,
+      jetEnabled: true,
+      bloomEnabled: false,
+      targetFPS: 30,
+      adaptiveStep: 0.045,
+      geodesicTolerance: 1e-3,
+    },
+    medium: {
+      maxSteps: 192,
+      pixelRatio: 0.85,
+      upscaledPixelRatio: 0.7,
+      minPixelRatio: 0.5,
+      maxPixelRatio: 1.1,
+      diskSamples: 2,
+      jetEnabled: true,
+      bloomEnabled: false,
+      targetFPS: 45,
+      adaptiveStep: 0.04,
+      geodesicTolerance: 3e-4,
+    },
+    high: {
+      maxSteps: 320,
+      pixelRatio: 1.15,
+      upscaledPixelRatio: 1.15,
+      minPixelRatio: 0.6,
+      maxPixelRatio: 1.4,
+      diskSamples: 3,
+      jetEnabled: true,
+      bloomEnabled: true,
+      targetFPS: 60,
+      adaptiveStep: 0.03,
+      geodesicTolerance: 1e-4,
+    },
+    ultra: {
+      maxSteps: 450,
+      pixelRatio: 1.4,
+      upscaledPixelRatio: 1.4,
+      minPixelRatio: 0.7,
+      maxPixelRatio: 1.6,
+      diskSamples: 3,
+      jetEnabled: true,
+      bloomEnabled: true,
+      targetFPS: 60,
+      adaptiveStep: 0.02,
+      geodesicTolerance: 3e-5,
+    },
+  }
+  return settings[tier]
+}
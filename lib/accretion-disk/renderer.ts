@@ -0,0 +1,1193 @@
+import { DiskAtlas } from "./disk-atlas"
+import { buildDiskNoise, DISK_NOISE_SIZE } from "./disk-noise"
+import { buildDiskShiftLut } from "./disk-shift-lut"
+import { GBuffer, supportsFloatRenderTargets } from "./gbuffer"
+import { GLResourceManager } from "./gl-resources"
+import { buildGeodesicLut } from "./geodesic-lut"
+import { GpuTimer } from "./gpu-timer"
+import { getQualitySettings, QUALITY_TIERS, type QualityTier } from "./quality"
+import { PostChain } from "./post-chain"
+import { ResolutionGovernor, type FrameCostSource } from "./resolution-governor"
+import { ShaderCompiler, type PendingProgram } from "./shader-compiler"
+import {
+  BLOOM_STRENGTH,
+  DEBUG_VIEWS,
+  DISK_ATLAS_TEXTURE_UNIT,
+  DISK_NOISE_TEXTURE_UNIT,
+  DISK_SHIFT_TEXTURE_UNIT,
+  fullscreenQuadShaderSource,
+  GBUFFER_TEXTURE_UNITS,
+  GEODESIC_LUT_PARAMS,
+  GEODESIC_LUT_TEXTURE_UNIT,
+  loadShaderVariant,
+  placeholderShaderSource,
+  POST_BLOOM_TEXTURE_UNIT,
+  POST_SOURCE_TEXTURE_UNIT,
+  TEMPORAL_HISTORY_TEXTURE_UNIT,
+  TEMPORAL_MOTION_TEXTURE_UNIT,
+  TILE_SIZE,
+  TILE_STATS_TEXTURE_UNIT,
+  UPSCALE_SHARPNESS,
+  type DebugView,
+  type GeodesicMode,
+  type ShaderProgramName,
+  type ShaderVariant,
+  type UpscalerMode,
+} from "./shaders"
+import type { RendererTelemetryEvent } from "./telemetry"
+import { TEMPORAL_HISTORY_WEIGHT, TEMPORAL_MAX_TIME_STEP, temporalJitter } from "./temporal"
+import { TierGovernor, type TierDecision } from "./tier-governor"
+import { TraceRecorder, type ChromeTrace } from "./trace-recorder"
+import { TileStats } from "./tile-stats"
+
+/**
+ * `gbuffer` traces geodesics once per resize into float targets and only
+ * re-shades emission each frame; needs WebGL2 with float render targets.
+ */
+export type RenderMode = "direct" | "gbuffer"
+
+export interface RendererOptions {
+  qualityTier: QualityTier
+  geodesicMode: GeodesicMode
+  renderMode: RenderMode
+  /**
+   * Let the renderer move between quality tiers when the resolution governor
+   * alone cannot hold the frame rate, or has headroom to spare.
+   */
+  adaptiveQuality: boolean
+  /**
+   * Accumulate jittered frames into a reprojected history (see temporal.ts),
+   * marching each with coarser steps. Needs ray marching in direct mode on
+   * WebGL2 with float render targets; ignored elsewhere.
+   */
+  temporal?: boolean
+  /** Render deterministic, individually timed frames instead of adapting to the device. */
+  benchmark?: BenchmarkOptions
+}
+
+export interface BenchmarkOptions {
+  /** Value u_time is pinned to, in seconds. */
+  time: number
+}
+
+/** Layout size in CSS pixels; the renderer derives the drawing-buffer size from it. */
+export interface RendererViewport {
+  width: number
+  height: number
+  devicePixelRatio: number
+}
+
+export type RendererError = { kind: "webgl" } | { kind: "shader"; message: string }
+
+/** Callbacks through which the renderer reports back, whichever thread it runs on. */
+export interface RendererHost {
+  onTelemetry(event: RendererTelemetryEvent): void
+  onError(error: RendererError): void
+}
+
+/** Opt-in instrumentation, e.g. for the performance HUD. */
+export interface RendererDiagnostics {
+  /** Report a "frame-timing" event for every drawn frame. */
+  frameTimings: boolean
+  /** Paint steps or ray termination instead of the scene; ray-marching mode only. */
+  debugView: DebugView
+  /** How a march smaller than the display is brought up to it; needs the post chain. */
+  upscaler: UpscalerMode
+}
+
+export interface AccretionDiskRenderer {
+  setViewport(viewport: RendererViewport): void
+  setVisible(visible: boolean): void
+  setDiagnostics(diagnostics: RendererDiagnostics): void
+  /** Starts recording the render loop into a fresh ring buffer, replacing any recording in progress. */
+  startTrace(): void
+  /** Stops recording and resolves with the trace, or null when nothing was being recorded. */
+  stopTrace(): Promise<ChromeTrace | null>
+  dispose(): void
+}
+
+interface ShaderPass {
+  program: WebGLProgram
+  timeLoc: WebGLUniformLocation | null
+  resolutionLoc: WebGLUniformLocation | null
+}
+
+/** The programs one quality tier renders with. */
+interface ProgramSet {
+  /** Programs still compiling; null while their sources load and once they have been finished. */
+  pending: PendingProgram[] | null
+  /** Linked passes in draw order, the per-frame pass last. */
+  passes: ShaderPass[] | null
+  framesWaited: number
+}
+
+/** Programs of the post chain, with the uniforms set per pass. */
+interface PostPasses {
+  down: ShaderPass
+  downTexelLoc: WebGLUniformLocation | null
+  prefilterLoc: WebGLUniformLocation | null
+  up: ShaderPass
+  upTexelLoc: WebGLUniformLocation | null
+  composite: ShaderPass
+  bloomScaleLoc: WebGLUniformLocation | null
+  rawColorLoc: WebGLUniformLocation | null
+  easu: ShaderPass
+  easuSourceSizeLoc: WebGLUniformLocation | null
+  rcas: ShaderPass
+  /** Null unless temporal accumulation is on. */
+  resolve: ShaderPass | null
+  historyWeightLoc: WebGLUniformLocation | null
+}
+
+/** Per-frame uniforms of the temporal ray-marching pass. */
+interface TemporalMarchUniforms {
+  jitterLoc: WebGLUniformLocation | null
+  jitterPhaseLoc: WebGLUniformLocation | null
+  timeStepLoc: WebGLUniformLocation | null
+}
+
+interface DebugProgram {
+  tier: QualityTier
+  pending: PendingProgram | null
+  /** Null while compiling, and after a failed compile so it is not retried. */
+  pass: ShaderPass | null
+  viewLoc: WebGLUniformLocation | null
+  tileCountLoc: WebGLUniformLocation | null
+}
+
+// How often the current resolution state is reported when it is not changing.
+const TELEMETRY_INTERVAL_MS = 1000
+
+// Without KHR_parallel_shader_compile, frames to leave the driver before the
+// blocking status query on an adjacent tier's programs.
+const ADJACENT_TIER_COMPILE_FRAMES = 120
+
+// Programs of the post chain, compiled after a tier's scene programs in this order.
+const POST_PROGRAMS: ShaderProgramName[] = ["bloom-down", "bloom-up", "post-composite", "upscale-easu", "upscale-rcas"]
+
+// Attribute slot shared by every program so one vertex setup serves all passes.
+const POSITION_ATTRIBUTE = 0
+
+// Dedicated workers only gained requestAnimationFrame alongside OffscreenCanvas; fall back to timers.
+const requestFrame: (callback: (time: number) => void) => number =
+  typeof requestAnimationFrame === "function"
+    ? (callback) => requestAnimationFrame(callback)
+    : (callback) => setTimeout(() => callback(performance.now()), 16) as unknown as number
+const cancelFrame: (handle: number) => void =
+  typeof cancelAnimationFrame === "function" ? (handle) => cancelAnimationFrame(handle) : (handle) => clearTimeout(handle)
+
+/**
+ * Creates the WebGL context, programs and frame loop on the given canvas. Runs
+ * unchanged on the main thread or inside a worker on an OffscreenCanvas: it
+ * touches no DOM APIs and learns its size and visibility from the caller.
+ * Returns null when setup failed; the failure was reported to `host.onError`.
+ */
+export function createAccretionDiskRenderer(
+  canvas: HTMLCanvasElement | OffscreenCanvas,
+  options: RendererOptions,
+  host: RendererHost,
+): AccretionDiskRenderer | null {
+  const { qualityTier, geodesicMode, renderMode, benchmark } = options
+  const adaptiveQuality = options.adaptiveQuality && !benchmark
+  let activeTier = qualityTier
+  let quality = getQualitySettings(activeTier)
+  const isAndroid = /Android/i.test(navigator.userAgent)
+
+  let glContext: WebGL2RenderingContext | WebGLRenderingContext | null = null
+  let isWebGL2 = true
+
+  // Context attributes are fixed for the canvas' lifetime, so they follow the
+  // initial tier even after the tier governor has moved.
+  const contextOptions: WebGLContextAttributes = {
+    alpha: false,
+    antialias: qualityTier === "high" || qualityTier === "ultra",
+    powerPreference: qualityTier === "ultra-low" || qualityTier === "low" ? "low-power" : "high-performance",
+    failIfMajorPerformanceCaveat: false,
+    preserveDrawingBuffer: false,
+    desynchronized: true,
+  }
+
+  try {
+    glContext = (canvas as HTMLCanvasElement).getContext("webgl2", contextOptions) as WebGL2RenderingContext | null
+  } catch (e) {
+    console.warn("WebGL2 context creation failed, trying WebGL1")
+  }
+
+  if (!glContext) {
+    isWebGL2 = false
+    try {
+      glContext = (canvas as HTMLCanvasElement).getContext("webgl", contextOptions) as WebGLRenderingContext | null
+      if (!glContext) {
+        glContext = (canvas as HTMLCanvasElement).getContext("experimental-webgl", contextOptions) as WebGLRenderingContext | null
+      }
+    } catch (e) {
+      console.error("WebGL context creation failed")
+    }
+  }
+
+  if (!glContext) {
+    host.onError({ kind: "webgl" })
+    return null
+  }
+
+  let activeGeodesicMode = geodesicMode
+  if (activeGeodesicMode === "lut" && !isWebGL2) {
+    console.warn("[v0] Geodesic LUT mode requires WebGL2, falling back to ray marching")
+    activeGeodesicMode = "march"
+  }
+
+  let activeRenderMode = renderMode
+  if (activeRenderMode === "gbuffer" && !supportsFloatRenderTargets(glContext, isWebGL2)) {
+    console.warn("[v0] G-buffer mode requires WebGL2 float render targets, falling back to direct rendering")
+    activeRenderMode = "direct"
+  }
+
+  // Where float render targets exist, the march renders linear HDR into a
+  // target at its own resolution and the post chain (bloom pyramid, tonemap,
+  // vignette) draws the canvas at display resolution. Elsewhere one pass
+  // draws straight to a canvas sized for the march.
+  const multiPass = isWebGL2 && supportsFloatRenderTargets(glContext, isWebGL2)
+
+  // Temporal accumulation swaps in the jittered ray-marching pass and resolves
+  // it into the history ahead of the post chain, which reads the history.
+  const temporal = !!options.temporal && multiPass && activeRenderMode === "direct" && activeGeodesicMode === "march"
+  if (options.temporal && !temporal) {
+    console.warn("[v0] Temporal accumulation requires ray marching on WebGL2 with float render targets, rendering single frames")
+  }
+  const postPrograms: ShaderProgramName[] = temporal ? [...POST_PROGRAMS, "temporal-resolve"] : POST_PROGRAMS
+
+  console.log("[v0] Device:", {
+    userAgent: navigator.userAgent,
+    isAndroid,
+    qualityTier,
+    webglVersion: isWebGL2 ? "WebGL2" : "WebGL1",
+    geodesicMode: activeGeodesicMode,
+    renderMode: activeRenderMode,
+    pipeline: multiPass ? "multi-pass" : "single-pass",
+    temporal,
+  })
+
+  const createdAt = performance.now()
+  const resources = new GLResourceManager(glContext)
+  const vertexShaderSource = fullscreenQuadShaderSource(isWebGL2)
+  // Each tier's programs arrive in their own chunk; kept so a context restore compiles without refetching.
+  const shaderVariants = new Map<QualityTier, ShaderVariant>()
+
+  function toPass(program: WebGLProgram): ShaderPass {
+    return {
+      program,
+      timeLoc: glContext!.getUniformLocation(program, "u_time"),
+      resolutionLoc: glContext!.getUniformLocation(program, "u_resolution"),
+    }
+  }
+
+  function activateProgram(program: WebGLProgram) {
+    glContext!.useProgram(program)
+  }
+
+  /** Points a program's disk emission samplers at the atlas's and shift table's units; leaves the program active. */
+  function bindDiskTextures(program: WebGLProgram) {
+    activateProgram(program)
+    glContext!.uniform1i(glContext!.getUniformLocation(program, "u_diskAtlas"), DISK_ATLAS_TEXTURE_UNIT)
+    glContext!.uniform1i(glContext!.getUniformLocation(program, "u_diskShift"), DISK_SHIFT_TEXTURE_UNIT)
+  }
+
+  let compiler!: ShaderCompiler
+  let placeholderPass!: ShaderPass
+  const programSets = new Map<QualityTier, ProgramSet>()
+  let mainPass: ShaderPass | null = null
+  // Renders the disk emission atlas at the start of every frame.
+  let atlasPass: ShaderPass | null = null
+  let diskAtlas: DiskAtlas | null = null
+  // Runs only when the ray geometry changes: the G-buffer trace or the tile pre-pass.
+  let tracePass: ShaderPass | null = null
+  let gbuffer: GBuffer | null = null
+  let tileStats: TileStats | null = null
+  let tileCountLoc: WebGLUniformLocation | null = null
+  let temporalMarch: TemporalMarchUniforms | null = null
+  let postChain: PostChain | null = null
+  let postPasses: PostPasses | null = null
+  let geometryDirty = true
+  let diagnostics: RendererDiagnostics = { frameTimings: false, debugView: "off", upscaler: "fsr" }
+  // Null unless recording, so the render loop pays one null check per event site.
+  let trace: TraceRecorder | null = null
+  let debugProgram: DebugProgram | null = null
+
+  /**
+   * Registers a tier's program set and starts compiling it, first loading its
+   * sources if this is the tier's first use. Returns null if compiling could
+   * not start; a failed load is reported once it happens.
+   */
+  function beginProgramSet(tier: QualityTier): ProgramSet | null {
+    const set: ProgramSet = { pending: null, passes: null, framesWaited: 0 }
+    programSets.set(tier, set)
+    const sources = shaderVariants.get(tier)
+    if (sources) return compileProgramSet(tier, set, sources) ? set : null
+
+    loadShaderVariant(tier, isWebGL2).then(
+      (loaded) => {
+        shaderVariants.set(tier, loaded)
+        // The set may have been dropped, or the context lost, while the chunk loaded.
+        if (programSets.get(tier) !== set || contextLost) return
+        if (!compileProgramSet(tier, set, loaded)) failProgramSet(tier, "Program creation failed")
+      },
+      (e) => {
+        console.error(`[v0] Failed to load ${tier} tier shaders:`, e)
+        if (programSets.get(tier) === set) failProgramSet(tier, `Could not load the ${tier} tier shaders`)
+      },
+    )
+    return set
+  }
+
+  function compileProgramSet(tier: QualityTier, set: ProgramSet, sources: ShaderVariant): boolean {
+    const names: ShaderProgramName[] =
+      activeRenderMode === "gbuffer"
+        ? ["disk-atlas", "gbuffer-trace", "gbuffer-shade"]
+        : activeGeodesicMode === "march"
+          ? ["disk-atlas", "tile-stats", temporal ? "temporal-march" : "direct-march"]
+          : ["disk-atlas", "direct-lut"]
+    if (multiPass) names.push(...postPrograms)
+    const pending = names.map((name) => compiler.begin(name, vertexShaderSource, sources[name]!))
+    if (pending.some((program) => !program)) {
+      pending.forEach((program) => program && compiler.discard(program))
+      programSets.delete(tier)
+      return false
+    }
+    set.pending = pending as PendingProgram[]
+    return true
+  }
+
+  /** Drops a tier whose programs cannot be built; without the active tier there is nothing to render. */
+  function failProgramSet(tier: QualityTier, error: string) {
+    programSets.delete(tier)
+    if (tier === activeTier) {
+      host.onError({ kind: "shader", message: error })
+      cancelFrame(animationId)
+    } else {
+      console.warn(`[v0] ${tier} tier programs failed; staying off that tier`)
+    }
+  }
+
+  /** Links a set's programs and reports their compile times. Returns the error if any of them failed. */
+  function finishProgramSet(tier: QualityTier, set: ProgramSet): string | null {
+    const pending = set.pending!
+    const results = pending.map((program) => compiler.finish(program))
+    set.pending = null
+    const failure = results.find((result) => !result.ok)
+    if (failure && !failure.ok) {
+      results.forEach((result) => result.ok && glContext!.deleteProgram(result.program))
+      programSets.delete(tier)
+      return failure.error
+    }
+
+    set.passes = []
+    results.forEach((result, i) => {
+      if (!result.ok) return
+      host.onTelemetry({
+        type: "shader-compile",
+        variant: `${tier}/${pending[i].name}`,
+        compileMs: result.compileMs,
+        parallel: compiler.isParallel,
+      })
+      set.passes!.push(toPass(result.program))
+    })
+    return null
+  }
+
+  function deleteProgramSet(set: ProgramSet) {
+    set.pending?.forEach((program) => compiler.discard(program))
+    set.passes?.forEach((pass) => glContext!.deleteProgram(pass.program))
+    set.pending = null
+    set.passes = null
+  }
+
+  function activateProgramSet(programs: ShaderPass[]) {
+    const passes = multiPass ? programs.slice(0, -postPrograms.length) : programs
+    if (multiPass) activatePostPasses(programs.slice(-postPrograms.length))
+    atlasPass = passes[0]
+    activateProgram(atlasPass.program)
+    glContext!.uniform1i(glContext!.getUniformLocation(atlasPass.program, "u_diskNoise"), DISK_NOISE_TEXTURE_UNIT)
+    passes.slice(1).forEach((pass) => bindDiskTextures(pass.program))
+    diskAtlas ??= new DiskAtlas(glContext!, DISK_ATLAS_TEXTURE_UNIT)
+    mainPass = passes[passes.length - 1]
+    activateProgram(mainPass.program)
+    glContext!.uniform1i(glContext!.getUniformLocation(mainPass.program, "u_hdrOutput"), multiPass ? 1 : 0)
+    if (activeRenderMode === "gbuffer") {
+      tracePass = passes[1]
+      ;["u_gCrossing0", "u_gCrossing1", "u_gEscape", "u_gGlow"].forEach((name, i) => {
+        glContext!.uniform1i(glContext!.getUniformLocation(mainPass!.program, name), GBUFFER_TEXTURE_UNITS[i])
+      })
+      gbuffer ??= new GBuffer(glContext as WebGL2RenderingContext)
+    } else if (activeGeodesicMode === "march") {
+      tracePass = passes[1]
+      glContext!.uniform1i(glContext!.getUniformLocation(mainPass.program, "u_tileStats"), TILE_STATS_TEXTURE_UNIT)
+      tileCountLoc = glContext!.getUniformLocation(mainPass.program, "u_tileCount")
+      tileStats ??= new TileStats(glContext!, TILE_SIZE)
+      temporalMarch = temporal
+        ? {
+            jitterLoc: glContext!.getUniformLocation(mainPass.program, "u_jitter"),
+            jitterPhaseLoc: glContext!.getUniformLocation(mainPass.program, "u_jitterPhase"),
+            timeStepLoc: glContext!.getUniformLocation(mainPass.program, "u_timeStep"),
+          }
+        : null
+    } else if (activeGeodesicMode === "lut") {
+      glContext!.uniform1i(glContext!.getUniformLocation(mainPass.program, "u_geodesicLut"), GEODESIC_LUT_TEXTURE_UNIT)
+    }
+    // Tiers differ in step counts, so the trace or tile budgets must be redone.
+    geometryDirty = true
+  }
+
+  function activatePostPasses([down, up, composite, easu, rcas, resolve]: ShaderPass[]) {
+    const gl = glContext!
+    activateProgram(down.program)
+    gl.uniform1i(gl.getUniformLocation(down.program, "u_source"), POST_SOURCE_TEXTURE_UNIT)
+    activateProgram(up.program)
+    gl.uniform1i(gl.getUniformLocation(up.program, "u_source"), POST_SOURCE_TEXTURE_UNIT)
+    activateProgram(composite.program)
+    gl.uniform1i(gl.getUniformLocation(composite.program, "u_scene"), POST_SOURCE_TEXTURE_UNIT)
+    gl.uniform1i(gl.getUniformLocation(composite.program, "u_bloom"), POST_BLOOM_TEXTURE_UNIT)
+    activateProgram(easu.program)
+    gl.uniform1i(gl.getUniformLocation(easu.program, "u_source"), POST_SOURCE_TEXTURE_UNIT)
+    activateProgram(rcas.program)
+    gl.uniform1i(gl.getUniformLocation(rcas.program, "u_source"), POST_SOURCE_TEXTURE_UNIT)
+    gl.uniform1f(gl.getUniformLocation(rcas.program, "u_sharpness"), UPSCALE_SHARPNESS)
+    if (resolve) {
+      activateProgram(resolve.program)
+      gl.uniform1i(gl.getUniformLocation(resolve.program, "u_source"), POST_SOURCE_TEXTURE_UNIT)
+      gl.uniform1i(gl.getUniformLocation(resolve.program, "u_motion"), TEMPORAL_MOTION_TEXTURE_UNIT)
+      gl.uniform1i(gl.getUniformLocation(resolve.program, "u_history"), TEMPORAL_HISTORY_TEXTURE_UNIT)
+    }
+    postPasses = {
+      down,
+      downTexelLoc: gl.getUniformLocation(down.program, "u_texelSize"),
+      prefilterLoc: gl.getUniformLocation(down.program, "u_prefilter"),
+      up,
+      upTexelLoc: gl.getUniformLocation(up.program, "u_texelSize"),
+      composite,
+      bloomScaleLoc: gl.getUniformLocation(composite.program, "u_bloomScale"),
+      rawColorLoc: gl.getUniformLocation(composite.program, "u_rawColor"),
+      easu,
+      easuSourceSizeLoc: gl.getUniformLocation(easu.program, "u_sourceSize"),
+      rcas,
+      resolve: resolve ?? null,
+      historyWeightLoc: resolve ? gl.getUniformLocation(resolve.program, "u_historyWeight") : null,
+    }
+    postChain ??= new PostChain(gl as WebGL2RenderingContext, temporal)
+  }
+
+  /**
+   * Keeps programs for the tiers directly above and below the active one
+   * compiling in the background, so a tier change never waits on the driver,
+   * and drops any that are no longer adjacent.
+   */
+  function prepareAdjacentTiers() {
+    if (!adaptiveQuality) return
+    const index = QUALITY_TIERS.indexOf(activeTier)
+    const keep = QUALITY_TIERS.slice(Math.max(index - 1, 0), index + 2)
+    for (const [tier, set] of programSets) {
+      if (keep.includes(tier)) continue
+      deleteProgramSet(set)
+      programSets.delete(tier)
+    }
+    for (const tier of keep) {
+      if (!programSets.has(tier) && !beginProgramSet(tier)) {
+        console.warn(`[v0] Could not start compiling ${tier} tier programs`)
+      }
+    }
+  }
+
+  function deleteDebugProgram() {
+    if (debugProgram?.pending) compiler.discard(debugProgram.pending)
+    if (debugProgram?.pass) glContext!.deleteProgram(debugProgram.pass.program)
+    debugProgram = null
+  }
+
+  /**
+   * Returns the debug program for the active tier once it is linked, starting
+   * its compile on first use. Without the parallel compile extension the first
+   * frame in a debug view blocks until it is ready.
+   */
+  function readyDebugProgram(): DebugProgram | null {
+    if (debugProgram && debugProgram.tier !== activeTier) deleteDebugProgram()
+    if (!debugProgram) {
+      const sources = shaderVariants.get(activeTier)
+      const pending = sources ? compiler.begin("debug", vertexShaderSource, sources.debug) : null
+      if (!pending) return null
+      debugProgram = { tier: activeTier, pending, pass: null, viewLoc: null, tileCountLoc: null }
+    }
+    if (debugProgram.pending) {
+      if (!compiler.isSettled(debugProgram.pending)) return null
+      const result = compiler.finish(debugProgram.pending)
+      debugProgram.pending = null
+      if (!result.ok) return null
+      const pass = toPass(result.program)
+      bindDiskTextures(pass.program)
+      glContext!.uniform1i(glContext!.getUniformLocation(pass.program, "u_tileStats"), TILE_STATS_TEXTURE_UNIT)
+      debugProgram.pass = pass
+      debugProgram.viewLoc = glContext!.getUniformLocation(pass.program, "u_debugView")
+      debugProgram.tileCountLoc = glContext!.getUniformLocation(pass.program, "u_tileCount")
+    }
+    return debugProgram.pass ? debugProgram : null
+  }
+
+  try {
+    resources.add({
+      name: "programs",
+      create(gl) {
+        // Extension objects do not survive a context loss, so the compiler is rebuilt with the programs.
+        compiler = new ShaderCompiler(gl, { a_position: POSITION_ATTRIBUTE })
+        if (activeRenderMode === "gbuffer" || multiPass) supportsFloatRenderTargets(gl, isWebGL2)
+
+        // The placeholder is tiny, so its synchronous compile costs next to nothing.
+        const placeholderProgram = compiler.begin("placeholder", vertexShaderSource, placeholderShaderSource(isWebGL2))
+        const placeholderResult = placeholderProgram ? compiler.finish(placeholderProgram) : null
+        if (!placeholderResult || !placeholderResult.ok) throw new Error("Placeholder program failed")
+        placeholderPass = toPass(placeholderResult.program)
+
+        // The active tier's programs compile in the background while the
+        // placeholder is shown; the adjacent tiers follow once it is up.
+        programSets.clear()
+        debugProgram = null
+        if (!beginProgramSet(activeTier)) throw new Error("Program creation failed")
+
+        mainPass = null
+        atlasPass = null
+        tracePass = null
+        gbuffer = null
+        tileStats = null
+        temporalMarch = null
+        diskAtlas = null
+        postChain = null
+        postPasses = null
+        geometryDirty = true
+      },
+      dispose(gl) {
+        programSets.forEach((set) => deleteProgramSet(set))
+        programSets.clear()
+        deleteDebugProgram()
+        gl.deleteProgram(placeholderPass.program)
+        gbuffer?.dispose()
+        tileStats?.dispose()
+        diskAtlas?.dispose()
+        postChain?.dispose()
+      },
+    })
+  } catch (e) {
+    console.error("[v0] Failed to create shader programs:", e)
+    host.onError({ kind: "webgl" })
+    return null
+  }
+
+  let quadBuffer: WebGLBuffer | null = null
+  resources.add({
+    name: "fullscreen-quad",
+    create(gl) {
+      quadBuffer = gl.createBuffer()
+      gl.bindBuffer(gl.ARRAY_BUFFER, quadBuffer)
+      gl.bufferData(gl.ARRAY_BUFFER, new Float32Array([-1, -1, 1, -1, -1, 1, 1, 1]), gl.STATIC_DRAW)
+      gl.enableVertexAttribArray(POSITION_ATTRIBUTE)
+      gl.vertexAttribPointer(POSITION_ATTRIBUTE, 2, gl.FLOAT, false, 0, 0)
+    },
+    dispose: (gl) => gl.deleteBuffer(quadBuffer),
+  })
+
+  // Baked once; a rebuild only re-uploads it.
+  const diskNoise = buildDiskNoise()
+  let diskNoiseTexture: WebGLTexture | null = null
+  resources.add({
+    name: "disk-noise",
+    create(gl) {
+      diskNoiseTexture = gl.createTexture()
+      gl.activeTexture(gl.TEXTURE0 + DISK_NOISE_TEXTURE_UNIT)
+      gl.bindTexture(gl.TEXTURE_2D, diskNoiseTexture)
+      gl.texImage2D(
+        gl.TEXTURE_2D,
+        0,
+        gl.LUMINANCE,
+        DISK_NOISE_SIZE,
+        DISK_NOISE_SIZE,
+        0,
+        gl.LUMINANCE,
+        gl.UNSIGNED_BYTE,
+        diskNoise,
+      )
+      // Sampled inside the march loop, where screen-space derivatives are undefined, so no mipmaps.
+      gl.texParameteri(gl.TEXTURE_2D, gl.TEXTURE_MIN_FILTER, gl.LINEAR)
+      gl.texParameteri(gl.TEXTURE_2D, gl.TEXTURE_MAG_FILTER, gl.LINEAR)
+      gl.texParameteri(gl.TEXTURE_2D, gl.TEXTURE_WRAP_S, gl.REPEAT)
+      gl.texParameteri(gl.TEXTURE_2D, gl.TEXTURE_WRAP_T, gl.REPEAT)
+    },
+    dispose: (gl) => gl.deleteTexture(diskNoiseTexture),
+  })
+
+  if (isWebGL2) {
+    // A few thousand texels, so it is built synchronously; WebGL1 variants shift the color analytically.
+    const shiftLut = buildDiskShiftLut()
+    let diskShiftTexture: WebGLTexture | null = null
+    resources.add({
+      name: "disk-shift-lut",
+      create(gl) {
+        const gl2 = gl as WebGL2RenderingContext
+        diskShiftTexture = gl2.createTexture()
+        gl2.activeTexture(gl2.TEXTURE0 + DISK_SHIFT_TEXTURE_UNIT)
+        gl2.bindTexture(gl2.TEXTURE_2D, diskShiftTexture)
+        gl2.texImage2D(
+          gl2.TEXTURE_2D,
+          0,
+          gl2.RGBA16F,
+          shiftLut.width,
+          shiftLut.height,
+          0,
+          gl2.RGBA,
+          gl2.FLOAT,
+          shiftLut.data,
+        )
+        gl2.texParameteri(gl2.TEXTURE_2D, gl2.TEXTURE_MIN_FILTER, gl2.LINEAR)
+        gl2.texParameteri(gl2.TEXTURE_2D, gl2.TEXTURE_MAG_FILTER, gl2.LINEAR)
+        gl2.texParameteri(gl2.TEXTURE_2D, gl2.TEXTURE_WRAP_S, gl2.CLAMP_TO_EDGE)
+        gl2.texParameteri(gl2.TEXTURE_2D, gl2.TEXTURE_WRAP_T, gl2.CLAMP_TO_EDGE)
+      },
+      dispose: (gl) => gl.deleteTexture(diskShiftTexture),
+    })
+  }
+
+  if (activeRenderMode === "direct" && activeGeodesicMode === "lut") {
+    // Integrating the table is the slow part, so a rebuild only re-uploads it.
+    const lut = buildGeodesicLut(GEODESIC_LUT_PARAMS)
+    let geodesicLutTexture: WebGLTexture | null = null
+    resources.add({
+      name: "geodesic-lut",
+      create(gl) {
+        const gl2 = gl as WebGL2RenderingContext
+        geodesicLutTexture = gl2.createTexture()
+        gl2.activeTexture(gl2.TEXTURE0 + GEODESIC_LUT_TEXTURE_UNIT)
+        gl2.bindTexture(gl2.TEXTURE_2D, geodesicLutTexture)
+        gl2.texImage2D(gl2.TEXTURE_2D, 0, gl2.RGBA16F, lut.width, lut.height, 0, gl2.RGBA, gl2.FLOAT, lut.data)
+        gl2.texParameteri(gl2.TEXTURE_2D, gl2.TEXTURE_MIN_FILTER, gl2.LINEAR)
+        gl2.texParameteri(gl2.TEXTURE_2D, gl2.TEXTURE_MAG_FILTER, gl2.LINEAR)
+        gl2.texParameteri(gl2.TEXTURE_2D, gl2.TEXTURE_WRAP_S, gl2.CLAMP_TO_EDGE)
+        gl2.texParameteri(gl2.TEXTURE_2D, gl2.TEXTURE_WRAP_T, gl2.CLAMP_TO_EDGE)
+      },
+      dispose: (gl) => gl.deleteTexture(geodesicLutTexture),
+    })
+  }
+
+  let gpuTimer: GpuTimer | null = null
+  // Timer queries cannot nest, so the post chain gets its own timer and the frame cost is the sum of both.
+  let postTimer: GpuTimer | null = null
+  let postGpuMs: number | null = null
+  resources.add({
+    name: "gpu-timer",
+    create: (gl) => {
+      gpuTimer = GpuTimer.create(gl, isWebGL2)
+      postTimer = multiPass && gpuTimer ? GpuTimer.create(gl, isWebGL2) : null
+      postGpuMs = null
+    },
+    dispose: () => {
+      gpuTimer?.dispose()
+      postTimer?.dispose()
+    },
+  })
+
+  let governor = new ResolutionGovernor({
+    minScale: quality.minPixelRatio,
+    maxScale: quality.maxPixelRatio,
+    // The post chain's upscaler keeps a smaller march sharp, so low tiers start further down.
+    initialScale: multiPass ? quality.upscaledPixelRatio : quality.pixelRatio,
+    targetFPS: quality.targetFPS,
+  })
+  const tierGovernor = new TierGovernor(activeTier)
+
+  let firstFrameMs: number | null = null
+  let firstFullFrameMs: number | null = null
+
+  // Set while the context is gone; the frame loop keeps running but draws nothing.
+  let contextLost = false
+  let lostAt = 0
+  let recovery: { restoredAt: number; lostMs: number; rebuildMs: number } | null = null
+  canvas.addEventListener("webglcontextlost", (e) => {
+    e.preventDefault()
+    contextLost = true
+    lostAt = performance.now()
+    trace?.instant("context-lost")
+    console.warn("[v0] WebGL context lost")
+  })
+
+  canvas.addEventListener("webglcontextrestored", () => {
+    const restoredAt = performance.now()
+    try {
+      recovery = { restoredAt, lostMs: restoredAt - lostAt, rebuildMs: resources.rebuild() }
+    } catch (e) {
+      console.error("[v0] Failed to rebuild GPU resources:", e)
+      host.onError({ kind: "webgl" })
+      cancelFrame(animationId)
+      return
+    }
+    trace?.instant("context-restored", { rebuildMs: recovery.rebuildMs })
+    applyResolution()
+    lastDrawTime = 0
+    contextLost = false
+  })
+
+  let viewport: RendererViewport | null = null
+  // Size the scene is traced at; the canvas matches it unless the post chain rescales.
+  let marchWidth = 0
+  let marchHeight = 0
+  function applyResolution() {
+    if (!viewport) return
+    // Benchmarks render at exactly the viewport size so runs are comparable.
+    const scale = benchmark ? 1 : governor.getState().scale
+    const dpr = Math.min(viewport.devicePixelRatio * scale, 2.5)
+    marchWidth = Math.floor(viewport.width * dpr)
+    marchHeight = Math.floor(viewport.height * dpr)
+    // With the post chain the canvas stays at the display's own density while the governor moves the march.
+    const displayDpr = multiPass ? Math.min(viewport.devicePixelRatio, 2.5) : dpr
+    const width = Math.floor(viewport.width * displayDpr)
+    const height = Math.floor(viewport.height * displayDpr)
+    // Assigning a canvas dimension reallocates the drawing buffer even when it is unchanged.
+    if (canvas.width !== width) canvas.width = width
+    if (canvas.height !== height) canvas.height = height
+    glContext!.viewport(0, 0, canvas.width, canvas.height)
+    geometryDirty = true
+    trace?.instant("resize", { width: marchWidth, height: marchHeight, displayWidth: width, displayHeight: height, scale })
+  }
+
+  /** Binds what the scene pass draws into: the post chain's HDR target, or the canvas. */
+  function bindSceneTarget() {
+    if (postChain) {
+      postChain.bindSceneForWriting()
+    } else {
+      glContext!.bindFramebuffer(glContext!.FRAMEBUFFER, null)
+      glContext!.viewport(0, 0, canvas.width, canvas.height)
+    }
+  }
+
+  /**
+   * Blends the frame just marched into the temporal history, reprojected by
+   * the march's motion target, for the post chain to read in its place. A
+   * debug view is not accumulated and leaves the history to start over.
+   */
+  function resolveTemporal(chain: PostChain, post: PostPasses, active: boolean) {
+    if (!active) {
+      chain.resolved = false
+      historyValid = false
+      return
+    }
+    const gl = glContext!
+    activateProgram(post.resolve!.program)
+    chain.bindMarch(POST_SOURCE_TEXTURE_UNIT)
+    chain.bindMotion(TEMPORAL_MOTION_TEXTURE_UNIT)
+    chain.bindHistoryForResolve(TEMPORAL_HISTORY_TEXTURE_UNIT)
+    gl.uniform1f(post.historyWeightLoc, historyValid ? TEMPORAL_HISTORY_WEIGHT : 0)
+    gl.drawArrays(gl.TRIANGLE_STRIP, 0, 4)
+    chain.commitResolve()
+    historyValid = true
+  }
+
+  /**
+   * Runs the post chain on the scene target: bright-pass and downsample into
+   * the bloom pyramid, upsample it back to its top level, then composite to
+   * the canvas. A march smaller than the canvas is composited at its own size
+   * and upscaled by EASU and sharpened by RCAS instead, unless diagnostics
+   * ask for bilinear. `raw` shows a debug view's colors without bloom or
+   * tonemap, and bilinear.
+   */
+  function runPostChain(chain: PostChain, post: PostPasses, raw: boolean) {
+    const gl = glContext!
+    const levels = raw || !quality.bloomEnabled ? 0 : chain.bloomLevels
+    if (levels > 0) {
+      activateProgram(post.down.program)
+      for (let level = 0; level < levels; level++) {
+        if (level === 0) {
+          chain.bindScene(POST_SOURCE_TEXTURE_UNIT)
+        } else {
+          chain.bindBloom(level - 1, POST_SOURCE_TEXTURE_UNIT)
+        }
+        chain.bindBloomForWriting(level)
+        const [texelX, texelY] = chain.texelSize(level - 1)
+        gl.uniform2f(post.downTexelLoc, texelX, texelY)
+        gl.uniform1i(post.prefilterLoc, level === 0 ? 1 : 0)
+        gl.drawArrays(gl.TRIANGLE_STRIP, 0, 4)
+      }
+
+      // Each level is added onto the one above, so the top ends up with the sum of all of them.
+      activateProgram(post.up.program)
+      gl.enable(gl.BLEND)
+      gl.blendFunc(gl.ONE, gl.ONE)
+      for (let level = levels - 1; level > 0; level--) {
+        chain.bindBloom(level, POST_SOURCE_TEXTURE_UNIT)
+        chain.bindBloomForWriting(level - 1)
+        const [texelX, texelY] = chain.texelSize(level)
+        gl.uniform2f(post.upTexelLoc, texelX * 0.5, texelY * 0.5)
+        gl.drawArrays(gl.TRIANGLE_STRIP, 0, 4)
+      }
+      gl.disable(gl.BLEND)
+      chain.bindBloom(0, POST_BLOOM_TEXTURE_UNIT)
+    }
+
+    activateProgram(post.composite.program)
+    chain.bindScene(POST_SOURCE_TEXTURE_UNIT)
+    gl.uniform1f(post.bloomScaleLoc, levels > 0 ? BLOOM_STRENGTH / levels : 0)
+    gl.uniform1i(post.rawColorLoc, raw ? 1 : 0)
+    const upscaler = raw || marchWidth >= canvas.width ? "bilinear" : diagnostics.upscaler
+    if (upscaler !== "fsr") {
+      gl.bindFramebuffer(gl.FRAMEBUFFER, null)
+      gl.viewport(0, 0, canvas.width, canvas.height)
+      gl.uniform2f(post.composite.resolutionLoc, canvas.width, canvas.height)
+      gl.drawArrays(gl.TRIANGLE_STRIP, 0, 4)
+      if (upscaler === "bilinear") return
+    }
+
+    chain.bindCompositedForWriting()
+    gl.uniform2f(post.composite.resolutionLoc, marchWidth, marchHeight)
+    gl.drawArrays(gl.TRIANGLE_STRIP, 0, 4)
+
+    activateProgram(post.easu.program)
+    chain.bindComposited(POST_SOURCE_TEXTURE_UNIT)
+    chain.bindUpscaledForWriting()
+    gl.uniform2f(post.easu.resolutionLoc, canvas.width, canvas.height)
+    gl.uniform2f(post.easuSourceSizeLoc, marchWidth, marchHeight)
+    gl.drawArrays(gl.TRIANGLE_STRIP, 0, 4)
+
+    activateProgram(post.rcas.program)
+    chain.bindUpscaled(POST_SOURCE_TEXTURE_UNIT)
+    gl.bindFramebuffer(gl.FRAMEBUFFER, null)
+    gl.viewport(0, 0, canvas.width, canvas.height)
+    // The split view sharpens only the right half, over the bilinear image.
+    if (upscaler === "split") {
+      gl.enable(gl.SCISSOR_TEST)
+      gl.scissor(canvas.width >> 1, 0, canvas.width - (canvas.width >> 1), canvas.height)
+    }
+    gl.drawArrays(gl.TRIANGLE_STRIP, 0, 4)
+    gl.disable(gl.SCISSOR_TEST)
+  }
+
+  let lastTelemetryTime = 0
+  function reportResolution(changed: boolean, now: number) {
+    lastTelemetryTime = now
+    host.onTelemetry({
+      type: "resolution",
+      changed,
+      width: marchWidth,
+      height: marchHeight,
+      displayWidth: canvas.width,
+      displayHeight: canvas.height,
+      ...governor.getState(),
+    })
+  }
+
+  let isVisible = true
+  let lastDrawTime = 0
+
+  // The scene clock starts with the first full frame, so the render opens on
+  // the u_time 0 frame that the poster images show.
+  let startTime: number | null = null
+  let animationId: number
+  let lastFrameTime = 0
+  let frameInterval = 1000 / quality.targetFPS
+  // Temporal accumulation: frames marched so far, which picks each one's
+  // jitter, the scene time of the last, and whether the history holds frames
+  // the current one can be reprojected onto.
+  let temporalFrame = 0
+  let lastSceneTime = 0
+  let historyValid = false
+  const syncPixel = new Uint8Array(4)
+
+  /** Moves to the decided tier if its programs are ready. Returns false to try again later. */
+  function switchTier(decision: TierDecision): boolean {
+    const passes = programSets.get(decision.tier)?.passes
+    if (!passes) return false
+
+    const from = activeTier
+    activeTier = decision.tier
+    quality = getQualitySettings(activeTier)
+    activateProgramSet(passes)
+    // Carry the current scale over so the switch itself does not also jump in resolution.
+    governor = new ResolutionGovernor({
+      minScale: quality.minPixelRatio,
+      maxScale: quality.maxPixelRatio,
+      initialScale: governor.getState().scale,
+      targetFPS: quality.targetFPS,
+    })
+    frameInterval = 1000 / quality.targetFPS
+    tierGovernor.commit(decision)
+    prepareAdjacentTiers()
+    applyResolution()
+    trace?.instant("tier-change", { from, to: activeTier })
+    host.onTelemetry({ type: "tier-change", from, to: activeTier, direction: decision.direction, ...decision.percentiles })
+    return true
+  }
+
+  function render(currentTime: number) {
+    animationId = requestFrame(render)
+
+    if (!viewport || !isVisible || contextLost) return
+
+    const elapsed = currentTime - lastFrameTime
+    if (elapsed < frameInterval && !benchmark) {
+      trace?.instant("skipped-frame", { sinceLastMs: elapsed })
+      return
+    }
+
+    lastFrameTime = currentTime - (elapsed % frameInterval)
+    if (!trace) {
+      drawFrame(currentTime)
+      return
+    }
+    const frameStart = performance.now()
+    drawFrame(currentTime)
+    trace?.span("frame", frameStart, { width: marchWidth, height: marchHeight, tier: activeTier })
+  }
+
+  function drawFrame(currentTime: number) {
+    const frameStart = performance.now()
+    const time = benchmark ? benchmark.time : startTime === null ? 0 : (performance.now() - startTime) / 1000
+
+    for (const [tier, set] of programSets) {
+      if (!set.pending) continue
+      set.framesWaited++
+      // Without the parallel compile extension the status query blocks, so only
+      // ask once the placeholder has reached the screen, and give adjacent
+      // tiers long enough that the driver has most likely finished.
+      const isActive = tier === activeTier
+      const minFrames = isActive ? 2 : compiler.isParallel ? 0 : ADJACENT_TIER_COMPILE_FRAMES
+      // Every program is polled every frame, so each one's compile time ends when it settles.
+      const settled = set.pending.map((pending) => compiler.isSettled(pending)).every(Boolean)
+      if (set.framesWaited < minFrames || !settled) continue
+
+      const error = finishProgramSet(tier, set)
+      if (isActive) {
+        if (error !== null) {
+          host.onError({ kind: "shader", message: error })
+          cancelFrame(animationId)
+          return
+        }
+        activateProgramSet(set.passes!)
+        prepareAdjacentTiers()
+      } else if (error !== null) {
+        console.warn(`[v0] ${tier} tier programs failed; staying off that tier`)
+      }
+      // Finish at most one set per frame so blocking queries do not pile up.
+      break
+    }
+
+    if (!mainPass) {
+      activateProgram(placeholderPass.program)
+      glContext!.uniform1f(placeholderPass.timeLoc, (performance.now() - createdAt) / 1000)
+      glContext!.uniform2f(placeholderPass.resolutionLoc, canvas.width, canvas.height)
+      glContext!.drawArrays(glContext!.TRIANGLE_STRIP, 0, 4)
+      if (firstFrameMs === null) firstFrameMs = performance.now() - createdAt
+      return
+    }
+    const pass: ShaderPass = mainPass
+    const atlas: ShaderPass = atlasPass!
+    startTime ??= performance.now()
+
+    if (postChain) {
+      const upscaling = marchWidth < canvas.width && diagnostics.upscaler !== "bilinear"
+      const complete =
+        ((postChain.width === marchWidth && postChain.height === marchHeight) ||
+          postChain.resize(marchWidth, marchHeight)) &&
+        (!upscaling || postChain.resizeUpscale(canvas.width, canvas.height))
+      if (!complete) {
+        console.error("[v0] Post chain framebuffer incomplete")
+        host.onError({ kind: "webgl" })
+        cancelFrame(animationId)
+        return
+      }
+    }
+
+    // A new size or tier leaves nothing to reproject.
+    if (geometryDirty) historyValid = false
+
+    if (gbuffer && tracePass && geometryDirty) {
+      if (!gbuffer.resize(marchWidth, marchHeight)) {
+        console.error("[v0] G-buffer framebuffer incomplete")
+        host.onError({ kind: "webgl" })
+        cancelFrame(animationId)
+        return
+      }
+      const traceStart = trace ? performance.now() : 0
+      gbuffer.bindForWriting()
+      activateProgram(tracePass.program)
+      glContext!.uniform1f(tracePass.timeLoc, 0)
+      glContext!.uniform2f(tracePass.resolutionLoc, marchWidth, marchHeight)
+      glContext!.drawArrays(glContext!.TRIANGLE_STRIP, 0, 4)
+      activateProgram(pass.program)
+      gbuffer.bindTextures(GBUFFER_TEXTURE_UNITS)
+      geometryDirty = false
+      trace?.span("gbuffer-trace", traceStart)
+    }
+
+    if (tileStats && tracePass && geometryDirty) {
+      if (!tileStats.resize(marchWidth, marchHeight)) {
+        console.error("[v0] Tile stats framebuffer incomplete")
+        host.onError({ kind: "webgl" })
+        cancelFrame(animationId)
+        return
+      }
+      const prepassStart = trace ? performance.now() : 0
+      tileStats.bindForWriting()
+      activateProgram(tracePass.program)
+      glContext!.uniform1f(tracePass.timeLoc, 0)
+      glContext!.uniform2f(tracePass.resolutionLoc, marchWidth, marchHeight)
+      glContext!.drawArrays(glContext!.TRIANGLE_STRIP, 0, 4)
+      host.onTelemetry({ type: "tile-stats", ...tileStats.summarize(quality.maxSteps) })
+      activateProgram(pass.program)
+      tileStats.bindTexture(TILE_STATS_TEXTURE_UNIT)
+      glContext!.uniform2f(tileCountLoc, tileStats.columns, tileStats.rows)
+      geometryDirty = false
+      trace?.span("tile-prepass", prepassStart)
+    }
+
+    const debug = diagnostics.debugView !== "off" && tileStats ? readyDebugProgram() : null
+    const drawn = debug ? debug.pass! : pass
+    if (debug) {
+      activateProgram(drawn.program)
+      glContext!.uniform1i(debug.viewLoc, DEBUG_VIEWS[diagnostics.debugView as keyof typeof DEBUG_VIEWS])
+      glContext!.uniform2f(debug.tileCountLoc, tileStats!.columns, tileStats!.rows)
+    }
+
+    // Only the steady-state passes are timed; a one-off G-buffer trace should not shrink the resolution.
+    const drawStart = performance.now()
+    gpuTimer?.begin()
+    // The disk flows every frame, so its atlas is redrawn before the pass that reads it.
+    diskAtlas!.bindForWriting()
+    activateProgram(atlas.program)
+    glContext!.uniform1f(atlas.timeLoc, time)
+    glContext!.drawArrays(glContext!.TRIANGLE_STRIP, 0, 4)
+    bindSceneTarget()
+    activateProgram(drawn.program)
+    trace?.span("disk-atlas", drawStart)
+
+    const uploadStart = trace ? performance.now() : 0
+    glContext!.uniform1f(drawn.timeLoc, time)
+    glContext!.uniform2f(drawn.resolutionLoc, marchWidth, marchHeight)
+    if (temporalMarch && !debug) {
+      const timeStep = time - lastSceneTime
+      // After a stall the motion estimate no longer holds.
+      if (timeStep < 0 || timeStep > TEMPORAL_MAX_TIME_STEP) historyValid = false
+      const jitter = temporalJitter(temporalFrame++)
+      glContext!.uniform2f(temporalMarch.jitterLoc, jitter.x, jitter.y)
+      glContext!.uniform1f(temporalMarch.jitterPhaseLoc, jitter.phase)
+      glContext!.uniform1f(temporalMarch.timeStepLoc, historyValid ? timeStep : 0)
+      lastSceneTime = time
+    }
+    trace?.span("upload-uniforms", uploadStart, { time })
+    glContext!.drawArrays(glContext!.TRIANGLE_STRIP, 0, 4)
+    gpuTimer?.end()
+    if (postChain && postPasses) {
+      const postStart = trace ? performance.now() : 0
+      postTimer?.begin()
+      if (postPasses.resolve) {
+        resolveTemporal(postChain, postPasses, debug === null)
+        trace?.span("temporal-resolve", postStart)
+      }
+      runPostChain(postChain, postPasses, debug !== null)
+      postTimer?.end()
+      trace?.span("post-chain", postStart, {
+        bloom: quality.bloomEnabled && debug === null,
+        upscaler: marchWidth < canvas.width ? diagnostics.upscaler : "none",
+      })
+    }
+    trace?.span("draw", drawStart, { debug: debug !== null })
+    if (debug) activateProgram(pass.program)
+
+    if (benchmark && firstFullFrameMs !== null) {
+      // Reading a pixel back waits for the draw to complete, unlike finish() on some drivers.
+      glContext!.readPixels(0, 0, 1, 1, glContext!.RGBA, glContext!.UNSIGNED_BYTE, syncPixel)
+      host.onTelemetry({ type: "frame", frameMs: performance.now() - drawStart })
+      return
+    }
+
+    if (firstFullFrameMs === null || recovery) {
+      if (recovery) {
+        host.onTelemetry({
+          type: "context-restored",
+          lostMs: recovery.lostMs,
+          rebuildMs: recovery.rebuildMs,
+          recoveryMs: performance.now() - recovery.restoredAt,
+        })
+        recovery = null
+      } else {
+        firstFullFrameMs = performance.now() - createdAt
+        host.onTelemetry({ type: "startup", firstFrameMs: firstFrameMs ?? firstFullFrameMs, firstFullFrameMs })
+      }
+      // The first real frame ends the placeholder phase; its interval is not a steady-state cost.
+      lastDrawTime = currentTime
+      return
+    }
+
+    let changed = false
+    const sceneGpuMs = gpuTimer?.poll() ?? null
+    postGpuMs = postTimer?.poll() ?? postGpuMs
+    const gpuMs = sceneGpuMs !== null ? sceneGpuMs + (postGpuMs ?? 0) : null
+    let cost: { ms: number; source: FrameCostSource } | null = null
+    if (gpuMs !== null) {
+      cost = { ms: gpuMs, source: "gpu" }
+    } else if (!gpuTimer && lastDrawTime > 0) {
+      cost = { ms: currentTime - lastDrawTime, source: "raf" }
+    }
+    lastDrawTime = currentTime
+    if (gpuMs !== null) trace?.counter("gpu-ms", { gpu: gpuMs, post: postGpuMs ?? 0 })
+
+    if (diagnostics.frameTimings) {
+      host.onTelemetry({ type: "frame-timing", cpuMs: performance.now() - frameStart, gpuMs, postGpuMs })
+    }
+
+    if (cost) {
+      changed = governor.sample(cost.ms, cost.source)
+      if (adaptiveQuality && !changed) {
+        const state = governor.getState()
+        const scaleLimit =
+          state.scale <= quality.minPixelRatio + 1e-3 ? "min" : state.scale >= quality.maxPixelRatio - 1e-3 ? "max" : null
+        const decision = tierGovernor.sample(cost.ms, cost.source, state.targetFrameMs, scaleLimit)
+        if (decision && switchTier(decision)) {
+          reportResolution(true, currentTime)
+          return
+        }
+      }
+    }
+
+    if (changed) {
+      applyResolution()
+      reportResolution(true, currentTime)
+    } else if (currentTime - lastTelemetryTime > TELEMETRY_INTERVAL_MS) {
+      reportResolution(false, currentTime)
+    }
+  }
+
+  animationId = requestFrame(render)
+
+  return {
+    setViewport(next: RendererViewport) {
+      viewport = next
+      applyResolution()
+    },
+    setVisible(visible: boolean) {
+      isVisible = visible
+      // The gap while hidden is not a frame cost.
+      lastDrawTime = 0
+      historyValid = false
+      tierGovernor.reset()
+      trace?.instant("visibility", { visible })
+    },
+    setDiagnostics(next: RendererDiagnostics) {
+      diagnostics = next
+      if (next.debugView === "off") deleteDebugProgram()
+    },
+    startTrace() {
+      trace = new TraceRecorder()
+    },
+    stopTrace() {
+      const recorded = trace?.export(typeof window === "undefined" ? "Render worker" : "Main thread") ?? null
+      trace = null
+      return Promise.resolve(recorded)
+    },
+    dispose() {
+      cancelFrame(animationId)
+      // After a loss the objects are gone already and deleting them is a no-op.
+      resources.dispose()
+    },
+  }
+}
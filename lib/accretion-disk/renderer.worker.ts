@@ -0,0 +1,47 @@
+import { createAccretionDiskRenderer, type AccretionDiskRenderer } from "./renderer"
+import type { WorkerInboundMessage, WorkerOutboundMessage } from "./worker-protocol"
+
+// The project compiles against the DOM lib only, so describe the worker scope we use.
+const scope = self as unknown as {
+  onmessage: ((event: MessageEvent<WorkerInboundMessage>) => void) | null
+  postMessage(message: WorkerOutboundMessage): void
+  close(): void
+}
+
+let renderer: AccretionDiskRenderer | null = null
+
+scope.onmessage = (event) => {
+  const message = event.data
+  switch (message.type) {
+    case "init":
+      renderer = createAccretionDiskRenderer(message.canvas, message.options, {
+        onTelemetry: (telemetry) => scope.postMessage({ type: "telemetry", event: telemetry }),
+        onError: (error) => scope.postMessage({ type: "error", error }),
+      })
+      break
+    case "viewport":
+      renderer?.setViewport(message.viewport)
+      break
+    case "visibility":
+      renderer?.setVisible(message.visible)
+      break
+    case "diagnostics":
+      renderer?.setDiagnostics(message.diagnostics)
+      break
+    case "start-trace":
+      renderer?.startTrace()
+      break
+    case "stop-trace":
+      if (renderer) {
+        renderer.stopTrace().then((trace) => scope.postMessage({ type: "trace", trace }))
+      } else {
+        scope.postMessage({ type: "trace", trace: null })
+      }
+      break
+    case "dispose":
+      renderer?.dispose()
+      renderer = null
+      scope.close()
+      break
+  }
+}
@@ -0,0 +1,138 @@
+export type FrameCostSource = "gpu" | "raf"
+
+export interface ResolutionGovernorOptions {
+  /** Lowest render scale (multiplier on devicePixelRatio) the governor may pick. */
+  minScale: number
+  /** Highest render scale the governor may pick. */
+  maxScale: number
+  /** Scale used until the first measurements arrive. */
+  initialScale: number
+  targetFPS: number
+}
+
+export interface ResolutionGovernorState {
+  scale: number
+  /** Smoothed frame cost in milliseconds. */
+  frameCostMs: number
+  source: FrameCostSource
+  /** Budget the cost is compared against for the current source. */
+  targetFrameMs: number
+}
+
+// Aim below the frame budget so compositor and main-thread work still fit.
+const BUDGET_HEADROOM = 0.85
+// rAF deltas sit at the frame interval when keeping up, so only a clear overrun counts.
+const RAF_TOLERANCE = 1.15
+// Cost band (as a fraction of the budget) inside which the scale is left alone.
+const LOWER_BAND = 0.7
+const UPPER_BAND = 1.0
+// Consecutive out-of-band samples required before acting, and frames to wait after a change.
+const SAMPLES_TO_DOWNSCALE = 6
+const SAMPLES_TO_UPSCALE = 30
+const MAX_UPSCALE_BACKOFF = 8
+const COOLDOWN_SAMPLES = 20
+const SCALE_QUANTUM = 0.05
+const MAX_UPSCALE_STEP = 0.1
+const EMA_ALPHA = 0.15
+
+/**
+ * Closed-loop controller that trades render-target resolution for frame time.
+ * Fragment cost scales with pixel count, i.e. with scale², so corrections are
+ * made in sqrt(budget / cost) steps, quantized to avoid reallocating the
+ * drawing buffer for tiny changes.
+ */
+export class ResolutionGovernor {
+  private scale: number
+  private frameCost = 0
+  private source: FrameCostSource = "raf"
+  private overBudgetCount = 0
+  private underBudgetCount = 0
+  private cooldown = 0
+  private upscaleBackoff = 1
+  private samplesSinceUpscale = Infinity
+  private readonly frameIntervalMs: number
+
+  constructor(private readonly options: ResolutionGovernorOptions) {
+    this.scale = clamp(options.initialScale, options.minScale, options.maxScale)
+    this.frameIntervalMs = 1000 / options.targetFPS
+  }
+
+  /**
+   * Feeds one frame-cost measurement. Returns true when the scale changed and
+   * the render target must be resized.
+   */
+  sample(costMs: number, source: FrameCostSource): boolean {
+    if (!Number.isFinite(costMs) || costMs <= 0) return false
+
+    // GPU timings are authoritative; once they flow, ignore rAF deltas.
+    if (source === "raf" && this.source === "gpu") return false
+    if (source !== this.source) {
+      this.source = source
+      this.frameCost = costMs
+    } else {
+      this.frameCost = this.frameCost === 0 ? costMs : this.frameCost + (costMs - this.frameCost) * EMA_ALPHA
+    }
+
+    this.samplesSinceUpscale++
+    if (this.cooldown > 0) {
+      this.cooldown--
+      return false
+    }
+
+    const ratio = this.frameCost / this.budget()
+    if (ratio > UPPER_BAND) {
+      this.overBudgetCount++
+      this.underBudgetCount = 0
+    } else if (ratio < LOWER_BAND || (this.source === "raf" && ratio <= UPPER_BAND)) {
+      // rAF deltas are clamped by vsync and the FPS cap, so they cannot reveal
+      // real headroom; when within budget, probe upward slowly instead.
+      this.underBudgetCount++
+      this.overBudgetCount = 0
+    } else {
+      this.overBudgetCount = 0
+      this.underBudgetCount = 0
+    }
+
+    let next = this.scale
+    if (this.overBudgetCount >= SAMPLES_TO_DOWNSCALE) {
+      next = this.scale * Math.sqrt(1 / ratio)
+    } else if (this.underBudgetCount >= SAMPLES_TO_UPSCALE * this.upscaleBackoff) {
+      const ideal = this.source === "gpu" ? this.scale * Math.sqrt(1 / Math.max(ratio, 0.01)) : this.scale
+      next = Math.min(Math.max(ideal, this.scale + SCALE_QUANTUM), this.scale + MAX_UPSCALE_STEP)
+    } else {
+      return false
+    }
+
+    next = clamp(Math.round(next / SCALE_QUANTUM) * SCALE_QUANTUM, this.options.minScale, this.options.maxScale)
+    this.overBudgetCount = 0
+    this.underBudgetCount = 0
+    if (Math.abs(next - this.scale) < SCALE_QUANTUM / 2) return false
+
+    if (next > this.scale) {
+      this.samplesSinceUpscale = 0
+    } else if (this.samplesSinceUpscale < COOLDOWN_SAMPLES * 3) {
+      // The last upscale did not hold; probe less eagerly to avoid oscillating between two sizes.
+      this.upscaleBackoff = Math.min(this.upscaleBackoff * 2, MAX_UPSCALE_BACKOFF)
+    }
+    this.scale = next
+    this.cooldown = COOLDOWN_SAMPLES
+    return true
+  }
+
+  getState(): ResolutionGovernorState {
+    return {
+      scale: this.scale,
+      frameCostMs: this.frameCost,
+      source: this.source,
+      targetFrameMs: this.budget(),
+    }
+  }
+
+  private budget() {
+    return this.source === "gpu" ? this.frameIntervalMs * BUDGET_HEADROOM : this.frameIntervalMs * RAF_TOLERANCE
+  }
+}
+
+function clamp(value: number, min: number, max: number) {
+  return Math.min(Math.max(value, min), max)
+}
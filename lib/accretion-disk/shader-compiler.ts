@@ -0,0 +1,105 @@
+type GL = WebGL2RenderingContext | WebGLRenderingContext
+
+export interface PendingProgram {
+  name: string
+  program: WebGLProgram
+  shaders: WebGLShader[]
+  startedAt: number
+  /** When the parallel compile was first seen complete; null until then and without the extension. */
+  settledAt: number | null
+}
+
+export type ProgramResult = { ok: true; program: WebGLProgram; compileMs: number } | { ok: false; error: string }
+
+/**
+ * Compiles and links programs without querying their status up front. With
+ * KHR_parallel_shader_compile the driver compiles on its own threads and
+ * `isSettled` can be polled once per frame; without it the first status query
+ * in `finish` blocks until the driver is done, so callers should defer it
+ * until something has been presented.
+ */
+export class ShaderCompiler {
+  private readonly parallel: { COMPLETION_STATUS_KHR: number } | null
+
+  constructor(
+    private readonly gl: GL,
+    private readonly attributes: Record<string, number>,
+  ) {
+    this.parallel = gl.getExtension("KHR_parallel_shader_compile")
+  }
+
+  get isParallel() {
+    return this.parallel !== null
+  }
+
+  begin(name: string, vertexSource: string, fragmentSource: string): PendingProgram | null {
+    const gl = this.gl
+    const startedAt = performance.now()
+    const vertexShader = gl.createShader(gl.VERTEX_SHADER)
+    const fragmentShader = gl.createShader(gl.FRAGMENT_SHADER)
+    const program = gl.createProgram()
+    if (!vertexShader || !fragmentShader || !program) {
+      console.error("[v0] Failed to create shader")
+      return null
+    }
+
+    gl.shaderSource(vertexShader, vertexSource)
+    gl.compileShader(vertexShader)
+    gl.shaderSource(fragmentShader, fragmentSource)
+    gl.compileShader(fragmentShader)
+    gl.attachShader(program, vertexShader)
+    gl.attachShader(program, fragmentShader)
+    for (const [attribute, location] of Object.entries(this.attributes)) {
+      gl.bindAttribLocation(program, location, attribute)
+    }
+    gl.linkProgram(program)
+
+    return { name, program, shaders: [vertexShader, fragmentShader], startedAt, settledAt: null }
+  }
+
+  /**
+   * Non-blocking readiness check; always true without the parallel compile
+   * extension. Poll it every frame, since the compile time ends when it first
+   * reads true.
+   */
+  isSettled(pending: PendingProgram): boolean {
+    if (!this.parallel || pending.settledAt !== null) return true
+    if (!this.gl.getProgramParameter(pending.program, this.parallel.COMPLETION_STATUS_KHR)) return false
+    pending.settledAt = performance.now()
+    return true
+  }
+
+  /**
+   * Reads the link status, blocking if the driver is not done. `compileMs`
+   * runs until `isSettled` first read true or, if it never did, until here, so
+   * frames a caller deferred `finish` by after that do not count.
+   */
+  finish(pending: PendingProgram): ProgramResult {
+    const gl = this.gl
+    const linked = gl.getProgramParameter(pending.program, gl.LINK_STATUS)
+    const compileMs = (pending.settledAt ?? performance.now()) - pending.startedAt
+
+    if (!linked) {
+      // Prefer the compile log of the failing shader; the link log is often empty in that case.
+      const compileError = pending.shaders
+        .filter((shader) => !gl.getShaderParameter(shader, gl.COMPILE_STATUS))
+        .map((shader) => gl.getShaderInfoLog(shader))
+        .find(Boolean)
+      const error = compileError || gl.getProgramInfoLog(pending.program) || "Program link failed"
+      console.error(`[v0] Shader program "${pending.name}" failed:`, error)
+      this.discard(pending)
+      return { ok: false, error: error.substring(0, 500) }
+    }
+
+    for (const shader of pending.shaders) {
+      gl.detachShader(pending.program, shader)
+      gl.deleteShader(shader)
+    }
+    return { ok: true, program: pending.program, compileMs }
+  }
+
+  discard(pending: PendingProgram) {
+    for (const shader of pending.shaders) this.gl.deleteShader(shader)
+    this.gl.deleteProgram(pending.program)
+  }
+}
@@ -0,0 +1,120 @@
+import { FULLSCREEN_QUAD_SHADERS, PLACEHOLDER_SHADERS, SHADER_VARIANT_LOADERS } from "./generated"
+import type { GeodesicLutParams } from "./geodesic-lut"
+import type { QualityTier } from "./quality"
+
+// The GLSL lives in ./glsl as #include/#ifdef modules. scripts/build-shaders.mjs
+// specializes it per quality tier and WebGL version into ./generated, and the
+// constants below are mirrored there where the shaders need them.
+
+/**
+ * `march` integrates every ray in 3D; `lut` resolves the planar orbit from a
+ * precomputed deflection table (WebGL2 only, see geodesic-lut.ts).
+ */
+export type GeodesicMode = "march" | "lut"
+
+// Mirrors RS, camDist, the escape radius and the photon-ring glow in the GLSL modules.
+export const GEODESIC_LUT_PARAMS: GeodesicLutParams = {
+  rs: 0.6,
+  cameraDistance: 11,
+  escapeRadius: 30,
+  photonRingRadius: 0.9,
+  photonRingSharpness: 100,
+}
+
+// Texture unit targets and tables are created, resized and uploaded on. No
+// program samples it, so every allocation selects it before binding instead of
+// using whichever unit is active, which would rebind that unit's sampler.
+export const SCRATCH_TEXTURE_UNIT = 0
+
+// Texture units of the G-buffer targets sampled by the shading pass.
+export const GBUFFER_TEXTURE_UNITS = [1, 2, 3, 4]
+
+// Texture unit of the per-tile statistics read by the ray-marching pass.
+export const TILE_STATS_TEXTURE_UNIT = 5
+
+// Texture unit of the baked disk turbulence, sampled by the disk-atlas pass.
+export const DISK_NOISE_TEXTURE_UNIT = 6
+
+// Texture unit of the per-frame disk emission atlas, sampled by every program that shades the disk.
+export const DISK_ATLAS_TEXTURE_UNIT = 7
+
+// Texture unit of the Doppler and gravitational shift table (WebGL2 only), next to the atlas it scales.
+export const DISK_SHIFT_TEXTURE_UNIT = 8
+
+// Texture units the post chain passes read from: the pass's input (the scene
+// target or a bloom level) and, in the composite, the top of the bloom pyramid.
+export const POST_SOURCE_TEXTURE_UNIT = 9
+export const POST_BLOOM_TEXTURE_UNIT = 10
+
+// Texture units the temporal resolve reads the march's motion and the history from.
+export const TEMPORAL_MOTION_TEXTURE_UNIT = 11
+export const TEMPORAL_HISTORY_TEXTURE_UNIT = 12
+
+// Texture unit the deflection table is bound to (WebGL2 only).
+export const GEODESIC_LUT_TEXTURE_UNIT = 13
+
+// Bloom added by the composite, relative to the bright part of the scene. The
+// single-pass programs only brighten each bright pixel in place (post.glsl),
+// which spreads nothing and so takes a larger gain.
+export const BLOOM_STRENGTH = 0.1
+
+// RCAS sharpening after the edge-adaptive upscale: FSR1's default of 0.2
+// stops, exp2(-0.2).
+export const UPSCALE_SHARPNESS = 0.87
+
+// How the post chain brings a march smaller than the display up to it:
+// "fsr" runs EASU and RCAS, "bilinear" lets the composite's texture fetch do
+// it, and "split" shows bilinear on the left half and fsr on the right.
+export type UpscalerMode = "fsr" | "bilinear" | "split"
+
+// Screen tile edge in pixels for the coarse step-budget pre-pass.
+export const TILE_SIZE = 16
+
+// Values of u_debugView in the debug program.
+export const DEBUG_VIEWS = { steps: 1, termination: 2 } as const
+export type DebugView = "off" | keyof typeof DEBUG_VIEWS
+
+// How a marched ray ended, in the colors the termination view paints them.
+export const DEBUG_TERMINATIONS: { label: string; color: [number, number, number] }[] = [
+  { label: "sky (not marched)", color: [0.15, 0.2, 0.4] },
+  { label: "escaped", color: [0.2, 0.75, 0.3] },
+  { label: "horizon", color: [0.75, 0.2, 0.8] },
+  { label: "alpha saturated", color: [1.0, 0.75, 0.15] },
+  { label: "step budget", color: [1.0, 0.1, 0.1] },
+]
+
+/** Fragment programs of one quality tier, keyed by program name. */
+export interface ShaderVariant {
+  "disk-atlas": string
+  "tile-stats": string
+  "direct-march": string
+  debug: string
+  /** The remaining programs need WebGL2 and are missing from WebGL1 variants. */
+  "direct-lut"?: string
+  "gbuffer-trace"?: string
+  "gbuffer-shade"?: string
+  "bloom-down"?: string
+  "bloom-up"?: string
+  "post-composite"?: string
+  "upscale-easu"?: string
+  "upscale-rcas"?: string
+  "temporal-march"?: string
+  "temporal-resolve"?: string
+}
+
+export type ShaderProgramName = keyof ShaderVariant
+
+/** Vertex shader of the fullscreen quad every pass draws. */
+export function fullscreenQuadShaderSource(isWebGL2: boolean) {
+  return isWebGL2 ? FULLSCREEN_QUAD_SHADERS.webgl2 : FULLSCREEN_QUAD_SHADERS.webgl1
+}
+
+/** Placeholder shown while the real programs compile; bundled so it never waits on the network. */
+export function placeholderShaderSource(isWebGL2: boolean) {
+  return isWebGL2 ? PLACEHOLDER_SHADERS.webgl2 : PLACEHOLDER_SHADERS.webgl1
+}
+
+/** Fetches the prebuilt programs of one tier, each tier and WebGL version being its own chunk. */
+export async function loadShaderVariant(tier: QualityTier, isWebGL2: boolean): Promise<ShaderVariant> {
+  return (await SHADER_VARIANT_LOADERS[`${tier}/webgl${isWebGL2 ? 2 : 1}`]()).default
+}
@@ -0,0 +1,65 @@
+import type { QualityTier } from "./quality"
+import type { ResolutionGovernorState } from "./resolution-governor"
+import type { FrameTimePercentiles, TierDirection } from "./tier-governor"
+import type { TileStatsSummary } from "./tile-stats"
+
+export type RendererTelemetryEvent =
+  | ({
+      type: "resolution"
+      /** True when the governor just changed the scale, false for periodic reports. */
+      changed: boolean
+      /** Size the scene is ray-marched at. */
+      width: number
+      height: number
+      /** Canvas size; larger than the march when the post chain upscales it. */
+      displayWidth: number
+      displayHeight: number
+    } & ResolutionGovernorState)
+  | {
+      type: "shader-compile"
+      /** Quality tier and pass, e.g. "high/direct-march". */
+      variant: string
+      /** From compile start until the program was known to be linked. */
+      compileMs: number
+      /** Whether KHR_parallel_shader_compile kept compilation off the frame loop. */
+      parallel: boolean
+    }
+  | {
+      type: "startup"
+      /** From renderer creation to the first presented frame (placeholder included). */
+      firstFrameMs: number
+      /** From renderer creation to the first frame of the full visualization. */
+      firstFullFrameMs: number
+    }
+  /** Emitted whenever the tile pre-pass reruns, i.e. after each resize. */
+  | ({ type: "tile-stats" } & TileStatsSummary)
+  | {
+      type: "context-restored"
+      /** How long the context was unavailable. */
+      lostMs: number
+      /** Time spent re-running the GL resource recipes, shader compiles excluded. */
+      rebuildMs: number
+      /** From the restore event to the first full frame on the new context. */
+      recoveryMs: number
+    }
+  /** Only while diagnostics ask for frame timings. */
+  | {
+      type: "frame-timing"
+      /** Time spent in the frame callback, draw submission included. */
+      cpuMs: number
+      /** Most recent GPU timer result; it lags a few frames behind. Null without timer queries. */
+      gpuMs: number | null
+      /** Share of gpuMs spent in the post chain (bloom, tonemap, upscale). Null without it or timer queries. */
+      postGpuMs: number | null
+    }
+  /** Benchmark mode only: from draw submission until the GPU finished the frame. */
+  | { type: "frame"; frameMs: number }
+  /** Percentiles are those of the frame-time window that triggered the change. */
+  | ({
+      type: "tier-change"
+      from: QualityTier
+      to: QualityTier
+      direction: TierDirection
+    } & FrameTimePercentiles)
+
+export type RendererTelemetryListener = (event: RendererTelemetryEvent) => void
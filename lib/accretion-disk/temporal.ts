@@ -0,0 +1,46 @@
+// Temporal accumulation of the ray-marching pass (WebGL2 with float render
+// targets). Every frame shifts the rays by a sub-pixel offset and samples the
+// emitters at a different point within each step; temporal-resolve blends the
+// result into a history reprojected along each pixel's motion, so a still
+// scene converges on the average over all of them. The march can then take
+// longer emission steps (TEMPORAL_STEP_SCALE in temporal-march.frag.glsl).
+
+// Frames before the sub-pixel offsets repeat. Mirrored in scripts/reference-render.mjs.
+export const TEMPORAL_JITTER_FRAMES = 16
+
+// Share of the reprojected history kept each frame; the rest is the new frame.
+export const TEMPORAL_HISTORY_WEIGHT = 0.9
+
+// Scene time between frames beyond which the history is dropped rather than
+// reprojected, in seconds: after a stall the motion estimate no longer holds.
+export const TEMPORAL_MAX_TIME_STEP = 0.25
+
+export interface TemporalJitter {
+  /** Sub-pixel offset of the rays, in march pixels, within [-0.5, 0.5). */
+  x: number
+  y: number
+  /** Added to the per-pixel offset of the emitter samples within each step, in [0, 1). */
+  phase: number
+}
+
+/** Element `index` of the base-`base` Halton sequence, in [0, 1). */
+function halton(index: number, base: number): number {
+  let result = 0
+  let f = 1 / base
+  for (let i = index; i > 0; i = Math.floor(i / base)) {
+    result += f * (i % base)
+    f /= base
+  }
+  return result
+}
+
+/**
+ * Jitter of a frame: the (2, 3) Halton sequence from its second element, which
+ * covers the pixel evenly over TEMPORAL_JITTER_FRAMES frames, and a golden
+ * ratio phase that does the same for the step offsets.
+ */
+export function temporalJitter(frame: number): TemporalJitter {
+  const index = (frame % TEMPORAL_JITTER_FRAMES) + 1
+  const phase = (frame * 0.618034) % 1
+  return { x: halton(index, 2) - 0.5, y: halton(index, 3) - 0.5, phase }
+}
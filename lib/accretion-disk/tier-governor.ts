@@ -0,0 +1,131 @@
+import { QUALITY_TIERS, type QualityTier } from "./quality"
+import type { FrameCostSource } from "./resolution-governor"
+
+export type TierDirection = "down" | "up"
+
+export interface FrameTimePercentiles {
+  p50: number
+  p90: number
+  p99: number
+}
+
+export interface TierDecision {
+  tier: QualityTier
+  direction: TierDirection
+  percentiles: FrameTimePercentiles
+}
+
+// Frames per evaluation window; percentiles are taken over one window.
+const WINDOW_FRAMES = 90
+// p90 above this fraction of the budget is a slow window...
+const SLOW_P90 = 1.25
+// ...and with GPU timings, p90 below this fraction leaves room for the next tier.
+const FAST_P90 = 0.45
+// Consecutive windows required before moving, and windows to wait after a move.
+const WINDOWS_TO_DOWNGRADE = 2
+const WINDOWS_TO_UPGRADE = 4
+const MAX_UPGRADE_BACKOFF = 8
+const COOLDOWN_WINDOWS = 2
+// A downgrade this many windows after an upgrade means the upgrade did not hold.
+const FAILED_UPGRADE_WINDOWS = 6
+
+/**
+ * Moves along the quality ladder from frame-time percentiles. It only acts
+ * once the resolution governor has run out of room: sustained slow frames at
+ * the lowest render scale step down, sustained headroom at the highest step
+ * up. rAF deltas cannot show headroom (they sit at the frame interval), so
+ * without GPU timings an upgrade is a slow probe that backs off whenever it
+ * has to be undone.
+ */
+export class TierGovernor {
+  private samples: number[] = []
+  private source: FrameCostSource = "raf"
+  private slowWindows = 0
+  private fastWindows = 0
+  private cooldown = 0
+  private upgradeBackoff = 1
+  private windowsSinceUpgrade = Infinity
+
+  constructor(private tier: QualityTier) {}
+
+  getTier() {
+    return this.tier
+  }
+
+  /**
+   * Feeds one frame cost along with the budget it is measured against and
+   * whether the resolution governor is pinned at either end of its range.
+   * Returns a decision once a move is warranted; the caller confirms it with
+   * `commit` when it has actually switched.
+   */
+  sample(
+    costMs: number,
+    source: FrameCostSource,
+    budgetMs: number,
+    scaleLimit: "min" | "max" | null,
+  ): TierDecision | null {
+    if (!Number.isFinite(costMs) || costMs <= 0) return null
+    if (source === "raf" && this.source === "gpu") return null
+    if (source !== this.source) {
+      this.source = source
+      this.samples.length = 0
+    }
+
+    this.samples.push(costMs)
+    if (this.samples.length < WINDOW_FRAMES) return null
+    const percentiles = computePercentiles(this.samples)
+    this.samples.length = 0
+
+    this.windowsSinceUpgrade++
+    if (this.cooldown > 0) {
+      this.cooldown--
+      return null
+    }
+
+    const ratio = percentiles.p90 / budgetMs
+    const fast = this.source === "gpu" ? ratio < FAST_P90 : ratio <= 1
+    if (ratio > SLOW_P90 && scaleLimit === "min") {
+      this.slowWindows++
+      this.fastWindows = 0
+    } else if (fast && scaleLimit === "max") {
+      this.fastWindows++
+      this.slowWindows = 0
+    } else {
+      this.slowWindows = 0
+      this.fastWindows = 0
+    }
+
+    const index = QUALITY_TIERS.indexOf(this.tier)
+    if (this.slowWindows >= WINDOWS_TO_DOWNGRADE && index > 0) {
+      return { tier: QUALITY_TIERS[index - 1], direction: "down", percentiles }
+    }
+    if (this.fastWindows >= WINDOWS_TO_UPGRADE * this.upgradeBackoff && index < QUALITY_TIERS.length - 1) {
+      return { tier: QUALITY_TIERS[index + 1], direction: "up", percentiles }
+    }
+    return null
+  }
+
+  /** Records that the renderer switched as decided. */
+  commit(decision: TierDecision) {
+    if (decision.direction === "up") {
+      this.windowsSinceUpgrade = 0
+    } else if (this.windowsSinceUpgrade < FAILED_UPGRADE_WINDOWS) {
+      this.upgradeBackoff = Math.min(this.upgradeBackoff * 2, MAX_UPGRADE_BACKOFF)
+    }
+    this.tier = decision.tier
+    this.slowWindows = 0
+    this.fastWindows = 0
+    this.cooldown = COOLDOWN_WINDOWS
+  }
+
+  /** Drops the current window, e.g. after the tab was hidden. */
+  reset() {
+    this.samples.length = 0
+  }
+}
+
+function computePercentiles(samples: number[]): FrameTimePercentiles {
+  const sorted = [...samples].sort((a, b) => a - b)
+  const at = (q: number) => sorted[Math.min(sorted.length - 1, Math.floor(q * sorted.length))]
+  return { p50: at(0.5), p90: at(0.9), p99: at(0.99) }
+}
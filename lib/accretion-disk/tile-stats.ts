@@ -0,0 +1,122 @@
+import { SCRATCH_TEXTURE_UNIT } from "./shaders"
+
+type GL = WebGL2RenderingContext | WebGLRenderingContext
+
+// Buckets of the step histogram reported with the tile statistics.
+const STEP_HISTOGRAM_BINS = 8
+
+// Alpha at which the march stops early, as stored in the 8-bit green channel.
+const SATURATED_ALPHA = Math.round(0.95 * 255)
+
+export interface TileStatsSummary {
+  tileSize: number
+  columns: number
+  rows: number
+  /** Share of tiles where at least one sample ray entered the march instead of the sky path. */
+  marchedFraction: number
+  /** Share of tiles whose rays become opaque and stop before escaping. */
+  saturatedFraction: number
+  /** Mean of the most steps any sample ray in a tile used, over marched tiles. */
+  meanSteps: number
+  maxSteps: number
+  /** Marched tiles by steps used, in equal bins from 0 to the tier's MAX_STEPS. */
+  stepHistogram: number[]
+}
+
+/**
+ * One RGBA8 texel per screen tile, written by the coarse pre-pass: most steps
+ * used, highest alpha reached, closest approach to the hole and the share of
+ * sample rays that marched. The full-resolution pass reads it to pick each
+ * tile's step budget and step size.
+ */
+export class TileStats {
+  readonly texture: WebGLTexture
+  private framebuffer: WebGLFramebuffer | null
+  columns = 0
+  rows = 0
+
+  constructor(
+    private readonly gl: GL,
+    readonly tileSize: number,
+  ) {
+    const texture = gl.createTexture()
+    if (!texture) throw new Error("Failed to create tile stats texture")
+    this.texture = texture
+    this.framebuffer = gl.createFramebuffer()
+  }
+
+  /** Sizes the grid for a canvas. Returns false if the framebuffer is incomplete on this device. */
+  resize(width: number, height: number): boolean {
+    const gl = this.gl
+    this.columns = Math.ceil(width / this.tileSize)
+    this.rows = Math.ceil(height / this.tileSize)
+
+    gl.activeTexture(gl.TEXTURE0 + SCRATCH_TEXTURE_UNIT)
+    gl.bindTexture(gl.TEXTURE_2D, this.texture)
+    gl.texImage2D(gl.TEXTURE_2D, 0, gl.RGBA, this.columns, this.rows, 0, gl.RGBA, gl.UNSIGNED_BYTE, null)
+    gl.texParameteri(gl.TEXTURE_2D, gl.TEXTURE_MIN_FILTER, gl.NEAREST)
+    gl.texParameteri(gl.TEXTURE_2D, gl.TEXTURE_MAG_FILTER, gl.NEAREST)
+    gl.texParameteri(gl.TEXTURE_2D, gl.TEXTURE_WRAP_S, gl.CLAMP_TO_EDGE)
+    gl.texParameteri(gl.TEXTURE_2D, gl.TEXTURE_WRAP_T, gl.CLAMP_TO_EDGE)
+    gl.bindFramebuffer(gl.FRAMEBUFFER, this.framebuffer)
+    gl.framebufferTexture2D(gl.FRAMEBUFFER, gl.COLOR_ATTACHMENT0, gl.TEXTURE_2D, this.texture, 0)
+    const complete = gl.checkFramebufferStatus(gl.FRAMEBUFFER) === gl.FRAMEBUFFER_COMPLETE
+    gl.bindFramebuffer(gl.FRAMEBUFFER, null)
+    return complete
+  }
+
+  bindForWriting() {
+    this.gl.bindFramebuffer(this.gl.FRAMEBUFFER, this.framebuffer)
+    this.gl.viewport(0, 0, this.columns, this.rows)
+  }
+
+  bindTexture(unit: number) {
+    this.gl.activeTexture(this.gl.TEXTURE0 + unit)
+    this.gl.bindTexture(this.gl.TEXTURE_2D, this.texture)
+  }
+
+  /**
+   * Reads the grid back and summarizes it. This stalls until the pre-pass has
+   * finished, which is acceptable because it only runs when the canvas is resized.
+   */
+  summarize(maxSteps: number): TileStatsSummary {
+    const gl = this.gl
+    const pixels = new Uint8Array(this.columns * this.rows * 4)
+    gl.bindFramebuffer(gl.FRAMEBUFFER, this.framebuffer)
+    gl.readPixels(0, 0, this.columns, this.rows, gl.RGBA, gl.UNSIGNED_BYTE, pixels)
+    gl.bindFramebuffer(gl.FRAMEBUFFER, null)
+
+    const tiles = this.columns * this.rows
+    const stepHistogram = new Array<number>(STEP_HISTOGRAM_BINS).fill(0)
+    let marched = 0
+    let saturated = 0
+    let stepSum = 0
+    let stepMax = 0
+    for (let i = 0; i < pixels.length; i += 4) {
+      if (pixels[i + 1] >= SATURATED_ALPHA) saturated++
+      if (pixels[i + 3] === 0) continue
+      const steps = (pixels[i] / 255) * maxSteps
+      marched++
+      stepSum += steps
+      stepMax = Math.max(stepMax, steps)
+      stepHistogram[Math.min(Math.floor((pixels[i] / 256) * STEP_HISTOGRAM_BINS), STEP_HISTOGRAM_BINS - 1)]++
+    }
+
+    return {
+      tileSize: this.tileSize,
+      columns: this.columns,
+      rows: this.rows,
+      marchedFraction: tiles > 0 ? marched / tiles : 0,
+      saturatedFraction: tiles > 0 ? saturated / tiles : 0,
+      meanSteps: marched > 0 ? stepSum / marched : 0,
+      maxSteps: Math.round(stepMax),
+      stepHistogram,
+    }
+  }
+
+  dispose() {
+    this.gl.deleteTexture(this.texture)
+    this.gl.deleteFramebuffer(this.framebuffer)
+    this.framebuffer = null
+  }
+}
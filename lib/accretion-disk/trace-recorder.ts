@@ -0,0 +1,119 @@
+type TraceArgs = Record<string, number | string | boolean | null>
+
+/** One entry of the Trace Event Format read by chrome://tracing and Perfetto. */
+export interface ChromeTraceEvent {
+  name: string
+  cat: string
+  /** X: complete span, i: instant, C: counter, M: metadata. */
+  ph: "X" | "i" | "C" | "M"
+  /** Microseconds. */
+  ts: number
+  dur?: number
+  pid: number
+  tid: number
+  /** Scope of an instant event; "t" draws it on its thread only. */
+  s?: "t"
+  args?: TraceArgs
+}
+
+export interface ChromeTrace {
+  traceEvents: ChromeTraceEvent[]
+  displayTimeUnit: "ms"
+  otherData: { droppedEvents: number }
+}
+
+// Roughly 30 seconds of a 120 Hz loop with several events per frame.
+const DEFAULT_CAPACITY = 32768
+
+const PHASES = ["X", "i", "C"] as const
+const PID = 1
+const TID = 1
+
+/**
+ * Fixed-size ring buffer of render-loop events. Slots are preallocated and
+ * names are interned, so recording a frame costs a few array writes; once
+ * full, the oldest events are overwritten. Callers keep the recorder behind a
+ * nullable reference so that tracing costs one null check when it is off.
+ * All times are milliseconds on the performance.now() clock.
+ */
+export class TraceRecorder {
+  private readonly names: string[] = []
+  private readonly nameIds = new Map<string, number>()
+  private readonly nameId: Uint16Array
+  private readonly phase: Uint8Array
+  private readonly start: Float64Array
+  private readonly duration: Float64Array
+  private readonly args: (TraceArgs | undefined)[]
+  private next = 0
+  private count = 0
+  private dropped = 0
+
+  constructor(readonly capacity = DEFAULT_CAPACITY) {
+    this.nameId = new Uint16Array(capacity)
+    this.phase = new Uint8Array(capacity)
+    this.start = new Float64Array(capacity)
+    this.duration = new Float64Array(capacity)
+    this.args = new Array(capacity)
+  }
+
+  /** A span that started at `startMs` and ends now. */
+  span(name: string, startMs: number, args?: TraceArgs) {
+    const now = performance.now()
+    this.push(name, 0, startMs, now - startMs, args)
+  }
+
+  instant(name: string, args?: TraceArgs) {
+    this.push(name, 1, performance.now(), 0, args)
+  }
+
+  /** Values plotted as a stacked series named `name`. */
+  counter(name: string, values: Record<string, number>) {
+    this.push(name, 2, performance.now(), 0, values)
+  }
+
+  /** Everything still in the buffer, oldest first, as a Chrome trace. */
+  export(threadName: string): ChromeTrace {
+    const traceEvents: ChromeTraceEvent[] = [
+      { name: "process_name", cat: "__metadata", ph: "M", ts: 0, pid: PID, tid: TID, args: { name: "Accretion disk" } },
+      { name: "thread_name", cat: "__metadata", ph: "M", ts: 0, pid: PID, tid: TID, args: { name: threadName } },
+    ]
+    const first = (this.next - this.count + this.capacity) % this.capacity
+    for (let i = 0; i < this.count; i++) {
+      const slot = (first + i) % this.capacity
+      const ph = PHASES[this.phase[slot]]
+      const event: ChromeTraceEvent = {
+        name: this.names[this.nameId[slot]],
+        cat: "render",
+        ph,
+        ts: Math.round(this.start[slot] * 1000),
+        pid: PID,
+        tid: TID,
+      }
+      if (ph === "X") event.dur = Math.round(this.duration[slot] * 1000)
+      if (ph === "i") event.s = "t"
+      if (this.args[slot]) event.args = this.args[slot]
+      traceEvents.push(event)
+    }
+    return { traceEvents, displayTimeUnit: "ms", otherData: { droppedEvents: this.dropped } }
+  }
+
+  private push(name: string, phase: number, startMs: number, durationMs: number, args: TraceArgs | undefined) {
+    let id = this.nameIds.get(name)
+    if (id === undefined) {
+      id = this.names.push(name) - 1
+      this.nameIds.set(name, id)
+    }
+    const slot = this.next
+    this.nameId[slot] = id
+    this.phase[slot] = phase
+    this.start[slot] = startMs
+    this.duration[slot] = durationMs
+    this.args[slot] = args
+    this.next = (slot + 1) % this.capacity
+    if (this.count < this.capacity) {
+      this.count++
+    } else {
+      this.dropped++
+    }
+  }
+}
@@ -0,0 +1,63 @@
+import type { AccretionDiskRenderer, RendererHost, RendererOptions } from "./renderer"
+import type { ChromeTrace } from "./trace-recorder"
+import type { WorkerInboundMessage, WorkerOutboundMessage } from "./worker-protocol"
+
+export function supportsOffscreenRendering(canvas: HTMLCanvasElement) {
+  return typeof Worker !== "undefined" && typeof canvas.transferControlToOffscreen === "function"
+}
+
+/**
+ * Hands the canvas to a worker that owns the WebGL context, programs and frame
+ * loop, so GPU work never blocks the page. The returned handle mirrors the
+ * in-thread renderer; calls become messages.
+ */
+export function createWorkerRenderer(
+  canvas: HTMLCanvasElement,
+  options: RendererOptions,
+  host: RendererHost,
+): AccretionDiskRenderer {
+  const worker = new Worker(new URL("./renderer.worker.ts", import.meta.url), { type: "module" })
+  const post = (message: WorkerInboundMessage, transfer: Transferable[] = []) => worker.postMessage(message, transfer)
+  // The worker answers stop-trace requests in order.
+  const pendingTraces: ((trace: ChromeTrace | null) => void)[] = []
+
+  worker.onmessage = (event: MessageEvent<WorkerOutboundMessage>) => {
+    const message = event.data
+    switch (message.type) {
+      case "telemetry":
+        host.onTelemetry(message.event)
+        break
+      case "error":
+        host.onError(message.error)
+        break
+      case "trace":
+        pendingTraces.shift()?.(message.trace)
+        break
+    }
+  }
+  worker.onerror = (event) => {
+    console.error("[v0] Render worker failed:", event.message)
+    host.onError({ kind: "webgl" })
+  }
+
+  const offscreen = canvas.transferControlToOffscreen()
+  post({ type: "init", canvas: offscreen, options }, [offscreen])
+
+  return {
+    setViewport: (viewport) => post({ type: "viewport", viewport }),
+    setVisible: (visible) => post({ type: "visibility", visible }),
+    setDiagnostics: (diagnostics) => post({ type: "diagnostics", diagnostics }),
+    startTrace: () => post({ type: "start-trace" }),
+    stopTrace: () =>
+      new Promise((resolve) => {
+        pendingTraces.push(resolve)
+        post({ type: "stop-trace" })
+      }),
+    dispose: () => {
+      post({ type: "dispose" })
+      for (const resolve of pendingTraces.splice(0)) resolve(null)
+      // Give the worker a moment to release GL resources before it is torn down.
+      setTimeout(() => worker.terminate(), 1000)
+    },
+  }
+}
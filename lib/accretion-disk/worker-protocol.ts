@@ -0,0 +1,19 @@
+import type { RendererDiagnostics, RendererError, RendererOptions, RendererViewport } from "./renderer"
+import type { RendererTelemetryEvent } from "./telemetry"
+import type { ChromeTrace } from "./trace-recorder"
+
+/** Messages from the page to the render worker. */
+export type WorkerInboundMessage =
+  | { type: "init"; canvas: OffscreenCanvas; options: RendererOptions }
+  | { type: "viewport"; viewport: RendererViewport }
+  | { type: "visibility"; visible: boolean }
+  | { type: "diagnostics"; diagnostics: RendererDiagnostics }
+  | { type: "start-trace" }
+  | { type: "stop-trace" }
+  | { type: "dispose" }
+
+/** Messages from the render worker back to the page. */
+export type WorkerOutboundMessage =
+  | { type: "telemetry"; event: RendererTelemetryEvent }
+  | { type: "error"; error: RendererError }
+  | { type: "trace"; trace: ChromeTrace | null }
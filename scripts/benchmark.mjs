@@ -0,0 +1,204 @@
+#!/usr/bin/env node
+// Benchmarks every quality tier of the accretion disk in headless Chromium on
+// SwiftShader, so it needs no GPU. Each tier and resolution gets a fresh
+// browser (no shared program cache) that loads /benchmark, renders frames with
+// a pinned u_time and reports compile and frame times. Every case runs
+// --repeats times and keeps the fastest value of each metric: a software
+// rasterizer stalls whenever anything else on the box wants the CPU. Results
+// are printed as JSON and compared against a committed baseline.
+//
+//   next build && node scripts/benchmark.mjs
+//   node scripts/benchmark.mjs --url http://localhost:3000 --tiers low,high
+//   node scripts/benchmark.mjs --update-baseline
+//
+// Exits with status 1 when any metric is slower than the baseline by more than
+// --threshold (a fraction, default 0.25). Chromium is taken from --chrome,
+// $CHROME_PATH or the PATH.
+
+import fs from "node:fs"
+import os from "node:os"
+import path from "node:path"
+import { fileURLToPath } from "node:url"
+import { Browser, findChrome, startServer } from "./browser.mjs"
+
+const ROOT = path.resolve(path.dirname(fileURLToPath(import.meta.url)), "..")
+const TIERS = ["ultra-low", "low", "medium", "high", "ultra"]
+const METRICS = ["compileMs", "meanFrameMs", "p95FrameMs"]
+
+const DEFAULTS = {
+  url: null,
+  chrome: process.env.CHROME_PATH ?? null,
+  tiers: TIERS.join(","),
+  resolutions: "160x90,320x180",
+  frames: "20",
+  repeats: "3",
+  warmup: "2",
+  time: "4",
+  timeout: "300",
+  baseline: path.join(ROOT, "benchmarks", "baseline.json"),
+  threshold: "0.25",
+  out: null,
+}
+
+function parseArgs(argv) {
+  const args = { ...DEFAULTS, "update-baseline": false }
+  for (let i = 0; i < argv.length; i++) {
+    const name = argv[i].replace(/^--/, "")
+    if (name === "update-baseline") {
+      args[name] = true
+    } else if (name in DEFAULTS && i + 1 < argv.length) {
+      args[name] = argv[++i]
+    } else {
+      throw new Error(`Unknown or incomplete option: ${argv[i]}`)
+    }
+  }
+  const tiers = args.tiers.split(",")
+  const unknown = tiers.filter((tier) => !TIERS.includes(tier))
+  if (unknown.length > 0) throw new Error(`Unknown tiers: ${unknown.join(", ")}`)
+  const resolutions = args.resolutions.split(",").map((value) => {
+    const match = /^(\d+)x(\d+)$/.exec(value)
+    if (!match) throw new Error(`Resolutions look like 640x360, got ${value}`)
+    return { width: Number(match[1]), height: Number(match[2]) }
+  })
+  return { ...args, tiers, resolutions }
+}
+
+async function runCase(chrome, baseUrl, tier, { width, height }, args) {
+  const browser = new Browser(chrome, width, height)
+  try {
+    const session = await browser.openPage()
+    const query = new URLSearchParams({ tier, frames: args.frames, warmup: args.warmup, time: args.time })
+    await browser.send("Page.navigate", { url: `${baseUrl}/benchmark?${query}` }, session)
+
+    const deadline = Date.now() + Number(args.timeout) * 1000
+    while (Date.now() < deadline) {
+      const { result } = await browser.send(
+        "Runtime.evaluate",
+        { expression: "window.__benchmarkResult ?? null", returnByValue: true },
+        session,
+      )
+      if (result.value) return { version: (await browser.send("Browser.getVersion")).product, ...result.value }
+      await new Promise((resolve) => setTimeout(resolve, 250))
+    }
+    throw new Error(`${tier} at ${width}x${height} produced no result within ${args.timeout}s`)
+  } finally {
+    await browser.close()
+  }
+}
+
+function summarize(raw) {
+  const sorted = [...raw.frameMs].sort((a, b) => a - b)
+  const mean = sorted.reduce((sum, value) => sum + value, 0) / sorted.length
+  const p95 = sorted[Math.min(sorted.length - 1, Math.ceil(0.95 * sorted.length) - 1)]
+  const round = (value) => Math.round(value * 100) / 100
+  return {
+    tier: raw.tier,
+    width: raw.width,
+    height: raw.height,
+    compileMs: round(raw.compileMs),
+    firstFullFrameMs: round(raw.firstFullFrameMs),
+    meanFrameMs: round(mean),
+    p95FrameMs: round(p95),
+  }
+}
+
+/** Keeps the best value of every metric over repeated runs of one case. */
+function fastest(runs) {
+  const best = { ...runs[0] }
+  for (const run of runs.slice(1)) {
+    for (const metric of [...METRICS, "firstFullFrameMs"]) best[metric] = Math.min(best[metric], run[metric])
+  }
+  return best
+}
+
+/** Lists every metric that got slower than the baseline by more than the threshold. */
+export function findRegressions(results, baseline, threshold) {
+  const regressions = []
+  for (const result of results) {
+    const reference = baseline.results.find(
+      (entry) => entry.tier === result.tier && entry.width === result.width && entry.height === result.height,
+    )
+    if (!reference) continue
+    for (const metric of METRICS) {
+      const limit = reference[metric] * (1 + threshold)
+      if (result[metric] > limit) {
+        regressions.push({
+          case: `${result.tier} ${result.width}x${result.height}`,
+          metric,
+          baseline: reference[metric],
+          current: result[metric],
+          ratio: Math.round((result[metric] / reference[metric]) * 100) / 100,
+        })
+      }
+    }
+  }
+  return regressions
+}
+
+async function main() {
+  const args = parseArgs(process.argv.slice(2))
+  const chrome = findChrome(args.chrome)
+  const server = await startServer(args.url)
+
+  const results = []
+  let version = null
+  try {
+    for (const resolution of args.resolutions) {
+      for (const tier of args.tiers) {
+        const runs = []
+        for (let run = 0; run < Number(args.repeats); run++) {
+          const raw = await runCase(chrome, server.url, tier, resolution, args)
+          version = raw.version
+          runs.push(summarize(raw))
+        }
+        const result = fastest(runs)
+        console.error(
+          `${tier.padEnd(9)} ${`${result.width}x${result.height}`.padEnd(9)} compile ${result.compileMs} ms, ` +
+            `frame mean ${result.meanFrameMs} ms, p95 ${result.p95FrameMs} ms`,
+        )
+        results.push(result)
+      }
+    }
+  } finally {
+    server.stop()
+  }
+
+  const report = {
+    environment: { browser: version, platform: `${os.platform()} ${os.arch()}`, cpu: os.cpus()[0]?.model ?? null },
+    settings: {
+      frames: Number(args.frames),
+      warmup: Number(args.warmup),
+      repeats: Number(args.repeats),
+      time: Number(args.time),
+    },
+    results,
+  }
+
+  if (args["update-baseline"]) {
+    fs.mkdirSync(path.dirname(args.baseline), { recursive: true })
+    fs.writeFileSync(args.baseline, JSON.stringify(report, null, 2) + "\n")
+    console.error(`Baseline written to ${path.relative(ROOT, args.baseline)}`)
+  } else if (fs.existsSync(args.baseline)) {
+    const baseline = JSON.parse(fs.readFileSync(args.baseline, "utf8"))
+    report.regressions = findRegressions(results, baseline, Number(args.threshold))
+    for (const regression of report.regressions) {
+      console.error(`REGRESSION ${regression.case} ${regression.metric}: ${regression.baseline} -> ${regression.current}`)
+    }
+  }
+
+  const json = JSON.stringify(report, null, 2) + "\n"
+  if (args.out) {
+    fs.writeFileSync(args.out, json)
+  } else {
+    process.stdout.write(json)
+  }
+  if (report.regressions?.length) process.exitCode = 1
+}
+
+// Imported by the tests for findRegressions.
+if (process.argv[1] && path.resolve(process.argv[1]) === fileURLToPath(import.meta.url)) {
+  main().catch((e) => {
+    console.error(e.message)
+    process.exit(2)
+  })
+}
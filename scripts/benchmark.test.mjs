@@ -0,0 +1,36 @@
+import assert from "node:assert/strict"
+import { describe, test } from "node:test"
+import { findRegressions } from "./benchmark.mjs"
+
+function result(tier, width, height, compileMs, meanFrameMs, p95FrameMs) {
+  return { tier, width, height, compileMs, firstFullFrameMs: 0, meanFrameMs, p95FrameMs }
+}
+
+const BASELINE = {
+  results: [result("medium", 160, 90, 100, 10, 20), result("high", 160, 90, 200, 20, 40)],
+}
+
+describe("findRegressions", () => {
+  test("passes results within the threshold", () => {
+    const results = [result("medium", 160, 90, 110, 11, 22), result("high", 160, 90, 150, 15, 30)]
+    assert.deepEqual(findRegressions(results, BASELINE, 0.1), [])
+  })
+
+  test("flags each metric past the threshold", () => {
+    const results = [result("medium", 160, 90, 111, 10, 30)]
+    assert.deepEqual(findRegressions(results, BASELINE, 0.1), [
+      { case: "medium 160x90", metric: "compileMs", baseline: 100, current: 111, ratio: 1.11 },
+      { case: "medium 160x90", metric: "p95FrameMs", baseline: 20, current: 30, ratio: 1.5 },
+    ])
+  })
+
+  test("matches cases by tier and size", () => {
+    const results = [result("medium", 320, 180, 1000, 100, 200), result("ultra", 160, 90, 1000, 100, 200)]
+    assert.deepEqual(findRegressions(results, BASELINE, 0.1), [])
+  })
+
+  test("does not gate on firstFullFrameMs", () => {
+    const results = [{ ...result("high", 160, 90, 200, 20, 40), firstFullFrameMs: 10000 }]
+    assert.deepEqual(findRegressions(results, BASELINE, 0), [])
+  })
+})
@@ -0,0 +1,147 @@
+// Headless Chromium helpers shared by the scripts that measure the app in a
+// browser: locating Chromium, serving the production build and a minimal
+// DevTools protocol client.
+
+import { spawn, spawnSync } from "node:child_process"
+import fs from "node:fs"
+import os from "node:os"
+import path from "node:path"
+import { fileURLToPath } from "node:url"
+
+const ROOT = path.resolve(path.dirname(fileURLToPath(import.meta.url)), "..")
+const CHROME_NAMES = ["chromium", "chromium-browser", "google-chrome", "google-chrome-stable", "chrome-headless-shell"]
+
+export function findChrome(explicit) {
+  if (explicit) return explicit
+  for (const name of CHROME_NAMES) {
+    const found = spawnSync("which", [name], { encoding: "utf8" })
+    if (found.status === 0) return found.stdout.trim()
+  }
+  throw new Error("No Chromium found; pass --chrome or set CHROME_PATH")
+}
+
+async function waitForServer(url, timeoutMs) {
+  const deadline = Date.now() + timeoutMs
+  while (Date.now() < deadline) {
+    try {
+      const response = await fetch(url)
+      if (response.ok) return
+    } catch {
+      // Not listening yet.
+    }
+    await new Promise((resolve) => setTimeout(resolve, 250))
+  }
+  throw new Error(`Server at ${url} did not come up`)
+}
+
+/** Starts `next start` on the existing build unless a URL was given. */
+export async function startServer(url) {
+  if (url) return { url, stop() {} }
+  if (!fs.existsSync(path.join(ROOT, ".next", "BUILD_ID"))) {
+    throw new Error("No production build found; run `next build` first or pass --url")
+  }
+  const port = 3100
+  const server = spawn(path.join(ROOT, "node_modules", ".bin", "next"), ["start", "-p", String(port)], {
+    cwd: ROOT,
+    stdio: "ignore",
+  })
+  const started = { url: `http://localhost:${port}`, stop: () => server.kill() }
+  try {
+    await waitForServer(started.url, 30000)
+  } catch (e) {
+    started.stop()
+    throw e
+  }
+  return started
+}
+
+/**
+ * Minimal DevTools protocol client over --remote-debugging-pipe: messages are
+ * JSON terminated by a NUL byte, written to fd 3 and read from fd 4.
+ */
+export class Browser {
+  constructor(executable, width, height) {
+    this.userDataDir = fs.mkdtempSync(path.join(os.tmpdir(), "accretion-bench-"))
+    this.process = spawn(
+      executable,
+      [
+        "--headless=new",
+        "--no-sandbox",
+        "--no-first-run",
+        "--use-angle=swiftshader",
+        "--enable-unsafe-swiftshader",
+        "--disable-gpu-vsync",
+        "--disable-frame-rate-limit",
+        "--remote-debugging-pipe",
+        `--user-data-dir=${this.userDataDir}`,
+        `--window-size=${width},${height}`,
+        "about:blank",
+      ],
+      { stdio: ["ignore", "ignore", "ignore", "pipe", "pipe"] },
+    )
+    this.nextId = 1
+    this.pending = new Map()
+    this.buffer = ""
+    this.failure = null
+    this.process.stdio[4].on("data", (chunk) => this.receive(chunk))
+    // A Chromium that cannot start exits (or never spawns) and closes the
+    // pipe under us; every error ends up rejecting the pending requests.
+    this.process.stdio[3].on("error", (e) => this.fail(e))
+    this.process.stdio[4].on("error", (e) => this.fail(e))
+    this.exited = new Promise((resolve) => {
+      this.process.on("exit", (code, signal) => {
+        this.fail(new Error(`Browser exited (${signal ?? `code ${code}`})`))
+        resolve()
+      })
+      // Spawning failed; "exit" may never follow.
+      this.process.on("error", (e) => {
+        this.fail(e)
+        resolve()
+      })
+    })
+  }
+
+  fail(error) {
+    this.failure ??= error
+    for (const { reject } of this.pending.values()) reject(this.failure)
+    this.pending.clear()
+  }
+
+  receive(chunk) {
+    this.buffer += chunk.toString("utf8")
+    let end
+    while ((end = this.buffer.indexOf("\0")) >= 0) {
+      const message = JSON.parse(this.buffer.slice(0, end))
+      this.buffer = this.buffer.slice(end + 1)
+      const request = this.pending.get(message.id)
+      if (!request) continue
+      this.pending.delete(message.id)
+      if (message.error) {
+        request.reject(new Error(message.error.message))
+      } else {
+        request.resolve(message.result)
+      }
+    }
+  }
+
+  send(method, params = {}, sessionId) {
+    if (this.failure) return Promise.reject(this.failure)
+    const id = this.nextId++
+    const response = new Promise((resolve, reject) => this.pending.set(id, { resolve, reject }))
+    this.process.stdio[3].write(JSON.stringify({ id, method, params, sessionId }) + "\0")
+    return response
+  }
+
+  async openPage() {
+    const { targetInfos } = await this.send("Target.getTargets")
+    const page = targetInfos.find((target) => target.type === "page")
+    const { sessionId } = await this.send("Target.attachToTarget", { targetId: page.targetId, flatten: true })
+    return sessionId
+  }
+
+  async close() {
+    this.process.kill()
+    await this.exited
+    fs.rmSync(this.userDataDir, { recursive: true, force: true })
+  }
+}
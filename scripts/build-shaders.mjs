@@ -0,0 +1,458 @@
+#!/usr/bin/env node
+// Compiles the accretion disk's GLSL modules (lib/accretion-disk/glsl) into one
+// specialized source per quality tier and WebGL version, written as TypeScript
+// modules to lib/accretion-disk/generated. The renderer imports only the
+// variant it runs, so no client downloads or assembles the others. Runs before
+// `next build`:
+//
+//   node scripts/build-shaders.mjs
+//   node scripts/build-shaders.mjs --report shaders.json   # sizes and compile times as JSON
+//   node scripts/build-shaders.mjs --check                 # exit 1 if the generated files are stale
+//
+// The preprocessor understands #include "file" (each file once per program),
+// #ifdef/#ifndef/#else/#endif and object-like #define, and resolves all of
+// them at build time: the tier's settings become MAX_STEPS, ADAPTIVE_STEP,
+// DISK_SAMPLES and the JET_ENABLED/BLOOM_ENABLED flags, STEP_SCALE is the same
+// for every tier, and WEBGL2 selects the GLSL ES 3.00 spelling. Sources are then minified
+// (comments, whitespace, float literals), checked for GLSL ES 1.00 leftovers
+// and, when Chromium is available, compiled in it on SwiftShader to catch
+// errors before they ship and to time each program. Without Chromium that
+// last step is skipped with a warning.
+
+import fs from "node:fs"
+import path from "node:path"
+import { fileURLToPath } from "node:url"
+import zlib from "node:zlib"
+import { Browser, findChrome } from "./browser.mjs"
+import { GEODESIC_INTEGRATOR, STEP_SCALE, TIERS } from "./reference-render.mjs"
+
+const ROOT = path.resolve(path.dirname(fileURLToPath(import.meta.url)), "..")
+const GLSL_DIR = path.join(ROOT, "lib", "accretion-disk", "glsl")
+const OUT_DIR = path.join(ROOT, "lib", "accretion-disk", "generated")
+const HEADER = "// Generated by scripts/build-shaders.mjs from lib/accretion-disk/glsl; do not edit.\n"
+
+// Fragment programs compiled per tier; the WebGL2-only ones are left out of WebGL1 variants.
+const PROGRAMS = [
+  { name: "disk-atlas", webgl1: true },
+  { name: "tile-stats", webgl1: true },
+  { name: "direct-march", webgl1: true },
+  { name: "debug", webgl1: true },
+  { name: "direct-lut", webgl1: false },
+  { name: "gbuffer-trace", webgl1: false },
+  { name: "gbuffer-shade", webgl1: false },
+  { name: "bloom-down", webgl1: false },
+  { name: "bloom-up", webgl1: false },
+  { name: "post-composite", webgl1: false },
+  { name: "upscale-easu", webgl1: false },
+  { name: "upscale-rcas", webgl1: false },
+  { name: "temporal-march", webgl1: false },
+  { name: "temporal-resolve", webgl1: false },
+]
+const VERTEX_PROGRAM = "fullscreen-quad"
+const PLACEHOLDER_PROGRAM = "placeholder"
+const WEBGL_VERSIONS = [1, 2]
+
+const DEFAULTS = {
+  chrome: process.env.CHROME_PATH ?? null,
+  report: null,
+}
+
+function parseArgs(argv) {
+  const args = { ...DEFAULTS, check: false }
+  for (let i = 0; i < argv.length; i++) {
+    const name = argv[i].replace(/^--/, "")
+    if (name === "check") {
+      args[name] = true
+    } else if (name in DEFAULTS && i + 1 < argv.length) {
+      args[name] = argv[++i]
+    } else {
+      throw new Error(`Unknown or incomplete option: ${argv[i]}`)
+    }
+  }
+  return args
+}
+
+function glslFloat(value) {
+  return Number.isInteger(value) ? value.toFixed(1) : String(value)
+}
+
+/** Defines a tier's variant is specialized with, before any the modules add. */
+function variantDefines(settings, webglVersion) {
+  const defines = new Map([
+    ["MAX_STEPS", String(settings.maxSteps)],
+    ["ADAPTIVE_STEP", glslFloat(settings.adaptiveStep)],
+    ["STEP_SCALE", glslFloat(STEP_SCALE)],
+    ["DISK_SAMPLES", String(settings.diskSamples)],
+  ])
+  if (GEODESIC_INTEGRATOR === "verlet") {
+    defines.set("INTEGRATOR_VERLET", "")
+    defines.set("GEODESIC_TOLERANCE", glslFloat(settings.geodesicTolerance))
+  }
+  if (settings.jetEnabled) defines.set("JET_ENABLED", "")
+  if (settings.bloomEnabled) defines.set("BLOOM_ENABLED", "")
+  if (webglVersion === 2) defines.set("WEBGL2", "")
+  return defines
+}
+
+const TOKEN =
+  /\s+|[A-Za-z_]\w*|\d+\.\d*(?:[eE][+-]?\d+)?|\.\d+(?:[eE][+-]?\d+)?|\d+(?:[eE][+-]?\d+)?|&&|\|\||\^\^|\+\+|--|<<=?|>>=?|[<>=!+\-*\/%&|^]=|[^\s]/g
+
+function tokenize(text) {
+  return (text.match(TOKEN) ?? []).filter((token) => !/^\s/.test(token))
+}
+
+function substitute(text, defines) {
+  return text.replace(/[A-Za-z_]\w*/g, (name) => (defines.has(name) ? defines.get(name) : name))
+}
+
+/**
+ * Expands an entry module into a single source with every include inlined,
+ * every conditional decided and every define substituted. Comments go first so
+ * that commented-out directives stay inert.
+ */
+function preprocess(entry, initialDefines) {
+  const defines = new Map(initialDefines)
+  const included = new Set()
+  const lines = []
+
+  function expand(file) {
+    if (included.has(file)) return
+    included.add(file)
+    const source = fs
+      .readFileSync(path.join(GLSL_DIR, file), "utf8")
+      .replace(/\/\*[\s\S]*?\*\//g, " ")
+      .replace(/\/\/.*$/gm, "")
+    // One entry per open conditional: whether its current branch is taken.
+    const conditions = []
+    const active = () => conditions.every(Boolean)
+
+    source.split("\n").forEach((line, index) => {
+      const where = `${file}:${index + 1}`
+      const directive = /^\s*#\s*(\w+)\s*(.*?)\s*$/.exec(line)
+      if (!directive) {
+        if (active() && line.trim()) lines.push(substitute(line, defines))
+        return
+      }
+      const [, name, rest] = directive
+      if (name === "ifdef" || name === "ifndef") {
+        conditions.push(defines.has(rest) === (name === "ifdef"))
+      } else if (name === "else") {
+        if (conditions.length === 0) throw new Error(`${where}: #else without #ifdef`)
+        conditions.push(!conditions.pop())
+      } else if (name === "endif") {
+        if (conditions.length === 0) throw new Error(`${where}: #endif without #ifdef`)
+        conditions.pop()
+      } else if (!active()) {
+        // Directives inside a skipped branch are skipped with it.
+      } else if (name === "include") {
+        const target = /^"([\w.-]+)"$/.exec(rest)
+        if (!target) throw new Error(`${where}: #include needs a quoted file name`)
+        if (!fs.existsSync(path.join(GLSL_DIR, target[1]))) throw new Error(`${where}: ${target[1]} not found`)
+        expand(target[1])
+      } else if (name === "define") {
+        const define = /^([A-Za-z_]\w*)(?:\s+(.*))?$/.exec(rest)
+        if (!define || rest.startsWith(`${define[1]}(`)) throw new Error(`${where}: only object-like #define is supported`)
+        defines.set(define[1], substitute(define[2] ?? "", defines))
+      } else {
+        throw new Error(`${where}: unsupported directive #${name}`)
+      }
+    })
+    if (conditions.length > 0) throw new Error(`${file}: unterminated #ifdef`)
+  }
+
+  expand(entry)
+  return lines.join("\n")
+}
+
+/** Shortest spelling of a float literal: 0.50 -> .5, 1.0 -> 1. */
+function shortenFloat(token) {
+  const match = /^(\d*)\.(\d*)$/.exec(token)
+  if (!match || token === ".") return token
+  const whole = match[1].replace(/^0+(?=\d)/, "")
+  const fraction = match[2].replace(/0+$/, "")
+  if (!fraction) return `${whole || "0"}.`
+  return `${whole === "0" ? "" : whole}.${fraction}`
+}
+
+function minify(source) {
+  let out = ""
+  let previous = ""
+  for (const raw of tokenize(source)) {
+    const token = shortenFloat(raw)
+    // A lone "." is a swizzle or field access and never needs a space
+    const wordBoundary = previous !== "." && token !== "." && /[\w.]$/.test(previous) && /^[\w.]/.test(token)
+    // a - -b must not become a--b
+    const operatorBoundary = /[+-]$/.test(previous) && /^[+-]/.test(token)
+    if (wordBoundary || operatorBoundary) out += " "
+    out += token
+    previous = token
+  }
+  return out
+}
+
+/** Catches mistakes that would otherwise only surface as a driver compile error on some devices. */
+function checkSource(label, source, webglVersion) {
+  const depth = { "(": 0, "{": 0, "[": 0 }
+  const closing = { ")": "(", "}": "{", "]": "[" }
+  for (const token of tokenize(source)) {
+    if (token in depth) depth[token]++
+    if (token in closing && --depth[closing[token]] < 0) throw new Error(`${label}: unbalanced ${token}`)
+  }
+  const open = Object.entries(depth).find(([, count]) => count !== 0)
+  if (open) throw new Error(`${label}: unbalanced ${open[0]}`)
+  if (!/\bvoid main\(\)/.test(source)) throw new Error(`${label}: no main()`)
+  if (/#/.test(source.replace(/^#version 300 es\n/, ""))) throw new Error(`${label}: unresolved preprocessor directive`)
+  if (webglVersion === 1) {
+    const leftover = /\b(texture|texelFetch|layout)\(/.exec(source)
+    if (leftover) throw new Error(`${label}: GLSL ES 3.00 construct "${leftover[1]}" in a WebGL1 variant`)
+  }
+}
+
+function buildProgram(entry, defines, webglVersion, label) {
+  const expanded = preprocess(entry, defines)
+  const source = (webglVersion === 2 ? "#version 300 es\n" : "") + minify(expanded)
+  checkSource(label, source, webglVersion)
+  return { source, expandedBytes: Buffer.byteLength(expanded), bytes: Buffer.byteLength(source) }
+}
+
+function buildAll() {
+  const common = {}
+  for (const webglVersion of WEBGL_VERSIONS) {
+    const defines = variantDefines(TIERS.medium, webglVersion)
+    common[`webgl${webglVersion}`] = {
+      vertex: buildProgram(`${VERTEX_PROGRAM}.vert.glsl`, defines, webglVersion, `webgl${webglVersion}/${VERTEX_PROGRAM}`),
+      placeholder: buildProgram(
+        `${PLACEHOLDER_PROGRAM}.frag.glsl`,
+        defines,
+        webglVersion,
+        `webgl${webglVersion}/${PLACEHOLDER_PROGRAM}`,
+      ),
+    }
+  }
+
+  const variants = []
+  for (const [tier, settings] of Object.entries(TIERS)) {
+    for (const webglVersion of WEBGL_VERSIONS) {
+      const defines = variantDefines(settings, webglVersion)
+      const programs = {}
+      for (const program of PROGRAMS) {
+        if (webglVersion === 1 && !program.webgl1) continue
+        programs[program.name] = buildProgram(
+          `${program.name}.frag.glsl`,
+          defines,
+          webglVersion,
+          `${tier}/webgl${webglVersion}/${program.name}`,
+        )
+      }
+      variants.push({ tier, webglVersion, key: `${tier}/webgl${webglVersion}`, file: `${tier}-webgl${webglVersion}.ts`, programs })
+    }
+  }
+  return { common, variants }
+}
+
+function variantModule(variant) {
+  const entries = Object.entries(variant.programs).map(([name, { source }]) => `  ${JSON.stringify(name)}: ${JSON.stringify(source)},`)
+  return `${HEADER}import type { ShaderVariant } from "../shaders"
+
+const variant: ShaderVariant = {
+${entries.join("\n")}
+}
+
+export default variant
+`
+}
+
+function indexModule({ common, variants }) {
+  const byVersion = (kind) =>
+    WEBGL_VERSIONS.map((version) => `  webgl${version}: ${JSON.stringify(common[`webgl${version}`][kind].source)},`).join("\n")
+  const loaders = variants.map(
+    (variant) => `  ${JSON.stringify(variant.key)}: () => import(${JSON.stringify(`./${variant.file.replace(/\.ts$/, "")}`)}),`,
+  )
+  return `${HEADER}import type { QualityTier } from "../quality"
+import type { ShaderVariant } from "../shaders"
+
+// Tier-independent, so they are bundled with the renderer.
+export const FULLSCREEN_QUAD_SHADERS = {
+${byVersion("vertex")}
+}
+
+export const PLACEHOLDER_SHADERS = {
+${byVersion("placeholder")}
+}
+
+// One chunk per tier and WebGL version, loaded on demand.
+export const SHADER_VARIANT_LOADERS: Record<\`\${QualityTier}/webgl\${1 | 2}\`, () => Promise<{ default: ShaderVariant }>> = {
+${loaders.join("\n")}
+}
+`
+}
+
+/** Compiles every program in Chromium and returns its link status and compile time, keyed by label. */
+async function compileInChrome(chrome, jobs) {
+  // Runs in the page; one context per WebGL version, each program linked against the version's vertex shader.
+  function compileAll(jobs) {
+    const contexts = {}
+    const results = {}
+    for (const job of jobs) {
+      let gl = contexts[job.webglVersion]
+      if (!gl) {
+        gl = document.createElement("canvas").getContext(job.webglVersion === 2 ? "webgl2" : "webgl")
+        if (!gl) throw new Error(`No WebGL${job.webglVersion} context`)
+        contexts[job.webglVersion] = gl
+      }
+      const start = performance.now()
+      const program = gl.createProgram()
+      const shaders = [
+        [gl.VERTEX_SHADER, job.vertex],
+        [gl.FRAGMENT_SHADER, job.fragment],
+      ].map(([type, source]) => {
+        const shader = gl.createShader(type)
+        gl.shaderSource(shader, source)
+        gl.compileShader(shader)
+        gl.attachShader(program, shader)
+        return shader
+      })
+      gl.bindAttribLocation(program, 0, "a_position")
+      gl.linkProgram(program)
+      const ok = gl.getProgramParameter(program, gl.LINK_STATUS)
+      const compileMs = performance.now() - start
+      const error = ok
+        ? null
+        : shaders.map((shader) => gl.getShaderInfoLog(shader)).find(Boolean) || gl.getProgramInfoLog(program)
+      shaders.forEach((shader) => gl.deleteShader(shader))
+      gl.deleteProgram(program)
+      results[job.label] = { ok, compileMs, error }
+    }
+    return results
+  }
+
+  const browser = new Browser(chrome, 64, 64)
+  try {
+    const session = await browser.openPage()
+    const { result, exceptionDetails } = await browser.send(
+      "Runtime.evaluate",
+      { expression: `(${compileAll.toString()})(${JSON.stringify(jobs)})`, returnByValue: true },
+      session,
+    )
+    if (exceptionDetails) throw new Error(exceptionDetails.exception?.description ?? exceptionDetails.text)
+    return { version: (await browser.send("Browser.getVersion")).product, results: result.value }
+  } finally {
+    await browser.close()
+  }
+}
+
+function compileJobs({ common, variants }) {
+  const jobs = WEBGL_VERSIONS.map((version) => ({
+    label: `webgl${version}/${PLACEHOLDER_PROGRAM}`,
+    webglVersion: version,
+    vertex: common[`webgl${version}`].vertex.source,
+    fragment: common[`webgl${version}`].placeholder.source,
+  }))
+  for (const variant of variants) {
+    for (const [name, { source }] of Object.entries(variant.programs)) {
+      jobs.push({
+        label: `${variant.key}/${name}`,
+        webglVersion: variant.webglVersion,
+        vertex: common[`webgl${variant.webglVersion}`].vertex.source,
+        fragment: source,
+      })
+    }
+  }
+  return jobs
+}
+
+function gzipBytes(text) {
+  return zlib.gzipSync(text, { level: 9 }).length
+}
+
+function kB(bytes) {
+  return `${(bytes / 1024).toFixed(1)} kB`
+}
+
+async function main() {
+  const args = parseArgs(process.argv.slice(2))
+  const built = buildAll()
+  const files = new Map([["index.ts", indexModule(built)], ...built.variants.map((variant) => [variant.file, variantModule(variant)])])
+
+  if (args.check) {
+    const stale = [...files].filter(([file, text]) => {
+      const target = path.join(OUT_DIR, file)
+      return !fs.existsSync(target) || fs.readFileSync(target, "utf8") !== text
+    })
+    if (stale.length > 0) {
+      console.error(`Stale generated shaders: ${stale.map(([file]) => file).join(", ")}; run scripts/build-shaders.mjs`)
+      process.exit(1)
+    }
+    return
+  }
+
+  let compiled = null
+  let chrome = null
+  try {
+    chrome = findChrome(args.chrome)
+  } catch {
+    console.error("No Chromium found; skipping the compile check of the shader variants")
+  }
+  if (chrome) {
+    try {
+      compiled = await compileInChrome(chrome, compileJobs(built))
+    } catch (e) {
+      // Compile errors come back as results; this is Chromium itself failing to start or run.
+      console.error(`Chromium failed (${e.message}); skipping the compile check of the shader variants`)
+    }
+  }
+  if (compiled) {
+    const failures = Object.entries(compiled.results).filter(([, result]) => !result.ok)
+    if (failures.length > 0) {
+      for (const [label, { error }] of failures) console.error(`${label} failed to compile:\n${error}`)
+      process.exit(1)
+    }
+  }
+
+  fs.rmSync(OUT_DIR, { recursive: true, force: true })
+  fs.mkdirSync(OUT_DIR, { recursive: true })
+  for (const [file, text] of files) fs.writeFileSync(path.join(OUT_DIR, file), text)
+
+  const round = (value) => Math.round(value * 10) / 10
+  const variants = built.variants.map((variant) => {
+    const module = files.get(variant.file)
+    const programs = Object.fromEntries(
+      Object.entries(variant.programs).map(([name, program]) => [
+        name,
+        {
+          expandedBytes: program.expandedBytes,
+          bytes: program.bytes,
+          gzipBytes: gzipBytes(program.source),
+          compileMs: compiled ? round(compiled.results[`${variant.key}/${name}`].compileMs) : null,
+        },
+      ]),
+    )
+    return { variant: variant.key, moduleBytes: Buffer.byteLength(module), moduleGzipBytes: gzipBytes(module), programs }
+  })
+
+  for (const { variant, moduleBytes, moduleGzipBytes, programs } of variants) {
+    const detail = Object.entries(programs)
+      .map(([name, program]) => `${name} ${kB(program.bytes)}${program.compileMs === null ? "" : ` ${program.compileMs} ms`}`)
+      .join(", ")
+    console.error(`${variant}: ${kB(moduleBytes)} (${kB(moduleGzipBytes)} gzip); ${detail}`)
+  }
+
+  if (args.report) {
+    const report = {
+      compiler: compiled ? `${compiled.version} (SwiftShader)` : null,
+      common: Object.fromEntries(
+        WEBGL_VERSIONS.map((version) => {
+          const { vertex, placeholder } = built.common[`webgl${version}`]
+          return [`webgl${version}`, { vertexBytes: vertex.bytes, placeholderBytes: placeholder.bytes }]
+        }),
+      ),
+      variants,
+    }
+    fs.writeFileSync(args.report, JSON.stringify(report, null, 2) + "\n")
+  }
+}
+
+main().catch((e) => {
+  console.error(e.message)
+  process.exit(2)
+})
@@ -0,0 +1,51 @@
+import assert from "node:assert/strict"
+import { describe, test } from "node:test"
+import { buildDiskNoise } from "../lib/accretion-disk/disk-noise.ts"
+
+// Fine enough that a texel step is small next to a seam at the edge.
+const SIZE = 2048
+
+/**
+ * Largest second difference along x (dx = 1) or z (dy = 1), either over the
+ * texels whose neighbours wrap around an edge or over all the others. The
+ * texture is smooth, so a seam stands out here even where it is no larger
+ * than a step between neighbours.
+ */
+function maxCurvature(data, size, dx, dy, wrapping) {
+  let max = 0
+  for (let j = 0; j < size; j++) {
+    for (let i = 0; i < size; i++) {
+      const wraps = dx ? i === 0 || i === size - 1 : j === 0 || j === size - 1
+      if (wraps !== wrapping) continue
+      const before = data[((j - dy + size) % size) * size + ((i - dx + size) % size)]
+      const after = data[((j + dy) % size) * size + ((i + dx) % size)]
+      max = Math.max(max, Math.abs(before - 2 * data[j * size + i] + after))
+    }
+  }
+  return max
+}
+
+describe("buildDiskNoise", () => {
+  const data = buildDiskNoise(SIZE)
+
+  test("fills one byte per texel", () => {
+    assert.ok(data instanceof Uint8Array)
+    assert.equal(data.length, SIZE * SIZE)
+  })
+
+  test("stays inside the byte range without clipping", () => {
+    let min = 255
+    let max = 0
+    for (const value of data) {
+      min = Math.min(min, value)
+      max = Math.max(max, value)
+    }
+    assert.ok(min > 0 && max < 255, `range ${min}..${max}`)
+  })
+
+  test("tiles without a seam at the edges", () => {
+    // Two rounding units of slack for the quantization to bytes.
+    assert.ok(maxCurvature(data, SIZE, 1, 0, true) <= maxCurvature(data, SIZE, 1, 0, false) + 2)
+    assert.ok(maxCurvature(data, SIZE, 0, 1, true) <= maxCurvature(data, SIZE, 0, 1, false) + 2)
+  })
+})
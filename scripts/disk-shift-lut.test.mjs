@@ -0,0 +1,66 @@
+import assert from "node:assert/strict"
+import { describe, test } from "node:test"
+import {
+  buildDiskShiftLut,
+  DISK_SHIFT_LUT_DOTS,
+  DISK_SHIFT_LUT_INNER,
+  DISK_SHIFT_LUT_RADII,
+} from "../lib/accretion-disk/disk-shift-lut.ts"
+
+const lut = buildDiskShiftLut()
+// The column with dopplerDot = 0.
+const CENTER = (DISK_SHIFT_LUT_DOTS - 1) / 2
+
+function texel(column, row) {
+  const offset = (row * lut.width + column) * 4
+  return Array.from(lut.data.subarray(offset, offset + 4))
+}
+
+describe("buildDiskShiftLut", () => {
+  test("has one RGBA texel per dopplerDot column and radius row", () => {
+    assert.equal(lut.width, DISK_SHIFT_LUT_DOTS)
+    assert.equal(lut.height, DISK_SHIFT_LUT_RADII)
+    assert.equal(lut.data.length, DISK_SHIFT_LUT_DOTS * DISK_SHIFT_LUT_RADII * 4)
+  })
+
+  test("leaves only the gravitational redshift at dopplerDot = 0", () => {
+    const [red, green, blue, addedBlue] = texel(CENTER, 0)
+    const grav = Math.sqrt(1 - 0.6 / DISK_SHIFT_LUT_INNER)
+    const gravColorShift = (1 - grav) * 2
+    assert.ok(Math.abs(red - grav) < 1e-6)
+    assert.ok(Math.abs(green - grav * (1 - gravColorShift * 0.15)) < 1e-6)
+    assert.ok(Math.abs(blue - grav * (1 - gravColorShift * 0.4)) < 1e-6)
+    assert.equal(addedBlue, 0)
+  })
+
+  test("adds blue only on the approaching side", () => {
+    for (let row = 0; row < lut.height; row++) {
+      for (let column = 0; column < lut.width; column++) {
+        const addedBlue = texel(column, row)[3]
+        if (column > CENTER) {
+          assert.ok(addedBlue > 0, `column ${column} row ${row}`)
+        } else {
+          assert.equal(addedBlue, 0, `column ${column} row ${row}`)
+        }
+      }
+    }
+  })
+
+  test("brightens the approaching side and dims the receding one", () => {
+    for (let row = 0; row < lut.height; row++) {
+      const receding = texel(0, row)
+      const center = texel(CENTER, row)
+      const approaching = texel(lut.width - 1, row)
+      for (let channel = 0; channel < 3; channel++) {
+        assert.ok(receding[channel] < center[channel], `row ${row} channel ${channel}`)
+        assert.ok(approaching[channel] > center[channel], `row ${row} channel ${channel}`)
+      }
+    }
+  })
+
+  test("weakens the gravitational redshift with radius", () => {
+    for (let row = 1; row < lut.height; row++) {
+      assert.ok(texel(CENTER, row)[0] > texel(CENTER, row - 1)[0], `row ${row}`)
+    }
+  })
+})
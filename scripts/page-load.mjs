@@ -0,0 +1,158 @@
+#!/usr/bin/env node
+// Measures how quickly a page becomes interactive in headless Chromium: first
+// contentful paint, time to interactive and total blocking time, from the
+// main thread's long tasks. TTI follows Lighthouse without the network part:
+// the end of the last long task before five quiet seconds. The CPU is
+// throttled 4x like Lighthouse's mobile profile, and every run gets a fresh
+// browser; medians over --runs are printed as JSON.
+//
+//   next build && node scripts/page-load.mjs --out before.json
+//   ...change the page, rebuild...
+//   node scripts/page-load.mjs --compare before.json
+
+import fs from "node:fs"
+import os from "node:os"
+import { Browser, findChrome, startServer } from "./browser.mjs"
+
+// Main-thread tasks longer than this block input.
+const LONG_TASK_MS = 50
+const METRICS = ["fcpMs", "ttiMs", "tbtMs"]
+
+const DEFAULTS = {
+  url: null,
+  path: "/",
+  chrome: process.env.CHROME_PATH ?? null,
+  runs: "5",
+  "cpu-throttle": "4",
+  quiet: "5000",
+  size: "1280x720",
+  timeout: "60",
+  compare: null,
+  out: null,
+}
+
+// Installed before any page script runs.
+const OBSERVER_SOURCE = `
+  window.__pageLoad = { fcpMs: null, longTasks: [] }
+  new PerformanceObserver((list) => {
+    for (const entry of list.getEntries()) {
+      if (entry.name === "first-contentful-paint") window.__pageLoad.fcpMs = entry.startTime
+    }
+  }).observe({ type: "paint", buffered: true })
+  new PerformanceObserver((list) => {
+    for (const entry of list.getEntries()) window.__pageLoad.longTasks.push([entry.startTime, entry.duration])
+  }).observe({ type: "longtask", buffered: true })
+`
+
+function parseArgs(argv) {
+  const args = { ...DEFAULTS }
+  for (let i = 0; i < argv.length; i++) {
+    const name = argv[i].replace(/^--/, "")
+    if (name in DEFAULTS && i + 1 < argv.length) {
+      args[name] = argv[++i]
+    } else {
+      throw new Error(`Unknown or incomplete option: ${argv[i]}`)
+    }
+  }
+  const size = /^(\d+)x(\d+)$/.exec(args.size)
+  if (!size) throw new Error(`Sizes look like 1280x720, got ${args.size}`)
+  return { ...args, width: Number(size[1]), height: Number(size[2]) }
+}
+
+/** TTI and TBT from the long tasks observed once the main thread has gone quiet. */
+function summarize({ fcpMs, longTasks }) {
+  let ttiMs = fcpMs
+  for (const [start, duration] of longTasks) {
+    if (start + duration > ttiMs) ttiMs = start + duration
+  }
+  let tbtMs = 0
+  for (const [start, duration] of longTasks) {
+    // Only the part after first paint blocks a user who can see the page.
+    const blocking = start + duration - Math.max(start, fcpMs) - LONG_TASK_MS
+    if (blocking > 0) tbtMs += blocking
+  }
+  return { fcpMs, ttiMs, tbtMs, longTasks: longTasks.length }
+}
+
+async function runOnce(chrome, url, args) {
+  const browser = new Browser(chrome, args.width, args.height)
+  try {
+    const session = await browser.openPage()
+    await browser.send("Page.enable", {}, session)
+    await browser.send("Page.addScriptToEvaluateOnNewDocument", { source: OBSERVER_SOURCE }, session)
+    await browser.send("Emulation.setCPUThrottlingRate", { rate: Number(args["cpu-throttle"]) }, session)
+    await browser.send("Page.navigate", { url }, session)
+
+    const deadline = Date.now() + Number(args.timeout) * 1000
+    while (Date.now() < deadline) {
+      await new Promise((resolve) => setTimeout(resolve, 250))
+      const { result } = await browser.send(
+        "Runtime.evaluate",
+        { expression: "window.__pageLoad ? { now: performance.now(), ...window.__pageLoad } : null", returnByValue: true },
+        session,
+      )
+      const state = result.value
+      if (!state || state.fcpMs === null) continue
+      const busyUntil = state.longTasks.reduce((end, [start, duration]) => Math.max(end, start + duration), state.fcpMs)
+      if (state.now - busyUntil >= Number(args.quiet)) return summarize(state)
+    }
+    throw new Error(`${url} did not go quiet within ${args.timeout}s`)
+  } finally {
+    await browser.close()
+  }
+}
+
+function median(values) {
+  const sorted = [...values].sort((a, b) => a - b)
+  const middle = Math.floor(sorted.length / 2)
+  return sorted.length % 2 ? sorted[middle] : (sorted[middle - 1] + sorted[middle]) / 2
+}
+
+async function main() {
+  const args = parseArgs(process.argv.slice(2))
+  const chrome = findChrome(args.chrome)
+  const server = await startServer(args.url)
+  const url = new URL(args.path, server.url).href
+
+  const runs = []
+  try {
+    for (let run = 0; run < Number(args.runs); run++) {
+      const result = await runOnce(chrome, url, args)
+      console.error(
+        `run ${run + 1}: FCP ${result.fcpMs.toFixed(0)} ms, TTI ${result.ttiMs.toFixed(0)} ms, ` +
+          `TBT ${result.tbtMs.toFixed(0)} ms (${result.longTasks} long tasks)`,
+      )
+      runs.push(result)
+    }
+  } finally {
+    server.stop()
+  }
+
+  const round = (value) => Math.round(value)
+  const report = {
+    environment: { platform: `${os.platform()} ${os.arch()}`, cpu: os.cpus()[0]?.model ?? null },
+    settings: { path: args.path, runs: runs.length, cpuThrottle: Number(args["cpu-throttle"]), size: args.size },
+    median: Object.fromEntries(METRICS.map((metric) => [metric, round(median(runs.map((run) => run[metric])))])),
+    runs: runs.map((run) => ({ ...run, fcpMs: round(run.fcpMs), ttiMs: round(run.ttiMs), tbtMs: round(run.tbtMs) })),
+  }
+
+  if (args.compare) {
+    const before = JSON.parse(fs.readFileSync(args.compare, "utf8"))
+    report.change = Object.fromEntries(METRICS.map((metric) => [metric, report.median[metric] - before.median[metric]]))
+    for (const metric of METRICS) {
+      console.error(`${metric}: ${before.median[metric]} -> ${report.median[metric]} (${report.change[metric]} ms)`)
+    }
+  }
+
+  const json = JSON.stringify(report, null, 2) + "\n"
+  if (args.out) {
+    fs.writeFileSync(args.out, json)
+  } else {
+    process.stdout.write(json)
+  }
+}
+
+main().catch((e) => {
+  console.error(e.message)
+  process.exit(2)
+})
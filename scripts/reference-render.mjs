@@ -0,0 +1,1383 @@
+#!/usr/bin/env node
+// Renders the accretion disk on the CPU, with no GPU or browser involved. It is
+// a line-for-line port of the ray-marching fragment shader in
+// lib/accretion-disk/glsl (rayMissesScene, traceGeodesicMarch,
+// sampleDiskVolume, sampleJet, the disk-atlas pass, the post chain's bloom
+// pyramid, ACES tonemap and FSR1 upscaler) as the WebGL2 variants build it,
+// run at full step budget, so it serves as ground truth for image comparisons
+// and renders stills at any resolution. The frame is split into tiles that a
+// pool of worker threads pulls from a shared queue and returns as
+// Float32Arrays of linear HDR color; the post chain then runs over the whole
+// frame on the main thread.
+//
+//   node scripts/reference-render.mjs --size 3840x2160 --out still.png
+//   node scripts/reference-render.mjs --tier medium --time 12.5 --out medium.pfm
+//   node scripts/reference-render.mjs --tier high --size 320x180 --step-scale 0.1 \
+//     --tolerance 1e-10 --max-steps 100000 --out converged.pfm
+//   node scripts/reference-render.mjs --tier high --size 320x180 --integrator euler --compare converged.pfm
+//   node scripts/reference-render.mjs --tier low --size 1280x720 --march-scale 0.5 --upscaler fsr --compare full.pfm
+//
+// .png output is 8-bit sRGB; .pfm keeps the float pixels for comparisons. A
+// JSON report with timings, megapixels per second and the mean steps per
+// marched ray goes to stdout, with the error against --compare's float map
+// when given. --integrator and --step-scale override the geodesic integrator
+// and step scale (a small one converges on the exact image), --tolerance the
+// tier's tolerance and --disk-samples its disk samples per step. --march-scale
+// marches a fraction of the pixels and upscales them with --upscaler, fsr
+// (EASU and RCAS) or bilinear. --accumulate N averages N frames jittered like
+// the temporal pass's. Other scripts import renderFrame() to render through
+// the same worker pool.
+
+import fs from "node:fs"
+import os from "node:os"
+import path from "node:path"
+import { fileURLToPath } from "node:url"
+import { Worker, isMainThread, parentPort, workerData } from "node:worker_threads"
+import zlib from "node:zlib"
+
+// GEODESIC_INTEGRATOR and STEP_SCALE in lib/accretion-disk/quality.ts, which
+// every tier uses.
+export const GEODESIC_INTEGRATOR = "verlet"
+export const STEP_SCALE = 1.5
+
+// The settings of getQualitySettings() in lib/accretion-disk/quality.ts that
+// change the fragment shader; scripts/build-shaders.mjs specializes it with them.
+export const TIERS = {
+  "ultra-low": {
+    maxSteps: 128,
+    adaptiveStep: 0.05,
+    diskSamples: 2,
+    jetEnabled: true,
+    bloomEnabled: false,
+    geodesicTolerance: 1e-3,
+  },
+  low: {
+    maxSteps: 160,
+    adaptiveStep: 0.045,
+    diskSamples: 2,
+    jetEnabled: true,
+    bloomEnabled: false,
+    geodesicTolerance: 1e-3,
+  },
+  medium: {
+    maxSteps: 192,
+    adaptiveStep: 0.04,
+    diskSamples: 2,
+    jetEnabled: true,
+    bloomEnabled: false,
+    geodesicTolerance: 3e-4,
+  },
+  high: {
+    maxSteps: 320,
+    adaptiveStep: 0.03,
+    diskSamples: 3,
+    jetEnabled: true,
+    bloomEnabled: true,
+    geodesicTolerance: 1e-4,
+  },
+  ultra: {
+    maxSteps: 450,
+    adaptiveStep: 0.02,
+    diskSamples: 3,
+    jetEnabled: true,
+    bloomEnabled: true,
+    geodesicTolerance: 3e-5,
+  },
+}
+
+const DEFAULTS = {
+  tier: "ultra",
+  size: "1920x1080",
+  time: "4",
+  threads: String(os.availableParallelism()),
+  tile: "32",
+  "max-steps": null,
+  "step-scale": null,
+  "disk-samples": null,
+  integrator: null,
+  tolerance: null,
+  "march-scale": "1",
+  accumulate: "1",
+  upscaler: "fsr",
+  compare: null,
+  out: "reference.png",
+}
+
+function parseArgs(argv) {
+  const args = { ...DEFAULTS }
+  for (let i = 0; i < argv.length; i++) {
+    const name = argv[i].replace(/^--/, "")
+    if (name in DEFAULTS && i + 1 < argv.length) {
+      args[name] = argv[++i]
+    } else {
+      throw new Error(`Unknown or incomplete option: ${argv[i]}`)
+    }
+  }
+  if (!(args.tier in TIERS)) throw new Error(`Unknown tier: ${args.tier}`)
+  const size = /^(\d+)x(\d+)$/.exec(args.size)
+  if (!size) throw new Error(`Sizes look like 1920x1080, got ${args.size}`)
+  if (![".png", ".pfm"].includes(path.extname(args.out))) throw new Error("--out must end in .png or .pfm")
+  const settings = { ...TIERS[args.tier] }
+  if (args["max-steps"] !== null) settings.maxSteps = Number(args["max-steps"])
+  settings.stepScale = args["step-scale"] === null ? STEP_SCALE : Number(args["step-scale"])
+  if (args["disk-samples"] !== null) settings.diskSamples = Math.max(1, Number(args["disk-samples"]))
+  settings.integrator = args.integrator ?? GEODESIC_INTEGRATOR
+  if (args.tolerance !== null) settings.geodesicTolerance = Number(args.tolerance)
+  if (!["euler", "verlet"].includes(settings.integrator)) throw new Error(`Unknown integrator: ${settings.integrator}`)
+  if (!["fsr", "bilinear"].includes(args.upscaler)) throw new Error(`Unknown upscaler: ${args.upscaler}`)
+  return {
+    ...args,
+    width: Number(size[1]),
+    height: Number(size[2]),
+    time: Number(args.time),
+    threads: Math.max(1, Number(args.threads)),
+    tile: Math.max(1, Number(args.tile)),
+    marchScale: Number(args["march-scale"]),
+    accumulate: Math.max(1, Number(args.accumulate)),
+    settings,
+  }
+}
+
+// ---------------------------------------------------------------------------
+// Scene, ported from the GLSL. Vectors are unpacked into scalars and results
+// are written to module-level scratch arrays so the inner loop allocates
+// nothing.
+
+const RS = 0.6
+const DISK_INNER = 1.2
+const DISK_OUTER = 6.0
+const INCLINATION = 0.1045
+const CORE_BOUND = RS * 6.0
+const DISK_BOUND = DISK_OUTER * 1.1 + 0.1
+const DISK_HALF_THICKNESS = 0.61
+const JET_BOUND = 1.5
+const JET_TOP = 12.0
+const BEND_SLACK = 0.25
+const ESCAPE_RADIUS = 30.0
+const MAX_GEODESIC_STEP = 2.0
+const PHOTON_RING_REACH = 0.45
+const DISK_CHORD_SAMPLES = 6
+
+const clamp = (x, lo, hi) => Math.min(Math.max(x, lo), hi)
+const mix = (a, b, t) => a + (b - a) * t
+const fract = (x) => x - Math.floor(x)
+
+function smoothstep(edge0, edge1, x) {
+  const t = clamp((x - edge0) / (edge1 - edge0), 0, 1)
+  return t * t * (3 - 2 * t)
+}
+
+// Evaluated in single precision: the star pattern depends on the low bits of
+// the ray direction, and GPUs compute it in 32-bit floats.
+function hash(x, y) {
+  const f = Math.fround
+  let a = fract(f(x * 0.1031))
+  let b = fract(f(y * 0.1031))
+  let c = a
+  const d = f(f(a * f(b + 33.33)) + f(b * f(c + 33.33)) + f(c * f(a + 33.33)))
+  a = f(a + d)
+  b = f(b + d)
+  c = f(c + d)
+  return fract(f(f(a + b) * c))
+}
+
+// buildDiskNoise() from lib/accretion-disk/disk-noise.ts, as floats rounded
+// to the bytes the GPU samples
+const DISK_NOISE_SIZE = 512
+const DISK_NOISE_PERIOD = 62.831853
+const DISK_NOISE_RANGE = 1.4
+const DISK_NOISE_DRIFT_X = 0.583333
+const DISK_NOISE_DRIFT_Y = -0.555556
+
+function waveTable(frequency) {
+  const sin = new Float64Array(DISK_NOISE_SIZE)
+  const cos = new Float64Array(DISK_NOISE_SIZE)
+  for (let i = 0; i < DISK_NOISE_SIZE; i++) {
+    const angle = (frequency * (i + 0.5) * 20 * Math.PI) / DISK_NOISE_SIZE
+    sin[i] = Math.sin(angle)
+    cos[i] = Math.cos(angle)
+  }
+  return { sin, cos }
+}
+
+const diskNoise = (() => {
+  const [x12, x23, x06, x41, x35, x60] = [1.2, 2.3, 0.6, 4.1, 3.5, 6.0].map(waveTable)
+  const [y09, y18, y27, y32, y40, y55] = [0.9, 1.8, 2.7, 3.2, 4.0, 5.5].map(waveTable)
+  const data = new Float64Array(DISK_NOISE_SIZE * DISK_NOISE_SIZE)
+  for (let j = 0; j < DISK_NOISE_SIZE; j++) {
+    for (let i = 0; i < DISK_NOISE_SIZE; i++) {
+      const value =
+        x12.sin[i] * y09.cos[j] * 0.5 +
+        (x23.sin[i] * y18.cos[j] + x23.cos[i] * y18.sin[j]) * 0.3 +
+        (y27.cos[j] * x06.cos[i] + y27.sin[j] * x06.sin[i]) * 0.25 +
+        (x41.sin[i] * y32.cos[j] + x41.cos[i] * y32.sin[j]) * 0.15 +
+        (x35.cos[i] * y40.cos[j] + x35.sin[i] * y40.sin[j]) * 0.12 +
+        x60.sin[i] * y55.cos[j] * 0.08
+      data[j * DISK_NOISE_SIZE + i] = Math.round((value / DISK_NOISE_RANGE) * 127.5 + 127.5) / 255
+    }
+  }
+  return data
+})()
+
+/** Bilinear, repeating lookup like a LINEAR / REPEAT texture fetch. */
+function sampleDiskNoise(u, v) {
+  const x = fract(u) * DISK_NOISE_SIZE - 0.5
+  const y = fract(v) * DISK_NOISE_SIZE - 0.5
+  const x0 = Math.floor(x)
+  const y0 = Math.floor(y)
+  const fx = x - x0
+  const fy = y - y0
+  const i0 = (x0 + DISK_NOISE_SIZE) % DISK_NOISE_SIZE
+  const i1 = (x0 + 1) % DISK_NOISE_SIZE
+  const j0 = ((y0 + DISK_NOISE_SIZE) % DISK_NOISE_SIZE) * DISK_NOISE_SIZE
+  const j1 = ((y0 + 1) % DISK_NOISE_SIZE) * DISK_NOISE_SIZE
+  const top = mix(diskNoise[j0 + i0], diskNoise[j0 + i1], fx)
+  const bottom = mix(diskNoise[j1 + i0], diskNoise[j1 + i1], fx)
+  return mix(top, bottom, fy)
+}
+
+function smoothTurb(x, y, t) {
+  const u = x / DISK_NOISE_PERIOD + fract((DISK_NOISE_DRIFT_X * t) / DISK_NOISE_PERIOD)
+  const v = y / DISK_NOISE_PERIOD + fract((DISK_NOISE_DRIFT_Y * t) / DISK_NOISE_PERIOD)
+  return sampleDiskNoise(u, v) * DISK_NOISE_RANGE - (DISK_NOISE_RANGE - 1.0) * 0.5
+}
+
+const HOT = [1.4, 1.4, 1.3]
+const WARM = [1.3, 1.0, 0.5]
+const MID = [1.2, 0.65, 0.2]
+const COOL = [0.9, 0.3, 0.1]
+const diskColorOut = new Float64Array(3)
+
+function diskColor(r, temp) {
+  const t = clamp((r - DISK_INNER) / (DISK_OUTER - DISK_INNER), 0, 1)
+  let from = MID
+  let to = COOL
+  let k = (t - 0.66) * 3
+  if (t < 0.33) {
+    from = HOT
+    to = WARM
+    k = t * 3
+  } else if (t < 0.66) {
+    from = WARM
+    to = MID
+    k = (t - 0.33) * 3
+  }
+  diskColorOut[0] = mix(from[0], to[0], k) + 0.3 * temp
+  diskColorOut[1] = mix(from[1], to[1], k) + 0.2 * temp
+  diskColorOut[2] = mix(from[2], to[2], k) + 0.1 * temp
+}
+
+function diskDopplerDot(x, z, r, vx, vy, vz) {
+  const orbitDirX = -z / Math.max(r, 0.001)
+  const orbitDirZ = x / Math.max(r, 0.001)
+  const velLen = Math.sqrt(vx * vx + vy * vy + vz * vz)
+  return (orbitDirX * vx + orbitDirZ * vz) / Math.max(velLen, 0.001)
+}
+
+const emission = new Float64Array(3)
+
+/** diskIntrinsicEmission: the procedural emission in the disk's own frame, left in `emission`. */
+function diskIntrinsicEmission(x, z, r, t) {
+  const orbitalSpeed = 15.0 / (r * Math.sqrt(r))
+  const orbitalPhase = t * orbitalSpeed
+  const flowX = x * Math.cos(orbitalPhase) - z * Math.sin(orbitalPhase)
+  const flowZ = x * Math.sin(orbitalPhase) + z * Math.cos(orbitalPhase)
+
+  const angle = Math.atan2(z, x)
+  const streakPhase = angle * 6.0 - t * orbitalSpeed * 0.5
+  const motionStreak = Math.pow(Math.sin(streakPhase) * 0.5 + 0.5, 0.7) * 0.3
+
+  const turb1 = smoothTurb(flowX * 0.8, flowZ * 0.8, t * 2.5)
+  const turb2 = smoothTurb(flowX * 1.5 + 5.0, flowZ * 1.2 + 3.0, t * 3.5)
+  const turb3 = smoothTurb(flowX * 0.4, flowZ * 0.5, t * 1.5)
+  const turbulence = turb1 * 0.5 + turb2 * 0.3 + turb3 * 0.2
+
+  const flow1 = Math.sin(flowX * 2.0 + flowZ * 1.2 + t * 4.0) * 0.5 + 0.5
+  const flow2 = Math.cos(flowX * 1.3 - flowZ * 1.8 - t * 3.0) * 0.5 + 0.5
+  const flow3 = Math.sin(angle * 3.0 - t * orbitalSpeed * 0.3) * 0.5 + 0.5
+  const flowBright = flow1 * 0.3 + flow2 * 0.25 + flow3 * 0.2 + motionStreak + 0.25
+
+  const radialBright = Math.pow(DISK_INNER / Math.max(r, DISK_INNER), 1.5)
+  const brightness = radialBright * (0.4 + turbulence * 0.4 + flowBright * 0.5)
+  diskColor(r, turbulence * 0.5)
+  emission[0] = diskColorOut[0] * brightness * 4.0
+  emission[1] = diskColorOut[1] * brightness * 4.0
+  emission[2] = diskColorOut[2] * brightness * 4.0
+}
+
+// The disk-atlas pass: diskIntrinsicEmission at one instant, baked into the
+// RGBM bytes of a polar texture (angle across, radius up) like the one
+// lib/accretion-disk/disk-atlas.ts allocates
+const DISK_ATLAS_ANGLES = 512
+const DISK_ATLAS_RADII = 128
+const DISK_ATLAS_INNER = DISK_INNER * 0.9
+const DISK_ATLAS_OUTER = DISK_OUTER * 1.1
+const DISK_ATLAS_RANGE = 12.0
+
+function bakeDiskAtlas(t) {
+  const atlas = new Float64Array(DISK_ATLAS_ANGLES * DISK_ATLAS_RADII * 4)
+  for (let j = 0; j < DISK_ATLAS_RADII; j++) {
+    const r = mix(DISK_ATLAS_INNER, DISK_ATLAS_OUTER, (j + 0.5) / DISK_ATLAS_RADII)
+    for (let i = 0; i < DISK_ATLAS_ANGLES; i++) {
+      const angle = ((i + 0.5) / DISK_ATLAS_ANGLES - 0.5) * 2 * Math.PI
+      diskIntrinsicEmission(r * Math.cos(angle), r * Math.sin(angle), r, t)
+      const red = emission[0] / DISK_ATLAS_RANGE
+      const green = emission[1] / DISK_ATLAS_RANGE
+      const blue = emission[2] / DISK_ATLAS_RANGE
+      const m = Math.ceil(clamp(Math.max(red, green, blue, 0.000001), 0, 1) * 255) / 255
+      const o = (j * DISK_ATLAS_ANGLES + i) * 4
+      atlas[o] = Math.round(clamp(red / m, 0, 1) * 255) / 255
+      atlas[o + 1] = Math.round(clamp(green / m, 0, 1) * 255) / 255
+      atlas[o + 2] = Math.round(clamp(blue / m, 0, 1) * 255) / 255
+      atlas[o + 3] = m
+    }
+  }
+  return atlas
+}
+
+// Baked once per frame time, the first time a worker needs it
+let diskAtlas = null
+let diskAtlasTime = null
+
+/** diskAtlasEmission: a LINEAR fetch, repeating in angle and clamped in radius, decoded into `emission`. */
+function diskAtlasEmission(x, z, r, t) {
+  if (diskAtlasTime !== t) {
+    diskAtlas = bakeDiskAtlas(t)
+    diskAtlasTime = t
+  }
+  const u = Math.atan2(z, x) / (2 * Math.PI) + 0.5
+  const v = (r - DISK_ATLAS_INNER) / (DISK_ATLAS_OUTER - DISK_ATLAS_INNER)
+  const px = fract(u) * DISK_ATLAS_ANGLES - 0.5
+  const py = clamp(v * DISK_ATLAS_RADII - 0.5, 0, DISK_ATLAS_RADII - 1)
+  const x0 = Math.floor(px)
+  const y0 = Math.floor(py)
+  const fx = px - x0
+  const fy = py - y0
+  const i0 = ((x0 + DISK_ATLAS_ANGLES) % DISK_ATLAS_ANGLES) * 4
+  const i1 = ((x0 + 1) % DISK_ATLAS_ANGLES) * 4
+  const j0 = y0 * DISK_ATLAS_ANGLES * 4
+  const j1 = Math.min(y0 + 1, DISK_ATLAS_RADII - 1) * DISK_ATLAS_ANGLES * 4
+  const texel = (c) =>
+    mix(mix(diskAtlas[j0 + i0 + c], diskAtlas[j0 + i1 + c], fx), mix(diskAtlas[j1 + i0 + c], diskAtlas[j1 + i1 + c], fx), fy)
+  const scale = texel(3) * DISK_ATLAS_RANGE
+  emission[0] = texel(0) * scale
+  emission[1] = texel(1) * scale
+  emission[2] = texel(2) * scale
+}
+
+// buildDiskShiftLut() from lib/accretion-disk/disk-shift-lut.ts: the Doppler
+// and gravitational terms of diskEmission as per-channel scales plus an added
+// blue, with (dopplerDot, r) texel centers on the ends of both ranges
+const DISK_SHIFT_LUT_DOTS = 129
+const DISK_SHIFT_LUT_RADII = 64
+
+/** Rounds to the nearest RGBA16F value, as the upload does. */
+function toHalf(x) {
+  if (x === 0) return 0
+  const quantum = 2 ** (Math.floor(Math.log2(Math.abs(x))) - 10)
+  return Math.round(x / quantum) * quantum
+}
+
+const diskShiftLut = (() => {
+  const data = new Float64Array(DISK_SHIFT_LUT_DOTS * DISK_SHIFT_LUT_RADII * 4)
+  for (let row = 0; row < DISK_SHIFT_LUT_RADII; row++) {
+    const r = mix(DISK_ATLAS_INNER, DISK_ATLAS_OUTER, row / (DISK_SHIFT_LUT_RADII - 1))
+    for (let column = 0; column < DISK_SHIFT_LUT_DOTS; column++) {
+      const dopplerDot = (2 * column) / (DISK_SHIFT_LUT_DOTS - 1) - 1
+      const vOrb = 0.5 / Math.sqrt(Math.max(r, 0.1))
+      const dopplerFactor = dopplerDot * vOrb * 2.5
+      let dopplerBright = clamp(1.0 + dopplerFactor, 0.25, 3.0)
+      dopplerBright *= dopplerBright
+
+      let red = dopplerBright
+      let green = dopplerBright
+      let blue = dopplerBright
+      let addedBlue = 0
+      const colorShift = clamp(dopplerFactor * 2.0, -1.0, 1.0)
+      if (colorShift > 0.0) {
+        const boost = 1.0 + colorShift * 0.5
+        red *= (1.0 - colorShift * 0.15) * boost
+        green *= (1.0 + colorShift * 1.2) * boost
+        blue *= (1.0 + colorShift * colorShift * 2.0) * boost
+        addedBlue = colorShift * 0.4 * boost
+      } else {
+        const redShift = -colorShift
+        red *= 1.0 + redShift * 0.6
+        green *= 1.0 - redShift * 0.35
+        blue *= 1.0 - redShift * 0.7
+      }
+
+      const gravRedshift = Math.sqrt(1.0 - RS / Math.max(r, RS * 1.01))
+      const gravColorShift = (1.0 - gravRedshift) * 2.0
+      const blueGrav = gravRedshift * (1.0 - gravColorShift * 0.4)
+      const o = (row * DISK_SHIFT_LUT_DOTS + column) * 4
+      data[o] = toHalf(red * gravRedshift)
+      data[o + 1] = toHalf(green * gravRedshift * (1.0 - gravColorShift * 0.15))
+      data[o + 2] = toHalf(blue * blueGrav)
+      data[o + 3] = toHalf(addedBlue * blueGrav)
+    }
+  }
+  return data
+})()
+
+/** diskEmission: the atlas color through a LINEAR, clamped fetch from the shift table. */
+function diskEmission(x, z, r, dopplerDot, t) {
+  diskAtlasEmission(x, z, r, t)
+  const px = clamp((dopplerDot * 0.5 + 0.5) * (DISK_SHIFT_LUT_DOTS - 1), 0, DISK_SHIFT_LUT_DOTS - 1)
+  const py = clamp(
+    ((r - DISK_ATLAS_INNER) / (DISK_ATLAS_OUTER - DISK_ATLAS_INNER)) * (DISK_SHIFT_LUT_RADII - 1),
+    0,
+    DISK_SHIFT_LUT_RADII - 1,
+  )
+  const x0 = Math.min(Math.floor(px), DISK_SHIFT_LUT_DOTS - 2)
+  const y0 = Math.min(Math.floor(py), DISK_SHIFT_LUT_RADII - 2)
+  const fx = px - x0
+  const fy = py - y0
+  const o00 = (y0 * DISK_SHIFT_LUT_DOTS + x0) * 4
+  const o01 = o00 + DISK_SHIFT_LUT_DOTS * 4
+  const texel = (c) =>
+    mix(mix(diskShiftLut[o00 + c], diskShiftLut[o00 + 4 + c], fx), mix(diskShiftLut[o01 + c], diskShiftLut[o01 + 4 + c], fx), fy)
+  emission[0] *= texel(0)
+  emission[1] *= texel(1)
+  emission[2] = emission[2] * texel(2) + texel(3)
+}
+
+function diskDensity(x, y, z) {
+  const r = Math.sqrt(x * x + z * z)
+  const absY = Math.abs(y)
+  const diskThickness = 0.08 + 0.12 * smoothstep(DISK_INNER, DISK_OUTER, r)
+  const verticalDensity = Math.exp((-absY * absY) / (diskThickness * diskThickness * 2.0))
+  if (r < DISK_INNER * 0.9 || r > DISK_OUTER * 1.1 || verticalDensity < 0.01) return 0
+  const radialDensity =
+    smoothstep(DISK_INNER * 0.9, DISK_INNER * 1.3, r) * smoothstep(DISK_OUTER * 1.1, DISK_OUTER * 0.6, r)
+  return verticalDensity * radialDensity
+}
+
+/** Density of the disk at a point, with its emission left in `emission`. */
+function sampleDiskVolume(x, y, z, vx, vy, vz, t) {
+  const density = diskDensity(x, y, z)
+  if (density <= 0) return 0
+  const r = Math.sqrt(x * x + z * z)
+  diskEmission(x, z, r, diskDopplerDot(x, z, r, vx, vy, vz), t)
+  return density
+}
+
+const jet = new Float64Array(4)
+
+/** Fills `jet` with the jet's color and density at a point. */
+function sampleJet(x, y, z, t) {
+  jet[3] = 0
+  const absY = Math.abs(y)
+  if (absY < 0.6 || absY > 12.0) return
+  const r = Math.sqrt(x * x + z * z)
+  const jetRadius = 0.15 + 0.08 * Math.sqrt(absY)
+  const radialFall = Math.exp((-r * r) / (jetRadius * jetRadius * 3.0))
+  if (radialFall < 0.02) return
+  const core = Math.exp((-r * r) / (jetRadius * jetRadius * 0.3))
+  const envelope = radialFall * smoothstep(0.6, 2.5, absY) * smoothstep(12.0, 6.0, absY)
+  if (envelope <= 0) return
+
+  const wave1 = Math.sin(absY * 0.8 - t * 4.0) * 0.5 + 0.5
+  const wave2 = Math.sin(absY * 0.4 - t * 2.8) * 0.5 + 0.5
+  const smoothWave = wave1 * 0.7 + wave2 * 0.3
+  const k = core * core + smoothWave * 0.2
+  jet[0] = mix(0.35, 0.7, k)
+  jet[1] = mix(0.25, 0.85, k)
+  jet[2] = mix(0.6, 1.0, k)
+  jet[3] = envelope * (0.5 + 0.4 * smoothWave) * 0.6
+}
+
+function deflectionIntegral(s, b) {
+  const q = b * b + s * s
+  return (s * (2.0 * s * s + 3.0 * b * b)) / (3.0 * b * q * Math.sqrt(q))
+}
+
+function displacementIntegral(s, b) {
+  const q = Math.sqrt(b * b + s * s)
+  return (2.0 * q - (b * b) / q) / (3.0 * b)
+}
+
+const bending = new Float64Array(2)
+
+function rayBending(s0, s, b) {
+  const f0 = deflectionIntegral(s0, b)
+  bending[0] = 1.5 * RS * (deflectionIntegral(s, b) - f0)
+  bending[1] = 1.5 * RS * (displacementIntegral(s, b) - displacementIntegral(s0, b) - f0 * (s - s0))
+}
+
+function rayMissesScene(cx, cy, cz, dx, dy, dz, settings) {
+  const tClosest = -(cx * dx + cy * dy + cz * dz)
+  if (tClosest < 0) return true
+
+  const px = cx + dx * tClosest
+  const py = cy + dy * tClosest
+  const pz = cz + dz * tClosest
+  const b = Math.sqrt(px * px + py * py + pz * pz)
+  if (b < CORE_BOUND) return false
+  const towardX = -px / b
+  const towardY = -py / b
+  const towardZ = -pz / b
+  const s0 = -tClosest
+
+  if (b < DISK_BOUND) {
+    const halfChord = Math.sqrt(DISK_BOUND * DISK_BOUND - b * b)
+    let prevY = 0
+    for (let i = 0; i < DISK_CHORD_SAMPLES; i++) {
+      const s = halfChord * ((2.0 * i) / (DISK_CHORD_SAMPLES - 1) - 1.0)
+      rayBending(s0, s, b)
+      const y = cy + dy * (s - s0) + towardY * bending[1]
+      if (Math.abs(y) < DISK_HALF_THICKNESS + BEND_SLACK || (i > 0 && y * prevY < 0)) return false
+      prevY = y
+    }
+  }
+
+  if (settings.jetEnabled) {
+    const lenXZ = dx * dx + dz * dz
+    if (lenXZ > 0.000001) {
+      const tAxis = Math.max(-(cx * dx + cz * dz) / lenXZ, 0)
+      rayBending(s0, tAxis + s0, b)
+      const ax = cx + dx * tAxis + towardX * bending[1]
+      const ay = cy + dy * tAxis + towardY * bending[1]
+      const az = cz + dz * tAxis + towardZ * bending[1]
+      if (Math.abs(ay) < JET_TOP + BEND_SLACK && Math.sqrt(ax * ax + az * az) < JET_BOUND + BEND_SLACK) return false
+    }
+  }
+  return true
+}
+
+function starfield(x, y, z) {
+  return Math.pow(hash(x * 400.0 + y * 200.0, z * 300.0), 35.0) * 0.3
+}
+
+function lensedStarfield(cx, cy, cz, dx, dy, dz) {
+  const tClosest = -(cx * dx + cy * dy + cz * dz)
+  const px = cx + dx * tClosest
+  const py = cy + dy * tClosest
+  const pz = cz + dz * tClosest
+  const b = Math.max(Math.sqrt(px * px + py * py + pz * pz), 0.001)
+  const sEscape = Math.sqrt(Math.max(ESCAPE_RADIUS * ESCAPE_RADIUS - b * b, 0))
+  rayBending(-tClosest, sEscape, b)
+  const cos = Math.cos(bending[0])
+  const sin = Math.sin(bending[0])
+  return starfield(dx * cos - (px / b) * sin, dy * cos - (py / b) * sin, dz * cos - (pz / b) * sin)
+}
+
+const traced = new Float64Array(5)
+
+/**
+ * Distance from a point to the nearest region that emits light: the photon
+ * ring, the disk slab and the jet cylinder. A step no longer than this cannot
+ * cross any of them however much the path bends, since an arc is never
+ * shorter than its chord.
+ */
+function emitterDistance(x, y, z, r, jetEnabled) {
+  const cylR = Math.sqrt(x * x + z * z)
+  const absY = Math.abs(y)
+  let distance = Math.min(
+    r - RS * 1.5 - PHOTON_RING_REACH,
+    Math.hypot(Math.max(cylR - DISK_BOUND, 0), Math.max(absY - DISK_HALF_THICKNESS, 0)),
+  )
+  if (jetEnabled) {
+    distance = Math.min(distance, Math.hypot(Math.max(cylR - JET_BOUND, 0), Math.max(absY - JET_TOP, 0)))
+  }
+  return Math.max(distance, 0)
+}
+
+/**
+ * traceGeodesicMarch at full budget; leaves color and alpha in `traced`, and
+ * the number of steps taken in traced[4]. `sampleOffset` places the emitter
+ * samples that far into each step, or into each of the step's diskSamples
+ * strata for the disk, as marchSampleOffset does.
+ */
+function traceGeodesicMarch(cx, cy, cz, dx, dy, dz, t, settings, sampleOffset = 0) {
+  traced.fill(0)
+  if (rayMissesScene(cx, cy, cz, dx, dy, dz, settings)) {
+    const star = lensedStarfield(cx, cy, cz, dx, dy, dz)
+    traced[0] = traced[1] = traced[2] = star
+    return
+  }
+
+  let posX = cx
+  let posY = cy
+  let posZ = cz
+  let velX = dx
+  let velY = dy
+  let velZ = dz
+  let red = 0
+  let green = 0
+  let blue = 0
+  let alpha = 0
+  const { maxSteps, adaptiveStep, diskSamples, jetEnabled, geodesicTolerance } = settings
+  const stepScale = settings.stepScale ?? STEP_SCALE
+  const verlet = (settings.integrator ?? GEODESIC_INTEGRATOR) === "verlet"
+  let stepSize = adaptiveStep * stepScale
+
+  // h = |pos x vel| is conserved under a central pull, so for Verlet its
+  // strength is fixed for the whole ray
+  const hx = cy * dz - cz * dy
+  const hy = cz * dx - cx * dz
+  const hz = cx * dy - cy * dx
+  const pull = 1.5 * RS * (hx * hx + hy * hy + hz * hz)
+  const camR = Math.sqrt(cx * cx + cy * cy + cz * cz)
+  let accScale = -pull / camR ** 5
+  let accX = cx * accScale
+  let accY = cy * accScale
+  let accZ = cz * accScale
+  let geodesicStep = MAX_GEODESIC_STEP
+
+  let steps = 0
+  for (let i = 0; i < maxSteps; i++) {
+    const r = Math.sqrt(posX * posX + posY * posY + posZ * posZ)
+    steps = i + 1
+
+    if (r < RS) {
+      red *= alpha
+      green *= alpha
+      blue *= alpha
+      alpha = 1
+      break
+    }
+
+    let leaving = r > DISK_BOUND && posX * velX + posY * velY + posZ * velZ > 0
+    if (jetEnabled) {
+      const cylR = Math.sqrt(posX * posX + posZ * posZ)
+      leaving =
+        leaving &&
+        ((Math.abs(posY) > JET_TOP + BEND_SLACK && posY * velY > 0) ||
+          (cylR > JET_BOUND + BEND_SLACK && posX * velX + posZ * velZ > 0))
+    }
+    if (r > ESCAPE_RADIUS || leaving) {
+      const star = starfield(dx, dy, dz) * (1 - alpha)
+      red += star
+      green += star
+      blue += star
+      break
+    }
+
+    const profileStep = adaptiveStep + 0.06 * smoothstep(RS * 2.0, RS * 8.0, r)
+    let newPosX, newPosY, newPosZ
+    if (verlet) {
+      const clearance = emitterDistance(posX, posY, posZ, r, jetEnabled)
+      stepSize = Math.min(Math.max(profileStep * stepScale, clearance), geodesicStep)
+      const dl = stepSize / Math.sqrt(velX * velX + velY * velY + velZ * velZ)
+      newPosX = posX + (velX + 0.5 * accX * dl) * dl
+      newPosY = posY + (velY + 0.5 * accY * dl) * dl
+      newPosZ = posZ + (velZ + 0.5 * accZ * dl) * dl
+      const newR = Math.sqrt(newPosX * newPosX + newPosY * newPosY + newPosZ * newPosZ)
+      accScale = -pull / newR ** 5
+      const newAccX = newPosX * accScale
+      const newAccY = newPosY * accScale
+      const newAccZ = newPosZ * accScale
+      velX += 0.5 * (accX + newAccX) * dl
+      velY += 0.5 * (accY + newAccY) * dl
+      velZ += 0.5 * (accZ + newAccZ) * dl
+      const jerkX = newAccX - accX
+      const jerkY = newAccY - accY
+      const jerkZ = newAccZ - accZ
+      const error = (Math.sqrt(jerkX * jerkX + jerkY * jerkY + jerkZ * jerkZ) * dl * dl) / 6.0
+      geodesicStep = stepSize * clamp(Math.cbrt(geodesicTolerance / Math.max(error, 1e-12)), 0.5, 2.0)
+      accX = newAccX
+      accY = newAccY
+      accZ = newAccZ
+    } else {
+      const hx = posY * velZ - posZ * velY
+      const hy = posZ * velX - posX * velZ
+      const hz = posX * velY - posY * velX
+      const h2 = hx * hx + hy * hy + hz * hz
+      const rInv = 1 / r
+      const accel = 1.5 * RS * h2 * rInv * rInv * rInv * rInv
+      velX -= posX * rInv * accel * stepSize
+      velY -= posY * rInv * accel * stepSize
+      velZ -= posZ * rInv * accel * stepSize
+      const velLen = Math.max(Math.sqrt(velX * velX + velY * velY + velZ * velZ), 0.001)
+      velX /= velLen
+      velY /= velLen
+      velZ /= velLen
+      stepSize = profileStep * stepScale
+      newPosX = posX + velX * stepSize
+      newPosY = posY + velY * stepSize
+      newPosZ = posZ + velZ * stepSize
+    }
+    const weight = stepSize / profileStep
+    const sampleX = posX + (newPosX - posX) * sampleOffset
+    const sampleY = posY + (newPosY - posY) * sampleOffset
+    const sampleZ = posZ + (newPosZ - posZ) * sampleOffset
+    const sampleR = Math.sqrt(sampleX * sampleX + sampleY * sampleY + sampleZ * sampleZ)
+
+    // Only steps that reach into the disk's slab can pick up any of it
+    if (posY * newPosY <= 0 || Math.min(Math.abs(posY), Math.abs(newPosY)) < DISK_HALF_THICKNESS) {
+      for (let k = 0; k < diskSamples; k++) {
+        const f = (k + sampleOffset) / diskSamples
+        const density = sampleDiskVolume(
+          posX + (newPosX - posX) * f,
+          posY + (newPosY - posY) * f,
+          posZ + (newPosZ - posZ) * f,
+          velX,
+          velY,
+          velZ,
+          t,
+        )
+        if (density > 0.01) {
+          const contribution = ((density * stepSize) / diskSamples) * 8.0 * (1 - alpha)
+          red += emission[0] * contribution
+          green += emission[1] * contribution
+          blue += emission[2] * contribution
+          alpha += contribution * 0.5
+        }
+      }
+    }
+
+    if (jetEnabled) {
+      sampleJet(sampleX, sampleY, sampleZ, t)
+      if (jet[3] > 0.01) {
+        const a = jet[3] * 0.008 * weight * (1 - alpha)
+        red += jet[0] * a
+        green += jet[1] * a
+        blue += jet[2] * a
+        alpha += a * 0.2
+      }
+    }
+
+    const prDist = Math.abs(sampleR - RS * 1.5)
+    const prPulse = 0.7 + 0.3 * Math.sin(t * 4.0 + Math.atan2(sampleZ, sampleX) * 4.0)
+    const prGlow = Math.exp(-prDist * prDist * 100.0) * 0.25 * prPulse * weight * (1 - alpha)
+    red += prGlow
+    green += 0.9 * prGlow
+    blue += 0.7 * prGlow
+
+    posX = newPosX
+    posY = newPosY
+    posZ = newPosZ
+
+    if (alpha > 0.95) break
+  }
+
+  traced[0] = red
+  traced[1] = green
+  traced[2] = blue
+  traced[3] = alpha
+  traced[4] = steps
+}
+
+/** Element `index` of the base-`base` Halton sequence, in [0, 1). */
+function halton(index, base) {
+  let result = 0
+  let f = 1 / base
+  for (let i = index; i > 0; i = Math.floor(i / base)) {
+    result += f * (i % base)
+    f /= base
+  }
+  return result
+}
+
+// Mirrors TEMPORAL_JITTER_FRAMES in lib/accretion-disk/temporal.ts.
+const TEMPORAL_JITTER_FRAMES = 16
+
+/**
+ * Sub-pixel offset and the step-offset phase of the temporal pass's `frame`,
+ * or none for a single unjittered frame (frame -1).
+ */
+function temporalJitter(frame) {
+  if (frame < 0) return { x: 0, y: 0, phase: 0 }
+  const index = (frame % TEMPORAL_JITTER_FRAMES) + 1
+  return { x: halton(index, 2) - 0.5, y: halton(index, 3) - 0.5, phase: fract(frame * 0.618034) }
+}
+
+/** Interleaved gradient noise at a gl_FragCoord, as marchSampleOffset in march.glsl computes it. */
+const gradientNoise = (x, y) => fract(52.9829189 * fract(0.06711056 * x + 0.00583715 * y))
+
+/**
+ * Renders a tile of a width x height frame whose top-left pixel is (x0, y0),
+ * as rows of linear HDR RGB floats from the top down, with the steps taken by
+ * the rays that were marched. A `frame` of 0 or more jitters the rays like
+ * that frame of the temporal pass.
+ */
+function renderTile(x0, y0, w, h, { width, height, time, settings }, frame = -1) {
+  const jitter = temporalJitter(frame)
+  const pixels = new Float32Array(w * h * 3)
+  let steps = 0
+  let marched = 0
+  const orbitAngle = time * 0.25
+  const cI = Math.cos(INCLINATION)
+  const sI = Math.sin(INCLINATION)
+  const cx = Math.sin(orbitAngle) * cI * 11.0
+  const cy = sI * 11.0
+  const cz = Math.cos(orbitAngle) * cI * 11.0
+  const camLen = Math.sqrt(cx * cx + cy * cy + cz * cz)
+  const fx = -cx / camLen
+  const fy = -cy / camLen
+  const fz = -cz / camLen
+  const rx = Math.cos(orbitAngle)
+  const rz = -Math.sin(orbitAngle)
+  // up = normalize(cross(right, fwd)) with right.y = 0
+  let ux = -rz * fy
+  let uy = rz * fx - rx * fz
+  let uz = rx * fy
+  const upLen = Math.max(Math.sqrt(ux * ux + uy * uy + uz * uz), 0.001)
+  ux /= upLen
+  uy /= upLen
+  uz /= upLen
+  const minSide = Math.min(width, height)
+
+  for (let j = 0; j < h; j++) {
+    // gl_FragCoord counts rows from the bottom
+    const fragY = height - (y0 + j) - 0.5
+    const v = (fragY + jitter.y - 0.5 * height) / minSide
+    for (let i = 0; i < w; i++) {
+      const fragX = x0 + i + 0.5
+      const u = (fragX + jitter.x - 0.5 * width) / minSide
+      let dx = fx + u * rx + v * ux
+      let dy = fy + v * uy
+      let dz = fz + u * rz + v * uz
+      const dLen = Math.sqrt(dx * dx + dy * dy + dz * dz)
+      dx /= dLen
+      dy /= dLen
+      dz /= dLen
+
+      const sampleOffset = fract(gradientNoise(fragX, fragY) + jitter.phase)
+      traceGeodesicMarch(cx, cy, cz, dx, dy, dz, time, settings, sampleOffset)
+      steps += traced[4]
+      if (traced[4] > 0) marched++
+      let red = traced[0]
+      let green = traced[1]
+      let blue = traced[2]
+      const alpha = traced[3]
+
+      // finishColor
+      const rayClosest = -(cx * dx + cy * dy + cz * dz)
+      if (rayClosest > 0) {
+        const px = cx + dx * rayClosest
+        const py = cy + dy * rayClosest
+        const pz = cz + dz * rayClosest
+        const erDist = Math.sqrt(px * px + py * py + pz * pz) - RS * 2.6
+        const ring = Math.exp(-erDist * erDist * 70.0) * 0.4 * (1 - alpha * 0.7)
+        red += ring
+        green += 0.8 * ring
+        blue += 0.5 * ring
+      }
+
+      const o = (j * w + i) * 3
+      pixels[o] = red
+      pixels[o + 1] = green
+      pixels[o + 2] = blue
+    }
+  }
+  return { pixels, steps, marched }
+}
+
+// ---------------------------------------------------------------------------
+// Post chain (lib/accretion-disk/post-chain.ts and the bloom-*.frag.glsl,
+// post-composite.frag.glsl programs)
+
+// Mirror BLOOM_LEVELS in post-chain.ts and BLOOM_STRENGTH in shaders.ts.
+const BLOOM_LEVELS = 5
+const MIN_BLOOM_SIZE = 8
+const BLOOM_STRENGTH = 0.1
+// Mirrors BLOOM_CLAMP in bloom-down.frag.glsl.
+const BLOOM_CLAMP = 2.0
+
+/** Bilinear RGB fetch at texture coordinate (s, t) with clamp-to-edge, like a LINEAR sampler. */
+function sampleLinear(image, width, height, s, t, out) {
+  const x = clamp(s * width - 0.5, 0, width - 1)
+  const y = clamp(t * height - 0.5, 0, height - 1)
+  const x0 = Math.floor(x)
+  const y0 = Math.floor(y)
+  const x1 = Math.min(x0 + 1, width - 1)
+  const y1 = Math.min(y0 + 1, height - 1)
+  const fx = x - x0
+  const fy = y - y0
+  for (let c = 0; c < 3; c++) {
+    const top = mix(image[(y0 * width + x0) * 3 + c], image[(y0 * width + x1) * 3 + c], fx)
+    const bottom = mix(image[(y1 * width + x0) * 3 + c], image[(y1 * width + x1) * 3 + c], fx)
+    out[c] = mix(top, bottom, fy)
+  }
+}
+
+const tap = new Float64Array(3)
+
+/** bloom-down.frag.glsl: five-tap dual filter from `source` into a level half its size. */
+function bloomDown(source, width, height, prefilter) {
+  const w = Math.floor(width / 2)
+  const h = Math.floor(height / 2)
+  const level = new Float32Array(w * h * 3)
+  const offsets = [
+    [0, 0, 4],
+    [-1, -1, 1],
+    [1, 1, 1],
+    [1, -1, 1],
+    [-1, 1, 1],
+  ]
+  for (let y = 0; y < h; y++) {
+    for (let x = 0; x < w; x++) {
+      const s = (x + 0.5) / w
+      const t = (y + 0.5) / h
+      const o = (y * w + x) * 3
+      for (const [dx, dy, weight] of offsets) {
+        sampleLinear(source, width, height, s + dx / width, t + dy / height, tap)
+        let k = weight / 8
+        if (prefilter) {
+          const lum = tap[0] * 0.299 + tap[1] * 0.587 + tap[2] * 0.114
+          k *= smoothstep(0.6, 2.0, lum) * Math.min(1, BLOOM_CLAMP / Math.max(lum, 1e-6))
+        }
+        level[o] += tap[0] * k
+        level[o + 1] += tap[1] * k
+        level[o + 2] += tap[2] * k
+      }
+    }
+  }
+  return { image: level, width: w, height: h }
+}
+
+/** bloom-up.frag.glsl: eight-tap tent over `source`, added into `target`. */
+function bloomUp(source, target) {
+  const hx = 0.5 / source.width
+  const hy = 0.5 / source.height
+  const offsets = [
+    [-2, 0, 1],
+    [2, 0, 1],
+    [0, -2, 1],
+    [0, 2, 1],
+    [-1, 1, 2],
+    [1, 1, 2],
+    [1, -1, 2],
+    [-1, -1, 2],
+  ]
+  for (let y = 0; y < target.height; y++) {
+    for (let x = 0; x < target.width; x++) {
+      const s = (x + 0.5) / target.width
+      const t = (y + 0.5) / target.height
+      const o = (y * target.width + x) * 3
+      for (const [dx, dy, weight] of offsets) {
+        sampleLinear(source.image, source.width, source.height, s + dx * hx, t + dy * hy, tap)
+        target.image[o] += (tap[0] * weight) / 12
+        target.image[o + 1] += (tap[1] * weight) / 12
+        target.image[o + 2] += (tap[2] * weight) / 12
+      }
+    }
+  }
+}
+
+const aces = (x) => (x * (2.51 * x + 0.03)) / (x * (2.43 * x + 0.59) + 0.14)
+
+/** post-composite.frag.glsl: bloom add and display transform of `image` sampled at a width x height target. */
+function composite(image, imageWidth, imageHeight, bloom, levels, width, height) {
+  const out = new Float32Array(width * height * 3)
+  const minSide = Math.min(width, height)
+  const color = new Float64Array(3)
+  const bloomColor = new Float64Array(3)
+  for (let y = 0; y < height; y++) {
+    // gl_FragCoord counts rows from the bottom
+    const v = (height - y - 0.5 - 0.5 * height) / minSide
+    for (let x = 0; x < width; x++) {
+      const u = (x + 0.5 - 0.5 * width) / minSide
+      const o = (y * width + x) * 3
+      sampleLinear(image, imageWidth, imageHeight, (x + 0.5) / width, (y + 0.5) / height, color)
+      if (bloom) {
+        sampleLinear(bloom.image, bloom.width, bloom.height, (x + 0.5) / width, (y + 0.5) / height, bloomColor)
+        for (let c = 0; c < 3; c++) color[c] += (bloomColor[c] * BLOOM_STRENGTH) / levels
+      }
+      const vignette = 0.92 + 0.08 * (1 - smoothstep(0.5, 1.4, Math.sqrt(u * u + v * v)))
+      for (let c = 0; c < 3; c++) out[o + c] = Math.pow(clamp(aces(color[c]), 0, 1), 0.4545) * vignette
+    }
+  }
+  return out
+}
+
+/** Rounds to the 8-bit levels of an RGBA8 render target, in place. */
+function quantize8(image) {
+  for (let i = 0; i < image.length; i++) image[i] = Math.round(clamp(image[i], 0, 1) * 255) / 255
+  return image
+}
+
+// Mirrors UPSCALE_SHARPNESS in lib/accretion-disk/shaders.ts.
+const UPSCALE_SHARPNESS = 0.87
+
+const easuLuma = (image, o) => image[o + 2] * 0.5 + (image[o] * 0.5 + image[o + 1])
+
+/**
+ * upscale-easu.frag.glsl at a width x height target. The GLSL works in
+ * gl_FragCoord space, rows from the bottom, and its taps are not symmetric
+ * in y, so texels are addressed the same way here and flipped on access.
+ */
+function easu(image, sourceWidth, sourceHeight, width, height) {
+  const out = new Float32Array(width * height * 3)
+  const offsets = [
+    [0, -1],
+    [1, -1],
+    [-1, 0],
+    [0, 0],
+    [1, 0],
+    [2, 0],
+    [-1, 1],
+    [0, 1],
+    [1, 1],
+    [2, 1],
+    [0, 2],
+    [1, 2],
+  ]
+  const [B, C, E, F, G, H, I, J, K, L, N, O] = offsets.keys()
+  const index = new Int32Array(12)
+  const luma = new Float64Array(12)
+  for (let gy = 0; gy < height; gy++) {
+    for (let x = 0; x < width; x++) {
+      let ppx = ((x + 0.5) * sourceWidth) / width - 0.5
+      let ppy = ((gy + 0.5) * sourceHeight) / height - 0.5
+      const fx = Math.floor(ppx)
+      const fy = Math.floor(ppy)
+      ppx -= fx
+      ppy -= fy
+      for (let t = 0; t < 12; t++) {
+        const tx = clamp(fx + offsets[t][0], 0, sourceWidth - 1)
+        const ty = clamp(fy + offsets[t][1], 0, sourceHeight - 1)
+        index[t] = ((sourceHeight - 1 - ty) * sourceWidth + tx) * 3
+        luma[t] = easuLuma(image, index[t])
+      }
+
+      let dirX = 0
+      let dirY = 0
+      let len = 0
+      const set = (w, a, b, c, d, e) => {
+        const dx = luma[d] - luma[b]
+        const lenX = clamp(Math.abs(dx) / Math.max(Math.abs(luma[d] - luma[c]), Math.abs(luma[c] - luma[b]), 1e-5), 0, 1)
+        const dy = luma[e] - luma[a]
+        const lenY = clamp(Math.abs(dy) / Math.max(Math.abs(luma[e] - luma[c]), Math.abs(luma[c] - luma[a]), 1e-5), 0, 1)
+        dirX += dx * w
+        dirY += dy * w
+        len += (lenX * lenX + lenY * lenY) * w
+      }
+      set((1 - ppx) * (1 - ppy), B, E, F, G, J)
+      set(ppx * (1 - ppy), C, F, G, H, K)
+      set((1 - ppx) * ppy, F, I, J, K, N)
+      set(ppx * ppy, G, J, K, L, O)
+
+      const dirLength2 = dirX * dirX + dirY * dirY
+      if (dirLength2 < 1 / 32768) {
+        dirX = 1
+        dirY = 0
+      } else {
+        dirX /= Math.sqrt(dirLength2)
+        dirY /= Math.sqrt(dirLength2)
+      }
+      len *= 0.5
+      len *= len
+      const stretch = (dirX * dirX + dirY * dirY) / Math.max(Math.abs(dirX), Math.abs(dirY))
+      const len2X = 1 + (stretch - 1) * len
+      const len2Y = 1 - 0.5 * len
+      const lob = 0.5 + (0.21 - 0.5) * len
+      const clp = 1 / lob
+
+      const o = ((height - 1 - gy) * width + x) * 3
+      let weightSum = 0
+      for (let t = 0; t < 12; t++) {
+        const offX = offsets[t][0] - ppx
+        const offY = offsets[t][1] - ppy
+        const vx = (offX * dirX + offY * dirY) * len2X
+        const vy = (offX * -dirY + offY * dirX) * len2Y
+        const d2 = Math.min(vx * vx + vy * vy, clp)
+        const wB = 0.4 * d2 - 1
+        const wA = lob * d2 - 1
+        const w = (1.5625 * wB * wB - 0.5625) * (wA * wA)
+        for (let c = 0; c < 3; c++) out[o + c] += image[index[t] + c] * w
+        weightSum += w
+      }
+      for (let c = 0; c < 3; c++) {
+        const channel = [F, G, J, K].map((t) => image[index[t] + c])
+        out[o + c] = clamp(out[o + c] / weightSum, Math.min(...channel), Math.max(...channel))
+      }
+    }
+  }
+  return out
+}
+
+/** upscale-rcas.frag.glsl over a whole image; its taps are symmetric, so rows stay top down. */
+function rcas(image, width, height) {
+  const out = new Float32Array(width * height * 3)
+  const limit = 0.25 - 1 / 16
+  for (let y = 0; y < height; y++) {
+    for (let x = 0; x < width; x++) {
+      const e = (y * width + x) * 3
+      const b = (Math.max(y - 1, 0) * width + x) * 3
+      const h = (Math.min(y + 1, height - 1) * width + x) * 3
+      const d = (y * width + Math.max(x - 1, 0)) * 3
+      const f = (y * width + Math.min(x + 1, width - 1)) * 3
+      const lumas = [b, d, e, f, h].map((o) => easuLuma(image, o))
+      const range = Math.max(...lumas) - Math.min(...lumas)
+      const noise = 1 - 0.5 * clamp(Math.abs(0.25 * (lumas[0] + lumas[1] + lumas[3] + lumas[4]) - lumas[2]) / Math.max(range, 1e-5), 0, 1)
+      let lobe = -Infinity
+      for (let c = 0; c < 3; c++) {
+        const mn4 = Math.min(image[b + c], image[d + c], image[f + c], image[h + c])
+        const mx4 = Math.max(image[b + c], image[d + c], image[f + c], image[h + c])
+        const hitMin = mn4 / (4 * Math.max(mx4, 1e-5))
+        const hitMax = (1 - mx4) / Math.min(4 * mn4 - 4, -1e-5)
+        lobe = Math.max(lobe, -hitMin, hitMax)
+      }
+      lobe = Math.max(-limit, Math.min(lobe, 0)) * UPSCALE_SHARPNESS * noise
+      for (let c = 0; c < 3; c++) {
+        const neighbors = image[b + c] + image[d + c] + image[f + c] + image[h + c]
+        out[e + c] = (lobe * neighbors + image[e + c]) / (4 * lobe + 1)
+      }
+    }
+  }
+  return out
+}
+
+/**
+ * Turns a marchWidth x marchHeight frame of linear HDR rows into width x
+ * height display colors: the bloom pyramid when the tier enables it, then
+ * post-composite.frag.glsl's bloom add and display transform (ACES, gamma,
+ * vignette). A smaller march is upscaled like the renderer does it, either
+ * with the composite's bilinear fetch ("bilinear") or by compositing at march
+ * size and running EASU and RCAS ("fsr"). Rows run top down here and bottom
+ * up on the GPU; the bloom filters are symmetric, so that makes no difference.
+ */
+function applyPostChain(image, marchWidth, marchHeight, settings, width, height, upscaler) {
+  let bloom = null
+  let levels = 0
+  if (settings.bloomEnabled) {
+    const pyramid = []
+    let source = { image, width: marchWidth, height: marchHeight }
+    while (pyramid.length < BLOOM_LEVELS && Math.min(source.width >> 1, source.height >> 1) >= MIN_BLOOM_SIZE) {
+      source = bloomDown(source.image, source.width, source.height, pyramid.length === 0)
+      pyramid.push(source)
+    }
+    for (let level = pyramid.length - 1; level > 0; level--) bloomUp(pyramid[level], pyramid[level - 1])
+    levels = pyramid.length
+    bloom = pyramid[0]
+  }
+
+  if (upscaler === "bilinear" || (marchWidth >= width && marchHeight >= height)) {
+    return composite(image, marchWidth, marchHeight, bloom, levels, width, height)
+  }
+  const composited = quantize8(composite(image, marchWidth, marchHeight, bloom, levels, marchWidth, marchHeight))
+  return rcas(quantize8(easu(composited, marchWidth, marchHeight, width, height)), width, height)
+}
+
+// ---------------------------------------------------------------------------
+// Output
+
+const CRC_TABLE = new Uint32Array(256).map((_, n) => {
+  let c = n
+  for (let k = 0; k < 8; k++) c = c & 1 ? 0xedb88320 ^ (c >>> 1) : c >>> 1
+  return c
+})
+
+function crc32(buffer) {
+  let c = 0xffffffff
+  for (const byte of buffer) c = CRC_TABLE[(c ^ byte) & 0xff] ^ (c >>> 8)
+  return (c ^ 0xffffffff) >>> 0
+}
+
+function pngChunk(type, data) {
+  const chunk = Buffer.alloc(12 + data.length)
+  chunk.writeUInt32BE(data.length, 0)
+  chunk.write(type, 4, "ascii")
+  data.copy(chunk, 8)
+  chunk.writeUInt32BE(crc32(chunk.subarray(4, 8 + data.length)), 8 + data.length)
+  return chunk
+}
+
+/** Quantizes float RGB pixels to bytes. */
+export function toRgb8(image) {
+  const bytes = new Uint8Array(image.length)
+  for (let i = 0; i < image.length; i++) bytes[i] = Math.round(clamp(image[i], 0, 1) * 255)
+  return bytes
+}
+
+function encodePng(image, width, height) {
+  const pixels = toRgb8(image)
+  const header = Buffer.alloc(13)
+  header.writeUInt32BE(width, 0)
+  header.writeUInt32BE(height, 4)
+  header[8] = 8 // bit depth
+  header[9] = 2 // truecolor RGB
+  const rows = Buffer.alloc(height * (1 + width * 3))
+  for (let y = 0; y < height; y++) {
+    const row = y * (1 + width * 3)
+    rows.set(pixels.subarray(y * width * 3, (y + 1) * width * 3), row + 1)
+  }
+  return Buffer.concat([
+    Buffer.from([0x89, 0x50, 0x4e, 0x47, 0x0d, 0x0a, 0x1a, 0x0a]),
+    pngChunk("IHDR", header),
+    pngChunk("IDAT", zlib.deflateSync(rows)),
+    pngChunk("IEND", Buffer.alloc(0)),
+  ])
+}
+
+/** Portable float map: little-endian RGB floats, rows from the bottom up. */
+function encodePfm(image, width, height) {
+  const header = Buffer.from(`PF\n${width} ${height}\n-1.0\n`, "ascii")
+  const body = Buffer.alloc(width * height * 12)
+  for (let y = 0; y < height; y++) {
+    const source = (height - 1 - y) * width * 3
+    for (let i = 0; i < width * 3; i++) body.writeFloatLE(image[source + i], (y * width * 3 + i) * 4)
+  }
+  return Buffer.concat([header, body])
+}
+
+function decodePfm(buffer) {
+  const header = /^PF\n(\d+) (\d+)\n(-?[\d.]+)\n/.exec(buffer.toString("latin1", 0, 64))
+  if (!header) throw new Error("Not an RGB portable float map")
+  const width = Number(header[1])
+  const height = Number(header[2])
+  const littleEndian = Number(header[3]) < 0
+  const image = new Float32Array(width * height * 3)
+  for (let y = 0; y < height; y++) {
+    const target = (height - 1 - y) * width * 3
+    for (let i = 0; i < width * 3; i++) {
+      const offset = header[0].length + (y * width * 3 + i) * 4
+      image[target + i] = littleEndian ? buffer.readFloatLE(offset) : buffer.readFloatBE(offset)
+    }
+  }
+  return { image, width, height }
+}
+
+/** Per-channel error against a reference image, in 8-bit levels. */
+function compareImages(image, reference) {
+  const errors = new Float32Array(image.length)
+  let squares = 0
+  for (let i = 0; i < image.length; i++) {
+    errors[i] = Math.abs(clamp(image[i], 0, 1) - clamp(reference[i], 0, 1)) * 255
+    squares += errors[i] * errors[i]
+  }
+  errors.sort()
+  const round = (value) => Math.round(value * 1000) / 1000
+  return {
+    rmse: round(Math.sqrt(squares / image.length)),
+    p99: round(errors[Math.floor(errors.length * 0.99)]),
+    max: round(errors[errors.length - 1]),
+  }
+}
+
+// ---------------------------------------------------------------------------
+// Worker pool
+
+/**
+ * Renders a width x height frame at `time` with tier `settings` on `threads`
+ * workers, handing `tile`-sized tiles to whichever worker is idle until the
+ * queue runs dry, then runs the post chain over the frame. With `marchScale`
+ * below 1 the rays are marched at that fraction of the size and `upscaler`
+ * ("fsr" or "bilinear") brings the frame back up. With `accumulate` above 1
+ * that many frames of the temporal pass's jitter sequence are marched at
+ * `time` and averaged, the image its history converges to while the scene
+ * holds still. Resolves with display RGB floats from the top row down and
+ * the mean number of steps per marched ray.
+ */
+export function renderFrame(args) {
+  const { tile } = args
+  const marchScale = Math.min(args.marchScale ?? 1, 1)
+  const width = Math.max(1, Math.floor(args.width * marchScale))
+  const height = Math.max(1, Math.floor(args.height * marchScale))
+  const frames = Math.max(1, args.accumulate ?? 1)
+  const queue = []
+  for (const frame of frames > 1 ? Array.from({ length: frames }, (_, n) => n) : [-1]) {
+    for (let y = 0; y < height; y += tile) {
+      for (let x = 0; x < width; x += tile) {
+        queue.push({ x, y, w: Math.min(tile, width - x), h: Math.min(tile, height - y), frame })
+      }
+    }
+  }
+  const image = new Float32Array(width * height * 3)
+  const scene = { width, height, time: args.time, settings: args.settings }
+  const threads = Math.min(args.threads, queue.length)
+  const tilesPerThread = new Array(threads).fill(0)
+  let remaining = queue.length
+  let steps = 0
+  let marched = 0
+
+  return new Promise((resolve, reject) => {
+    const workers = []
+    const finish = (error) => {
+      for (const worker of workers) worker.terminate()
+      if (error) {
+        reject(error)
+      } else {
+        const display = applyPostChain(image, width, height, args.settings, args.width, args.height, args.upscaler ?? "fsr")
+        resolve({ image: display, tilesPerThread, meanSteps: marched > 0 ? steps / marched : 0 })
+      }
+    }
+    for (let n = 0; n < threads; n++) {
+      const worker = new Worker(new URL(import.meta.url), { workerData: scene })
+      workers.push(worker)
+      const dispatch = () => {
+        const next = queue.shift()
+        if (next) worker.postMessage(next)
+      }
+      worker.on("message", (tile) => {
+        const { x, y, w, h, pixels } = tile
+        for (let row = 0; row < h; row++) {
+          const o = ((y + row) * width + x) * 3
+          for (let k = 0; k < w * 3; k++) image[o + k] += pixels[row * w * 3 + k] / frames
+        }
+        steps += tile.steps
+        marched += tile.marched
+        tilesPerThread[n]++
+        if (--remaining === 0) {
+          finish()
+        } else {
+          dispatch()
+        }
+      })
+      worker.on("error", finish)
+      dispatch()
+    }
+  })
+}
+
+async function main() {
+  const args = parseArgs(process.argv.slice(2))
+  const start = performance.now()
+  const { image, tilesPerThread, meanSteps } = await renderFrame(args)
+  const seconds = (performance.now() - start) / 1000
+  const megapixels = (args.width * args.height) / 1e6
+
+  const encoded =
+    path.extname(args.out) === ".pfm"
+      ? encodePfm(image, args.width, args.height)
+      : encodePng(image, args.width, args.height)
+  fs.writeFileSync(args.out, encoded)
+
+  const report = {
+    tier: args.tier,
+    settings: args.settings,
+    width: args.width,
+    height: args.height,
+    time: args.time,
+    marchScale: args.marchScale,
+    accumulate: args.accumulate,
+    upscaler: args.marchScale < 1 ? args.upscaler : null,
+    threads: tilesPerThread.length,
+    tiles: tilesPerThread.reduce((sum, count) => sum + count, 0),
+    tilesPerThread,
+    seconds: Math.round(seconds * 1000) / 1000,
+    megapixelsPerSecond: Math.round((megapixels / seconds) * 1000) / 1000,
+    meanSteps: Math.round(meanSteps * 10) / 10,
+    out: args.out,
+  }
+  console.error(
+    `${args.width}x${args.height} ${args.tier} in ${report.seconds} s on ${report.threads} threads: ` +
+      `${report.megapixelsPerSecond} MP/s, ${report.meanSteps} steps per marched ray`,
+  )
+  if (args.compare) {
+    const reference = decodePfm(fs.readFileSync(args.compare))
+    if (reference.width !== args.width || reference.height !== args.height) {
+      throw new Error(`${args.compare} is ${reference.width}x${reference.height}, not ${args.size}`)
+    }
+    report.error = compareImages(image, reference.image)
+    console.error(
+      `vs ${args.compare}: RMSE ${report.error.rmse}, p99 ${report.error.p99}, max ${report.error.max} (8-bit levels)`,
+    )
+  }
+  process.stdout.write(JSON.stringify(report, null, 2) + "\n")
+}
+
+if (!isMainThread) {
+  parentPort.on("message", ({ x, y, w, h, frame }) => {
+    const { pixels, steps, marched } = renderTile(x, y, w, h, workerData, frame)
+    parentPort.postMessage({ x, y, w, h, pixels, steps, marched }, [pixels.buffer])
+  })
+} else if (process.argv[1] && path.resolve(process.argv[1]) === fileURLToPath(import.meta.url)) {
+  main().catch((e) => {
+    console.error(e.message)
+    process.exit(2)
+  })
+}
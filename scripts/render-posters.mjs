@@ -0,0 +1,99 @@
+#!/usr/bin/env node
+// Renders the poster frames shown behind the accretion disk canvas until its
+// first real frame is presented (see .accretion-disk-poster in
+// app/globals.css). Runs before `next build`: the reference renderer draws the
+// scene at u_time 0, the moment the live render's clock starts, once per
+// orientation, and sharp (bundled with Next as its image optimizer) writes
+// AVIF and WebP at each breakpoint into public/posters.
+//
+//   node scripts/render-posters.mjs
+//   node scripts/render-posters.mjs --tier high --threads 4
+//
+// Without sharp the posters are skipped with a warning and the page falls
+// back to a black background.
+
+import fs from "node:fs"
+import { createRequire } from "node:module"
+import os from "node:os"
+import path from "node:path"
+import { fileURLToPath } from "node:url"
+import { TIERS, renderFrame, toRgb8 } from "./reference-render.mjs"
+
+const ROOT = path.resolve(path.dirname(fileURLToPath(import.meta.url)), "..")
+const OUT_DIR = path.join(ROOT, "public", "posters")
+
+// The shader scales the view by the shorter side, so a poster covering a
+// viewport lines up with the live frame as long as the poster is at least as
+// elongated. 21:9 covers ultrawide monitors and tall phones alike.
+const POSTERS = [
+  { orientation: "landscape", width: 1920, height: 823, widths: [960, 1920] },
+  { orientation: "portrait", width: 960, height: 2240, widths: [480, 960] },
+]
+
+const DEFAULTS = {
+  tier: "medium",
+  threads: String(os.availableParallelism()),
+}
+
+function parseArgs(argv) {
+  const args = { ...DEFAULTS }
+  for (let i = 0; i < argv.length; i++) {
+    const name = argv[i].replace(/^--/, "")
+    if (name in DEFAULTS && i + 1 < argv.length) {
+      args[name] = argv[++i]
+    } else {
+      throw new Error(`Unknown or incomplete option: ${argv[i]}`)
+    }
+  }
+  if (!(args.tier in TIERS)) throw new Error(`Unknown tier: ${args.tier}`)
+  return { tier: args.tier, threads: Math.max(1, Number(args.threads)) }
+}
+
+/** sharp is a dependency of next rather than of this project, so resolve it from there. */
+function loadSharp() {
+  try {
+    return createRequire(createRequire(path.join(ROOT, "package.json")).resolve("next/package.json"))("sharp")
+  } catch {
+    return null
+  }
+}
+
+async function main() {
+  const args = parseArgs(process.argv.slice(2))
+  const sharp = loadSharp()
+  if (!sharp) {
+    console.error("sharp is not installed; skipping poster frames")
+    return
+  }
+  fs.mkdirSync(OUT_DIR, { recursive: true })
+
+  for (const poster of POSTERS) {
+    const start = performance.now()
+    const { image } = await renderFrame({
+      width: poster.width,
+      height: poster.height,
+      time: 0,
+      threads: args.threads,
+      tile: 32,
+      settings: TIERS[args.tier],
+    })
+    const source = sharp(toRgb8(image), { raw: { width: poster.width, height: poster.height, channels: 3 } })
+    const written = []
+    for (const width of poster.widths) {
+      const resized = source.clone().resize({ width })
+      const name = `accretion-disk-${poster.orientation}-${width}`
+      await resized.clone().avif({ quality: 50, effort: 6 }).toFile(path.join(OUT_DIR, `${name}.avif`))
+      await resized.clone().webp({ quality: 75 }).toFile(path.join(OUT_DIR, `${name}.webp`))
+      written.push(name)
+    }
+    console.error(
+      `${poster.orientation} ${poster.width}x${poster.height} in ${((performance.now() - start) / 1000).toFixed(1)} s: ` +
+        written.join(", "),
+    )
+  }
+}
+
+main().catch((e) => {
+  console.error(e.message)
+  process.exit(2)
+})
@@ -0,0 +1,179 @@
+#!/usr/bin/env node
+// Pre-renders the seamless video loop that the ultra-low tier plays instead of
+// ray-marching live (see AccretionDiskVisualization's videoLoop prop). Frames
+// come from the CPU reference renderer and are piped into ffmpeg as H.264,
+// once per orientation and width, into public/videos. This takes a long time
+// and is run by hand when the scene changes, not as part of the build.
+//
+//   node scripts/render-video-loop.mjs
+//   node scripts/render-video-loop.mjs --tier medium --fps 24 --threads 16
+//
+// The loop lasts one camera orbit, so its first and last frames look at the
+// hole from the same angle; the disk's turbulence does not repeat, so the
+// last --fade seconds are blended into the first ones. ffmpeg is taken from
+// --ffmpeg, $FFMPEG_PATH or the PATH.
+
+import { spawn, spawnSync } from "node:child_process"
+import fs from "node:fs"
+import os from "node:os"
+import path from "node:path"
+import { fileURLToPath } from "node:url"
+import { TIERS, renderFrame, toRgb8 } from "./reference-render.mjs"
+
+const ROOT = path.resolve(path.dirname(fileURLToPath(import.meta.url)), "..")
+
+// The camera orbits at u_time * 0.25 radians per second.
+const ORBIT_SECONDS = (2 * Math.PI) / 0.25
+
+// Same 21:9 framing as the poster frames, so object-fit: cover lines up.
+const VARIANTS = [
+  { orientation: "landscape", width: 640, height: 274 },
+  { orientation: "landscape", width: 1280, height: 548 },
+  { orientation: "portrait", width: 360, height: 840 },
+  { orientation: "portrait", width: 720, height: 1680 },
+]
+
+const DEFAULTS = {
+  tier: "high",
+  fps: "30",
+  fade: "1",
+  crf: "26",
+  threads: String(os.availableParallelism()),
+  ffmpeg: process.env.FFMPEG_PATH ?? null,
+  out: path.join(ROOT, "public", "videos"),
+}
+
+function parseArgs(argv) {
+  const args = { ...DEFAULTS }
+  for (let i = 0; i < argv.length; i++) {
+    const name = argv[i].replace(/^--/, "")
+    if (name in DEFAULTS && i + 1 < argv.length) {
+      args[name] = argv[++i]
+    } else {
+      throw new Error(`Unknown or incomplete option: ${argv[i]}`)
+    }
+  }
+  if (!(args.tier in TIERS)) throw new Error(`Unknown tier: ${args.tier}`)
+  return {
+    ...args,
+    fps: Number(args.fps),
+    fade: Number(args.fade),
+    threads: Math.max(1, Number(args.threads)),
+  }
+}
+
+function findFfmpeg(explicit) {
+  if (explicit) return explicit
+  const found = spawnSync("which", ["ffmpeg"], { encoding: "utf8" })
+  if (found.status === 0) return found.stdout.trim()
+  throw new Error("No ffmpeg found; pass --ffmpeg or set FFMPEG_PATH")
+}
+
+/** H.264 main profile in yuv420p, which every phone can decode in hardware. */
+function startEncoder(ffmpeg, { width, height }, args, file) {
+  const encoder = spawn(
+    ffmpeg,
+    [
+      "-y",
+      "-loglevel",
+      "error",
+      "-f",
+      "rawvideo",
+      "-pix_fmt",
+      "rgb24",
+      "-s",
+      `${width}x${height}`,
+      "-r",
+      String(args.fps),
+      "-i",
+      "-",
+      "-an",
+      "-c:v",
+      "libx264",
+      "-profile:v",
+      "main",
+      "-pix_fmt",
+      "yuv420p",
+      "-preset",
+      "slow",
+      "-crf",
+      args.crf,
+      "-g",
+      String(args.fps * 2),
+      "-movflags",
+      "+faststart",
+      file,
+    ],
+    { stdio: ["pipe", "ignore", "inherit"] },
+  )
+  const exited = new Promise((resolve, reject) => {
+    encoder.on("error", reject)
+    encoder.on("exit", (code) => (code === 0 ? resolve() : reject(new Error(`ffmpeg exited with ${code}`))))
+  })
+  return {
+    write: (frame) =>
+      new Promise((resolve) => {
+        if (encoder.stdin.write(frame)) {
+          resolve()
+        } else {
+          encoder.stdin.once("drain", resolve)
+        }
+      }),
+    finish: () => {
+      encoder.stdin.end()
+      return exited
+    },
+  }
+}
+
+/**
+ * Emits frames fadeFrames..total-1 as rendered, then frames total.. blended
+ * into the first fadeFrames, which end the loop and lead back into its start.
+ */
+async function renderLoop(ffmpeg, variant, args, file) {
+  const total = Math.round(ORBIT_SECONDS * args.fps)
+  const fadeFrames = Math.min(Math.round(args.fade * args.fps), total)
+  const encoder = startEncoder(ffmpeg, variant, args, file)
+  const render = async (index) =>
+    (
+      await renderFrame({
+        width: variant.width,
+        height: variant.height,
+        time: index / args.fps,
+        threads: args.threads,
+        tile: 32,
+        settings: TIERS[args.tier],
+      })
+    ).image
+
+  const start = performance.now()
+  const head = []
+  for (let i = 0; i < fadeFrames; i++) head.push(await render(i))
+  for (let i = fadeFrames; i < total; i++) {
+    await encoder.write(toRgb8(await render(i)))
+    if (i % args.fps === 0) process.stderr.write(`\r${path.basename(file)}: ${i}/${total} frames`)
+  }
+  for (let i = 0; i < fadeFrames; i++) {
+    const frame = await render(total + i)
+    const weight = (i + 1) / (fadeFrames + 1)
+    for (let p = 0; p < frame.length; p++) frame[p] += (head[i][p] - frame[p]) * weight
+    await encoder.write(toRgb8(frame))
+  }
+  await encoder.finish()
+  process.stderr.write(`\r${path.basename(file)}: ${total} frames in ${((performance.now() - start) / 1000).toFixed(0)} s\n`)
+}
+
+async function main() {
+  const args = parseArgs(process.argv.slice(2))
+  const ffmpeg = findFfmpeg(args.ffmpeg)
+  fs.mkdirSync(args.out, { recursive: true })
+  for (const variant of VARIANTS) {
+    const file = path.join(args.out, `accretion-disk-loop-${variant.orientation}-${variant.width}.mp4`)
+    await renderLoop(ffmpeg, variant, args, file)
+  }
+}
+
+main().catch((e) => {
+  console.error(e.message)
+  process.exit(2)
+})
@@ -0,0 +1,85 @@
+import assert from "node:assert/strict"
+import { describe, test } from "node:test"
+import { ResolutionGovernor } from "../lib/accretion-disk/resolution-governor.ts"
+
+// At 60 FPS the GPU budget is 1000 / 60 * 0.85 = 14.17 ms.
+const OPTIONS = { minScale: 0.5, maxScale: 1, initialScale: 1, targetFPS: 60 }
+
+/** Feeds `count` equal samples and returns the indices of those that changed the scale. */
+function feed(governor, count, costMs, source = "gpu") {
+  const changes = []
+  for (let i = 0; i < count; i++) {
+    if (governor.sample(costMs, source)) changes.push(i)
+  }
+  return changes
+}
+
+/** Scales are multiples of 0.05, so compare them to a few ulps. */
+function assertScale(governor, expected) {
+  assert.ok(Math.abs(governor.getState().scale - expected) < 1e-9, `scale ${governor.getState().scale}, expected ${expected}`)
+}
+
+describe("ResolutionGovernor", () => {
+  test("smooths the frame cost with an EMA", () => {
+    const governor = new ResolutionGovernor(OPTIONS)
+    governor.sample(10, "gpu")
+    assert.equal(governor.getState().frameCostMs, 10)
+    governor.sample(20, "gpu")
+    assert.equal(governor.getState().frameCostMs, 11.5)
+  })
+
+  test("ignores rAF deltas once GPU timings arrive, and restarts the EMA on a switch", () => {
+    const governor = new ResolutionGovernor(OPTIONS)
+    governor.sample(30, "raf")
+    governor.sample(5, "gpu")
+    assert.deepEqual(governor.getState(), { scale: 1, frameCostMs: 5, source: "gpu", targetFrameMs: (1000 / 60) * 0.85 })
+    assert.equal(governor.sample(50, "raf"), false)
+    assert.equal(governor.getState().frameCostMs, 5)
+  })
+
+  test("rejects non-positive and non-finite costs", () => {
+    const governor = new ResolutionGovernor(OPTIONS)
+    for (const cost of [0, -1, NaN, Infinity]) assert.equal(governor.sample(cost, "gpu"), false)
+    assert.equal(governor.getState().frameCostMs, 0)
+  })
+
+  test("downscales by sqrt(budget / cost) after six slow samples, then cools down", () => {
+    const governor = new ResolutionGovernor(OPTIONS)
+    assert.deepEqual(feed(governor, 6, 30), [5])
+    // 1 * sqrt(14.17 / 30) = 0.687, quantized to 0.05
+    assertScale(governor, 0.7)
+    assert.deepEqual(feed(governor, 20, 60), [])
+    assert.deepEqual(feed(governor, 6, 60), [5])
+  })
+
+  test("leaves the scale alone inside the hysteresis band", () => {
+    const governor = new ResolutionGovernor(OPTIONS)
+    // 12 ms is 85% of the budget, between the 70% and 100% band edges.
+    assert.deepEqual(feed(governor, 500, 12), [])
+    assertScale(governor, 1)
+  })
+
+  test("upscales after thirty fast samples, by at most 0.1", () => {
+    const governor = new ResolutionGovernor({ ...OPTIONS, initialScale: 0.5 })
+    assert.deepEqual(feed(governor, 30, 5), [29])
+    assertScale(governor, 0.6)
+  })
+
+  test("clamps to the configured range", () => {
+    const governor = new ResolutionGovernor(OPTIONS)
+    feed(governor, 6, 1000)
+    assertScale(governor, 0.5)
+    // Already at the floor: slow samples no longer count as a change.
+    assert.deepEqual(feed(governor, 100, 1000), [])
+  })
+
+  test("doubles the wait before the next upscale when one does not hold", () => {
+    const governor = new ResolutionGovernor({ ...OPTIONS, initialScale: 0.5 })
+    assert.deepEqual(feed(governor, 30, 5), [29])
+    // Slow again within 60 samples of the upscale: step back down.
+    assert.deepEqual(feed(governor, 26, 30), [25])
+    assertScale(governor, 0.5)
+    // 20 samples of cooldown, then 60 fast samples instead of 30.
+    assert.deepEqual(feed(governor, 80, 5), [79])
+  })
+})
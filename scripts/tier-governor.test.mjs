@@ -0,0 +1,91 @@
+import assert from "node:assert/strict"
+import { describe, test } from "node:test"
+import { TierGovernor } from "../lib/accretion-disk/tier-governor.ts"
+
+const WINDOW = 90
+const BUDGET_MS = 10
+
+/** Feeds `windows` whole windows of equal samples and returns the decision of each. */
+function feedWindows(governor, windows, costMs, source, scaleLimit) {
+  const decisions = []
+  for (let w = 0; w < windows; w++) {
+    let decision = null
+    for (let i = 0; i < WINDOW; i++) {
+      const result = governor.sample(costMs, source, BUDGET_MS, scaleLimit)
+      if (i < WINDOW - 1) assert.equal(result, null, "decided before the window was full")
+      decision = result
+    }
+    decisions.push(decision)
+  }
+  return decisions
+}
+
+/** Index of the first window that decided, or -1. */
+function firstDecision(decisions) {
+  return decisions.findIndex((decision) => decision !== null)
+}
+
+describe("TierGovernor", () => {
+  test("steps down after two slow windows at the lowest render scale", () => {
+    const governor = new TierGovernor("medium")
+    const decisions = feedWindows(governor, 2, 20, "raf", "min")
+    assert.equal(decisions[0], null)
+    assert.deepEqual(decisions[1], { tier: "low", direction: "down", percentiles: { p50: 20, p90: 20, p99: 20 } })
+  })
+
+  test("only moves once the resolution governor is pinned", () => {
+    const governor = new TierGovernor("medium")
+    assert.equal(firstDecision(feedWindows(governor, 10, 20, "raf", null)), -1)
+    assert.equal(firstDecision(feedWindows(governor, 10, 2, "gpu", "min")), -1)
+  })
+
+  test("steps up after four fast GPU windows at the highest render scale", () => {
+    const governor = new TierGovernor("medium")
+    // p90 at 40% of the budget, under the 45% threshold
+    const decisions = feedWindows(governor, 4, 4, "gpu", "max")
+    assert.equal(firstDecision(decisions), 3)
+    assert.equal(decisions[3].tier, "high")
+    assert.equal(decisions[3].direction, "up")
+  })
+
+  test("takes p90 from the window", () => {
+    const governor = new TierGovernor("medium")
+    let decision = null
+    for (let window = 0; window < 2; window++) {
+      // 81 frames at 5 ms and 9 at 40 ms: p90 is the first slow frame.
+      for (let i = 0; i < WINDOW; i++) decision = governor.sample(i < 81 ? 5 : 40, "raf", BUDGET_MS, "min")
+    }
+    assert.deepEqual(decision?.percentiles, { p50: 5, p90: 40, p99: 40 })
+  })
+
+  test("does not step past either end of the ladder", () => {
+    assert.equal(firstDecision(feedWindows(new TierGovernor("ultra-low"), 10, 20, "raf", "min")), -1)
+    assert.equal(firstDecision(feedWindows(new TierGovernor("ultra"), 10, 1, "gpu", "max")), -1)
+  })
+
+  test("restarts the window when the cost source changes", () => {
+    const governor = new TierGovernor("medium")
+    assert.deepEqual(feedWindows(governor, 1, 20, "raf", "min"), [null])
+    for (let i = 0; i < WINDOW - 1; i++) governor.sample(20, "raf", BUDGET_MS, "min")
+    // Would have closed the second slow window, but the GPU sample starts a new one.
+    assert.equal(governor.sample(20, "gpu", BUDGET_MS, "min"), null)
+    for (let i = 0; i < WINDOW - 2; i++) assert.equal(governor.sample(20, "gpu", BUDGET_MS, "min"), null)
+    assert.equal(governor.sample(20, "gpu", BUDGET_MS, "min")?.tier, "low")
+  })
+
+  test("doubles the windows needed to step up again after an upgrade is undone", () => {
+    const governor = new TierGovernor("medium")
+    const up = feedWindows(governor, 4, 4, "gpu", "max")[3]
+    governor.commit(up)
+    assert.equal(governor.getTier(), "high")
+
+    // Two windows of cooldown, then two slow ones: undone four windows after the upgrade.
+    const down = feedWindows(governor, 4, 20, "gpu", "min")
+    assert.equal(firstDecision(down), 3)
+    governor.commit(down[3])
+    assert.equal(governor.getTier(), "medium")
+
+    // Two windows of cooldown, then eight fast ones instead of four.
+    assert.equal(firstDecision(feedWindows(governor, 10, 4, "gpu", "max")), 9)
+  })
+})
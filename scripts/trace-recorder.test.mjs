@@ -0,0 +1,54 @@
+import assert from "node:assert/strict"
+import { describe, test } from "node:test"
+import { TraceRecorder } from "../lib/accretion-disk/trace-recorder.ts"
+
+/** The recorded events, without the two metadata events every export starts with. */
+function recorded(trace) {
+  return trace.traceEvents.filter((event) => event.ph !== "M")
+}
+
+describe("TraceRecorder", () => {
+  test("exports spans, instants and counters as Chrome trace events", () => {
+    const recorder = new TraceRecorder(8)
+    const start = performance.now()
+    recorder.span("frame", start, { tier: "high" })
+    recorder.instant("tier-change")
+    recorder.counter("gpu", { march: 3.5 })
+    const trace = recorder.export("render")
+
+    assert.equal(trace.traceEvents[1].args.name, "render")
+    const [span, instant, counter] = recorded(trace)
+    assert.equal(span.ph, "X")
+    assert.equal(span.ts, Math.round(start * 1000))
+    assert.ok(span.dur >= 0)
+    assert.deepEqual(span.args, { tier: "high" })
+    assert.equal(instant.ph, "i")
+    assert.equal(instant.s, "t")
+    assert.equal(instant.args, undefined)
+    assert.equal(counter.ph, "C")
+    assert.deepEqual(counter.args, { march: 3.5 })
+    assert.equal(trace.otherData.droppedEvents, 0)
+  })
+
+  test("overwrites the oldest events once full and counts them as dropped", () => {
+    const recorder = new TraceRecorder(4)
+    for (let i = 0; i < 6; i++) recorder.instant(`event-${i}`)
+    const trace = recorder.export("render")
+    assert.deepEqual(
+      recorded(trace).map((event) => event.name),
+      ["event-2", "event-3", "event-4", "event-5"],
+    )
+    assert.equal(trace.otherData.droppedEvents, 2)
+  })
+
+  test("keeps order across several wraps", () => {
+    const recorder = new TraceRecorder(3)
+    for (let i = 0; i < 10; i++) recorder.instant(i % 2 === 0 ? "even" : "odd", { i })
+    const trace = recorder.export("render")
+    assert.deepEqual(
+      recorded(trace).map((event) => event.args.i),
+      [7, 8, 9],
+    )
+    assert.equal(trace.otherData.droppedEvents, 7)
+  })
+})
@@ -0,0 +1,32 @@
+// Module hooks that let the tests (`pnpm test`) import the TypeScript in lib/
+// directly: extensionless relative imports resolve to .ts files, which are
+// transpiled one at a time with the project's typescript. Types are erased,
+// not checked; `tsc` and `next build` do that.
+//
+//   node --import ./scripts/typescript-loader.mjs --test scripts/*.test.mjs
+
+import fs from "node:fs"
+import { register } from "node:module"
+import { fileURLToPath } from "node:url"
+import { isMainThread } from "node:worker_threads"
+
+// The hooks run on a thread of their own, which loads this file again.
+if (isMainThread) register(import.meta.url)
+
+export async function resolve(specifier, context, nextResolve) {
+  if (/^\.\.?\//.test(specifier) && context.parentURL?.endsWith(".ts") && !/\.[cm]?[jt]s$/.test(specifier)) {
+    const url = new URL(`${specifier}.ts`, context.parentURL)
+    if (fs.existsSync(url)) return { url: url.href, shortCircuit: true }
+  }
+  return nextResolve(specifier, context)
+}
+
+export async function load(url, context, nextLoad) {
+  if (!url.endsWith(".ts")) return nextLoad(url, context)
+  const { default: ts } = await import("typescript")
+  const { outputText } = ts.transpileModule(fs.readFileSync(new URL(url), "utf8"), {
+    fileName: fileURLToPath(url),
+    compilerOptions: { module: ts.ModuleKind.ESNext, target: ts.ScriptTarget.ES2022 },
+  })
+  return { format: "module", source: outputText, shortCircuit: true }
+}